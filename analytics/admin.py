@@ -0,0 +1,9 @@
+from django.contrib import admin
+from .models import CardEvent
+
+@admin.register(CardEvent)
+class CardEventAdmin(admin.ModelAdmin):
+    list_display = ("created_at", "card", "kind", "link", "device", "referrer")
+    list_filter = ("kind", "device")
+    raw_id_fields = ("card",)
+    date_hierarchy = "created_at"
@@ -0,0 +1,131 @@
+# analytics/buffer.py
+"""
+Buffer en memoria (por worker) de eventos de tarjetas.
+
+El endpoint de ingesta sólo hace append a una lista bajo un lock; un hilo
+de fondo vacía el buffer a la BD en lotes:
+  - cada ANALYTICS_FLUSH_INTERVAL segundos, o
+  - antes, si el buffer llega a ANALYTICS_FLUSH_SIZE eventos.
+Al salir el proceso (reinicio de gunicorn) se hace un último flush.
+
+El INSERT es multi-fila con ON CONFLICT DO NOTHING (bulk_create con
+ignore_conflicts) sobre event_id único: si un lote se reintenta, o el
+navegador re-envía un beacon, el evento no se cuenta dos veces.
+"""
+import atexit
+import os
+import threading
+import uuid
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, close_old_connections
+from django.utils import timezone
+
+
+class EventBuffer:
+    def __init__(self, flush_size=500, interval=5.0, max_pending=50_000):
+        self.flush_size = flush_size
+        self.interval = interval
+        self.max_pending = max_pending
+        self._events = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._pid = None
+        self.flushed = 0
+        self.dropped = 0
+
+    # ------------------------------ Ingesta ------------------------------
+    def add(self, card_id, kind, device, link="", referrer="", created_at=None, event_id=None):
+        """Encola un evento. Nunca toca la BD. False si el buffer está lleno."""
+        # La hora es la del evento, no la del flush: los rollups la usan
+        created_at = created_at or timezone.now()
+        event = (event_id or uuid.uuid4(), card_id, kind, link, device, referrer, created_at)
+        with self._lock:
+            if len(self._events) >= self.max_pending:
+                # BD caída por mucho tiempo: preferimos perder eventos a la memoria
+                self.dropped += 1
+                return False
+            self._events.append(event)
+            pending = len(self._events)
+        self._ensure_thread()
+        if pending >= self.flush_size:
+            self._wake.set()
+        return True
+
+    def pending(self):
+        return len(self._events)
+
+    # ------------------------------- Flush -------------------------------
+    def flush(self):
+        """Escribe todo lo pendiente. Devuelve cuántos eventos se enviaron."""
+        with self._lock:
+            batch, self._events = self._events, []
+        if not batch:
+            return 0
+        close_old_connections()
+        try:
+            _write(batch)
+        except DatabaseError:
+            # Se reintenta en el siguiente ciclo; event_id evita duplicados
+            with self._lock:
+                room = self.max_pending - len(self._events)
+                self._events[:0] = batch[:room]
+                self.dropped += max(0, len(batch) - room)
+            return 0
+        self.flushed += len(batch)
+        return len(batch)
+
+    def _ensure_thread(self):
+        # El pid cubre el caso de gunicorn --preload (fork después del import)
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="analytics-flush", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        from .rollups import maybe_aggregate
+
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+            # Mantiene los rollups al día sin cron (a lo más uno por intervalo)
+            maybe_aggregate()
+
+    def stats(self):
+        return {"pending": self.pending(), "flushed": self.flushed, "dropped": self.dropped}
+
+
+def _write(batch):
+    from .models import CardEvent
+
+    objs = [
+        CardEvent(
+            event_id=event_id, card_id=card_id, kind=kind, link=link,
+            device=device, referrer=referrer, created_at=created_at,
+        )
+        for event_id, card_id, kind, link, device, referrer, created_at in batch
+    ]
+    try:
+        CardEvent.objects.bulk_create(objs, batch_size=1000, ignore_conflicts=True)
+    except IntegrityError:
+        # Alguna tarjeta se borró mientras sus eventos estaban en el buffer
+        from vcards.models import VCard
+
+        alive = set(VCard.objects.filter(id__in={o.card_id for o in objs}).values_list("id", flat=True))
+        objs = [o for o in objs if o.card_id in alive]
+        CardEvent.objects.bulk_create(objs, batch_size=1000, ignore_conflicts=True)
+
+
+# Instancia única por proceso
+event_buffer = EventBuffer(
+    flush_size=getattr(settings, "ANALYTICS_FLUSH_SIZE", 500),
+    interval=getattr(settings, "ANALYTICS_FLUSH_INTERVAL", 5.0),
+    max_pending=getattr(settings, "ANALYTICS_MAX_PENDING", 50_000),
+)
+atexit.register(event_buffer.flush)
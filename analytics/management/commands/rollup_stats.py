@@ -0,0 +1,49 @@
+# analytics/management/commands/rollup_stats.py
+"""
+Mantiene los rollups de estadísticas (analytics/rollups.py).
+
+    python manage.py rollup_stats                 # incremental (cron)
+    python manage.py rollup_stats --rebuild --since 2025-01-01 --until 2025-01-31
+    python manage.py rollup_stats --rebuild --since 2025-01-01 --card 12 --card 15
+
+Los eventos insertados después (un backfill) tienen ids nuevos, así que el
+incremental los suma solo; --rebuild es para rangos que quedaron mal
+(eventos borrados o editados a mano, rollups truncados, etc.).
+"""
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from analytics.rollups import aggregate_all, rebuild
+
+
+def _date(value):
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise CommandError(f"Fecha inválida: {value} (usa AAAA-MM-DD)")
+
+
+class Command(BaseCommand):
+    help = "Actualiza (o reconstruye) los rollups por hora/día de los eventos de tarjetas."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rebuild", action="store_true", help="Recalcula un rango de días.")
+        parser.add_argument("--since", type=_date, help="Primer día (AAAA-MM-DD) del rango.")
+        parser.add_argument("--until", type=_date, help="Último día (por defecto: hoy).")
+        parser.add_argument("--card", type=int, action="append", help="Sólo estas tarjetas (repetible).")
+
+    def handle(self, *args, **opts):
+        # Primero se alcanza la marca: rebuild sólo cubre eventos ya agregados
+        n = aggregate_all()
+        self.stdout.write(f"Incremental: {n} eventos nuevos")
+
+        if opts["rebuild"]:
+            if not opts["since"]:
+                raise CommandError("--rebuild requiere --since")
+            until = opts["until"] or timezone.localdate()
+            if until < opts["since"]:
+                raise CommandError("--until es anterior a --since")
+            hours, days = rebuild(opts["since"], until, card_ids=opts["card"])
+            self.stdout.write(f"Reconstruido {opts['since']}..{until}: {hours} filas por hora, {days} por día")
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('vcards', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CardEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_id', models.UUIDField(unique=True)),
+                ('kind', models.CharField(choices=[('view', 'Vista'), ('click', 'Click')], max_length=10)),
+                ('link', models.CharField(blank=True, max_length=40)),
+                ('device', models.CharField(choices=[('mobile', 'Móvil'), ('desktop', 'Desktop'), ('tablet', 'Tablet')], max_length=10)),
+                ('referrer', models.CharField(blank=True, max_length=120)),
+                ('created_at', models.DateTimeField()),
+                ('card', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='events', to='vcards.vcard')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['card', 'created_at'], name='analytics_c_card_id_578e04_idx')],
+            },
+        ),
+    ]
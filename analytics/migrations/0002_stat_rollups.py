@@ -0,0 +1,55 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+        ('vcards', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupState',
+            fields=[
+                ('name', models.CharField(max_length=30, primary_key=True, serialize=False)),
+                ('last_event_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CardStatDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('view', 'Vista'), ('click', 'Click')], max_length=10)),
+                ('device', models.CharField(choices=[('mobile', 'Móvil'), ('desktop', 'Desktop'), ('tablet', 'Tablet')], max_length=10)),
+                ('referrer', models.CharField(blank=True, max_length=120)),
+                ('link', models.CharField(blank=True, max_length=40)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('bucket', models.DateField()),
+                ('card', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='vcards.vcard')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('card', 'bucket', 'kind', 'device', 'referrer', 'link'), name='uniq_cardstatday')],
+            },
+        ),
+        migrations.CreateModel(
+            name='CardStatHour',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('view', 'Vista'), ('click', 'Click')], max_length=10)),
+                ('device', models.CharField(choices=[('mobile', 'Móvil'), ('desktop', 'Desktop'), ('tablet', 'Tablet')], max_length=10)),
+                ('referrer', models.CharField(blank=True, max_length=120)),
+                ('link', models.CharField(blank=True, max_length=40)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('bucket', models.DateTimeField()),
+                ('card', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='vcards.vcard')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('card', 'bucket', 'kind', 'device', 'referrer', 'link'), name='uniq_cardstathour')],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-18 13:08
+
+import django.db.models.functions.datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0002_stat_rollups'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cardevent',
+            name='inserted_at',
+            field=models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), editable=False),
+        ),
+    ]
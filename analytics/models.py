@@ -0,0 +1,89 @@
+from django.db import models
+from django.db.models.functions import Now
+
+
+class CardEvent(models.Model):
+    """
+    Un evento crudo de una tarjeta pública (vista o click en un enlace).
+    Se insertan en lote desde analytics.buffer; event_id (único) hace que
+    reintentos y re-envíos no se cuenten dos veces.
+    """
+
+    class Kind(models.TextChoices):
+        VIEW = "view", "Vista"
+        CLICK = "click", "Click"
+
+    class Device(models.TextChoices):
+        MOBILE = "mobile", "Móvil"
+        DESKTOP = "desktop", "Desktop"
+        TABLET = "tablet", "Tablet"
+
+    event_id = models.UUIDField(unique=True)
+    card = models.ForeignKey("vcards.VCard", on_delete=models.CASCADE, related_name="events")
+    kind = models.CharField(max_length=10, choices=Kind.choices)
+    link = models.CharField(max_length=40, blank=True)       # whatsapp, phone, web, ...
+    device = models.CharField(max_length=10, choices=Device.choices)
+    referrer = models.CharField(max_length=120, blank=True)  # sólo el host
+    created_at = models.DateTimeField()
+    # Hora de la BD al insertar (no la del proceso que encoló el evento):
+    # es la que usa analytics.rollups para dejar asentar los lotes
+    inserted_at = models.DateTimeField(db_default=Now(), editable=False)
+
+    class Meta:
+        indexes = [models.Index(fields=["card", "created_at"])]
+
+    def __str__(self):
+        return f"{self.kind} {self.card_id} {self.created_at:%Y-%m-%d %H:%M}"
+
+
+# ------------------------------ Rollups ------------------------------
+class _StatRollup(models.Model):
+    """
+    Conteo de eventos por tarjeta y bucket, desglosado por tipo, dispositivo,
+    origen y enlace. Lo mantiene analytics.rollups a partir de CardEvent.
+    """
+
+    card = models.ForeignKey("vcards.VCard", on_delete=models.CASCADE, related_name="+")
+    kind = models.CharField(max_length=10, choices=CardEvent.Kind.choices)
+    device = models.CharField(max_length=10, choices=CardEvent.Device.choices)
+    referrer = models.CharField(max_length=120, blank=True)
+    link = models.CharField(max_length=40, blank=True)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+
+class CardStatHour(_StatRollup):
+    bucket = models.DateTimeField()  # inicio de la hora (UTC)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["card", "bucket", "kind", "device", "referrer", "link"],
+                name="uniq_cardstathour",
+            )
+        ]
+
+
+class CardStatDay(_StatRollup):
+    bucket = models.DateField()  # día local (TIME_ZONE)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["card", "bucket", "kind", "device", "referrer", "link"],
+                name="uniq_cardstatday",
+            )
+        ]
+
+
+class RollupState(models.Model):
+    """High-water mark: último CardEvent.id ya sumado a los rollups."""
+
+    name = models.CharField(max_length=30, primary_key=True)
+    last_event_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} @ {self.last_event_id}"
@@ -0,0 +1,217 @@
+# analytics/rollups.py
+"""
+Rollups por hora y por día de CardEvent (ver CardStatHour / CardStatDay).
+
+Incremental (aggregate): suma los eventos con id > high-water mark
+(RollupState) y mueve la marca. Sólo toma eventos insertados hace más de
+ANALYTICS_ROLLUP_LAG segundos según el reloj de la BD (inserted_at, con
+db_default=Now()): un id menor que todavía no hace commit pertenece a un
+INSERT que empezó antes, así que el margen evita saltárselo mientras la
+transacción del lote dure menos que el lag. No se usa created_at: es la
+hora en que el proceso encoló el evento, y un lote demorado o re-encolado
+tras un DatabaseError llega con ids nuevos y un created_at viejo. Lo
+corre el comando rollup_stats y el hilo del buffer de cada worker
+(maybe_aggregate), pero de éstos sólo uno por intervalo: el que gana el
+UPDATE condicional sobre RollupState.updated_at.
+
+Reconstrucción (rebuild): borra y recalcula un rango de días con un
+GROUP BY sobre los eventos ya cubiertos por la marca, bajo el mismo lock,
+así que no se cruza con el incremental ni cuenta doble.
+"""
+import time
+from collections import Counter
+from datetime import datetime, time as dtime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.db.models import BooleanField, Count, ExpressionWrapper, Q
+from django.db.models.functions import Now, TruncDate, TruncHour
+from django.utils import timezone
+
+from .models import CardEvent, CardStatDay, CardStatHour, RollupState
+
+STATE_NAME = "card_events"
+DIMENSIONS = ("kind", "device", "referrer", "link")
+
+
+def _hour(dt):
+    return dt.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def _day(dt):
+    return timezone.localtime(dt).date()
+
+
+def _locked_state(skip_locked=False):
+    """Fila de estado con SELECT ... FOR UPDATE (o None si otro la tiene)."""
+    RollupState.objects.get_or_create(name=STATE_NAME)
+    return (
+        RollupState.objects.select_for_update(skip_locked=skip_locked)
+        .filter(name=STATE_NAME)
+        .first()
+    )
+
+
+def _merge(model, counts):
+    """Suma counts {(card_id, bucket, kind, device, referrer, link): n} a model."""
+    if not counts:
+        return
+    cards = {key[0] for key in counts}
+    buckets = {key[1] for key in counts}
+    existing = {
+        (row.card_id, row.bucket, row.kind, row.device, row.referrer, row.link): row
+        for row in model.objects.filter(
+            card_id__in=cards, bucket__gte=min(buckets), bucket__lte=max(buckets)
+        )
+    }
+    to_update, to_create = [], []
+    for key, n in counts.items():
+        row = existing.get(key)
+        if row is not None:
+            row.count += n
+            to_update.append(row)
+        else:
+            card_id, bucket, kind, device, referrer, link = key
+            to_create.append(model(
+                card_id=card_id, bucket=bucket, kind=kind, device=device,
+                referrer=referrer, link=link, count=n,
+            ))
+    model.objects.bulk_update(to_update, ["count"], batch_size=1000)
+    model.objects.bulk_create(to_create, batch_size=1000)
+
+
+# ----------------------------- Incremental -----------------------------
+def aggregate(batch_size=20_000, lag=None):
+    """
+    Procesa hasta batch_size eventos nuevos. Devuelve cuántos sumó (0 si
+    no había nada o si otro proceso está agregando en este momento).
+    """
+    if lag is None:
+        lag = getattr(settings, "ANALYTICS_ROLLUP_LAG", 30)
+    # Se compara en la BD: mismo reloj que inserted_at
+    settled = ExpressionWrapper(
+        Q(inserted_at__lte=Now() - timedelta(seconds=lag)), output_field=BooleanField()
+    )
+
+    with transaction.atomic():
+        state = _locked_state(skip_locked=True)
+        if state is None:
+            return 0
+        rows = (
+            CardEvent.objects.filter(id__gt=state.last_event_id)
+            .annotate(settled=settled)
+            .order_by("id")
+            .values_list("id", "card_id", "created_at", "settled", *DIMENSIONS)[:batch_size]
+        )
+        hours, days = Counter(), Counter()
+        last_id, processed = state.last_event_id, 0
+        for event_id, card_id, created_at, is_settled, *dims in rows:
+            if not is_settled:
+                break  # lo de aquí en adelante puede tener huecos sin commit
+            hours[(card_id, _hour(created_at), *dims)] += 1
+            days[(card_id, _day(created_at), *dims)] += 1
+            last_id = event_id
+            processed += 1
+        if not processed:
+            return 0
+        _merge(CardStatHour, hours)
+        _merge(CardStatDay, days)
+        state.last_event_id = last_id
+        state.save(update_fields=["last_event_id", "updated_at"])
+    return processed
+
+
+def aggregate_all(batch_size=20_000):
+    total = 0
+    while True:
+        n = aggregate(batch_size=batch_size)
+        total += n
+        if n < batch_size:
+            return total
+
+
+_last_run = 0.0
+
+
+def _claim_run(interval):
+    """
+    True para un solo worker por intervalo: UPDATE condicional sobre la
+    fila de estado, con el reloj de la BD. Si dos lo intentan a la vez, el
+    segundo espera al primero y ya no cumple el WHERE.
+    """
+    _, created = RollupState.objects.get_or_create(name=STATE_NAME)
+    return created or bool(
+        RollupState.objects.filter(
+            name=STATE_NAME, updated_at__lte=Now() - timedelta(seconds=interval)
+        ).update(updated_at=Now())
+    )
+
+
+def maybe_aggregate():
+    """
+    Corre aggregate_all a lo más cada ANALYTICS_ROLLUP_INTERVAL segundos,
+    y en un solo worker de todos los que lo intentan (_claim_run).
+    """
+    global _last_run
+    interval = getattr(settings, "ANALYTICS_ROLLUP_INTERVAL", 60)
+    now = time.monotonic()
+    if now - _last_run < interval:
+        return 0
+    _last_run = now
+    try:
+        if not _claim_run(interval):
+            return 0
+        return aggregate_all()
+    except DatabaseError:
+        return 0
+
+
+# ---------------------------- Reconstrucción ----------------------------
+def rebuild(since, until, card_ids=None):
+    """
+    Recalcula los rollups de los días locales [since, until] (dates),
+    opcionalmente sólo para card_ids. Devuelve (filas_hora, filas_día).
+    """
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(since, dtime.min), tz)
+    end = timezone.make_aware(datetime.combine(until + timedelta(days=1), dtime.min), tz)
+
+    with transaction.atomic():
+        state = _locked_state()
+        events = CardEvent.objects.filter(
+            id__lte=state.last_event_id, created_at__gte=start, created_at__lt=end
+        )
+        hour_rows = CardStatHour.objects.filter(bucket__gte=start, bucket__lt=end)
+        day_rows = CardStatDay.objects.filter(bucket__gte=since, bucket__lte=until)
+        if card_ids:
+            events = events.filter(card_id__in=card_ids)
+            hour_rows = hour_rows.filter(card_id__in=card_ids)
+            day_rows = day_rows.filter(card_id__in=card_ids)
+        hour_rows.delete()
+        day_rows.delete()
+
+        n_hours = _bulk_from_query(
+            CardStatHour, events.annotate(bucket=TruncHour("created_at", tzinfo=dt_timezone.utc))
+        )
+        n_days = _bulk_from_query(CardStatDay, events.annotate(bucket=TruncDate("created_at")))
+    return n_hours, n_days
+
+
+def _bulk_from_query(model, qs, chunk=5000):
+    grouped = (
+        qs.values("card_id", "bucket", *DIMENSIONS)
+        .annotate(n=Count("id"))
+        .order_by()
+    )
+    batch, total = [], 0
+    for row in grouped.iterator(chunk_size=chunk):
+        batch.append(model(
+            card_id=row["card_id"], bucket=row["bucket"], count=row["n"],
+            **{dim: row[dim] for dim in DIMENSIONS},
+        ))
+        if len(batch) >= chunk:
+            model.objects.bulk_create(batch)
+            total += len(batch)
+            batch = []
+    model.objects.bulk_create(batch)
+    return total + len(batch)
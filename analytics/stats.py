@@ -0,0 +1,65 @@
+# analytics/stats.py
+"""
+Datos de la página de estadísticas del usuario, leídos SÓLO de los
+rollups diarios (CardStatDay): una query que trae O(días × desgloses)
+filas, sin importar cuántos eventos crudos haya.
+"""
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.utils import timezone
+
+from .models import CardEvent, CardStatDay
+
+DAY_LABELS = ("Lun", "Mar", "Mié", "Jue", "Vie", "Sáb", "Dom")
+DEVICE_ORDER = (CardEvent.Device.MOBILE, CardEvent.Device.DESKTOP, CardEvent.Device.TABLET)
+
+
+def _pct(part, total):
+    return round(100 * part / total) if total else 0
+
+
+def user_stats(card_ids, days=14):
+    """
+    Resumen de las tarjetas card_ids en los últimos `days` días (locales):
+    serie diaria de vistas, dispositivos, clicks por enlace, orígenes y
+    vistas por tarjeta.
+    """
+    today = timezone.localdate()
+    since = today - timedelta(days=days - 1)
+    rows = CardStatDay.objects.filter(card_id__in=card_ids, bucket__gte=since).values_list(
+        "card_id", "bucket", "kind", "device", "referrer", "link", "count"
+    )
+
+    views_by_day = Counter()
+    devices = Counter()
+    clicks = Counter()
+    referrers = Counter()
+    per_card = defaultdict(lambda: {"views": 0, "clicks": 0})
+    for card_id, bucket, kind, device, referrer, link, count in rows:
+        if kind == CardEvent.Kind.VIEW:
+            views_by_day[bucket] += count
+            devices[device] += count
+            referrers[referrer or "Directo"] += count
+            per_card[card_id]["views"] += count
+        else:
+            clicks[link or "Otro"] += count
+            per_card[card_id]["clicks"] += count
+
+    dates = [since + timedelta(days=i) for i in range(days)]
+    total_views = sum(views_by_day.values())
+    return {
+        "days": days,
+        "labels": [DAY_LABELS[d.weekday()] for d in dates],
+        "views": [views_by_day[d] for d in dates],
+        "total_views": total_views,
+        "total_clicks": sum(clicks.values()),
+        "devices": [devices[d] for d in DEVICE_ORDER],
+        "device_labels": [d.label for d in DEVICE_ORDER],
+        "clicks_labels": [name for name, _ in clicks.most_common(6)],
+        "clicks": [n for _, n in clicks.most_common(6)],
+        "referrers": [
+            {"name": name, "pct": _pct(n, total_views)} for name, n in referrers.most_common(5)
+        ],
+        "per_card": dict(per_card),
+    }
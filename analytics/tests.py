@@ -0,0 +1,202 @@
+import json
+import uuid
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.db.models import Sum
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from analytics import buffer, rollups, views
+from analytics.buffer import EventBuffer
+from analytics.models import CardEvent, CardStatDay, CardStatHour, RollupState
+from users.models import User
+from vcards.models import VCard
+
+
+class AggregateTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user("ana", password="x")
+        self.card = VCard.objects.create(owner=user, slug="ana-perez")
+
+    def add(self, n=1, kind=CardEvent.Kind.VIEW, created_at=None, settled=True):
+        events = CardEvent.objects.bulk_create([
+            CardEvent(
+                event_id=uuid.uuid4(), card=self.card, kind=kind, device=CardEvent.Device.MOBILE,
+                created_at=created_at or timezone.now() - timedelta(minutes=10),
+            )
+            for _ in range(n)
+        ])
+        if settled:
+            # Como si el INSERT hubiera sido hace rato (reloj de la BD)
+            CardEvent.objects.filter(id__in=[e.id for e in events]).update(
+                inserted_at=timezone.now() - timedelta(minutes=5)
+            )
+        return events
+
+    def total(self, model=CardStatDay):
+        return model.objects.aggregate(n=Sum("count"))["n"] or 0
+
+    def mark(self):
+        return RollupState.objects.get(name=rollups.STATE_NAME).last_event_id
+
+    def test_sums_settled_events(self):
+        self.add(3)
+        self.add(2, kind=CardEvent.Kind.CLICK)
+        self.assertEqual(rollups.aggregate(lag=30), 5)
+        self.assertEqual(self.total(), 5)
+        self.assertEqual(self.total(CardStatHour), 5)
+        self.assertEqual(CardStatDay.objects.get(kind=CardEvent.Kind.VIEW).count, 3)
+        self.assertEqual(self.mark(), CardEvent.objects.order_by("-id").first().id)
+        # Nada nuevo: no cuenta doble
+        self.assertEqual(rollups.aggregate(lag=30), 0)
+        self.assertEqual(self.total(), 5)
+
+    def test_late_batch_with_old_created_at_is_not_skipped(self):
+        self.add(2)
+        # Lote re-encolado: created_at viejo, pero recién insertado
+        self.add(1, created_at=timezone.now() - timedelta(hours=1), settled=False)
+        self.assertEqual(rollups.aggregate(lag=30), 2)
+        first_mark = self.mark()
+        self.add(1)
+        # El evento sin asentar detiene la marca aunque haya uno posterior
+        self.assertEqual(rollups.aggregate(lag=30), 0)
+        self.assertEqual(self.mark(), first_mark)
+        CardEvent.objects.update(inserted_at=timezone.now() - timedelta(minutes=5))
+        self.assertEqual(rollups.aggregate(lag=30), 2)
+        self.assertEqual(self.total(), 4)
+
+    def test_batch_size(self):
+        self.add(5)
+        self.assertEqual(rollups.aggregate(batch_size=2, lag=30), 2)
+        self.assertEqual(rollups.aggregate_all(batch_size=2), 3)
+        self.assertEqual(self.total(), 5)
+
+    def test_maybe_aggregate_runs_in_one_worker_per_interval(self):
+        self.add(2)
+        self.addCleanup(setattr, rollups, "_last_run", 0.0)
+        rollups._last_run = 0.0
+        self.assertEqual(rollups.maybe_aggregate(), 2)
+        # Otro worker (su propio _last_run) dentro del mismo intervalo
+        self.add(1)
+        rollups._last_run = 0.0
+        self.assertEqual(rollups.maybe_aggregate(), 0)
+        RollupState.objects.update(updated_at=timezone.now() - timedelta(minutes=5))
+        rollups._last_run = 0.0
+        self.assertEqual(rollups.maybe_aggregate(), 1)
+
+    def test_rebuild_matches_incremental(self):
+        self.add(4)
+        rollups.aggregate(lag=30)
+        today = timezone.localdate()
+        rollups.rebuild(today - timedelta(days=1), today + timedelta(days=1))
+        self.assertEqual(self.total(), 4)
+        self.assertEqual(self.total(CardStatHour), 4)
+
+
+def _test_buffer(**kwargs):
+    """EventBuffer sin hilo de fondo: el test llama flush()."""
+    buf = EventBuffer(**kwargs)
+    buf._ensure_thread = lambda: None
+    return buf
+
+
+class EventBufferTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user("ana", password="x")
+        self.card = VCard.objects.create(owner=user, slug="ana-perez")
+
+    def test_flush_writes_batch(self):
+        buf = _test_buffer()
+        for _ in range(3):
+            buf.add(self.card.id, CardEvent.Kind.VIEW, CardEvent.Device.MOBILE)
+        self.assertEqual(buf.pending(), 3)
+        self.assertEqual(buf.flush(), 3)
+        self.assertEqual(buf.pending(), 0)
+        self.assertEqual(CardEvent.objects.count(), 3)
+        self.assertEqual(buf.flush(), 0)
+
+    def test_resent_event_is_ignored(self):
+        buf = _test_buffer()
+        event_id = uuid.uuid4()
+        buf.add(self.card.id, CardEvent.Kind.CLICK, CardEvent.Device.DESKTOP, link="whatsapp", event_id=event_id)
+        buf.flush()
+        # Beacon re-enviado / lote reintentado: ON CONFLICT DO NOTHING
+        buf.add(self.card.id, CardEvent.Kind.CLICK, CardEvent.Device.DESKTOP, link="whatsapp", event_id=event_id)
+        buf.add(self.card.id, CardEvent.Kind.VIEW, CardEvent.Device.DESKTOP)
+        self.assertEqual(buf.flush(), 2)
+        self.assertEqual(CardEvent.objects.count(), 2)
+        self.assertEqual(CardEvent.objects.get(event_id=event_id).link, "whatsapp")
+
+    def test_flush_size_wakes_the_thread(self):
+        buf = _test_buffer(flush_size=2)
+        buf.add(self.card.id, CardEvent.Kind.VIEW, CardEvent.Device.MOBILE)
+        self.assertFalse(buf._wake.is_set())
+        buf.add(self.card.id, CardEvent.Kind.VIEW, CardEvent.Device.MOBILE)
+        self.assertTrue(buf._wake.is_set())
+
+    def test_max_pending_drops(self):
+        buf = _test_buffer(max_pending=2)
+        results = [buf.add(self.card.id, CardEvent.Kind.VIEW, CardEvent.Device.MOBILE) for _ in range(3)]
+        self.assertEqual(results, [True, True, False])
+        self.assertEqual(buf.stats(), {"pending": 2, "flushed": 0, "dropped": 1})
+
+    def test_database_error_requeues(self):
+        buf = _test_buffer(max_pending=3)
+        for _ in range(2):
+            buf.add(self.card.id, CardEvent.Kind.VIEW, CardEvent.Device.MOBILE)
+        with mock.patch.object(buffer, "_write", side_effect=DatabaseError):
+            self.assertEqual(buf.flush(), 0)
+        self.assertEqual(buf.pending(), 2)
+        self.assertEqual(buf.flush(), 2)
+        self.assertEqual(CardEvent.objects.count(), 2)
+
+
+class CollectTests(TestCase):
+    url = reverse("analytics:collect")
+    ua = "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) Mobile/15E148"
+
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create_user("ana", password="x")
+        self.card = VCard.objects.create(owner=user, slug="ana-perez", is_published=True)
+        self.buffer = _test_buffer()
+        patcher = mock.patch.object(views, "event_buffer", self.buffer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _post(self, payload, **extra):
+        body = payload if isinstance(payload, str) else json.dumps(payload)
+        return self.client.post(self.url, body, content_type="application/json", HTTP_USER_AGENT=self.ua, **extra)
+
+    def test_enqueues_event(self):
+        response = self._post({"id": str(uuid.uuid4()), "card": "ana-perez", "type": "click",
+                               "link": "whatsapp", "ref": "https://www.google.com/search?q=x"})
+        self.assertEqual(response.status_code, 204)
+        self.buffer.flush()
+        event = CardEvent.objects.get()
+        self.assertEqual((event.kind, event.device, event.link, event.referrer),
+                         ("click", "mobile", "whatsapp", "www.google.com"))
+
+    def test_views_count_once_per_ip(self):
+        for _ in range(3):
+            self.assertEqual(self._post({"card": "ana-perez", "type": "view"}).status_code, 204)
+        self.assertEqual(self.buffer.pending(), 1)
+
+    def test_rejects_bad_requests(self):
+        self.assertEqual(self._post({"card": "ana-perez", "type": "view"}, CONTENT_LENGTH="abc").status_code, 400)
+        self.assertEqual(self._post({"card": "x" * 3000, "type": "view"}).status_code, 400)
+        self.assertEqual(self._post("no es json").status_code, 400)
+        self.assertEqual(self._post({"card": "ana-perez", "type": "otro"}).status_code, 400)
+        self.assertEqual(self._post({"card": "ana-perez", "type": "view", "id": "no-uuid"}).status_code, 400)
+        self.assertEqual(self.buffer.pending(), 0)
+
+    def test_ignores_bots_and_unknown_cards(self):
+        response = self.client.post(self.url, json.dumps({"card": "ana-perez", "type": "view"}),
+                                    content_type="application/json", HTTP_USER_AGENT="Googlebot/2.1")
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self._post({"card": "no-existe", "type": "view"}).status_code, 204)
+        self.assertEqual(self.buffer.pending(), 0)
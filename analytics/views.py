@@ -0,0 +1,115 @@
+# analytics/views.py
+import json
+import re
+import uuid
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseBadRequest
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+
+from users import quotas
+from vcards.models import VCard
+from .buffer import event_buffer
+from .models import CardEvent
+
+_BOT_RE = re.compile(r"bot|crawl|spider|slurp|facebookexternalhit|preview", re.I)
+_TABLET_RE = re.compile(r"ipad|tablet|kindle|silk|(android(?!.*mobile))", re.I)
+_MOBILE_RE = re.compile(r"mobi|iphone|ipod|android|windows phone", re.I)
+
+MAX_BODY = 2048
+
+
+def is_bot(ua):
+    return not ua or bool(_BOT_RE.search(ua))
+
+
+def client_ip(request):
+    """
+    IP del visitante. Detrás de TRUSTED_PROXY_HOPS proxies (Render: 1) es
+    la que agregó el proxy más externo en X-Forwarded-For; lo anterior en
+    el header lo puede poner el cliente.
+    """
+    hops = getattr(settings, "TRUSTED_PROXY_HOPS", 0)
+    forwarded = [ip.strip() for ip in request.headers.get("X-Forwarded-For", "").split(",") if ip.strip()]
+    if hops and forwarded:
+        return forwarded[-min(hops, len(forwarded))]
+    return request.META.get("REMOTE_ADDR", "")
+
+
+def device_from_ua(ua):
+    if _TABLET_RE.search(ua):
+        return CardEvent.Device.TABLET
+    if _MOBILE_RE.search(ua):
+        return CardEvent.Device.MOBILE
+    return CardEvent.Device.DESKTOP
+
+
+def _card_info(slug):
+    """
+    slug -> (id, dueño, plan) de una tarjeta publicada, o (). Se cachea
+    (también los "no existe") para que la ingesta no haga una query por
+    evento.
+    """
+    key = f"analytics:card:v2:{slug}"
+    info = cache.get(key)
+    if info is None:
+        info = (
+            VCard.objects.filter(slug=slug, is_published=True)
+            .values_list("id", "owner_id", "owner__plan")
+            .first()
+            or ()
+        )
+        cache.set(key, info, getattr(settings, "ANALYTICS_CARD_CACHE_TTL", 300))
+    return info
+
+
+@csrf_exempt
+@require_POST
+def collect(request):
+    """
+    Ingesta de eventos de la página pública (navigator.sendBeacon).
+    Cuerpo JSON: {"id": uuid, "card": slug, "type": "view"|"click",
+                  "link": "whatsapp", "ref": document.referrer}
+    Sólo encola en memoria (analytics/buffer.py) y responde 204.
+
+    No toca la cuota de visitas (la cuenta public_card): cualquiera puede
+    mandar este POST. Aun así las vistas se aceptan una vez por IP y
+    tarjeta en la ventana de quotas.first_in_window, para que reintentos y
+    scripts no inflen las estadísticas ni el conteo de la BD con que se
+    reconcilia la cuota.
+    """
+    try:
+        length = int(request.META.get("CONTENT_LENGTH") or 0)
+    except ValueError:
+        return HttpResponseBadRequest("Content-Length inválido")
+    if length > MAX_BODY:
+        return HttpResponseBadRequest("Evento demasiado grande")
+
+    ua = request.headers.get("User-Agent", "")
+    if is_bot(ua):
+        return HttpResponse(status=204)
+
+    try:
+        data = json.loads(request.body)
+        kind = data["type"]
+        slug = str(data["card"])[:60]
+        event_id = uuid.UUID(data["id"]) if data.get("id") else None
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return HttpResponseBadRequest("Evento inválido")
+    if kind not in CardEvent.Kind.values:
+        return HttpResponseBadRequest("Evento inválido")
+
+    info = _card_info(slug)
+    if info and (kind != CardEvent.Kind.VIEW or quotas.first_in_window("event", slug, client_ip(request))):
+        event_buffer.add(
+            info[0],
+            kind,
+            device_from_ua(ua),
+            link=str(data.get("link") or "")[:40] if kind == CardEvent.Kind.CLICK else "",
+            referrer=(urlsplit(str(data.get("ref") or "")).hostname or "")[:120],
+            event_id=event_id,
+        )
+    return HttpResponse(status=204)
@@ -3,6 +3,23 @@ ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Las vistas calientes del editor (vcards: preview, draft_open/draft_patch,
+check_slug, set_global, set_globals; folders: chips/fragments/options)
+tienen una versión async (apreview, afolders_chips, ...). Este módulo
+activa settings.ASYNC_VIEWS, así que bajo ASGI las URLs apuntan a ésas:
+mientras esperan la BD o la caché el worker sigue atendiendo otros
+requests. Bajo WSGI (config/wsgi.py) se enrutan las síncronas: una vista
+async ahí pagaría async_to_sync en cada request. Con ASYNC_VIEWS=0 en el
+entorno ASGI también usa las síncronas. Las demás vistas son síncronas y
+bajo ASGI Django las corre en un hilo por request. Para producción (mismo
+número de procesos que con WSGI):
+
+    gunicorn config.asgi:application -k uvicorn_worker.UvicornWorker -w 4
+
+o en desarrollo: uvicorn config.asgi:application --reload
+
+Comparar contra el despliegue WSGI: python manage.py bench_http --help
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -12,5 +29,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+# Antes de cargar settings: enruta las vistas async del editor (ver arriba)
+os.environ.setdefault('ASYNC_VIEWS', '1')
 
 application = get_asgi_application()
@@ -0,0 +1,36 @@
+# config/middleware.py
+"""
+WhiteNoiseMiddleware con modo async.
+
+WhiteNoise sólo es síncrono: bajo ASGI Django lo adapta y todo lo que
+viene después (incluidas las vistas async) termina corriendo dentro de un
+hilo por request. Esta subclase atiende los estáticos igual que WhiteNoise
+y, si no es un estático, deja pasar el request sin salir del event loop.
+"""
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            # Abre el archivo (y lo stat-ea): disco, fuera del event loop
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
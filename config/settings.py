@@ -6,6 +6,7 @@ Generated by 'django-admin startproject' using Django 5.2.7.
 import os
 from pathlib import Path
 import dj_database_url
+from django.core.exceptions import ImproperlyConfigured
 
 # =====================
 # Paths base
@@ -54,7 +55,10 @@ INSTALLED_APPS = [
     "vcards",
     "folders",
     "users",
+    "helpcenter",
     "dashboard",
+    "analytics",
+    "monitoring",
 ]
 
 # =====================
@@ -62,6 +66,12 @@ INSTALLED_APPS = [
 # =====================
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    # Estáticos directo desde la app (sin CDN), ver STORAGES más abajo.
+    # WhiteNoise con modo async para ASGI (config/middleware.py)
+    "config.middleware.AsyncWhiteNoiseMiddleware",
+    # Métricas por vista + Server-Timing (después de WhiteNoise: los
+    # estáticos no cuentan), ver monitoring/middleware.py
+    "monitoring.middleware.MetricsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -77,7 +87,8 @@ ROOT_URLCONF = "config.urls"
 # =====================
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        # DjangoTemplates que además mide el render (monitoring/instrumentation.py)
+        "BACKEND": "monitoring.instrumentation.TimedDjangoTemplates",
         "DIRS": [BASE_DIR / "templates"],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -92,17 +103,93 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "config.wsgi.application"
 
+# Identifica el deploy (Render define RENDER_GIT_COMMIT): entra en las
+# llaves/ETags de los fragmentos cacheados, ver folders/cache.py
+DEPLOY_VERSION = os.environ.get("DEPLOY_VERSION") or os.environ.get("RENDER_GIT_COMMIT", "")
+
+# Vistas calientes del editor (preview, borradores, flags, slug, carpetas):
+# con ASYNC_VIEWS se enrutan sus versiones async. config/asgi.py lo activa
+# (ASYNC_VIEWS=0 lo apaga también bajo ASGI); bajo WSGI se usan las
+# síncronas, que no pagan async_to_sync en cada request.
+ASYNC_VIEWS = os.environ.get("ASYNC_VIEWS", "0") == "1"
+
 # =====================
 # Base de datos (Postgres en Render / local)
 # =====================
+# Sin DATABASE_URL se usa SQLite local, sin SSL, pero sólo en DEBUG (laptop /
+# benchmarks): en producción arrancar contra una BD vacía es peor que no arrancar
+DATABASE_URL = os.environ.get("DATABASE_URL")
+if not DATABASE_URL:
+    if not DEBUG:
+        raise ImproperlyConfigured("DATABASE_URL es obligatorio con DEBUG=False")
+    DATABASE_URL = f"sqlite:///{BASE_DIR / 'db.sqlite3'}"
+# DATABASE_SSL=0 para un Postgres local sin SSL
+DATABASE_SSL = os.environ.get("DATABASE_SSL", "1") == "1"
+# DB_POOL=1: pool de conexiones por proceso (psycopg 3) en lugar de una
+# conexión persistente por hilo, ver abajo
+DB_POOL = os.environ.get("DB_POOL", "0") == "1"
+
 DATABASES = {
-    "default": dj_database_url.config(
-        default=os.environ.get("DATABASE_URL"),
-        conn_max_age=600,
-        ssl_require=True,
+    "default": dj_database_url.parse(
+        DATABASE_URL,
+        conn_max_age=0 if DB_POOL else 600,
+        ssl_require=DATABASE_SSL and not DATABASE_URL.startswith("sqlite"),
     )
 }
 
+# Pool (sólo Postgres): los hilos del proceso (gthread, o los de las vistas
+# bajo ASGI) comparten hasta DB_POOL_MAX_SIZE conexiones ya abiertas, sin
+# handshake SSL por request. Conexiones al servidor ≤ procesos × max_size.
+# Con CONN_HEALTH_CHECKS el pool verifica cada conexión al sacarla
+# (ConnectionPool.check_connection); si no hay libre se espera hasta
+# DB_POOL_TIMEOUT s y el request falla. Estadísticas en /metrics
+# (monitoring/db_pool.py).
+if DB_POOL and DATABASES["default"]["ENGINE"] == "django.db.backends.postgresql":
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+    DATABASES["default"].setdefault("OPTIONS", {})["pool"] = {
+        "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", "2")),
+        "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", "10")),
+        "timeout": float(os.environ.get("DB_POOL_TIMEOUT", "10")),
+        "max_idle": float(os.environ.get("DB_POOL_MAX_IDLE", "300")),
+        "max_lifetime": float(os.environ.get("DB_POOL_MAX_LIFETIME", "3600")),
+    }
+
+# =====================
+# Caché
+# =====================
+# Con REDIS_URL la caché (KPIs del admin, folders, etc.) se comparte entre
+# workers; sin ella, LocMem por proceso (dev / benchmarks).
+REDIS_URL = os.environ.get("REDIS_URL")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+
+# Cuotas por plan (users/quotas.py). Los contadores viven en CACHES (con
+# Redis son exactos entre workers) y se recargan de la BD cada tanto.
+# PLAN_LIMITS sobrescribe users.quotas.DEFAULT_PLAN_LIMITS.
+QUOTA_RECONCILE_SECONDS = int(os.environ.get("QUOTA_RECONCILE_SECONDS", "900"))
+# Una visita cuenta una vez por IP y tarjeta en esta ventana (segundos)
+QUOTA_VIEW_WINDOW = int(os.environ.get("QUOTA_VIEW_WINDOW", "1800"))
+# Proxies delante de la app que agregan X-Forwarded-For. La IP del
+# visitante sale de ahí (analytics.views.client_ip); 0 = REMOTE_ADDR. En
+# Render (define RENDER=true) hay uno
+TRUSTED_PROXY_HOPS = int(os.environ.get("TRUSTED_PROXY_HOPS", "1" if os.environ.get("RENDER") else "0"))
+
+# Páginas de ayuda (helpcenter/content.py): fragmentos por versión e idioma
+HELP_FRAGMENT_TTL = 24 * 3600
+HELP_VERSION_TTL = int(os.environ.get("HELP_VERSION_TTL", "30"))
+
+# KPIs del admin: frescos ADMIN_METRICS_TTL s; después se sirven viejos
+# (hasta ADMIN_METRICS_STALE_TTL s más) mientras se recalculan en fondo
+ADMIN_METRICS_TTL = int(os.environ.get("ADMIN_METRICS_TTL", "300"))
+ADMIN_METRICS_STALE_TTL = int(os.environ.get("ADMIN_METRICS_STALE_TTL", "86400"))
+# Sin valor en caché, cuánto espera un request a otro que ya calcula (s)
+ADMIN_METRICS_COLD_WAIT = float(os.environ.get("ADMIN_METRICS_COLD_WAIT", "0.5"))
+
 # =====================
 # Password validators
 # =====================
@@ -134,6 +221,62 @@ STATICFILES_DIRS = [
     BASE_DIR / "static",
 ]
 
+# collectstatic agrega el hash del contenido al nombre (app.3f2a9c.css) y
+# genera las variantes .gz y .br (br requiere el paquete Brotli).
+# WhiteNoiseMiddleware sirve la mejor según Accept-Encoding y, como el
+# nombre cambia con el contenido, con caché de 10 años + immutable: una
+# visita repetida no vuelve a bajar CSS/JS.
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"},
+}
+# Sin collectstatic (dev, tests) {% static %} devuelve el nombre sin hash
+WHITENOISE_MANIFEST_STRICT = False
+# En el deploy sólo se publican los nombres con hash (y sus .gz/.br)
+WHITENOISE_KEEP_ONLY_HASHED_FILES = not DEBUG
+
+# =====================
+# Media (uploads)
+# =====================
+MEDIA_URL = "media/"
+MEDIA_ROOT = Path(os.environ.get("MEDIA_ROOT", BASE_DIR / "media"))
+
+# Imágenes del editor (ver vcards/images.py)
+IMAGE_MAX_UPLOAD_BYTES = 15 * 1024 * 1024
+IMAGE_WORKERS = int(os.environ.get("IMAGE_WORKERS", "2"))
+IMAGE_MANIFEST_CACHE_SIZE = int(os.environ.get("IMAGE_MANIFEST_CACHE_SIZE", "4096"))
+
+# Video por chunks (ver vcards/uploads.py)
+VIDEO_MAX_UPLOAD_BYTES = 250 * 1024 * 1024
+VIDEO_CHUNK_SIZE = 4 * 1024 * 1024
+VIDEO_UPLOAD_TTL = 24 * 3600
+
+# URL pública del sitio (links absolutos en los .vcf, ver vcards/vcf.py)
+SITE_URL = os.environ.get("SITE_URL", "https://mibio.onrender.com")
+VCF_CACHE_TTL = 24 * 3600
+
+# Códigos QR en disco (ver vcards/qr.py): tope antes de desalojar (LRU)
+QR_CACHE_MAX_BYTES = int(os.environ.get("QR_CACHE_MAX_BYTES", 200 * 1024 * 1024))
+
+# Importación masiva CSV/.vcf (ver vcards/importer.py)
+IMPORT_MAX_UPLOAD_BYTES = 20 * 1024 * 1024
+
+# =====================
+# Analytics (ver analytics/buffer.py)
+# =====================
+ANALYTICS_FLUSH_SIZE = 500        # eventos por lote
+ANALYTICS_FLUSH_INTERVAL = 5.0    # segundos máximos en el buffer
+ANALYTICS_MAX_PENDING = 50_000    # tope de memoria si la BD no responde
+ANALYTICS_ROLLUP_INTERVAL = 60    # cada cuánto el hilo del buffer agrega rollups
+ANALYTICS_ROLLUP_LAG = 30         # segundos que se dejan "asentar" antes de agregar
+
+# =====================
+# Métricas (ver monitoring/) en /metrics, formato Prometheus
+# =====================
+# Bearer token para el scraper; sin token sólo staff (o cualquiera en DEBUG)
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+METRICS_SERVER_TIMING = os.environ.get("METRICS_SERVER_TIMING", "1") == "1"
+
 # =====================
 # Auth custom
 # =====================
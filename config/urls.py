@@ -1,9 +1,13 @@
 # config/urls.py
+from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path, include
 from django.views.generic import RedirectView
 
 from dashboard.views import create_initial_users
+from monitoring.views import metrics_view
+from vcards.views import public_card, public_vcf
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -12,6 +16,8 @@ urlpatterns = [
     path("dashboard/", include("dashboard.urls")),
     path("users/", include("users.urls")),
     path("vcards/", include("vcards.urls")),
+    path("analytics/", include("analytics.urls")),
+    path("metrics", metrics_view, name="metrics"),
 
     # Raíz: redirige al dashboard del usuario (si no está logueado irá al LOGIN_URL)
     path("", RedirectView.as_view(pattern_name="dashboard:user_home", permanent=False)),
@@ -19,4 +25,13 @@ urlpatterns = [
     # 🔴 RUTA TEMPORAL para crear usuarios iniciales en Render
     # NO OLVIDES BORRARLA cuando ya hayas creado y probado los usuarios.
     path("create-users/", create_initial_users, name="create_initial_users"),
+
+    # Página pública de cada tarjeta (mibio.mx/<slug>/). Va al final para no
+    # tapar las rutas de arriba; ver vcards.slugs.RESERVED_SLUGS
+    path("<slug:slug>/", public_card, name="public_card"),
+    path("<slug:slug>/contacto.vcf", public_vcf, name="public_vcf"),
 ]
+
+# Uploads servidos por Django sólo en desarrollo
+if settings.DEBUG:
+    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,189 @@
+# dashboard/metrics.py
+"""
+KPIs del panel de administración, calculados de las tablas reales y
+servidos desde una caché con stale-while-revalidate.
+
+Cada agregado se guarda en la caché de Django como
+{"value": ..., "computed_at": epoch}:
+  - más nuevo que ttl      -> se sirve tal cual;
+  - más viejo (stale)      -> se sirve igual Y un hilo lo recalcula;
+  - no existe (arranque)   -> lo calcula el request que toma el lock; los
+                              demás esperan un momento (cold_wait, < 1 s) y si
+                              aún no está lo calculan ellos mismos.
+Para que sólo un worker recalcule se toma un lock con cache.add() (atómico
+en Redis/Memcached/BD), también en el arranque. Con LocMemCache todo esto es por proceso; en
+producción conviene REDIS_URL (ver settings.CACHES).
+"""
+import threading
+import time
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from vcards.models import VCard
+
+MONTH_LABELS = ("Ene", "Feb", "Mar", "Abr", "May", "Jun", "Jul", "Ago", "Sep", "Oct", "Nov", "Dic")
+
+
+class SWRCache:
+    def __init__(self, prefix, ttl=300, stale_ttl=86400, lock_ttl=120, cold_wait=0.5):
+        self.prefix = prefix
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl  # cuánto se conserva el valor viejo
+        self.lock_ttl = lock_ttl    # tope por si el worker que recalcula muere
+        self.cold_wait = cold_wait  # espera breve sin valor mientras otro calcula
+
+    def _key(self, name):
+        return f"{self.prefix}:{name}"
+
+    def get(self, name, compute):
+        """(value, computed_at) — nunca espera a un recálculo si hay valor."""
+        entry = cache.get(self._key(name))
+        if entry is None:
+            return self._cold(name, compute)
+        if time.time() - entry["computed_at"] > self.ttl and self._acquire(name):
+            threading.Thread(
+                target=self._refresh_in_thread, args=(name, compute), daemon=True
+            ).start()
+        return entry["value"], entry["computed_at"]
+
+    def refresh(self, name, compute):
+        entry = {"value": compute(), "computed_at": time.time()}
+        cache.set(self._key(name), entry, self.ttl + self.stale_ttl)
+        return entry["value"], entry["computed_at"]
+
+    def _cold(self, name, compute):
+        """
+        Sin valor en la caché: calcula quien toma el lock. Los demás sólo
+        esperan cold_wait s (lo que tarda un cálculo normal) y luego lo
+        calculan ellos: con workers sync, quedarse esperando a un cálculo
+        lento o a un worker muerto bloquearía el worker entero.
+        """
+        if self._acquire(name):
+            try:
+                return self.refresh(name, compute)
+            finally:
+                self._release(name)
+        deadline = time.monotonic() + self.cold_wait
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            entry = cache.get(self._key(name))
+            if entry is not None:
+                return entry["value"], entry["computed_at"]
+        return self.refresh(name, compute)
+
+    def _acquire(self, name):
+        return cache.add(self._key(name) + ":lock", 1, self.lock_ttl)
+
+    def _release(self, name):
+        cache.delete(self._key(name) + ":lock")
+
+    def _refresh_in_thread(self, name, compute):
+        try:
+            self.refresh(name, compute)
+        finally:
+            self._release(name)
+            connections.close_all()  # el hilo abrió su propia conexión
+
+
+admin_cache = SWRCache(
+    "admin:metrics",
+    ttl=getattr(settings, "ADMIN_METRICS_TTL", 300),
+    stale_ttl=getattr(settings, "ADMIN_METRICS_STALE_TTL", 86400),
+    cold_wait=getattr(settings, "ADMIN_METRICS_COLD_WAIT", 0.5),
+)
+
+
+# ------------------------------ Agregados ------------------------------
+def _delta(current, previous):
+    if not previous:
+        return None
+    return round(100 * (current - previous) / previous, 1)
+
+
+def compute_overview():
+    """
+    Todas las queries usan índices (last_login, date_joined, plan) y
+    devuelven conteos o ≤ 12 filas: el costo no crece con la página,
+    sólo con el rango que se escanea en los índices.
+    """
+    User = get_user_model()
+    now = timezone.now()
+    d30, d60 = now - timedelta(days=30), now - timedelta(days=60)
+
+    active = User.objects.filter(is_active=True, last_login__gte=d30).count()
+    signups_30 = User.objects.filter(date_joined__gte=d30).count()
+    signups_prev = User.objects.filter(date_joined__gte=d60, date_joined__lt=d30).count()
+    published = VCard.objects.filter(is_published=True).count()
+    published_30 = VCard.objects.filter(is_published=True, published_at__gte=d30).count()
+
+    plans = dict(User.objects.values_list("plan").annotate(n=Count("id")).order_by())
+    paid = sum(n for plan, n in plans.items() if plan != User.Plans.STARTER)
+
+    # Altas por mes: últimos 12 meses (incluye el actual), meses vacíos = 0
+    today = timezone.localdate()
+    months = []
+    y, m = today.year, today.month
+    for _ in range(12):
+        months.append((y, m))
+        y, m = (y, m - 1) if m > 1 else (y - 1, 12)
+    months.reverse()
+    start = timezone.make_aware(datetime(months[0][0], months[0][1], 1))
+    per_month = {
+        (d.year, d.month): n
+        for d, n in User.objects.filter(date_joined__gte=start)
+        .annotate(month=TruncMonth("date_joined"))
+        .values_list("month")
+        .annotate(n=Count("id"))
+        .order_by()
+        .values_list("month", "n")
+    }
+
+    return {
+        "kpis": [
+            {"label": "Usuarios activos", "value": f"{active:,}", "delta": None, "note": "últimos 30 días"},
+            {"label": "Tarjetas publicadas", "value": f"{published:,}", "delta": None,
+             "note": f"+{published_30:,} en 30 días"},
+            {"label": "Usuarios de pago", "value": f"{paid:,}", "delta": None, "note": "Pro + Business"},
+            {"label": "Altas", "value": f"{signups_30:,}", "delta": _delta(signups_30, signups_prev),
+             "note": "últimos 30 días"},
+        ],
+        "months": [MONTH_LABELS[m - 1] for _, m in months],
+        "users_series": [per_month.get(ym, 0) for ym in months],
+        "plans_labels": [label for _, label in User.Plans.choices],
+        "plans_data": [plans.get(value, 0) for value, _ in User.Plans.choices],
+    }
+
+
+def compute_activity(limit=8):
+    """Últimas altas y publicaciones (dos queries con LIMIT sobre índices)."""
+    User = get_user_model()
+    rows = [
+        {"at": u["date_joined"], "user": u["email"] or u["username"], "action": "Alta",
+         "entity": "Usuario", "detail": f"Plan {User.Plans(u['plan']).label}"}
+        for u in User.objects.order_by("-date_joined").values("date_joined", "email", "username", "plan")[:limit]
+    ]
+    rows += [
+        {"at": c["published_at"], "user": c["owner__email"], "action": "Publicación",
+         "entity": "Tarjeta", "detail": f"/{c['slug']}"}
+        for c in VCard.objects.filter(is_published=True, published_at__isnull=False)
+        .order_by("-published_at")
+        .values("published_at", "owner__email", "slug")[:limit]
+    ]
+    rows.sort(key=lambda r: r["at"], reverse=True)
+    for r in rows:
+        r["date"] = timezone.localtime(r.pop("at")).strftime("%Y-%m-%d %H:%M")
+    return rows[:limit]
+
+
+def admin_overview():
+    """(datos, computed_at) para admin_home; siempre responde al instante."""
+    overview, computed_at = admin_cache.get("overview", compute_overview)
+    activity, _ = admin_cache.get("activity", compute_activity)
+    return {**overview, "activity": activity}, computed_at
@@ -1,3 +1,200 @@
-from django.test import TestCase
+import threading
+import time
+from datetime import date, datetime, timezone as dt_timezone
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from analytics.models import CardEvent, CardStatDay
+from dashboard import views
+from dashboard.metrics import SWRCache, compute_overview
+from dashboard.paging import decode_cursor, encode_cursor
+from folders.models import Folder
+from users.models import User
+from vcards.models import VCard
+
+
+class SWRCacheTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def compute(self, value="v", delay=0.2):
+        def run():
+            with self.lock:
+                self.calls += 1
+            time.sleep(delay)
+            return value
+        return run
+
+    def test_cold_cache_is_computed_once(self):
+        swr = SWRCache("test:swr", ttl=60)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(swr.get("kpi", self.compute())[0]))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results, ["v"] * 8)
+
+    def test_waiter_computes_if_nothing_appears(self):
+        swr = SWRCache("test:swr", ttl=60, cold_wait=0.1)
+        swr._acquire("kpi")  # otro worker tomó el lock y murió
+        self.assertEqual(swr.get("kpi", self.compute(delay=0))[0], "v")
+        self.assertEqual(self.calls, 1)
+
+    def test_waiter_does_not_block_on_slow_compute(self):
+        swr = SWRCache("test:swr", ttl=60, cold_wait=0.1)
+        winner = threading.Thread(target=swr.get, args=("kpi", self.compute("lento", delay=1)))
+        winner.start()
+        self.addCleanup(winner.join)
+        time.sleep(0.05)
+        start = time.monotonic()
+        self.assertEqual(swr.get("kpi", self.compute("rapido", delay=0))[0], "rapido")
+        self.assertLess(time.monotonic() - start, 0.5)
+
+    def test_stale_value_is_served_while_refreshing(self):
+        swr = SWRCache("test:swr", ttl=60)
+        swr.refresh("kpi", lambda: "old")
+        entry = cache.get("test:swr:kpi")
+        cache.set("test:swr:kpi", {**entry, "computed_at": entry["computed_at"] - 120})
+        self.assertEqual(swr.get("kpi", self.compute("new", delay=0.1))[0], "old")
+        self.assertEqual(swr.get("kpi", self.compute("new", delay=0.1))[0], "old")
+        time.sleep(0.3)
+        self.assertEqual(swr.get("kpi", self.compute("newer"))[0], "new")
+        self.assertEqual(self.calls, 1)
+
+
+class OverviewTests(TestCase):
+    def test_signups_per_month(self):
+        User.objects.create_user("ana", password="x")
+        User.objects.create_user("viejo", password="x", date_joined=datetime(2000, 1, 1, tzinfo=dt_timezone.utc))
+        overview = compute_overview()
+        self.assertEqual(len(overview["months"]), 12)
+        self.assertEqual(overview["users_series"][-1], 1)
+        self.assertEqual(sum(overview["users_series"]), 1)
+
+
+class AdminUsersTests(TestCase):
+    url = reverse("dashboard:admin_users")
+
+    def setUp(self):
+        self.admin = User.objects.create_user("root", password="x", is_staff=True)
+        # Seis usuarios con la misma fecha de alta: el orden lo decide el id
+        joined = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+        self.users = [
+            User.objects.create_user(f"user{i}", email=f"u{i}@mibio.mx", password="x", date_joined=joined)
+            for i in range(6)
+        ]
+        self.client.force_login(self.admin)
+        patcher = mock.patch.object(views, "ADMIN_PAGE_SIZE", 2)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _pages(self, **params):
+        response = self.client.get(self.url, params)
+        seen = [u.username for u in response.context["users"]]
+        while response.context["next_cursor"]:
+            response = self.client.get(self.url, {**params, "cursor": response.context["next_cursor"]})
+            self.assertTemplateUsed(response, "admin/_users_rows.html")
+            self.assertTemplateNotUsed(response, "admin/_users_results.html")
+            seen += [u.username for u in response.context["users"]]
+        return seen
+
+    def test_cursor_walks_ties_without_gaps_or_repeats(self):
+        expected = [u.username for u in reversed(self.users)]
+        self.assertEqual(self._pages(staff="0"), expected)
+
+    def test_cursor_roundtrip_and_tampering(self):
+        joined = self.users[0].date_joined
+        self.assertEqual(decode_cursor(encode_cursor(joined, 7), is_datetime=True), (joined, 7))
+        self.assertIsNone(decode_cursor("no-es-un-cursor"))
+        # Un cursor alterado se trata como primera página
+        response = self.client.get(self.url, {"cursor": "xx"})
+        self.assertEqual(len(response.context["users"]), 2)
+
+    def test_search_matches_every_word_by_prefix(self):
+        User.objects.create_user("ana", first_name="Ana", last_name="Pérez", password="x")
+        User.objects.create_user("anabel", first_name="Anabel", last_name="Soto", password="x")
+        qs = views._user_search(User.objects.all(), "ana pé")
+        self.assertEqual([u.username for u in qs], ["ana"])
+        self.assertEqual(self._pages(q="u3@"), ["user3"])
+
+    def test_htmx_renders_results_partial(self):
+        response = self.client.get(self.url, {"q": "user"}, HTTP_HX_REQUEST="true")
+        self.assertTemplateUsed(response, "admin/_users_results.html")
+        self.assertTemplateNotUsed(response, "admin/admin_users.html")
+        self.assertEqual(response.context["total"], 6)
+
+        response = self.client.get(self.url)
+        self.assertTemplateUsed(response, "admin/admin_users.html")
+        self.assertEqual(response.context["total"], 7)
+
+
+class AdminVCardsTests(TestCase):
+    url = reverse("dashboard:admin_vcards")
+
+    def setUp(self):
+        admin = User.objects.create_user("root", password="x", is_staff=True)
+        self.ana = User.objects.create_user("ana", email="ana@mibio.mx", password="x")
+        self.beto = User.objects.create_user("beto", email="beto@mibio.mx", password="x")
+        self.folder = Folder.objects.create(owner=self.ana, name="Ventas")
+        self.cards = [
+            VCard.objects.create(owner=self.ana, slug=f"ana-{i}", folder=self.folder if i < 2 else None)
+            for i in range(4)
+        ] + [VCard.objects.create(owner=self.beto, slug="beto-1", template=VCard.Templates.DUAL2)]
+        # Misma actividad para todas: el orden lo decide el id
+        VCard.objects.update(updated_at=datetime(2024, 5, 10, 12, tzinfo=dt_timezone.utc))
+        self.client.force_login(admin)
+        patcher = mock.patch.object(views, "ADMIN_PAGE_SIZE", 2)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _pages(self, **params):
+        response = self.client.get(self.url, params)
+        seen = [c.slug for c in response.context["cards"]]
+        while response.context["next_cursor"]:
+            response = self.client.get(self.url, {**params, "cursor": response.context["next_cursor"]})
+            self.assertTemplateUsed(response, "admin/_vcards_rows.html")
+            seen += [c.slug for c in response.context["cards"]]
+        return seen
+
+    def test_cursor_walks_ties_without_gaps_or_repeats(self):
+        self.assertEqual(self._pages(), [c.slug for c in reversed(self.cards)])
+
+    def test_filters(self):
+        self.assertEqual(self._pages(owner="bet"), ["beto-1"])
+        self.assertEqual(self._pages(owner=str(self.ana.pk), folder=str(self.folder.pk)), ["ana-1", "ana-0"])
+        self.assertEqual(self._pages(owner=str(self.ana.pk), folder="none"), ["ana-3", "ana-2"])
+        self.assertEqual(self._pages(template="dual2"), ["beto-1"])
+        VCard.objects.filter(slug="ana-2").update(is_published=True)
+        self.assertEqual(self._pages(status="published"), ["ana-2"])
+        self.assertEqual(len(self._pages(status="draft")), 4)
+        self.assertEqual(len(self._pages(since="2024-05-10", until="2024-05-10")), 5)
+        self.assertEqual(self._pages(since="2024-05-11"), [])
+        self.assertEqual(self._pages(until="2024-05-09"), [])
+
+    def test_views_count_from_daily_rollups(self):
+        card = self.cards[-1]
+        CardStatDay.objects.bulk_create([
+            CardStatDay(card=card, bucket=date(2024, 5, d), kind=CardEvent.Kind.VIEW,
+                        device=CardEvent.Device.MOBILE, count=d)
+            for d in (1, 2)
+        ] + [CardStatDay(card=card, bucket=date(2024, 5, 1), kind=CardEvent.Kind.CLICK,
+                         device=CardEvent.Device.MOBILE, count=100)])
+        response = self.client.get(self.url)
+        counts = {c.slug: c.views_count for c in response.context["cards"]}
+        self.assertEqual(counts, {"beto-1": 3, "ana-3": 0})
+
+    def test_htmx_renders_results_partial(self):
+        response = self.client.get(self.url, {"owner": "ana"}, HTTP_HX_REQUEST="true")
+        self.assertTemplateUsed(response, "admin/_vcards_results.html")
+        self.assertTemplateNotUsed(response, "admin/admin_vcards.html")
+        self.assertEqual(response.context["total"], 4)
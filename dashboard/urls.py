@@ -33,6 +33,7 @@ urlpatterns = [
     # =========================
     path("editar-datos/",    views.edit_profile,      name="edit_profile"),
     path("tarjetas/crear/",  views.user_vcard_create, name="user_vcard_create"),
+    path("tarjetas/importar/", views.user_vcard_import, name="user_vcard_import"),
     path("tarjetas/",        views.user_vcards_list,  name="user_vcards_list"),
     path("estadisticas/",    views.user_stats,        name="user_stats"),
     path("mejorar-plan/",    views.user_upgrade,      name="user_upgrade"),
@@ -41,4 +42,5 @@ urlpatterns = [
     path("preguntas-frecuentes/", views.user_faqs,    name="user_faqs"),
     
     path("folders/", include(("folders.urls", "folders"), namespace="folders")),
+    path("ayuda/", include(("helpcenter.urls", "helpcenter"), namespace="helpcenter")),
 ]
@@ -10,11 +10,26 @@ from django.contrib.auth.decorators import login_required, user_passes_test
 from django.shortcuts import render, redirect
 from django.http import HttpResponse
 from django.contrib.auth import get_user_model
-
-from datetime import date
-from calendar import month_abbr
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from datetime import date, datetime, time as dt_time, timedelta, timezone as dt_timezone
+
+from analytics.models import CardEvent, CardStatDay
+from analytics.stats import user_stats as user_stats_data
+from users import quotas
+from folders.models import Folder
+from helpcenter import content
+from helpcenter.models import (
+    FaqCategory, FaqSuggestion, PlanAddon, PlanComparison, SupportCategory, Tutorial,
+)
+from vcards import preferences
+from vcards.importer import can_import
+from vcards.models import VCard
 
 from .auth import staff_required
+from .metrics import admin_overview
+from .paging import estimate_count, keyset_page
 from .forms import ProfileForm
 
 
@@ -79,110 +94,32 @@ def create_initial_users(request):
 def user_upgrade(request):
     """
     Muestra la página de “Mejorar plan”.
-    Por ahora la data es MOCK (estática) para la interfaz.
-    En un futuro, estos datos deben venir de la base de datos/modelos.
+    Planes, comparación, add-ons y FAQs vienen de helpcenter (ver
+    helpcenter/content.py); las secciones se cachean como fragmentos.
     """
+    plans = content.plans()
 
-    # Plan actual del usuario (mock)
+    # Plan actual del usuario y su consumo (users/quotas.py)
+    slug = request.user.plan if request.user.is_authenticated else "starter"
+    plan = next((p for p in plans if p["slug"] == slug), plans[0] if plans else {})
     current_plan = {
-        "name": "Starter",
-        "price": 0,
-        "period": "mes",
+        "name": plan.get("name", slug.title()),
+        "price": plan.get("price", 0),
+        "period": plan.get("period", "mes"),
         "badge": "Plan actual",
-        "features": [
-            "1 tarjeta digital",
-            "100 visitas/mes",
-            "Estadísticas básicas",
-            "Temas básicos",
-        ],
-        "limits": {"vcards": 1, "views": 100},
+        "features": plan.get("features", []),
+        "limits": quotas.plan_limits(slug),
     }
-
-    # Planes disponibles (mock)
-    plans = [
-        {
-            "slug": "starter",
-            "name": "Starter",
-            "price": 0,
-            "period": "mes",
-            "highlight": False,
-            "description": "Perfecto para empezar",
-            "features": [
-                "1 tarjeta digital",
-                "100 visitas/mes",
-                "Estadísticas básicas",
-                "1 plantilla",
-            ],
-            "cta": "Continuar con Starter",
-        },
-        {
-            "slug": "pro",
-            "name": "Pro",
-            "price": 9,
-            "period": "mes",
-            "highlight": True,  # Este se resalta en la UI
-            "description": "Para marcas personales y equipos pequeños",
-            "features": [
-                "Hasta 10 tarjetas",
-                "10,000 visitas/mes",
-                "Estadísticas avanzadas",
-                "Plantillas premium",
-                "Dominio personalizado",
-                "Botón WhatsApp + Links ilimitados",
-            ],
-            "cta": "Mejorar a Pro",
-        },
-        {
-            "slug": "business",
-            "name": "Business",
-            "price": 29,
-            "period": "mes",
-            "highlight": False,
-            "description": "Para organizaciones y franquicias",
-            "features": [
-                "Tarjetas ilimitadas",
-                "Visitas ilimitadas*",
-                "SAML/SSO (empresas)",
-                "Gestión multi-equipo",
-                "Soporte prioritario",
-                "SLA y facturación",
-            ],
-            "cta": "Contactar ventas",
-        },
-    ]
-
-    # Tabla comparativa de características (mock)
-    comparison = [
-        {"feature": "Tarjetas incluidas", "starter": "1", "pro": "10", "business": "Ilimitadas"},
-        {"feature": "Visitas/mes", "starter": "100", "pro": "10,000", "business": "Ilimitadas*"},
-        {"feature": "Plantillas premium", "starter": "—", "pro": "✔", "business": "✔"},
-        {"feature": "Dominio personalizado", "starter": "—", "pro": "✔", "business": "✔"},
-        {"feature": "Estadísticas avanzadas", "starter": "—", "pro": "✔", "business": "✔"},
-        {"feature": "SAML/SSO", "starter": "—", "pro": "—", "business": "✔"},
-        {"feature": "Soporte prioritario", "starter": "—", "pro": "—", "business": "✔"},
-    ]
-
-    # Add-ons opcionales (mock)
-    addons = [
-        {"name": "Dominio .com", "desc": "Conecta o compra tu dominio", "price": 8, "period": "mes"},
-        {"name": "QR dinámico", "desc": "QR editable con UTM", "price": 3, "period": "mes"},
-        {"name": "Remover marca MiBio", "desc": "White-label en tu tarjeta", "price": 5, "period": "mes"},
-    ]
-
-    # Preguntas frecuentes para esta página (mock)
-    faqs = [
-        {"q": "¿Puedo cambiar de plan cuando quiera?", "a": "Sí, puedes subir o bajar de plan en cualquier momento. El cambio se prorratea automáticamente."},
-        {"q": "¿Hay permanencia?", "a": "No. Puedes cancelar en cualquier momento sin penalización."},
-        {"q": "¿Ofrecen descuentos anuales?", "a": "Sí, paga anual y ahorra hasta 20% (aplicable a Pro y Business)."},
-        {"q": "¿Cómo integro Google Analytics?", "a": "En Pro y Business puedes añadir tu ID de GA4 por tarjeta o a nivel cuenta."},
-    ]
+    if request.user.is_authenticated:
+        current_plan.update(limits=quotas.limits_for(request.user), usage=quotas.usage(request.user))
 
     context = {
+        **content.fragment_context(),
         "current_plan": current_plan,
         "plans": plans,
-        "comparison": comparison,
-        "addons": addons,
-        "faqs": faqs,
+        "comparison": content.published(PlanComparison),
+        "addons": content.published(PlanAddon),
+        "faqs": content.faqs("upgrade"),
     }
     return render(request, "dashboard/user_upgrade.html", context)
 
@@ -194,7 +131,8 @@ def user_support(request):
     """
     Página de soporte del usuario.
     Muestra estado del sistema, enlaces rápidos, categorías de ayuda,
-    tickets recientes y FAQs. Todo por ahora es MOCK.
+    tickets recientes y FAQs. Categorías y FAQs vienen de helpcenter;
+    estado y tickets siguen siendo MOCK.
     """
 
     # Estado del sistema (mock)
@@ -212,16 +150,6 @@ def user_support(request):
         {"name": "Email", "icon": "✉️", "href": "#email", "variant": "ghost"},
     ]
 
-    # Categorías del centro de ayuda (mock)
-    help_categories = [
-        {"title": "Tarjetas digitales", "desc": "Creación, diseño, enlaces y QR", "articles": 18},
-        {"title": "Planes y Facturación", "desc": "Suscripciones, cupones, recibos", "articles": 12},
-        {"title": "Estadísticas", "desc": "Métricas, GA4, privacidad", "articles": 9},
-        {"title": "Integraciones", "desc": "GA4, Meta Pixel, Zapier", "articles": 14},
-        {"title": "Cuenta y Seguridad", "desc": "Acceso, 2FA, roles", "articles": 11},
-        {"title": "Problemas comunes", "desc": "Errores frecuentes y fixes", "articles": 22},
-    ]
-
     # Tickets recientes del usuario (mock)
     recent_tickets = [
         {"id": "#3241", "subject": "No carga la previsualización", "status": "Abierto", "updated": "ayer 16:20"},
@@ -229,20 +157,14 @@ def user_support(request):
         {"id": "#3210", "subject": "Cambio de plan a Pro", "status": "Resuelto", "updated": "hace 3 días"},
     ]
 
-    # FAQs (mock)
-    faqs = [
-        {"q": "¿Cómo creo y comparto mi tarjeta?", "a": "Desde “Mis tarjetas” crea una nueva, personaliza y comparte el enlace o QR."},
-        {"q": "¿Puedo conectar Google Analytics?", "a": "Sí, en Pro/Business puedes añadir tu ID de GA4 por tarjeta o a nivel cuenta."},
-        {"q": "¿Cómo cambio o cancelo mi plan?", "a": "Ve a “Mejorar plan”. No hay permanencia; el cambio se prorratea."},
-        {"q": "¿Dónde descargo mis facturas?", "a": "En la misma sección de plan, encontrarás el historial de facturación."},
-    ]
-
     context = {
+        **content.fragment_context(),
         "system_status": system_status,
         "quick_links": quick_links,
-        "help_categories": help_categories,
+        # Centro de ayuda y FAQs: helpcenter, perezosas (fragmentos en caché)
+        "help_categories": content.published(SupportCategory),
         "recent_tickets": recent_tickets,
-        "faqs": faqs,
+        "faqs": content.faqs("support"),
         "support_hours": "Lun–Vie 9:00–18:00 (CDMX)",
         "sla_note": "Tiempo medio de primera respuesta: 2–4 h hábiles (Pro/Business prioritario).",
     }
@@ -255,48 +177,177 @@ def user_support(request):
 @login_required
 @user_passes_test(is_admin)  # Solo usuarios con role == "ADMIN"
 def admin_home(request):
-    # KPIs mock
-    kpis = [
-        {"label": "Usuarios activos", "value": "1,284", "delta": 8.2, "note": "vs mes anterior"},
-        {"label": "Tarjetas publicadas", "value": "3,920", "delta": 3.1, "note": "total"},
-        {"label": "Ingresos (MXN)", "value": "$78,450", "delta": 5.6, "note": "últimos 30 días"},
-        {"label": "Tickets abiertos", "value": "12", "delta": -10.5, "note": "variación"},
-    ]
-    # Serie mensual mock (últimos 12 meses)
-    months = []
-    users_series = []
-    for i in range(11, -1, -1):
-        m = (date.today().month - i - 1) % 12 + 1
-        months.append(month_abbr[m])
-        users_series.append(120 + (i * 7) % 60)  # mock simple
-
-    # Distribución de planes mock
-    plans_data = [52, 33, 15]
-
-    # Actividad mock
-    activity = [
-        {"date": "2025-10-26 18:42", "user": "ana@demo.com", "action": "Alta", "entity": "Usuario", "detail": "Se registró en plan Básico"},
-        {"date": "2025-10-26 16:03", "user": "carlos@demo.com", "action": "Upgrade", "entity": "Plan", "detail": "Básico → Pro"},
-        {"date": "2025-10-25 13:11", "user": "ventas@empresa.com", "action": "Publicación", "entity": "Tarjeta", "detail": "/coco-playa"},
-        {"date": "2025-10-24 09:58", "user": "soporte@mibio.live", "action": "Cierre", "entity": "Ticket", "detail": "#1024 cerrado"},
-    ]
+    # KPIs reales desde la caché stale-while-revalidate (ver dashboard/metrics.py)
+    ctx, computed_at = admin_overview()
+    ctx["computed_at"] = datetime.fromtimestamp(computed_at, tz=dt_timezone.utc)
+    return render(request, "admin/admin_home.html", ctx)
+
+
+# ==========================================================
+# Vista: Usuarios del admin (listado keyset + búsqueda)
+# ==========================================================
+ADMIN_PAGE_SIZE = 50
+USER_SEARCH_FIELDS = ("username", "email", "first_name", "last_name")
+
 
+def _user_search(qs, term):
+    """
+    Búsqueda por prefijo: cada palabra debe ser inicio de usuario, email,
+    nombre o apellido ("ana pé" encuentra a Ana Pérez). En PostgreSQL la
+    resuelven los índices trigram de users/0004.
+    """
+    for word in term.split()[:4]:
+        cond = Q()
+        for field in USER_SEARCH_FIELDS:
+            cond |= Q(**{f"{field}__istartswith": word})
+        qs = qs.filter(cond)
+    return qs
+
+
+@login_required
+@user_passes_test(is_admin)
+def admin_users(request):
+    """
+    GET ?q=&role=&staff=&active=&cursor=
+    Página completa, o sólo las filas (HTMX) para búsqueda / "Cargar más".
+    """
+    User = get_user_model()
+    q = request.GET.get("q", "").strip()[:100]
+    role = request.GET.get("role", "")
+    staff = request.GET.get("staff", "")
+    active = request.GET.get("active", "")
+
+    qs = User.objects.only(
+        "id", "username", "email", "first_name", "last_name",
+        "role", "plan", "is_staff", "is_active", "date_joined",
+    )
+    if role in User.Roles.values:
+        qs = qs.filter(role=role)
+    if staff in ("1", "0"):
+        qs = qs.filter(is_staff=staff == "1")
+    if active in ("1", "0"):
+        qs = qs.filter(is_active=active == "1")
+    if q:
+        qs = _user_search(qs, q)
+
+    users, next_cursor = keyset_page(qs, "date_joined", request.GET.get("cursor"), ADMIN_PAGE_SIZE)
+
+    # Tarjetas por usuario sólo de la página (una query acotada por owner_id)
+    cards = dict(
+        VCard.objects.filter(owner_id__in=[u.pk for u in users])
+        .values_list("owner_id")
+        .annotate(n=Count("id"))
+        .order_by()
+    )
+    for u in users:
+        u.cards_count = cards.get(u.pk, 0)
+
+    params = request.GET.copy()
+    params.pop("cursor", None)
     ctx = {
-        "kpis": kpis,
-        "months": months,
-        "users_series": users_series,
-        "plans_data": plans_data,
-        "activity": activity,
+        "users": users,
+        "next_cursor": next_cursor,
+        "query_string": params.urlencode(),
+        "q": q,
+        "role": role,
+        "staff": staff,
+        "active": active,
+        "roles": User.Roles.choices,
     }
-    return render(request, "admin/admin_home.html", ctx)
+    # "Cargar más" sólo agrega filas; sin cursor (página o búsqueda nueva)
+    # se renderiza también el total
+    if request.GET.get("cursor"):
+        return render(request, "admin/_users_rows.html", ctx)
+    ctx["total"], ctx["total_exact"] = estimate_count(qs)
+    if request.headers.get("HX-Request"):
+        return render(request, "admin/_users_results.html", ctx)
+    return render(request, "admin/admin_users.html", ctx)
 
 
-def admin_users(request):
-    return render(request, "admin/admin_users.html")
+# ==========================================================
+# Vista: Tarjetas del admin (todas las cuentas, keyset + filtros)
+# ==========================================================
+def _parse_date(value):
+    try:
+        return date.fromisoformat(value) if value else None
+    except ValueError:
+        return None
 
 
+@login_required
+@user_passes_test(is_admin)
 def admin_vcards(request):
-    return render(request, "admin/admin_vcards.html")
+    """
+    GET ?owner=&folder=&template=&status=&since=&until=&cursor=
+    Tarjetas de todos los usuarios por actividad reciente (updated_at).
+    owner acepta id o inicio de usuario/email; folder es un id o "none".
+    """
+    owner = request.GET.get("owner", "").strip()[:100]
+    folder = request.GET.get("folder", "")
+    template = request.GET.get("template", "")
+    status = request.GET.get("status", "")
+    since = _parse_date(request.GET.get("since"))
+    until = _parse_date(request.GET.get("until"))
+
+    # Un solo SELECT con JOIN a usuario y carpeta; sin el HTML publicado
+    qs = VCard.objects.select_related("owner", "folder").only(
+        "id", "slug", "full_name", "template", "is_published", "published_at", "updated_at",
+        "owner__id", "owner__username", "owner__email",
+        "folder__id", "folder__name", "folder__color",
+    )
+    if owner.isdigit():
+        qs = qs.filter(owner_id=int(owner))
+    elif owner:
+        qs = qs.filter(Q(owner__username__istartswith=owner) | Q(owner__email__istartswith=owner))
+    if folder == "none":
+        qs = qs.filter(folder__isnull=True)
+    elif folder.isdigit():
+        qs = qs.filter(folder_id=int(folder))
+    if template in VCard.Templates.values:
+        qs = qs.filter(template=template)
+    if status in ("published", "draft"):
+        qs = qs.filter(is_published=status == "published")
+    tz = timezone.get_current_timezone()
+    if since:
+        qs = qs.filter(updated_at__gte=datetime.combine(since, dt_time.min, tz))
+    if until:
+        qs = qs.filter(updated_at__lt=datetime.combine(until + timedelta(days=1), dt_time.min, tz))
+
+    cards, next_cursor = keyset_page(qs, "updated_at", request.GET.get("cursor"), ADMIN_PAGE_SIZE)
+
+    # Vistas totales sólo de las tarjetas de la página (rollups diarios)
+    views = dict(
+        CardStatDay.objects.filter(card_id__in=[c.pk for c in cards], kind=CardEvent.Kind.VIEW)
+        .values_list("card_id")
+        .annotate(n=Sum("count"))
+        .order_by()
+    )
+    for c in cards:
+        c.views_count = views.get(c.pk, 0)
+
+    params = request.GET.copy()
+    params.pop("cursor", None)
+    ctx = {
+        "cards": cards,
+        "next_cursor": next_cursor,
+        "query_string": params.urlencode(),
+        "owner": owner,
+        "folder": folder,
+        "template": template,
+        "status": status,
+        "since": since,
+        "until": until,
+        "templates": VCard.Templates.choices,
+    }
+    if request.GET.get("cursor"):
+        return render(request, "admin/_vcards_rows.html", ctx)
+    ctx["total"], ctx["total_exact"] = estimate_count(qs)
+    if request.headers.get("HX-Request"):
+        return render(request, "admin/_vcards_results.html", ctx)
+    # El filtro de carpeta sólo tiene sentido dentro de un usuario
+    if owner.isdigit():
+        ctx["folders"] = Folder.objects.filter(owner_id=int(owner)).values_list("id", "name")
+    return render(request, "admin/admin_vcards.html", ctx)
 
 
 def admin_plans(request):
@@ -353,7 +404,23 @@ def user_vcard_create(request):
     Por ahora sólo renderiza la UI. La lógica HTMX/preview se maneja
     desde la app 'vcards' (endpoints /vcards/preview/ y uploads).
     """
-    return render(request, "dashboard/user_vcard_create.html")
+    ctx = {"globals": preferences.get_globals(request.user, request.session)}
+    return render(request, "dashboard/user_vcard_create.html", ctx)
+
+
+# ==========================================================
+# Vista: Importar tarjetas desde CSV/.vcf (plan Business)
+# ==========================================================
+@login_required
+def user_vcard_import(request):
+    """
+    Página de importación masiva. El archivo se manda a vcards:import_cards,
+    que responde el progreso en streaming (NDJSON).
+    """
+    return render(request, "dashboard/user_vcard_import.html", {
+        "can_import": can_import(request.user),
+        "folders": Folder.objects.filter(owner=request.user).values_list("id", "name"),
+    })
 
 
 # ==========================================================
@@ -374,8 +441,37 @@ def user_vcards_list(request):
 # ==========================================================
 @login_required
 def user_stats(request):
-    # Sólo render de la página de estadísticas (la UI usa Chart.js con datos demo).
-    return render(request, "dashboard/user_stats.html")
+    """
+    Estadísticas de las tarjetas del usuario. Los números salen de los
+    rollups diarios (analytics/stats.py), nunca de los eventos crudos.
+    Filtros por GET: ?days=7|14|30 y ?card=<id>.
+    """
+    cards = list(request.user.vcards.order_by("slug").values("id", "slug", "full_name"))
+    card_ids = [c["id"] for c in cards]
+
+    selected = request.GET.get("card") or ""
+    if selected.isdigit() and int(selected) in card_ids:
+        card_ids = [int(selected)]
+    else:
+        selected = ""
+    days = request.GET.get("days")
+    days = int(days) if days in ("7", "14", "30") else 14
+
+    stats = user_stats_data(card_ids, days=days)
+    for c in cards:
+        row = stats["per_card"].get(c["id"], {"views": 0, "clicks": 0})
+        c["views"] = row["views"]
+        c["ctr"] = round(100 * row["clicks"] / row["views"], 1) if row["views"] else 0
+
+    return render(request, "dashboard/user_stats.html", {
+        "stats": stats,
+        "cards": cards,
+        "selected_card": selected,
+        "days": days,
+        "chart_data": {k: stats[k] for k in (
+            "labels", "views", "devices", "device_labels", "clicks_labels", "clicks"
+        )},
+    })
 
 
 # ==========================================================
@@ -384,76 +480,18 @@ def user_stats(request):
 @login_required
 def user_tutorials(request):
     """
-    Muestra una galería/listado de videotutoriales.
-    Los datos son de ejemplo (mock). 'source' puede ser 'youtube' o 'mp4'.
+    Muestra una galería/listado de videotutoriales (helpcenter.Tutorial).
+    'source' puede ser 'youtube' o 'mp4'. Las categorías sólo se calculan
+    si el fragmento no está en caché.
     """
-    tutorials = [
-        {
-            "id": "t1",
-            "title": "Primeros pasos en Mibio",
-            "duration": "06:42",
-            "level": "Básico",
-            "category": "General",
-            "thumb": "https://images.unsplash.com/photo-1522199710521-72d69614c702?q=80&w=1200&auto=format&fit=crop",
-            "source": "youtube",
-            "youtube_id": "dQw4w9WgXcQ",
-            "desc": "Tour rápido por el panel y cómo navegar.",
-        },
-        {
-            "id": "t2",
-            "title": "Crear tu primera tarjeta",
-            "duration": "10:15",
-            "level": "Básico",
-            "category": "Tarjetas",
-            "thumb": "https://images.unsplash.com/photo-1521737604893-d14cc237f11d?q=80&w=1200&auto=format&fit=crop",
-            "source": "youtube",
-            "youtube_id": "ysz5S6PUM-U",
-            "desc": "Desde plantilla hasta compartir con QR.",
-        },
-        {
-            "id": "t3",
-            "title": "Carpetas y organización",
-            "duration": "07:28",
-            "level": "Intermedio",
-            "category": "Organización",
-            "thumb": "https://images.unsplash.com/photo-1544005313-94ddf0286df2?q=80&w=1200&auto=format&fit=crop",
-            "source": "mp4",
-            "mp4": "https://filesamples.com/samples/video/mp4/sample_640x360.mp4",
-            "desc": "Mejores prácticas para equipos.",
-        },
-        {
-            "id": "t4",
-            "title": "Estadísticas y GA4",
-            "duration": "09:03",
-            "level": "Intermedio",
-            "category": "Estadísticas",
-            "thumb": "https://images.unsplash.com/photo-1551281044-8d8d0d8c8c02?q=80&w=1200&auto=format&fit=crop",
-            "source": "youtube",
-            "youtube_id": "rUWxSEwctFU",
-            "desc": "Lee métricas y conecta Google Analytics.",
-        },
-        {
-            "id": "t5",
-            "title": "Diseño y branding",
-            "duration": "12:47",
-            "level": "Avanzado",
-            "category": "Diseño",
-            "thumb": "https://images.unsplash.com/photo-1520975922284-71a0d52b3e51?q=80&w=1200&auto=format&fit=crop",
-            "source": "mp4",
-            "mp4": "https://filesamples.com/samples/video/mp4/sample_960x400_ocean_with_audio.mp4",
-            "desc": "Paleta, tipografías y componentes.",
-        },
-    ]
-    categories = ["General", "Tarjetas", "Organización", "Estadísticas", "Diseño"]
-    levels = ["Básico", "Intermedio", "Avanzado"]
-
     return render(
         request,
         "dashboard/user_tutorials.html",
         {
-            "tutorials": tutorials,
-            "categories": categories,
-            "levels": levels,
+            **content.fragment_context(),
+            "tutorials": content.published(Tutorial),
+            "categories": content.tutorial_categories,
+            "levels": Tutorial.Levels.values,
         },
     )
 
@@ -465,106 +503,17 @@ def user_tutorials(request):
 def user_faqs(request):
     """
     Página de FAQ (Preguntas Frecuentes).
-    Muestra categorías, una lista de preguntas y chips de búsqueda rápida.
-    Todo mock por ahora.
+    Muestra categorías, una lista de preguntas y chips de búsqueda rápida
+    (helpcenter; cada sección es un fragmento en caché).
     """
-
-    categories = [
-        "Cuenta y acceso",
-        "Tarjetas digitales",
-        "Diseño y branding",
-        "Estadísticas y privacidad",
-        "Planes y facturación",
-        "Integraciones",
-        "Seguridad y cumplimiento",
-        "Soporte y operaciones",
-    ]
-
-    faqs = [
-        # Cuenta y acceso
-        {
-            "category": "Cuenta y acceso",
-            "q": "¿Olvidé mi contraseña, cómo la restablezco?",
-            "a": "Ve a la pantalla de acceso y haz clic en “¿Olvidaste tu contraseña?”. Recibirás un correo con un enlace para crear una nueva.",
-        },
-        {
-            "category": "Cuenta y acceso",
-            "q": "¿Puedo activar 2FA (autenticación en dos pasos)?",
-            "a": "Sí. En Ajustes › Seguridad puedes activar 2FA con aplicación de autenticación (TOTP).",
-        },
-        # Tarjetas digitales
-        {
-            "category": "Tarjetas digitales",
-            "q": "¿Cómo creo mi primera tarjeta?",
-            "a": "Desde “Crear tarjeta” elige una plantilla, personaliza tus datos y colores. Guarda y comparte con enlace o QR.",
-        },
-        {
-            "category": "Tarjetas digitales",
-            "q": "¿Puedo tener varias tarjetas?",
-            "a": "Según tu plan. Starter permite 1, Pro hasta 10 y Business ilimitadas.",
-        },
-        # Diseño y branding
-        {
-            "category": "Diseño y branding",
-            "q": "¿Cómo subo mi logo, banner o video?",
-            "a": "En el editor de tarjeta (Perfil) tienes tiles para subir imágenes o video. Aceptamos JPG/PNG y MP4 cortos.",
-        },
-        {
-            "category": "Diseño y branding",
-            "q": "¿Puedo usar mi dominio propio?",
-            "a": "Sí, en Pro/Business puedes conectar un dominio o subdominio desde Ajustes › Dominios.",
-        },
-        # Estadísticas y privacidad
-        {
-            "category": "Estadísticas y privacidad",
-            "q": "¿Qué métricas ofrece Mibio?",
-            "a": "Vistas, origen del tráfico, dispositivos, escaneos de QR y clics en botones/links. Puedes exportar CSV.",
-        },
-        {
-            "category": "Estadísticas y privacidad",
-            "q": "¿Puedo integrar GA4?",
-            "a": "Sí, añade tu ID de GA4 en Ajustes o por tarjeta (planes Pro/Business).",
-        },
-        # Planes y facturación
-        {
-            "category": "Planes y facturación",
-            "q": "¿Cómo cambio o cancelo mi plan?",
-            "a": "Desde “Mejorar plan” puedes subir/bajar de plan o cancelar sin permanencia. El cambio se prorratea.",
-        },
-        {
-            "category": "Planes y facturación",
-            "q": "¿Emiten facturas?",
-            "a": "Sí. Descarga tus comprobantes en el historial de facturación una vez aplicado el pago.",
-        },
-        # Integraciones
-        {
-            "category": "Integraciones",
-            "q": "¿Qué integraciones están disponibles?",
-            "a": "GA4, Meta Pixel, Zapier y webhooks. Pronto: HubSpot y Notion (beta).",
-        },
-        # Seguridad y cumplimiento
-        {
-            "category": "Seguridad y cumplimiento",
-            "q": "¿Cómo protegen mis datos?",
-            "a": "Ciframos en tránsito (TLS 1.2+) y aplicamos buenas prácticas de seguridad. Políticas de privacidad y retención vigentes.",
-        },
-        # Soporte y operaciones
-        {
-            "category": "Soporte y operaciones",
-            "q": "¿En qué horario brindan soporte?",
-            "a": "Lun–Vie 9:00–18:00 (CDMX). Pro/Business tienen prioridad de respuesta.",
-        },
-    ]
-
-    quick_suggestions = ["QR", "GA4", "dominio", "plantillas", "exportar CSV", "2FA", "Zapier", "privacidad"]
-
     return render(
         request,
         "dashboard/user_faqs.html",
         {
-            "categories": categories,
-            "faqs": faqs,
-            "quick_suggestions": quick_suggestions,
+            **content.fragment_context(),
+            "categories": content.published(FaqCategory),
+            "faqs": content.faqs("faqs"),
+            "quick_suggestions": content.published(FaqSuggestion),
             "active_item": "faqs",
         },
     )
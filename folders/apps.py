@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class FoldersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'folders'
+
+    def ready(self):
+        # Cualquier alta/edición/baja de carpeta (también desde el admin)
+        # invalida los fragmentos del usuario
+        from .cache import connect_signals
+        connect_signals()
@@ -0,0 +1,110 @@
+# folders/cache.py
+"""
+Caché por usuario de los fragmentos de carpetas (chips y <option>).
+
+Cualquier save/delete de una carpeta (las vistas de folders, el admin de
+Django, un shell) llama a bump_version() por las señales de Folder. El
+número de versión vive en la fila del usuario (User.folders_version), así
+que es el mismo en todos los workers:
+  - ETag = usuario + versión + versión de templates + fragmento: un 304
+    no hace ninguna query.
+  - La lista y el HTML renderizado se guardan en la caché de Django bajo
+    una llave con las mismas versiones; al subir alguna las llaves viejas
+    dejan de usarse (expiran solas con FOLDERS_CACHE_TTL).
+  - La versión de templates (templates_version) cambia con cada deploy
+    (DEPLOY_VERSION) o al editar los templates de los fragmentos: un
+    deploy nunca sirve HTML viejo de la caché ni valida un ETag viejo.
+  - afolder_list / aget_fragment: lo mismo para las vistas async.
+"""
+import functools
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.template.loader import get_template, render_to_string
+
+from .models import Folder
+
+# Fragmento -> template. "all" son chips + options en una sola respuesta
+# (swaps OOB) para que la página cargue ambos en un solo round trip.
+FRAGMENTS = {
+    "chips": "folders/_chips.html",
+    "options": "folders/_options.html",
+    "all": "folders/_fragments.html",
+}
+
+
+def bump_version(user_id):
+    """Invalida los fragmentos del usuario (después de crear/editar/borrar)."""
+    get_user_model().objects.filter(pk=user_id).update(folders_version=F("folders_version") + 1)
+
+
+def _on_change(sender, instance, **kwargs):
+    bump_version(instance.owner_id)
+
+
+def connect_signals():
+    post_save.connect(_on_change, sender=Folder, dispatch_uid="folders_cache_save")
+    post_delete.connect(_on_change, sender=Folder, dispatch_uid="folders_cache_delete")
+
+
+@functools.lru_cache(maxsize=None)
+def templates_version():
+    """Hash de DEPLOY_VERSION y de los templates de FRAGMENTS (una vez por proceso)."""
+    digest = hashlib.sha256(getattr(settings, "DEPLOY_VERSION", "").encode())
+    for name in sorted(set(FRAGMENTS.values())):
+        digest.update(get_template(name).template.source.encode())
+    return digest.hexdigest()[:10]
+
+
+def etag(user, fragment):
+    return f'"folders-{user.pk}-{user.folders_version}-{templates_version()}-{fragment}"'
+
+
+def _key(user, name):
+    return f"folders:{user.pk}:{user.folders_version}:{templates_version()}:{name}"
+
+
+def folder_list(user):
+    """[{"id", "name", "color"}, ...] de la versión actual."""
+    key = _key(user, "list")
+    folders = cache.get(key)
+    if folders is None:
+        folders = list(
+            Folder.objects.filter(owner=user).order_by("name").values("id", "name", "color")
+        )
+        cache.set(key, folders, getattr(settings, "FOLDERS_CACHE_TTL", 3600))
+    return folders
+
+
+def get_fragment(user, name):
+    """HTML del fragmento de la versión actual (se renderiza una vez por versión)."""
+    key = _key(user, name)
+    html = cache.get(key)
+    if html is None:
+        html = render_to_string(FRAGMENTS[name], {"folders": folder_list(user), "oob": name == "all"})
+        cache.set(key, html, getattr(settings, "FOLDERS_CACHE_TTL", 3600))
+    return html
+
+
+async def afolder_list(user):
+    key = _key(user, "list")
+    folders = await cache.aget(key)
+    if folders is None:
+        folders = [
+            row async for row in Folder.objects.filter(owner=user).order_by("name").values("id", "name", "color")
+        ]
+        await cache.aset(key, folders, getattr(settings, "FOLDERS_CACHE_TTL", 3600))
+    return folders
+
+
+async def aget_fragment(user, name):
+    key = _key(user, name)
+    html = await cache.aget(key)
+    if html is None:
+        html = render_to_string(FRAGMENTS[name], {"folders": await afolder_list(user), "oob": name == "all"})
+        await cache.aset(key, html, getattr(settings, "FOLDERS_CACHE_TTL", 3600))
+    return html
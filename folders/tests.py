@@ -1,3 +1,96 @@
-from django.test import TestCase
+import io
+import zipfile
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from users.models import User
+from vcards.models import VCard
+
+from . import cache as folder_cache
+from .models import Folder
+
+
+class FolderExportTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("ana", password="x")
+        self.folder = Folder.objects.create(owner=self.user, name="Clientes")
+        for slug in ("ana", "beto", "carla"):
+            VCard.objects.create(owner=self.user, slug=slug, full_name=slug.title(), folder=self.folder)
+        self.url = reverse("dashboard:folders:export", args=[self.folder.id])
+
+    def _names(self, body):
+        with zipfile.ZipFile(io.BytesIO(body)) as zf:
+            return sorted(zf.namelist())
+
+    def test_wsgi_streams_sync_iterator(self):
+        self.client.force_login(self.user)
+        response = self.client.get(self.url)
+        self.assertTrue(response.streaming)
+        self.assertFalse(response.is_async)
+        self.assertEqual(len(self._names(b"".join(response.streaming_content))), 3)
+
+    async def test_asgi_streams_async_iterator(self):
+        # Un iterador síncrono bajo ASGI se bufferea entero (sync_to_async(list))
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(self.url)
+        self.assertTrue(response.is_async)
+        body = b"".join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(len(self._names(body)), 3)
+
+    def test_other_users_folder_is_404(self):
+        other = User.objects.create_user("beto", password="x")
+        self.client.force_login(other)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+
+class FolderFragmentTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("ana", password="x")
+        Folder.objects.create(owner=self.user, name="Clientes")
+        self.client.force_login(self.user)
+        self.url = reverse("dashboard:folders:chips")
+
+    def _revalidate(self, etag):
+        return self.client.get(self.url, headers={"If-None-Match": etag})
+
+    def test_etag_and_304(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+        self.assertIn("Clientes", response.content.decode())
+        self.assertEqual(self._revalidate(response["ETag"]).status_code, 304)
+
+    def test_views_change_the_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.post(reverse("dashboard:folders:save"), {"name": "Proveedores"})
+        self.assertIn("Proveedores", response.content.decode())
+        response = self._revalidate(etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Proveedores", response.content.decode())
+
+    def test_changes_outside_the_views_change_the_etag(self):
+        # Como desde el admin de Django: sólo las señales del modelo
+        etag = self.client.get(self.url)["ETag"]
+        folder = Folder.objects.get(name="Clientes")
+        folder.name = "Clientes VIP"
+        folder.save()
+        response = self._revalidate(etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Clientes VIP", response.content.decode())
+
+        etag = response["ETag"]
+        folder.delete()
+        response = self._revalidate(etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Clientes VIP", response.content.decode())
+
+    def test_deploy_changes_etag_and_cache_key(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.addCleanup(folder_cache.templates_version.cache_clear)
+        with override_settings(DEPLOY_VERSION="nuevo-deploy"):
+            folder_cache.templates_version.cache_clear()
+            self.assertEqual(self._revalidate(etag).status_code, 200)
+            self.assertIn(folder_cache.templates_version(), folder_cache._key(self.user, "chips"))
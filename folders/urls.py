@@ -1,11 +1,18 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
 app_name = "folders"
 
+# Fragmentos con versión async: sólo se enrutan bajo ASGI (ver config/asgi.py)
+_async = "a" if settings.ASYNC_VIEWS else ""
+
 urlpatterns = [
-    path("chips/", views.folders_chips, name="chips"),
+    path("chips/", getattr(views, f"{_async}folders_chips"), name="chips"),
     path("save/",  views.folder_save,   name="save"),
     path("delete/", views.folder_delete, name="delete"),
-    path("options/", views.folders_options, name="options"),
+    path("options/", getattr(views, f"{_async}folders_options"), name="options"),
+    path("fragments/", getattr(views, f"{_async}folders_fragments"), name="fragments"),
+    path("<int:folder_id>/export.zip", views.folder_export, name="export"),
+    path("<int:folder_id>/qr.zip", views.folder_qr_export, name="qr_export"),
 ]
@@ -1,20 +1,83 @@
 # folders/views.py
 from django.contrib.auth.decorators import login_required
-from django.http import HttpResponseBadRequest
-from django.shortcuts import render
+from django.http import Http404, HttpResponse, HttpResponseBadRequest
+from django.utils.text import slugify
 from django.db import IntegrityError
+from django.utils.cache import get_conditional_response
+from django.views.decorators.http import condition
 
+from vcards import qr
+from vcards.models import VCard
+from vcards.streaming import streaming_response
+from vcards.vcf import stream_zip
+
+from . import cache as folder_cache
 from .models import Folder
 
 
+def _fragment_response(request, name):
+    """
+    Sirve un fragmento desde la caché versionada (folders/cache.py).
+    'no-cache' obliga al navegador a revalidar con If-None-Match: mientras
+    no cambien las carpetas la respuesta es un 304 sin queries.
+    """
+    response = HttpResponse(folder_cache.get_fragment(request.user, name))
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def _etag(name):
+    return lambda request, *args, **kwargs: folder_cache.etag(request.user, name)
+
+
+async def _afragment_response(request, name):
+    """
+    _fragment_response() para las vistas async (ASGI, ver config/asgi.py),
+    con el ETag de @condition hecho a mano: etag_func es síncrono y
+    request.user no se puede leer desde código async (se usa
+    await request.auser()).
+    """
+    user = await request.auser()
+    etag = folder_cache.etag(user, name)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(await folder_cache.aget_fragment(user, name))
+        response["Cache-Control"] = "private, no-cache"
+    if request.method in ("GET", "HEAD"):
+        response.headers.setdefault("ETag", etag)
+    return response
+
+
 @login_required
+@condition(etag_func=_etag("chips"))
 def folders_chips(request):
     """
     Devuelve el fragmento con los chips (lista de carpetas del usuario).
     Este view se usa como respuesta HTMX para refrescar la tira de chips.
     """
-    folders = Folder.objects.filter(owner=request.user).order_by("name")
-    return render(request, "folders/_chips.html", {"folders": folders})
+    return _fragment_response(request, "chips")
+
+
+@login_required
+async def afolders_chips(request):
+    """folders_chips() async (ASGI)."""
+    return await _afragment_response(request, "chips")
+
+
+@login_required
+@condition(etag_func=_etag("all"))
+def folders_fragments(request):
+    """
+    Chips + <option> del selector en una sola respuesta: los chips y el
+    <select id="folderSelect"> llegan como swaps OOB.
+    """
+    return _fragment_response(request, "all")
+
+
+@login_required
+async def afolders_fragments(request):
+    """folders_fragments() async (ASGI)."""
+    return await _afragment_response(request, "all")
 
 
 @login_required
@@ -23,7 +86,7 @@ def folder_save(request):
     ÚNICO endpoint para crear/editar.
     - Si viene id -> edita
     - Si no viene id -> crea
-    Devuelve el fragmento de chips actualizado.
+    Devuelve chips + options actualizados (OOB).
     """
     if request.method != "POST":
         return HttpResponseBadRequest("POST requerido")
@@ -50,13 +113,15 @@ def folder_save(request):
         # Tu modelo tiene unique_together (owner, name)
         return HttpResponseBadRequest("Ya existe una carpeta con ese nombre")
 
-    return folders_chips(request)
+    # La señal de Folder ya subió la versión (folders/cache.py)
+    request.user.refresh_from_db(fields=["folders_version"])
+    return _fragment_response(request, "all")
 
 
 @login_required
 def folder_delete(request):
     """
-    Elimina una carpeta del usuario. (Las tarjetas pueden desvincularse aquí si lo deseas)
+    Elimina una carpeta del usuario. Sus tarjetas quedan sin carpeta.
     """
     if request.method != "POST":
         return HttpResponseBadRequest("POST requerido")
@@ -67,18 +132,72 @@ def folder_delete(request):
     except Folder.DoesNotExist:
         return HttpResponseBadRequest("No existe")
 
-    # Opcional: dejar las tarjetas "sin carpeta"
-    # from vcards.models import VCard
-    # VCard.objects.filter(owner=request.user, folder=f).update(folder=None)
-
+    # Las tarjetas de la carpeta quedan "sin carpeta" (VCard.folder on_delete=SET_NULL)
     f.delete()
-    return folders_chips(request)
+    # La señal de Folder ya subió la versión (folders/cache.py)
+    request.user.refresh_from_db(fields=["folders_version"])
+    return _fragment_response(request, "all")
 
 @login_required
+@condition(etag_func=_etag("options"))
 def folders_options(request):
     """
     Devuelve SOLO las <option> del selector de carpetas del usuario.
     Se usa para refrescar el <select> vía HTMX.
     """
-    folders = Folder.objects.filter(owner=request.user).order_by("name")
-    return render(request, "folders/_options.html", {"folders": folders})
\ No newline at end of file
+    return _fragment_response(request, "options")
+
+
+@login_required
+async def afolders_options(request):
+    """folders_options() async (ASGI)."""
+    return await _afragment_response(request, "options")
+
+
+@login_required
+def folder_export(request, folder_id):
+    """
+    Zip con el .vcf de cada tarjeta de la carpeta. Se manda en streaming
+    (vcards/vcf.py: stream_zip) conforme se genera cada archivo: el primer
+    byte sale de inmediato y el zip nunca está completo en memoria.
+    """
+    folder = Folder.objects.filter(id=folder_id, owner=request.user).first()
+    if folder is None:
+        raise Http404("No existe")
+    cards = (
+        VCard.objects.filter(folder=folder, owner=request.user)
+        .defer("published_html", "published_vcf", "theme", "gallery")
+        .order_by("slug")
+    )
+    response = streaming_response(request, stream_zip(cards), "application/zip")
+    name = slugify(folder.name) or f"carpeta-{folder.id}"
+    response["Content-Disposition"] = f'attachment; filename="{name}-contactos.zip"'
+    response["Cache-Control"] = "private, no-store"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+@login_required
+def folder_qr_export(request, folder_id):
+    """
+    Zip con el QR de cada tarjeta publicada de la carpeta (?fmt=png|svg).
+    Los QR se generan por lotes en el pool de procesos (vcards/qr.py) y
+    quedan en disco: exportar de nuevo sólo lee archivos.
+    """
+    fmt = request.GET.get("fmt", "png")
+    if fmt not in qr.FORMATS:
+        return HttpResponseBadRequest("Formato no soportado")
+    folder = Folder.objects.filter(id=folder_id, owner=request.user).first()
+    if folder is None:
+        raise Http404("No existe")
+    cards = (
+        VCard.objects.filter(folder=folder, owner=request.user, is_published=True)
+        .only("slug", "theme", "photo", "updated_at")
+        .order_by("slug")
+    )
+    response = streaming_response(request, qr.stream_zip(cards, fmt), "application/zip")
+    name = slugify(folder.name) or f"carpeta-{folder.id}"
+    response["Content-Disposition"] = f'attachment; filename="{name}-qr.zip"'
+    response["Cache-Control"] = "private, no-store"
+    response["X-Accel-Buffering"] = "no"
+    return response
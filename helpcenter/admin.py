@@ -0,0 +1,53 @@
+from django.contrib import admin
+
+from . import models
+
+
+class HelpContentAdmin(admin.ModelAdmin):
+    list_editable = ("order", "is_published")
+    list_filter = ("language", "is_published")
+
+
+@admin.register(models.FaqCategory)
+class FaqCategoryAdmin(HelpContentAdmin):
+    list_display = ("name", "language", "order", "is_published")
+    search_fields = ("name",)
+
+
+@admin.register(models.Faq)
+class FaqAdmin(HelpContentAdmin):
+    list_display = ("question", "category", "show_on_faqs", "show_on_upgrade", "show_on_support", "language", "order", "is_published")
+    list_filter = ("language", "is_published", "category", "show_on_faqs", "show_on_upgrade", "show_on_support")
+    search_fields = ("question", "answer")
+
+
+@admin.register(models.FaqSuggestion)
+class FaqSuggestionAdmin(HelpContentAdmin):
+    list_display = ("term", "language", "order", "is_published")
+
+
+@admin.register(models.Tutorial)
+class TutorialAdmin(HelpContentAdmin):
+    list_display = ("title", "category", "level", "source", "duration", "language", "order", "is_published")
+    list_filter = ("language", "is_published", "level", "source")
+    search_fields = ("title", "description", "category")
+
+
+@admin.register(models.Plan)
+class PlanAdmin(HelpContentAdmin):
+    list_display = ("name", "slug", "price", "highlight", "language", "order", "is_published")
+
+
+@admin.register(models.PlanComparison)
+class PlanComparisonAdmin(HelpContentAdmin):
+    list_display = ("feature", "starter", "pro", "business", "language", "order", "is_published")
+
+
+@admin.register(models.PlanAddon)
+class PlanAddonAdmin(HelpContentAdmin):
+    list_display = ("name", "price", "period", "language", "order", "is_published")
+
+
+@admin.register(models.SupportCategory)
+class SupportCategoryAdmin(HelpContentAdmin):
+    list_display = ("title", "articles", "language", "order", "is_published")
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class HelpcenterConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'helpcenter'
+    verbose_name = "Centro de ayuda"
+
+    def ready(self):
+        # Cualquier alta/edición/baja de contenido invalida los fragmentos
+        from .content import connect_signals
+        connect_signals()
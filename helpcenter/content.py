@@ -0,0 +1,110 @@
+# helpcenter/content.py
+"""
+Versión del contenido de ayuda y datos para las páginas.
+
+Las páginas (dashboard.views: user_faqs, user_tutorials, user_upgrade,
+user_support) envuelven cada sección en {% cache %} con la llave
+(sección, versión, idioma). Las querysets que reciben son perezosas: si el
+fragmento está en caché no se ejecuta ninguna; sólo se lee la versión.
+
+La versión vive en ContentVersion (la misma para todos los workers) y se
+lee de la caché de Django (HELP_VERSION_TTL). Cualquier save/delete de un
+modelo de contenido la incrementa: las llaves viejas dejan de usarse y
+expiran solas con HELP_FRAGMENT_TTL. Con caché por proceso (LocMem) los
+demás workers ven el cambio a lo más HELP_VERSION_TTL s después.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.utils import translation
+
+from . import models
+
+VERSION_KEY = "helpcenter:version"
+
+CONTENT_MODELS = (
+    models.FaqCategory, models.Faq, models.FaqSuggestion, models.Tutorial,
+    models.Plan, models.PlanComparison, models.PlanAddon, models.SupportCategory,
+)
+
+
+# --------------------------------- Versión ---------------------------------
+def version():
+    value = cache.get(VERSION_KEY)
+    if value is None:
+        value = models.ContentVersion.objects.values_list("version", flat=True).first() or 0
+        cache.set(VERSION_KEY, value, getattr(settings, "HELP_VERSION_TTL", 30))
+    return value
+
+
+def bump_version():
+    updated = models.ContentVersion.objects.filter(pk=1).update(version=F("version") + 1)
+    if not updated:
+        models.ContentVersion.objects.get_or_create(pk=1)
+    value = models.ContentVersion.objects.values_list("version", flat=True).get(pk=1)
+    cache.set(VERSION_KEY, value, getattr(settings, "HELP_VERSION_TTL", 30))
+    return value
+
+
+def _on_change(sender, **kwargs):
+    bump_version()
+
+
+def connect_signals():
+    for model in CONTENT_MODELS:
+        uid = f"helpcenter_{model.__name__}"
+        post_save.connect(_on_change, sender=model, dispatch_uid=f"{uid}_save")
+        post_delete.connect(_on_change, sender=model, dispatch_uid=f"{uid}_delete")
+
+
+def language():
+    return translation.get_language() or settings.LANGUAGE_CODE
+
+
+def fragment_context():
+    """Variables que usan los {% cache %} de las páginas de ayuda."""
+    return {
+        "help_version": version(),
+        "help_lang": language(),
+        "help_ttl": getattr(settings, "HELP_FRAGMENT_TTL", 24 * 3600),
+    }
+
+
+# ---------------------------------- Datos ----------------------------------
+def published(model, lang=None):
+    """Queryset perezosa del contenido publicado en el idioma."""
+    return model.objects.filter(language=lang or language(), is_published=True)
+
+
+def faqs(page, lang=None):
+    return published(models.Faq, lang).filter(**{f"show_on_{page}": True}).select_related("category")
+
+
+def tutorial_categories(lang=None):
+    """Categorías en el orden en que aparecen los tutoriales."""
+    seen = {}
+    for category in published(models.Tutorial, lang).values_list("category", flat=True):
+        seen.setdefault(category, None)
+    return list(seen)
+
+
+def plans(lang=None):
+    """
+    Planes como dicts (también fuera de los fragmentos: "Mejorar plan" arma
+    el plan actual con ellos). Cacheados por versión e idioma.
+    """
+    lang = lang or language()
+    key = f"helpcenter:plans:{version()}:{lang}"
+    rows = cache.get(key)
+    if rows is None:
+        rows = [
+            {
+                "slug": p.slug, "name": p.name, "price": p.price, "period": p.period,
+                "highlight": p.highlight, "description": p.description,
+                "features": p.feature_list, "cta": p.cta,
+            }
+            for p in published(models.Plan, lang)
+        ]
+        cache.set(key, rows, getattr(settings, "HELP_FRAGMENT_TTL", 24 * 3600))
+    return rows
@@ -0,0 +1,187 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContentVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveBigIntegerField(default=1)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='FaqCategory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language', models.CharField(db_index=True, default='es-mx', max_length=10)),
+                ('order', models.PositiveIntegerField(default=0)),
+                ('is_published', models.BooleanField(default=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=80)),
+            ],
+            options={
+                'verbose_name': 'categoría de FAQ',
+                'verbose_name_plural': 'categorías de FAQ',
+                'ordering': ('order', 'id'),
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='FaqSuggestion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language', models.CharField(db_index=True, default='es-mx', max_length=10)),
+                ('order', models.PositiveIntegerField(default=0)),
+                ('is_published', models.BooleanField(default=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('term', models.CharField(max_length=40)),
+            ],
+            options={
+                'verbose_name': 'sugerencia de búsqueda',
+                'verbose_name_plural': 'sugerencias de búsqueda',
+                'ordering': ('order', 'id'),
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Plan',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language', models.CharField(db_index=True, default='es-mx', max_length=10)),
+                ('order', models.PositiveIntegerField(default=0)),
+                ('is_published', models.BooleanField(default=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('slug', models.CharField(choices=[('starter', 'Starter'), ('pro', 'Pro'), ('business', 'Business')], max_length=10)),
+                ('name', models.CharField(max_length=40)),
+                ('price', models.PositiveIntegerField(default=0)),
+                ('period', models.CharField(default='mes', max_length=20)),
+                ('highlight', models.BooleanField(default=False)),
+                ('description', models.CharField(blank=True, max_length=160)),
+                ('features', models.TextField(blank=True, help_text='Una característica por línea.')),
+                ('cta', models.CharField(blank=True, max_length=60, verbose_name='botón')),
+            ],
+            options={
+                'verbose_name': 'plan',
+                'verbose_name_plural': 'planes',
+                'ordering': ('order', 'id'),
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='PlanAddon',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language', models.CharField(db_index=True, default='es-mx', max_length=10)),
+                ('order', models.PositiveIntegerField(default=0)),
+                ('is_published', models.BooleanField(default=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=60)),
+                ('description', models.CharField(blank=True, max_length=160)),
+                ('price', models.PositiveIntegerField(default=0)),
+                ('period', models.CharField(default='mes', max_length=20)),
+            ],
+            options={
+                'verbose_name': 'complemento',
+                'verbose_name_plural': 'complementos',
+                'ordering': ('order', 'id'),
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='PlanComparison',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language', models.CharField(db_index=True, default='es-mx', max_length=10)),
+                ('order', models.PositiveIntegerField(default=0)),
+                ('is_published', models.BooleanField(default=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('feature', models.CharField(max_length=80)),
+                ('starter', models.CharField(max_length=40)),
+                ('pro', models.CharField(max_length=40)),
+                ('business', models.CharField(max_length=40)),
+            ],
+            options={
+                'verbose_name': 'fila de comparación',
+                'verbose_name_plural': 'comparación de planes',
+                'ordering': ('order', 'id'),
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='SupportCategory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language', models.CharField(db_index=True, default='es-mx', max_length=10)),
+                ('order', models.PositiveIntegerField(default=0)),
+                ('is_published', models.BooleanField(default=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('title', models.CharField(max_length=80)),
+                ('description', models.CharField(blank=True, max_length=160)),
+                ('articles', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'categoría de soporte',
+                'verbose_name_plural': 'categorías de soporte',
+                'ordering': ('order', 'id'),
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Tutorial',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language', models.CharField(db_index=True, default='es-mx', max_length=10)),
+                ('order', models.PositiveIntegerField(default=0)),
+                ('is_published', models.BooleanField(default=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('title', models.CharField(max_length=120)),
+                ('description', models.CharField(blank=True, max_length=240)),
+                ('category', models.CharField(max_length=60)),
+                ('level', models.CharField(choices=[('Básico', 'Básico'), ('Intermedio', 'Intermedio'), ('Avanzado', 'Avanzado')], default='Básico', max_length=20)),
+                ('duration', models.CharField(blank=True, max_length=10)),
+                ('thumb', models.URLField(blank=True, max_length=500)),
+                ('source', models.CharField(choices=[('youtube', 'YouTube'), ('mp4', 'MP4')], default='youtube', max_length=10)),
+                ('youtube_id', models.CharField(blank=True, max_length=20)),
+                ('mp4', models.URLField(blank=True, max_length=500)),
+            ],
+            options={
+                'verbose_name': 'tutorial',
+                'verbose_name_plural': 'tutoriales',
+                'ordering': ('order', 'id'),
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Faq',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language', models.CharField(db_index=True, default='es-mx', max_length=10)),
+                ('order', models.PositiveIntegerField(default=0)),
+                ('is_published', models.BooleanField(default=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('question', models.CharField(max_length=200)),
+                ('answer', models.TextField()),
+                ('show_on_faqs', models.BooleanField(default=True, verbose_name='en Preguntas frecuentes')),
+                ('show_on_upgrade', models.BooleanField(default=False, verbose_name='en Mejorar plan')),
+                ('show_on_support', models.BooleanField(default=False, verbose_name='en Soporte')),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='faqs', to='helpcenter.faqcategory')),
+            ],
+            options={
+                'verbose_name': 'pregunta frecuente',
+                'verbose_name_plural': 'preguntas frecuentes',
+                'ordering': ('order', 'id'),
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,154 @@
+# Contenido inicial: el que estaba escrito a mano en dashboard/views.py
+from django.db import migrations
+
+FAQ_CATEGORIES = [
+    "Cuenta y acceso",
+    "Tarjetas digitales",
+    "Diseño y branding",
+    "Estadísticas y privacidad",
+    "Planes y facturación",
+    "Integraciones",
+    "Seguridad y cumplimiento",
+    "Soporte y operaciones",
+]
+
+# (categoría, pregunta, respuesta)
+FAQS = [
+    ("Cuenta y acceso", "¿Olvidé mi contraseña, cómo la restablezco?", "Ve a la pantalla de acceso y haz clic en “¿Olvidaste tu contraseña?”. Recibirás un correo con un enlace para crear una nueva."),
+    ("Cuenta y acceso", "¿Puedo activar 2FA (autenticación en dos pasos)?", "Sí. En Ajustes › Seguridad puedes activar 2FA con aplicación de autenticación (TOTP)."),
+    ("Tarjetas digitales", "¿Cómo creo mi primera tarjeta?", "Desde “Crear tarjeta” elige una plantilla, personaliza tus datos y colores. Guarda y comparte con enlace o QR."),
+    ("Tarjetas digitales", "¿Puedo tener varias tarjetas?", "Según tu plan. Starter permite 1, Pro hasta 10 y Business ilimitadas."),
+    ("Diseño y branding", "¿Cómo subo mi logo, banner o video?", "En el editor de tarjeta (Perfil) tienes tiles para subir imágenes o video. Aceptamos JPG/PNG y MP4 cortos."),
+    ("Diseño y branding", "¿Puedo usar mi dominio propio?", "Sí, en Pro/Business puedes conectar un dominio o subdominio desde Ajustes › Dominios."),
+    ("Estadísticas y privacidad", "¿Qué métricas ofrece Mibio?", "Vistas, origen del tráfico, dispositivos, escaneos de QR y clics en botones/links. Puedes exportar CSV."),
+    ("Estadísticas y privacidad", "¿Puedo integrar GA4?", "Sí, añade tu ID de GA4 en Ajustes o por tarjeta (planes Pro/Business)."),
+    ("Planes y facturación", "¿Cómo cambio o cancelo mi plan?", "Desde “Mejorar plan” puedes subir/bajar de plan o cancelar sin permanencia. El cambio se prorratea."),
+    ("Planes y facturación", "¿Emiten facturas?", "Sí. Descarga tus comprobantes en el historial de facturación una vez aplicado el pago."),
+    ("Integraciones", "¿Qué integraciones están disponibles?", "GA4, Meta Pixel, Zapier y webhooks. Pronto: HubSpot y Notion (beta)."),
+    ("Seguridad y cumplimiento", "¿Cómo protegen mis datos?", "Ciframos en tránsito (TLS 1.2+) y aplicamos buenas prácticas de seguridad. Políticas de privacidad y retención vigentes."),
+    ("Soporte y operaciones", "¿En qué horario brindan soporte?", "Lun–Vie 9:00–18:00 (CDMX). Pro/Business tienen prioridad de respuesta."),
+]
+
+# (pregunta, respuesta)
+UPGRADE_FAQS = [
+    ("¿Puedo cambiar de plan cuando quiera?", "Sí, puedes subir o bajar de plan en cualquier momento. El cambio se prorratea automáticamente."),
+    ("¿Hay permanencia?", "No. Puedes cancelar en cualquier momento sin penalización."),
+    ("¿Ofrecen descuentos anuales?", "Sí, paga anual y ahorra hasta 20% (aplicable a Pro y Business)."),
+    ("¿Cómo integro Google Analytics?", "En Pro y Business puedes añadir tu ID de GA4 por tarjeta o a nivel cuenta."),
+]
+
+SUPPORT_FAQS = [
+    ("¿Cómo creo y comparto mi tarjeta?", "Desde “Mis tarjetas” crea una nueva, personaliza y comparte el enlace o QR."),
+    ("¿Puedo conectar Google Analytics?", "Sí, en Pro/Business puedes añadir tu ID de GA4 por tarjeta o a nivel cuenta."),
+    ("¿Cómo cambio o cancelo mi plan?", "Ve a “Mejorar plan”. No hay permanencia; el cambio se prorratea."),
+    ("¿Dónde descargo mis facturas?", "En la misma sección de plan, encontrarás el historial de facturación."),
+]
+
+FAQ_SUGGESTIONS = [
+    "QR",
+    "GA4",
+    "dominio",
+    "plantillas",
+    "exportar CSV",
+    "2FA",
+    "Zapier",
+    "privacidad",
+]
+
+TUTORIALS = [
+    {"title": "Primeros pasos en Mibio", "duration": "06:42", "level": "Básico", "category": "General", "thumb": "https://images.unsplash.com/photo-1522199710521-72d69614c702?q=80&w=1200&auto=format&fit=crop", "source": "youtube", "youtube_id": "dQw4w9WgXcQ", "desc": "Tour rápido por el panel y cómo navegar."},
+    {"title": "Crear tu primera tarjeta", "duration": "10:15", "level": "Básico", "category": "Tarjetas", "thumb": "https://images.unsplash.com/photo-1521737604893-d14cc237f11d?q=80&w=1200&auto=format&fit=crop", "source": "youtube", "youtube_id": "ysz5S6PUM-U", "desc": "Desde plantilla hasta compartir con QR."},
+    {"title": "Carpetas y organización", "duration": "07:28", "level": "Intermedio", "category": "Organización", "thumb": "https://images.unsplash.com/photo-1544005313-94ddf0286df2?q=80&w=1200&auto=format&fit=crop", "source": "mp4", "mp4": "https://filesamples.com/samples/video/mp4/sample_640x360.mp4", "desc": "Mejores prácticas para equipos."},
+    {"title": "Estadísticas y GA4", "duration": "09:03", "level": "Intermedio", "category": "Estadísticas", "thumb": "https://images.unsplash.com/photo-1551281044-8d8d0d8c8c02?q=80&w=1200&auto=format&fit=crop", "source": "youtube", "youtube_id": "rUWxSEwctFU", "desc": "Lee métricas y conecta Google Analytics."},
+    {"title": "Diseño y branding", "duration": "12:47", "level": "Avanzado", "category": "Diseño", "thumb": "https://images.unsplash.com/photo-1520975922284-71a0d52b3e51?q=80&w=1200&auto=format&fit=crop", "source": "mp4", "mp4": "https://filesamples.com/samples/video/mp4/sample_960x400_ocean_with_audio.mp4", "desc": "Paleta, tipografías y componentes."},
+]
+
+PLANS = [
+    {"slug": "starter", "name": "Starter", "price": 0, "period": "mes", "highlight": False, "description": "Perfecto para empezar", "features": ["1 tarjeta digital", "100 visitas/mes", "Estadísticas básicas", "1 plantilla"], "cta": "Continuar con Starter"},
+    {"slug": "pro", "name": "Pro", "price": 9, "period": "mes", "highlight": True, "description": "Para marcas personales y equipos pequeños", "features": ["Hasta 10 tarjetas", "10,000 visitas/mes", "Estadísticas avanzadas", "Plantillas premium", "Dominio personalizado", "Botón WhatsApp + Links ilimitados"], "cta": "Mejorar a Pro"},
+    {"slug": "business", "name": "Business", "price": 29, "period": "mes", "highlight": False, "description": "Para organizaciones y franquicias", "features": ["Tarjetas ilimitadas", "Visitas ilimitadas*", "SAML/SSO (empresas)", "Gestión multi-equipo", "Soporte prioritario", "SLA y facturación"], "cta": "Contactar ventas"},
+]
+
+COMPARISON = [
+    {"feature": "Tarjetas incluidas", "starter": "1", "pro": "10", "business": "Ilimitadas"},
+    {"feature": "Visitas/mes", "starter": "100", "pro": "10,000", "business": "Ilimitadas*"},
+    {"feature": "Plantillas premium", "starter": "—", "pro": "✔", "business": "✔"},
+    {"feature": "Dominio personalizado", "starter": "—", "pro": "✔", "business": "✔"},
+    {"feature": "Estadísticas avanzadas", "starter": "—", "pro": "✔", "business": "✔"},
+    {"feature": "SAML/SSO", "starter": "—", "pro": "—", "business": "✔"},
+    {"feature": "Soporte prioritario", "starter": "—", "pro": "—", "business": "✔"},
+]
+
+ADDONS = [
+    {"name": "Dominio .com", "desc": "Conecta o compra tu dominio", "price": 8, "period": "mes"},
+    {"name": "QR dinámico", "desc": "QR editable con UTM", "price": 3, "period": "mes"},
+    {"name": "Remover marca MiBio", "desc": "White-label en tu tarjeta", "price": 5, "period": "mes"},
+]
+
+SUPPORT_CATEGORIES = [
+    {"title": "Tarjetas digitales", "desc": "Creación, diseño, enlaces y QR", "articles": 18},
+    {"title": "Planes y Facturación", "desc": "Suscripciones, cupones, recibos", "articles": 12},
+    {"title": "Estadísticas", "desc": "Métricas, GA4, privacidad", "articles": 9},
+    {"title": "Integraciones", "desc": "GA4, Meta Pixel, Zapier", "articles": 14},
+    {"title": "Cuenta y Seguridad", "desc": "Acceso, 2FA, roles", "articles": 11},
+    {"title": "Problemas comunes", "desc": "Errores frecuentes y fixes", "articles": 22},
+]
+
+
+def seed(apps, schema_editor):
+    get = apps.get_model
+    categories = {
+        name: get("helpcenter", "FaqCategory").objects.create(name=name, order=i)
+        for i, name in enumerate(FAQ_CATEGORIES)
+    }
+    Faq = get("helpcenter", "Faq")
+    Faq.objects.bulk_create(
+        [Faq(category=categories[c], question=q, answer=a, order=i) for i, (c, q, a) in enumerate(FAQS)]
+        + [Faq(question=q, answer=a, order=i, show_on_faqs=False, show_on_upgrade=True) for i, (q, a) in enumerate(UPGRADE_FAQS)]
+        + [Faq(question=q, answer=a, order=i, show_on_faqs=False, show_on_support=True) for i, (q, a) in enumerate(SUPPORT_FAQS)]
+    )
+    FaqSuggestion = get("helpcenter", "FaqSuggestion")
+    FaqSuggestion.objects.bulk_create([FaqSuggestion(term=t, order=i) for i, t in enumerate(FAQ_SUGGESTIONS)])
+
+    Tutorial = get("helpcenter", "Tutorial")
+    Tutorial.objects.bulk_create([
+        Tutorial(
+            title=t["title"], description=t["desc"], category=t["category"], level=t["level"],
+            duration=t["duration"], thumb=t["thumb"], source=t["source"],
+            youtube_id=t.get("youtube_id", ""), mp4=t.get("mp4", ""), order=i,
+        )
+        for i, t in enumerate(TUTORIALS)
+    ])
+
+    Plan = get("helpcenter", "Plan")
+    Plan.objects.bulk_create([
+        Plan(
+            slug=p["slug"], name=p["name"], price=p["price"], period=p["period"], highlight=p["highlight"],
+            description=p["description"], features="\n".join(p["features"]), cta=p["cta"], order=i,
+        )
+        for i, p in enumerate(PLANS)
+    ])
+    PlanComparison = get("helpcenter", "PlanComparison")
+    PlanComparison.objects.bulk_create([PlanComparison(order=i, **row) for i, row in enumerate(COMPARISON)])
+    PlanAddon = get("helpcenter", "PlanAddon")
+    PlanAddon.objects.bulk_create([
+        PlanAddon(name=a["name"], description=a["desc"], price=a["price"], period=a["period"], order=i)
+        for i, a in enumerate(ADDONS)
+    ])
+    SupportCategory = get("helpcenter", "SupportCategory")
+    SupportCategory.objects.bulk_create([
+        SupportCategory(title=c["title"], description=c["desc"], articles=c["articles"], order=i)
+        for i, c in enumerate(SUPPORT_CATEGORIES)
+    ])
+    get("helpcenter", "ContentVersion").objects.update_or_create(pk=1, defaults={"version": 1})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("helpcenter", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(seed, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,179 @@
+# helpcenter/models.py
+"""
+Contenido de las páginas de ayuda del dashboard (FAQ, tutoriales, planes,
+soporte). Se edita en el admin; las páginas lo sirven como fragmentos
+pre-renderizados (ver helpcenter/content.py).
+"""
+from django.conf import settings
+from django.db import models
+
+from users.models import User
+
+
+class HelpContent(models.Model):
+    """Campos comunes: idioma, orden y si se muestra."""
+
+    language = models.CharField(max_length=10, default=settings.LANGUAGE_CODE, db_index=True)
+    order = models.PositiveIntegerField(default=0)
+    is_published = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        abstract = True
+        ordering = ("order", "id")
+
+
+# ------------------------------ Preguntas frecuentes ------------------------------
+class FaqCategory(HelpContent):
+    name = models.CharField(max_length=80)
+
+    class Meta(HelpContent.Meta):
+        verbose_name = "categoría de FAQ"
+        verbose_name_plural = "categorías de FAQ"
+
+    def __str__(self):
+        return self.name
+
+
+class Faq(HelpContent):
+    category = models.ForeignKey(FaqCategory, on_delete=models.SET_NULL, null=True, blank=True, related_name="faqs")
+    question = models.CharField(max_length=200)
+    answer = models.TextField()
+    # Páginas donde aparece
+    show_on_faqs = models.BooleanField("en Preguntas frecuentes", default=True)
+    show_on_upgrade = models.BooleanField("en Mejorar plan", default=False)
+    show_on_support = models.BooleanField("en Soporte", default=False)
+
+    class Meta(HelpContent.Meta):
+        verbose_name = "pregunta frecuente"
+        verbose_name_plural = "preguntas frecuentes"
+
+    def __str__(self):
+        return self.question
+
+
+class FaqSuggestion(HelpContent):
+    """Chips de búsqueda rápida de la página de FAQ."""
+
+    term = models.CharField(max_length=40)
+
+    class Meta(HelpContent.Meta):
+        verbose_name = "sugerencia de búsqueda"
+        verbose_name_plural = "sugerencias de búsqueda"
+
+    def __str__(self):
+        return self.term
+
+
+# ---------------------------------- Tutoriales ----------------------------------
+class Tutorial(HelpContent):
+    class Levels(models.TextChoices):
+        BASIC = "Básico", "Básico"
+        INTERMEDIATE = "Intermedio", "Intermedio"
+        ADVANCED = "Avanzado", "Avanzado"
+
+    class Sources(models.TextChoices):
+        YOUTUBE = "youtube", "YouTube"
+        MP4 = "mp4", "MP4"
+
+    title = models.CharField(max_length=120)
+    description = models.CharField(max_length=240, blank=True)
+    category = models.CharField(max_length=60)
+    level = models.CharField(max_length=20, choices=Levels.choices, default=Levels.BASIC)
+    duration = models.CharField(max_length=10, blank=True)  # "06:42"
+    thumb = models.URLField(max_length=500, blank=True)
+    source = models.CharField(max_length=10, choices=Sources.choices, default=Sources.YOUTUBE)
+    youtube_id = models.CharField(max_length=20, blank=True)
+    mp4 = models.URLField(max_length=500, blank=True)
+
+    class Meta(HelpContent.Meta):
+        verbose_name = "tutorial"
+        verbose_name_plural = "tutoriales"
+
+    def __str__(self):
+        return self.title
+
+
+# ------------------------------------ Planes ------------------------------------
+class Plan(HelpContent):
+    """Tarjeta de un plan en "Mejorar plan" (los límites están en users/quotas.py)."""
+
+    slug = models.CharField(max_length=10, choices=User.Plans.choices)
+    name = models.CharField(max_length=40)
+    price = models.PositiveIntegerField(default=0)
+    period = models.CharField(max_length=20, default="mes")
+    highlight = models.BooleanField(default=False)
+    description = models.CharField(max_length=160, blank=True)
+    features = models.TextField(blank=True, help_text="Una característica por línea.")
+    cta = models.CharField("botón", max_length=60, blank=True)
+
+    class Meta(HelpContent.Meta):
+        verbose_name = "plan"
+        verbose_name_plural = "planes"
+
+    def __str__(self):
+        return self.name
+
+    @property
+    def feature_list(self):
+        return [line.strip() for line in self.features.splitlines() if line.strip()]
+
+
+class PlanComparison(HelpContent):
+    """Fila de la tabla comparativa de planes."""
+
+    feature = models.CharField(max_length=80)
+    starter = models.CharField(max_length=40)
+    pro = models.CharField(max_length=40)
+    business = models.CharField(max_length=40)
+
+    class Meta(HelpContent.Meta):
+        verbose_name = "fila de comparación"
+        verbose_name_plural = "comparación de planes"
+
+    def __str__(self):
+        return self.feature
+
+
+class PlanAddon(HelpContent):
+    name = models.CharField(max_length=60)
+    description = models.CharField(max_length=160, blank=True)
+    price = models.PositiveIntegerField(default=0)
+    period = models.CharField(max_length=20, default="mes")
+
+    class Meta(HelpContent.Meta):
+        verbose_name = "complemento"
+        verbose_name_plural = "complementos"
+
+    def __str__(self):
+        return self.name
+
+
+# ------------------------------------ Soporte ------------------------------------
+class SupportCategory(HelpContent):
+    """Categoría del centro de ayuda en la página de soporte."""
+
+    title = models.CharField(max_length=80)
+    description = models.CharField(max_length=160, blank=True)
+    articles = models.PositiveIntegerField(default=0)
+
+    class Meta(HelpContent.Meta):
+        verbose_name = "categoría de soporte"
+        verbose_name_plural = "categorías de soporte"
+
+    def __str__(self):
+        return self.title
+
+
+# ------------------------------------ Versión ------------------------------------
+class ContentVersion(models.Model):
+    """
+    Una sola fila: se incrementa con cada cambio de contenido. Es parte de
+    la llave de los fragmentos, así que es la misma en todos los workers.
+    """
+
+    version = models.PositiveBigIntegerField(default=1)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"v{self.version}"
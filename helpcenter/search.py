@@ -0,0 +1,202 @@
+# helpcenter/search.py
+"""
+Búsqueda del centro de ayuda (FAQs, tutoriales y categorías de soporte)
+con un índice invertido en memoria.
+
+- Texto: minúsculas, sin acentos ("estadísticas" == "estadisticas"),
+  sin palabras vacías del español y con singular y plural reducidos al
+  mismo tronco ("tarjeta"/"tarjetas" -> "tarjeta", "cliente"/"clientes"
+  -> "client", "luz"/"luces" -> "luc").
+- La última palabra de la consulta también se busca como prefijo
+  (búsqueda mientras se escribe: "integ" encuentra "integraciones").
+- Ranking BM25; el título pesa más que el cuerpo. Primero se exige que
+  aparezcan todas las palabras; si no hay resultados, basta con una.
+
+Cada proceso guarda un índice por idioma junto con la versión del
+contenido con que se construyó (helpcenter/content.py). Se construye en
+la primera búsqueda y se reconstruye cuando la versión cambia; buscar no
+toca la BD, sólo lee la versión de la caché.
+"""
+import math
+import re
+import threading
+import unicodedata
+from bisect import bisect_left
+from dataclasses import dataclass
+
+from django.urls import reverse
+
+from . import content, models
+
+K1 = 1.2
+B = 0.75
+TITLE_BOOST = 2
+PREFIX_WEIGHT = 0.7     # un término por prefijo cuenta menos que el exacto
+MAX_PREFIX_TERMS = 50
+MIN_PREFIX_LENGTH = 2
+MAX_QUERY_TERMS = 8
+
+STOPWORDS = frozenset("""
+    a al ante como con cual cuando de del desde donde e el ella en entre es esta este esto
+    hay la las le les lo los mas me mi mis muy o os para pero por porque que se si sin
+    sobre su sus te tu tus un una unas uno unos y ya yo
+""".split())
+
+_WORD = re.compile(r"\w+")
+_VOWELS = "aeiou"
+
+
+@dataclass(frozen=True)
+class Document:
+    kind: str       # "faq" | "tutorial" | "article"
+    pk: int
+    title: str
+    text: str
+    category: str
+    url: str
+
+
+# --------------------------------- Texto ---------------------------------
+def fold(text):
+    """Minúsculas y sin diacríticos ("Básico" -> "basico"; la ñ queda como n)."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def stem(token):
+    """
+    Tronco común del singular y el plural regulares. El plural en -es no
+    dice si el singular termina en consonante ("integraciones") o en -e
+    ("clientes"), así que se quitan las dos cosas: consonante + -es, vocal
+    + -s y la -e final tras consonante. La -z final pasa a -c (luz/luces).
+    """
+    if token.endswith("z"):
+        token = token[:-1] + "c"
+    if len(token) <= 3:
+        return token
+    if token.endswith("es") and token[-3] not in _VOWELS and len(token) > 4:
+        return token[:-2]
+    if token.endswith("s") and token[-2] in _VOWELS:
+        token = token[:-1]
+    if token.endswith("e") and token[-2] not in _VOWELS and len(token) > 3:
+        return token[:-1]
+    return token
+
+
+def tokenize(text):
+    return [stem(t) for t in _WORD.findall(fold(text)) if t not in STOPWORDS]
+
+
+# --------------------------------- Índice ---------------------------------
+class SearchIndex:
+    def __init__(self, documents):
+        self.documents = list(documents)
+        postings = {}
+        self.lengths = []
+        for doc_id, doc in enumerate(self.documents):
+            counts = {}
+            for token in tokenize(doc.title):
+                counts[token] = counts.get(token, 0) + TITLE_BOOST
+            for token in tokenize(f"{doc.text} {doc.category}"):
+                counts[token] = counts.get(token, 0) + 1
+            for token, tf in counts.items():
+                postings.setdefault(token, []).append((doc_id, tf))
+            self.lengths.append(sum(counts.values()))
+        self.postings = postings
+        self.terms = sorted(postings)   # para buscar prefijos con bisect
+        self.avg_length = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0.0
+        n = len(self.documents)
+        self.idf = {
+            term: math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            for term, docs in postings.items()
+        }
+
+    def _expand(self, word, prefix):
+        """{término: peso} que cubren una palabra de la consulta."""
+        found = {}
+        if prefix and len(word) >= MIN_PREFIX_LENGTH:
+            # La última palabra puede estar a medias: se busca tal cual como prefijo
+            i = bisect_left(self.terms, word)
+            while i < len(self.terms) and len(found) < MAX_PREFIX_TERMS and self.terms[i].startswith(word):
+                found[self.terms[i]] = PREFIX_WEIGHT
+                i += 1
+        for term in {word, stem(word)}:
+            if term in self.postings:
+                found[term] = 1.0
+        return found
+
+    def _score_term(self, scores, term, weight):
+        idf = self.idf[term]
+        for doc_id, tf in self.postings[term]:
+            norm = K1 * (1 - B + B * self.lengths[doc_id] / self.avg_length)
+            scores[doc_id] = scores.get(doc_id, 0.0) + weight * idf * tf * (K1 + 1) / (tf + norm)
+
+    def search(self, query, limit=10, kind=None):
+        """[(puntaje, Document)] de mayor a menor."""
+        raw = [t for t in _WORD.findall(fold(query)) if t not in STOPWORDS][:MAX_QUERY_TERMS]
+        if not raw or not self.documents:
+            return []
+        last = len(raw) - 1
+        scores, matched = {}, []
+        for i, word in enumerate(raw):
+            expansions = self._expand(word, prefix=i == last)
+            docs = set()
+            for term, weight in expansions.items():
+                self._score_term(scores, term, weight)
+                docs.update(doc_id for doc_id, _ in self.postings[term])
+            matched.append(docs)
+
+        every = set.intersection(*matched) if all(matched) else set()
+        candidates = every or set(scores)
+        if kind:
+            candidates = {d for d in candidates if self.documents[d].kind == kind}
+        ranked = sorted(candidates, key=lambda d: (-scores[d], d))[:limit]
+        return [(scores[d], self.documents[d]) for d in ranked]
+
+
+# ------------------------------- Documentos -------------------------------
+def documents(lang):
+    faqs_url = reverse("dashboard:user_faqs")
+    tutorials_url = reverse("dashboard:user_tutorials")
+    support_url = reverse("dashboard:user_support")
+    upgrade_url = reverse("dashboard:user_upgrade")
+    for faq in content.published(models.Faq, lang).select_related("category"):
+        # La página donde aparece la pregunta (FAQ tiene prioridad)
+        if faq.show_on_faqs:
+            url = f"{faqs_url}#faq-{faq.pk}"
+        elif faq.show_on_support:
+            url = f"{support_url}#faq-{faq.pk}"
+        else:
+            url = f"{upgrade_url}#faq-{faq.pk}"
+        yield Document("faq", faq.pk, faq.question, faq.answer, faq.category.name if faq.category else "", url)
+    for tutorial in content.published(models.Tutorial, lang):
+        yield Document(
+            "tutorial", tutorial.pk, tutorial.title, tutorial.description,
+            f"{tutorial.category} · {tutorial.level}", f"{tutorials_url}#tutorial-{tutorial.pk}",
+        )
+    for article in content.published(models.SupportCategory, lang):
+        yield Document(
+            "article", article.pk, article.title, article.description, "", f"{support_url}#help-center",
+        )
+
+
+# Índices de este proceso: idioma -> (versión, SearchIndex)
+_indexes = {}
+_lock = threading.Lock()
+
+
+def get_index(lang=None):
+    lang = lang or content.language()
+    current = content.version()
+    entry = _indexes.get(lang)
+    if entry is None or entry[0] != current:
+        with _lock:
+            entry = _indexes.get(lang)
+            if entry is None or entry[0] != current:
+                entry = (current, SearchIndex(documents(lang)))
+                _indexes[lang] = entry
+    return entry[1]
+
+
+def search(query, limit=10, kind=None, lang=None):
+    return get_index(lang).search(query, limit=limit, kind=kind)
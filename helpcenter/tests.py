@@ -0,0 +1,126 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from helpcenter import content
+from helpcenter.models import ContentVersion, Faq, Plan
+from helpcenter.search import Document, SearchIndex, stem, tokenize
+from users.models import User
+
+
+def _doc(pk, title, text="", kind="faq"):
+    return Document(kind, pk, title, text, "", f"/ayuda/#{pk}")
+
+
+class StemTests(SimpleTestCase):
+    def test_singular_and_plural_share_a_stem(self):
+        pairs = [
+            ("cliente", "clientes"), ("reporte", "reportes"), ("paquete", "paquetes"),
+            ("enlace", "enlaces"), ("luz", "luces"), ("tarjeta", "tarjetas"),
+            ("integracion", "integraciones"), ("flor", "flores"), ("base", "bases"),
+            ("serie", "series"), ("mes", "meses"),
+        ]
+        for singular, plural in pairs:
+            with self.subTest(singular=singular):
+                self.assertEqual(stem(singular), stem(plural))
+
+    def test_short_words(self):
+        self.assertEqual(stem("web"), "web")
+        self.assertEqual(stem("pie"), "pie")
+
+
+class TokenizeTests(SimpleTestCase):
+    def test_folds_accents_and_drops_stopwords(self):
+        self.assertEqual(tokenize("¿Cómo comparto las Estadísticas de mi tarjeta?"), ["comparto", "estadistica", "tarjeta"])
+
+    def test_plural_and_singular_tokens_match(self):
+        self.assertEqual(tokenize("Reportes para clientes"), tokenize("reporte para cliente"))
+
+
+class SearchIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = SearchIndex([
+            _doc(1, "Exportar reportes", "Descarga los reportes de tus clientes en CSV."),
+            _doc(2, "Compartir enlaces", "Copia el enlace de tu tarjeta."),
+            _doc(3, "Integraciones", "Conecta Mibio con tu CRM.", kind="tutorial"),
+        ])
+
+    def pks(self, query, **kwargs):
+        return [doc.pk for _, doc in self.index.search(query, **kwargs)]
+
+    def test_singular_query_finds_plural_document(self):
+        self.assertEqual(self.pks("reporte de cliente"), [1])
+        self.assertEqual(self.pks("enlace"), [2])
+
+    def test_prefix_on_last_word(self):
+        self.assertEqual(self.pks("integ"), [3])
+
+    def test_falls_back_to_any_word(self):
+        self.assertEqual(self.pks("reportes inexistente"), [1])
+
+    def test_title_ranks_higher(self):
+        index = SearchIndex([_doc(1, "Otra cosa", "enlace"), _doc(2, "Enlace", "otra cosa")])
+        self.assertEqual([doc.pk for _, doc in index.search("enlace")], [2, 1])
+
+    def test_kind_filter_and_empty_query(self):
+        self.assertEqual(self.pks("integraciones", kind="faq"), [])
+        self.assertEqual(self.pks("de la"), [])
+
+
+class ContentVersionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_version_is_read_from_cache(self):
+        start = content.version()
+        self.assertEqual(start, ContentVersion.objects.get(pk=1).version)
+        with self.assertNumQueries(0):
+            self.assertEqual(content.version(), start)
+
+    def test_save_and_delete_bump_version(self):
+        start = content.version()
+        faq = Faq.objects.create(question="¿Nueva?", answer="Sí")
+        self.assertEqual(content.version(), start + 1)
+        faq.delete()
+        self.assertEqual(content.version(), start + 2)
+        # Otro worker (caché vacía) lee la misma versión de la BD
+        cache.delete(content.VERSION_KEY)
+        self.assertEqual(content.version(), start + 2)
+
+    def test_bump_recreates_missing_row(self):
+        ContentVersion.objects.all().delete()
+        cache.delete(content.VERSION_KEY)
+        self.assertEqual(content.version(), 0)
+        self.assertEqual(content.bump_version(), 1)
+
+    def test_plans_key_follows_version(self):
+        names = [p["name"] for p in content.plans()]
+        Plan.objects.create(slug=User.Plans.PRO, name="Pro Max", order=99)
+        self.assertEqual([p["name"] for p in content.plans()], names + ["Pro Max"])
+
+
+class HelpFragmentsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client.force_login(User.objects.create_user("ana", password="x"))
+        self.url = reverse("dashboard:user_faqs")
+
+    def _faq_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            html = self.client.get(self.url).content.decode()
+        return html, [q["sql"] for q in ctx.captured_queries if "helpcenter_faq" in q["sql"]]
+
+    def test_fragments_cached_until_content_changes(self):
+        _, queries = self._faq_queries()
+        self.assertTrue(queries)
+        _, queries = self._faq_queries()
+        self.assertEqual(queries, [])  # los fragmentos salen de la caché
+
+        Faq.objects.create(question="¿Puedo exportar a Excel?", answer="Sí")
+        html, queries = self._faq_queries()
+        self.assertTrue(queries)
+        self.assertIn("¿Puedo exportar a Excel?", html)
@@ -0,0 +1,30 @@
+# helpcenter/views.py
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.shortcuts import render
+
+from . import search as help_search
+
+KINDS = {"faq": "Pregunta frecuente", "tutorial": "Tutorial", "article": "Centro de ayuda"}
+
+
+@login_required
+def search(request):
+    """
+    Búsqueda mientras se escribe (?q=...&kind=faq|tutorial|article).
+    Con HTMX devuelve el fragmento de resultados; si no, JSON.
+    """
+    q = request.GET.get("q", "").strip()[:100]
+    kind = request.GET.get("kind") if request.GET.get("kind") in KINDS else None
+    hits = help_search.search(q, limit=10, kind=kind) if q else []
+
+    if request.headers.get("HX-Request"):
+        results = [{"doc": doc, "kind_label": KINDS[doc.kind]} for _, doc in hits]
+        return render(request, "helpcenter/_search_results.html", {"q": q, "results": results})
+    return JsonResponse({
+        "q": q,
+        "results": [
+            {"kind": doc.kind, "id": doc.pk, "title": doc.title, "text": doc.text, "url": doc.url, "score": round(score, 4)}
+            for score, doc in hits
+        ],
+    })
@@ -0,0 +1,16 @@
+from django.apps import AppConfig
+
+
+class MonitoringConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'monitoring'
+    verbose_name = "Monitoreo"
+
+    def ready(self):
+        # Cada conexión nueva a la BD lleva el wrapper que mide las queries
+        from django.db.backends.signals import connection_created
+
+        from .instrumentation import install_sql_wrapper
+        connection_created.connect(install_sql_wrapper, dispatch_uid="monitoring_sql_wrapper")
+        # Registra las métricas del pool de conexiones (settings.DB_POOL)
+        from . import db_pool  # noqa: F401
@@ -0,0 +1,50 @@
+# monitoring/db_pool.py
+"""
+Estadísticas de los pools de conexiones de Postgres (settings.DB_POOL)
+en /metrics.
+
+Django guarda un psycopg_pool.ConnectionPool por alias y por proceso en
+DatabaseWrapper._connection_pools. Se lee de ahí y no de la propiedad
+.pool, que crearía el pool si todavía no existe.
+
+Espera para obtener conexión: rate(mibio_db_pool_wait_seconds_total) /
+rate(mibio_db_pool_requests_total) es la espera media; requests_waiting
+> 0 sostenido o errores de timeout piden subir DB_POOL_MAX_SIZE (o bajar
+la concurrencia por proceso).
+"""
+from django.db import connections
+
+from .metrics import REGISTRY, CallbackMetric
+
+
+def _pools():
+    for alias in connections:
+        pools = getattr(type(connections[alias]), "_connection_pools", None)
+        pool = pools.get(alias) if pools else None
+        if pool is not None:
+            yield alias, pool
+
+
+def _stat(key, scale=1):
+    def collect():
+        return [((alias,), pool.get_stats().get(key, 0) * scale) for alias, pool in _pools()]
+    return collect
+
+
+def _metric(name, kind, help_text, key, scale=1):
+    REGISTRY.register(CallbackMetric(name, kind, help_text, ("alias",), _stat(key, scale)))
+
+
+_metric("mibio_db_pool_min_size", "gauge", "Conexiones mínimas del pool.", "pool_min")
+_metric("mibio_db_pool_max_size", "gauge", "Conexiones máximas del pool.", "pool_max")
+_metric("mibio_db_pool_size", "gauge", "Conexiones abiertas (libres + en uso).", "pool_size")
+_metric("mibio_db_pool_available", "gauge", "Conexiones libres en el pool.", "pool_available")
+_metric("mibio_db_pool_waiting", "gauge", "Hilos esperando conexión ahora.", "requests_waiting")
+_metric("mibio_db_pool_requests_total", "counter", "Conexiones pedidas al pool.", "requests_num")
+_metric("mibio_db_pool_queued_total", "counter", "Pedidos que tuvieron que esperar.", "requests_queued")
+_metric("mibio_db_pool_wait_seconds_total", "counter", "Tiempo total esperando conexión.", "requests_wait_ms", 0.001)
+_metric("mibio_db_pool_timeouts_total", "counter", "Pedidos que fallaron por timeout.", "requests_errors")
+_metric("mibio_db_pool_connections_total", "counter", "Conexiones nuevas abiertas al servidor.", "connections_num")
+_metric("mibio_db_pool_connect_seconds_total", "counter", "Tiempo abriendo conexiones (handshake).", "connections_ms", 0.001)
+_metric("mibio_db_pool_bad_returns_total", "counter", "Conexiones devueltas rotas (descartadas).", "returns_bad")
+_metric("mibio_db_pool_lost_total", "counter", "Conexiones que fallaron el check al sacarlas.", "connections_lost")
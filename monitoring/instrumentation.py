@@ -0,0 +1,92 @@
+# monitoring/instrumentation.py
+"""
+Medición por request: queries SQL (conteo y tiempo) y tiempo de render
+de templates.
+
+El estado del request vive en un ContextVar (lo abre
+monitoring.middleware.MetricsMiddleware). Fuera de un request, p. ej. en
+un comando o en el hilo del buffer de analytics, no hay estado y los
+wrappers sólo llaman a la función original.
+
+- SQL: un execute_wrapper que se instala una vez por conexión (señal
+  connection_created), no en cada request.
+- Templates: el backend TimedDjangoTemplates (settings.TEMPLATES) mide
+  Template.render de nivel superior; los {% include %} corren dentro y no
+  se cuentan dos veces.
+"""
+import time
+from contextvars import ContextVar
+
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import DjangoTemplates, reraise
+from django.template.backends.django import Template as DjangoTemplate
+
+
+class RequestStats:
+    __slots__ = ("sql_count", "sql_time", "template_time", "template_depth")
+
+    def __init__(self):
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+
+
+_current = ContextVar("monitoring_request_stats", default=None)
+
+
+def begin():
+    """Abre el estado del request; devuelve (stats, token para end())."""
+    stats = RequestStats()
+    return stats, _current.set(stats)
+
+
+def end(token):
+    _current.reset(token)
+
+
+# ----------------------------------- SQL -----------------------------------
+def _sql_wrapper(execute, sql, params, many, context):
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.sql_count += 1
+        stats.sql_time += time.perf_counter() - start
+
+
+def install_sql_wrapper(sender, connection, **kwargs):
+    if _sql_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_sql_wrapper)
+
+
+# -------------------------------- Templates --------------------------------
+class Template(DjangoTemplate):
+    def render(self, context=None, request=None):
+        stats = _current.get()
+        if stats is None or stats.template_depth:
+            # render_to_string dentro de otro render: ya se está midiendo
+            return super().render(context, request)
+        stats.template_depth += 1
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            stats.template_depth -= 1
+            stats.template_time += time.perf_counter() - start
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """DjangoTemplates cuyos templates registran su tiempo de render."""
+
+    def from_string(self, template_code):
+        return Template(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return Template(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
@@ -0,0 +1,141 @@
+# monitoring/metrics.py
+"""
+Contadores e histogramas en memoria con salida en el formato de texto de
+Prometheus (sin dependencias).
+
+Son por proceso: con varios workers de gunicorn cada uno expone los
+suyos y /metrics responde con los del worker que atendió el scrape. Para
+ver el total hay que scrapear cada worker (o correr uno solo por
+contenedor); los contadores se reinician con el proceso, algo que
+Prometheus ya maneja en rate()/increase().
+"""
+import threading
+from bisect import bisect_left
+
+# Segundos
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# Queries por request
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+# Bytes
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=""):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help_text, labels=()):
+        self.name, self.help, self.label_names = name, help_text, tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            yield f"{self.name}{_labels(self.label_names, labels)} {_number(value)}"
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=DURATION_BUCKETS):
+        self.name, self.help, self.label_names = name, help_text, tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}   # labels -> [conteo por bucket (+Inf al final), suma]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        i = bisect_left(self.buckets, value)  # primer bucket con le >= value
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][i] += 1
+            series[1] += value
+
+    def samples(self):
+        with self._lock:
+            items = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._series.items())
+        for labels, (counts, total) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = f'le="{_number(bound)}"'
+                yield f"{self.name}_bucket{_labels(self.label_names, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.label_names, labels)} {_number(total)}"
+            yield f"{self.name}_count{_labels(self.label_names, labels)} {cumulative}"
+
+
+class CallbackMetric:
+    """
+    Valores leídos al momento del scrape (p. ej. estadísticas del pool de
+    BD). collect() devuelve [(labels, valor)].
+    """
+
+    def __init__(self, name, kind, help_text, labels, collect):
+        self.name, self.kind, self.help, self.label_names = name, kind, help_text, tuple(labels)
+        self.collect = collect
+
+    def samples(self):
+        for labels, value in self.collect():
+            yield f"{self.name}{_labels(self.label_names, labels)} {_number(value)}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+REQUESTS = REGISTRY.register(Counter(
+    "mibio_requests_total", "Requests atendidos.", ("view", "method", "status"),
+))
+REQUEST_DURATION = REGISTRY.register(Histogram(
+    "mibio_request_duration_seconds", "Tiempo total del request.", ("view",),
+))
+DB_QUERIES = REGISTRY.register(Histogram(
+    "mibio_db_queries", "Queries SQL por request.", ("view",), COUNT_BUCKETS,
+))
+DB_DURATION = REGISTRY.register(Histogram(
+    "mibio_db_duration_seconds", "Tiempo en queries SQL por request.", ("view",),
+))
+TEMPLATE_DURATION = REGISTRY.register(Histogram(
+    "mibio_template_duration_seconds", "Tiempo renderizando templates por request.", ("view",),
+))
+RESPONSE_SIZE = REGISTRY.register(Histogram(
+    "mibio_response_size_bytes", "Tamaño del cuerpo de la respuesta.", ("view",), SIZE_BUCKETS,
+))
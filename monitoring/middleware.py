@@ -0,0 +1,80 @@
+# monitoring/middleware.py
+"""
+Métricas por vista de cada request (monitoring/metrics.py) y header
+Server-Timing con el desglose BD / templates / total, visible en la
+pestaña Network del navegador.
+
+Costo por request: unos perf_counter() y un lock por histograma; las
+queries pagan una llamada extra a función. Pensado para dejarse prendido
+en producción. METRICS_SERVER_TIMING=False quita el header (los tiempos
+dan pistas de qué tan caro es cada request a cualquier visitante).
+"""
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from . import instrumentation, metrics
+
+
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.server_timing = getattr(settings, "METRICS_SERVER_TIMING", True)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        start = time.perf_counter()
+        stats, token = instrumentation.begin()
+        try:
+            response = self.get_response(request)
+        finally:
+            instrumentation.end(token)
+        return self._record(request, response, stats, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        stats, token = instrumentation.begin()
+        try:
+            response = await self.get_response(request)
+        finally:
+            instrumentation.end(token)
+        return self._record(request, response, stats, time.perf_counter() - start)
+
+    def _record(self, request, response, stats, elapsed):
+        # Nombre de la vista y no el path: /<slug>/ no debe crear una serie por tarjeta
+        match = request.resolver_match
+        view = match.view_name if match else "unmatched"
+
+        metrics.REQUESTS.inc(view, request.method, str(response.status_code))
+        metrics.REQUEST_DURATION.observe(elapsed, view)
+        metrics.DB_QUERIES.observe(stats.sql_count, view)
+        metrics.DB_DURATION.observe(stats.sql_time, view)
+        metrics.TEMPLATE_DURATION.observe(stats.template_time, view)
+        size = _body_size(response)
+        if size is not None:
+            metrics.RESPONSE_SIZE.observe(size, view)
+
+        if self.server_timing:
+            timing = (
+                f'db;dur={stats.sql_time * 1000:.1f};desc="{stats.sql_count} queries", '
+                f"tpl;dur={stats.template_time * 1000:.1f}, "
+                f"total;dur={elapsed * 1000:.1f}"
+            )
+            previous = response.headers.get("Server-Timing")
+            response.headers["Server-Timing"] = f"{previous}, {timing}" if previous else timing
+        return response
+
+
+def _body_size(response):
+    """Bytes del cuerpo; en streaming sólo si trae Content-Length."""
+    if getattr(response, "streaming", False):
+        length = response.headers.get("Content-Length")
+        return int(length) if length and length.isdigit() else None
+    return len(response.content)
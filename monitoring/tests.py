@@ -0,0 +1,306 @@
+import os
+import runpy
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest import mock
+
+import dj_database_url
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import OperationalError, connections
+from django.db.backends.postgresql.base import DatabaseWrapper
+from django.http import HttpResponse, StreamingHttpResponse
+from django.templatetags.static import static
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from config.middleware import AsyncWhiteNoiseMiddleware
+
+from users.models import User
+
+from . import db_pool, metrics
+from .metrics import REGISTRY
+from .middleware import MetricsMiddleware, _body_size
+
+SETTINGS_FILE = Path(settings.BASE_DIR) / "config" / "settings.py"
+
+# Postgres desechable para las pruebas del pool, p. ej.
+#   TEST_POSTGRES_URL=postgres://postgres@127.0.0.1:5432/mibio python manage.py test monitoring
+TEST_POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL", "")
+
+
+def _load_settings(**env):
+    # Variables con valor None: se quitan del entorno
+    with mock.patch.dict(os.environ, {k: v for k, v in env.items() if v is not None}):
+        for name in [k for k, v in env.items() if v is None]:
+            os.environ.pop(name, None)
+        return runpy.run_path(str(SETTINGS_FILE))
+
+
+class DatabaseSettingsTests(SimpleTestCase):
+    def test_sqlite_fallback_only_in_debug(self):
+        db = _load_settings(DATABASE_URL=None, DEBUG="True")["DATABASES"]["default"]
+        self.assertEqual(db["ENGINE"], "django.db.backends.sqlite3")
+        with self.assertRaises(ImproperlyConfigured):
+            _load_settings(DATABASE_URL=None, DEBUG="False")
+
+
+def _sample(series):
+    """Valor de una serie en /metrics (0 si todavía no existe)."""
+    for line in REGISTRY.render().splitlines():
+        if line.startswith(series + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return 0
+
+
+class MetricsFormatTests(SimpleTestCase):
+    def test_counter_labels_are_escaped(self):
+        registry = metrics.Registry()
+        counter = registry.register(metrics.Counter("x_total", "Ayuda.", ("view",)))
+        counter.inc('a"b')
+        counter.inc('a"b', amount=2)
+        self.assertEqual(
+            registry.render(), '# HELP x_total Ayuda.\n# TYPE x_total counter\nx_total{view="a\\"b"} 3\n'
+        )
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = metrics.Histogram("h", "Ayuda.", ("view",), buckets=(1, 5))
+        for value in (0.5, 1, 3, 10):
+            histogram.observe(value, "v")
+        self.assertEqual(list(histogram.samples()), [
+            'h_bucket{view="v",le="1"} 2',
+            'h_bucket{view="v",le="5"} 3',
+            'h_bucket{view="v",le="+Inf"} 4',
+            'h_sum{view="v"} 14.5',
+            'h_count{view="v"} 4',
+        ])
+
+    def test_callback_metric_reads_at_scrape(self):
+        values = [(("default",), 1)]
+        gauge = metrics.CallbackMetric("g", "gauge", "Ayuda.", ("alias",), lambda: values)
+        values.append((("replica",), 2.5))
+        self.assertEqual(list(gauge.samples()), ['g{alias="default"} 1', 'g{alias="replica"} 2.5'])
+
+
+class MetricsMiddlewareTests(TestCase):
+    def test_records_view_and_server_timing(self):
+        series = 'mibio_requests_total{view="users:login",method="GET",status="200"}'
+        before = _sample(series)
+        response = self.client.get(reverse("users:login"))
+        self.assertEqual(_sample(series), before + 1)
+        self.assertRegex(
+            response["Server-Timing"], r'^db;dur=[\d.]+;desc="\d+ queries", tpl;dur=[\d.]+, total;dur=[\d.]+$'
+        )
+
+    def test_counts_queries_and_groups_by_view_name(self):
+        self.client.force_login(User.objects.create_user("ana", password="x"))
+        count = 'mibio_db_queries_count{view="dashboard:user_faqs"}'
+        total = 'mibio_db_queries_sum{view="dashboard:user_faqs"}'
+        before = (_sample(count), _sample(total))
+        self.client.get(reverse("dashboard:user_faqs"))
+        self.assertEqual(_sample(count), before[0] + 1)
+        self.assertGreater(_sample(total), before[1])
+
+        # Cada slug no crea su propia serie: cuenta la vista
+        series = 'mibio_requests_total{view="public_card",method="GET",status="404"}'
+        before = _sample(series)
+        self.client.get("/no-existe-1/")
+        self.client.get("/no-existe-2/")
+        self.assertEqual(_sample(series), before + 2)
+
+    @override_settings(METRICS_SERVER_TIMING=False)
+    def test_server_timing_can_be_disabled(self):
+        self.assertNotIn("Server-Timing", self.client.get(reverse("users:login")))
+
+    def test_async_stack(self):
+        async def view(request):
+            return HttpResponse("ok")
+
+        middleware = MetricsMiddleware(view)
+        self.assertTrue(iscoroutinefunction(middleware))
+        series = 'mibio_requests_total{view="unmatched",method="GET",status="200"}'
+        before = _sample(series)
+        response = async_to_sync(middleware)(RequestFactory().get("/x"))
+        self.assertIn("total;dur=", response["Server-Timing"])
+        self.assertEqual(_sample(series), before + 1)
+
+    def test_body_size(self):
+        self.assertEqual(_body_size(HttpResponse("hola")), 4)
+        self.assertIsNone(_body_size(StreamingHttpResponse(iter([b"a"]))))
+        streaming = StreamingHttpResponse(iter([b"abc"]))
+        streaming["Content-Length"] = "3"
+        self.assertEqual(_body_size(streaming), 3)
+
+
+class MetricsViewTests(TestCase):
+    url = "/metrics"
+
+    @override_settings(METRICS_TOKEN="")
+    def test_staff_only_without_token(self):
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        self.client.force_login(User.objects.create_user("root", password="x", is_staff=True))
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("# TYPE mibio_requests_total counter", response.content.decode())
+
+    @override_settings(METRICS_TOKEN="secreto")
+    def test_bearer_token(self):
+        self.assertEqual(self.client.get(self.url, headers={"Authorization": "Bearer otro"}).status_code, 403)
+        self.assertEqual(self.client.get(self.url, headers={"Authorization": "Bearer secreto"}).status_code, 200)
+
+
+class StaticFilesTests(SimpleTestCase):
+    """collectstatic con la storage de WhiteNoise y el middleware sync/async."""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        override = override_settings(STATIC_ROOT=self.root)
+        override.enable()
+        self.addCleanup(override.disable)
+        # Sin los del admin: bastan los del proyecto y tarda < 1 s
+        call_command("collectstatic", interactive=False, verbosity=0, ignore_patterns=["admin"])
+        self.url = static("dashboard/js/user_vcard_create.js")
+
+    def test_settings(self):
+        conf = _load_settings(DEBUG="False", DATABASE_URL="sqlite:///tmp/x.sqlite3")
+        self.assertEqual(
+            conf["STORAGES"]["staticfiles"]["BACKEND"], "whitenoise.storage.CompressedManifestStaticFilesStorage"
+        )
+        self.assertTrue(conf["WHITENOISE_KEEP_ONLY_HASHED_FILES"])
+        self.assertFalse(_load_settings(DEBUG="True")["WHITENOISE_KEEP_ONLY_HASHED_FILES"])
+
+    def test_hashed_and_precompressed(self):
+        self.assertRegex(self.url, r"^/static/dashboard/js/user_vcard_create\.[0-9a-f]{12}\.js$")
+        path = os.path.join(self.root, self.url.removeprefix("/static/"))
+        for suffix in ("", ".gz", ".br"):
+            self.assertTrue(os.path.exists(path + suffix), suffix)
+
+    def test_sync_serves_immutable_brotli(self):
+        middleware = AsyncWhiteNoiseMiddleware(lambda request: HttpResponse("app"))
+        self.assertFalse(iscoroutinefunction(middleware))
+        response = middleware(RequestFactory().get(self.url, headers={"Accept-Encoding": "gzip, br"}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertIn("immutable", response["Cache-Control"])
+        response.close()
+        self.assertEqual(middleware(RequestFactory().get("/dashboard/")).content, b"app")
+
+    def test_async_serves_and_passes_through(self):
+        async def app(request):
+            return HttpResponse("app")
+
+        middleware = AsyncWhiteNoiseMiddleware(app)
+        self.assertTrue(iscoroutinefunction(middleware))
+        response = async_to_sync(middleware)(RequestFactory().get(self.url))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("immutable", response["Cache-Control"])
+        response.close()
+        response = async_to_sync(middleware)(RequestFactory().get("/dashboard/"))
+        self.assertEqual(response.content, b"app")
+
+
+class PoolSettingsTests(SimpleTestCase):
+    pg_url = "postgres://mibio:x@db.example.com:5432/mibio"
+
+    def test_pool_is_opt_in(self):
+        db = _load_settings(DATABASE_URL=self.pg_url, DB_POOL="0")["DATABASES"]["default"]
+        self.assertEqual(db["CONN_MAX_AGE"], 600)
+        self.assertNotIn("pool", db.get("OPTIONS", {}))
+
+    def test_pool_mode(self):
+        db = _load_settings(
+            DATABASE_URL=self.pg_url, DB_POOL="1", DB_POOL_MIN_SIZE="3", DB_POOL_MAX_SIZE="7", DB_POOL_TIMEOUT="2.5"
+        )["DATABASES"]["default"]
+        # El pool administra las conexiones: nada de persistentes por hilo
+        self.assertEqual(db["CONN_MAX_AGE"], 0)
+        self.assertTrue(db["CONN_HEALTH_CHECKS"])
+        pool = db["OPTIONS"]["pool"]
+        self.assertEqual((pool["min_size"], pool["max_size"], pool["timeout"]), (3, 7, 2.5))
+        self.assertEqual(db["OPTIONS"]["sslmode"], "require")
+
+    def test_pool_ignored_on_sqlite(self):
+        db = _load_settings(DATABASE_URL="sqlite:///tmp/x.sqlite3", DB_POOL="1")["DATABASES"]["default"]
+        self.assertNotIn("pool", db.get("OPTIONS", {}))
+
+
+class PoolMetricsTests(SimpleTestCase):
+    """Contra un Postgres real (TEST_POSTGRES_URL); se salta si no hay."""
+
+    alias = "pool_test"
+
+    def setUp(self):
+        if not TEST_POSTGRES_URL:
+            self.skipTest("TEST_POSTGRES_URL no está definido")
+        db = dj_database_url.parse(TEST_POSTGRES_URL, conn_max_age=0)
+        db.update(CONN_HEALTH_CHECKS=True, OPTIONS={"pool": {"min_size": 1, "max_size": 2, "timeout": 5}})
+        db = connections.configure_settings({"default": db})["default"]
+        self.db = db
+        self.wrappers = [DatabaseWrapper(dict(db), alias=self.alias) for _ in range(2)]
+        try:
+            self.wrappers[0].ensure_connection()
+        except OperationalError as e:
+            self.skipTest(f"Postgres no disponible: {e}")
+        finally:
+            self.addCleanup(self._close)
+
+        patcher = mock.patch.object(db_pool, "connections", {self.alias: self.wrappers[0]})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _close(self):
+        for wrapper in self.wrappers:
+            wrapper.close()
+        self.wrappers[0].close_pool()
+
+    def _metrics(self):
+        prefix = "mibio_db_pool_"
+        values = {}
+        for line in REGISTRY.render().splitlines():
+            if line.startswith(prefix) and f'alias="{self.alias}"' in line:
+                name, value = line.split(" ")
+                values[name.split("{")[0][len(prefix):]] = float(value)
+        return values
+
+    def test_connections_are_reused(self):
+        first = self.wrappers[0]
+        for _ in range(5):
+            with first.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            first.close()  # vuelve al pool
+
+        metrics = self._metrics()
+        self.assertEqual(metrics["max_size"], 2)
+        self.assertGreaterEqual(metrics["requests_total"], 5)
+        # Cinco requests sin un handshake por cada uno
+        self.assertLessEqual(metrics["connections_total"], 2)
+        self.assertLessEqual(metrics["size"], 2)
+
+    def test_wait_for_a_free_connection_is_measured(self):
+        first, second = self.wrappers
+        second.ensure_connection()  # pool agotado (max_size=2)
+        got = threading.Event()
+
+        def checkout():
+            third = DatabaseWrapper(dict(self.db), alias=self.alias)
+            third.ensure_connection()
+            got.set()
+            third.close()
+
+        thread = threading.Thread(target=checkout)
+        thread.start()
+        time.sleep(0.2)
+        self.assertFalse(got.is_set())
+        first.close()
+        thread.join(5)
+        self.assertTrue(got.is_set())
+
+        metrics = self._metrics()
+        self.assertGreaterEqual(metrics["queued_total"], 1)
+        self.assertGreater(metrics["wait_seconds_total"], 0.1)
+        self.assertEqual(metrics["timeouts_total"], 0)
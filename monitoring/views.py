@@ -0,0 +1,27 @@
+# monitoring/views.py
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.views.decorators.cache import never_cache
+
+from .metrics import REGISTRY
+
+
+def _allowed(request):
+    """
+    Con METRICS_TOKEN: "Authorization: Bearer <token>" (lo que configura
+    Prometheus). Sin token: staff logueado, o cualquiera en DEBUG.
+    """
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if token:
+        sent = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+        return hmac.compare_digest(sent.encode(), token.encode())
+    return settings.DEBUG or (request.user.is_authenticated and request.user.is_staff)
+
+
+@never_cache
+def metrics_view(request):
+    if not _allowed(request):
+        return HttpResponseForbidden("Forbidden")
+    return HttpResponse(REGISTRY.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
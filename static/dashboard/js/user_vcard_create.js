@@ -225,7 +225,7 @@ document.addEventListener("change", (e) => {
   if (!input.matches('form.asset-uploader input[type="file"].hidden-file')) return;
 
   const form = input.closest("form.asset-uploader");
-  const targetSel = form?.getAttribute("hx-target");
+  const targetSel = form?.getAttribute("hx-target") || form?.dataset.target;
   const targetEl = targetSel ? document.querySelector(targetSel) : null;
 
   if (targetEl && input.files && input.files[0]) {
@@ -238,12 +238,83 @@ document.addEventListener("change", (e) => {
     }
   }
 
-  // envía el form para server-side processing (si aplica)
-  form?.requestSubmit();
+  // video: subida por chunks (fetch); el resto: envía el form con HTMX
+  if (form?.dataset.chunkedUpload && input.files && input.files[0]) {
+    uploadChunked(form.dataset.chunkedUpload, input.files[0], form)
+      .then((url) => {
+        const hidden = document.getElementById("videoUrlValue");
+        if (hidden) hidden.value = url;
+        document.body.dispatchEvent(new Event("vcard:asset-uploaded"));
+      })
+      .catch((err) => {
+        console.error(err);
+        if (targetEl) targetEl.innerHTML = `<div class="tile-empty">⚠︎</div>`;
+      });
+  } else {
+    form?.requestSubmit();
+  }
   // limpia el input (permite re-subir el mismo archivo)
   setTimeout(() => { input.value = ""; }, 0);
 });
 
+/* Subida por chunks reanudable (protocolo en vcards/uploads.py).
+   Si se corta la conexión o un chunk falla, pregunta al servidor el
+   offset real y sigue desde ahí. */
+async function uploadChunked(initUrl, file, form) {
+  const headers = { "X-CSRFToken": form.querySelector("[name=csrfmiddlewaretoken]")?.value || "" };
+  const init = new FormData();
+  init.append("size", file.size);
+  init.append("filename", file.name);
+  let res = await fetch(initUrl, { method: "POST", body: init, headers });
+  const state = await res.json();
+  if (!res.ok) throw new Error(state.error || "No se pudo iniciar la subida");
+
+  const url = `${initUrl}${state.id}/`;
+  let offset = state.offset;
+  let retries = 0;
+  while (offset < file.size) {
+    const buf = await file.slice(offset, offset + state.chunk_size).arrayBuffer();
+    const hash = await crypto.subtle.digest("SHA-256", buf);
+    const hex = [...new Uint8Array(hash)].map((b) => b.toString(16).padStart(2, "0")).join("");
+    try {
+      res = await fetch(url, {
+        method: "PATCH",
+        body: buf,
+        headers: { ...headers, "Content-Type": "application/octet-stream", "Upload-Offset": offset, "X-Chunk-Sha256": hex },
+      });
+      if (res.ok) {
+        offset = (await res.json()).offset;
+        retries = 0;
+        continue;
+      }
+      // 409 (offset desfasado) y 422 (chunk corrupto) se reintentan; el resto no
+      if (![409, 422].includes(res.status) && res.status < 500) {
+        throw Object.assign(new Error((await res.json()).error), { fatal: true });
+      }
+    } catch (err) {
+      if (err.fatal) throw err;
+    }
+    if (++retries > 5) throw new Error("La subida falló");
+    await new Promise((r) => setTimeout(r, 1000 * retries));
+    try {
+      res = await fetch(url, { headers });
+      if (res.ok) offset = (await res.json()).offset;
+    } catch (_) { /* sin red: se reintenta en la siguiente vuelta */ }
+  }
+
+  res = await fetch(`${url}finalize/`, { method: "POST", headers });
+  const done = await res.json();
+  if (!res.ok) throw new Error(done.error || "No se pudo finalizar la subida");
+  return done.url;
+}
+
+// upload_image manda HX-Trigger: vcard:asset-uploaded cuando ya actualizó el
+// input oculto (photo/banner); con eso se refresca el preview.
+document.body.addEventListener("vcard:asset-uploaded", () => {
+  const form = document.getElementById("editorForm");
+  if (form && window.htmx) htmx.trigger(form, "change");
+});
+
 /* ==========================
    7) Colores helpers
    ========================== */
@@ -332,10 +403,49 @@ document.addEventListener("keydown", (e) => {
     document.getElementById("saveBtn")?.click();
   }
 });
-document.getElementById("saveBtnRight")?.addEventListener("click", () => {
-  document.getElementById("saveBtn")?.click();
+document.getElementById("saveBtnRight")?.addEventListener("click", (e) => {
+  if (document.getElementById("saveBtn")) return document.getElementById("saveBtn").click();
+  saveCard(e.currentTarget, true);
 });
 
+// Campos del editor (columna izquierda), sin archivos ni token
+const EDITOR_FIELDS = ".shell .left input[name], .shell .left textarea[name], .shell .left select[name]";
+
+function editorFields() {
+  const fd = new FormData();
+  document.querySelectorAll(EDITOR_FIELDS).forEach((el) => {
+    if (el.type === "file" || el.name === "csrfmiddlewaretoken") return;
+    if ((el.type === "checkbox" || el.type === "radio") && !el.checked) return;
+    fd.append(el.name, el.value);
+  });
+  return fd;
+}
+
+// Junta todos los campos del editor y guarda/publica
+function saveCard(btn, publish) {
+  const url = btn?.dataset?.saveUrl;
+  if (!url) return;
+  const fd = editorFields();
+  if (btn.dataset.cardId) fd.set("card", btn.dataset.cardId);
+  if (window.editorDraft?.id) fd.set("draft", window.editorDraft.id);
+  if (publish) fd.set("publish", "1");
+  const csrf = document.querySelector('input[name="csrfmiddlewaretoken"]')?.value || "";
+
+  btn.disabled = true;
+  fetch(url, { method: "POST", body: fd, headers: { "X-CSRFToken": csrf } })
+    .then(async (r) => {
+      if (!r.ok) throw new Error(await r.text());
+      return r.json();
+    })
+    .then((data) => {
+      btn.dataset.cardId = data.id;
+      const slug = document.getElementById("slug");
+      if (slug) slug.readOnly = true; // el slug no se puede cambiar después de guardar
+    })
+    .catch((err) => alert(err.message || "No se pudo guardar"))
+    .finally(() => { btn.disabled = false; });
+}
+
 /* ======================================================
    10) Tabs de la izquierda: scroll suave + resaltar activo
    ====================================================== */
@@ -484,3 +594,269 @@ document.getElementById("saveBtnRight")?.addEventListener("click", () => {
     }
   });
 })();
+
+/* ======================================================
+   14) Preview por sección: indica qué campo cambió
+   - El server re-renderiza sólo esa sección (hx-swap-oob).
+   - Sin evento (load, htmx.ajax) => preview completo.
+   - El trigger del form tiene un solo debounce para todos los campos:
+     si en esa ventana cambió más de uno, el evento sólo trae el último,
+     así que se pide el preview completo (y con borrador, el estado
+     completo: sección 17).
+   - Único handler de htmx:configRequest para el preview del editor.
+   ====================================================== */
+const pendingFields = new Set();
+
+["input", "change"].forEach((type) => {
+  document.addEventListener(type, (e) => {
+    if (e.target?.name && e.target.matches?.(EDITOR_FIELDS)) pendingFields.add(e.target);
+  }, true);
+});
+
+// Estado completo del editor para el borrador ({nombre: valor | [valores]})
+function editorState() {
+  const state = {};
+  for (const [name, value] of editorFields().entries()) {
+    if (name.endsWith("[]")) (state[name] = state[name] || []).push(value);
+    else state[name] = value;
+  }
+  return state;
+}
+
+// Operación de parche para el input que cambió, o null si hay que mandar todo
+function draftFieldOp(el) {
+  if (!el?.name || el.type === "file" || !el.matches(EDITOR_FIELDS)) return null;
+  const path = "/" + el.name.replace(/~/g, "~0").replace(/\//g, "~1");
+  const same = Array.from(document.querySelectorAll(EDITOR_FIELDS)).filter((x) => x.name === el.name);
+  if (el.name.endsWith("[]")) {
+    if (el.type === "checkbox" || el.type === "radio") return null;
+    return { op: "replace", path: `${path}/${same.indexOf(el)}`, value: el.value };
+  }
+  if (el.type === "radio") return el.checked ? { op: "add", path, value: el.value } : null;
+  if (same.length > 1) return null;
+  if (el.type === "checkbox" && !el.checked) return { op: "remove", path };
+  return { op: "add", path, value: el.value };
+}
+
+document.addEventListener("htmx:configRequest", (evt) => {
+  if (!/\/vcards\/preview\/?$/.test(evt.detail.path || "")) return;
+  const src = evt.detail.triggeringEvent?.target;
+  const single = src?.name && [...pendingFields].every((el) => el === src) ? src : null;
+  if (single) pendingFields.delete(single);
+  else pendingFields.clear();
+
+  const draft = window.editorDraft;
+  if (!draft) {
+    // Vacío = varios campos pendientes: el server manda el preview completo
+    // aunque HX-Trigger-Name nombre al input que disparó el request
+    evt.detail.parameters["_changed"] = single ? single.name : "";
+    return;
+  }
+  // Con borrador (sección 17): sólo el parche del campo, o el estado completo
+  const op = draftFieldOp(single);
+  const params = {
+    patch: JSON.stringify(op ? [op] : [{ op: "replace", path: "", value: editorState() }]),
+  };
+  if (op) params._changed = single.name;
+  evt.detail.parameters = params;
+  evt.detail.path = draft.patchUrl;
+  evt.detail.headers["X-CSRFToken"] = document.querySelector('input[name="csrfmiddlewaretoken"]')?.value || "";
+});
+
+/* ======================================================
+   15) Slug: usar una alternativa sugerida por check_slug
+   ====================================================== */
+document.addEventListener("click", (e) => {
+  const btn = e.target.closest("[data-slug-suggestion]");
+  if (!btn) return;
+  const $slug = document.getElementById("slug");
+  if (!$slug) return;
+  $slug.value = btn.dataset.slugSuggestion;
+  if (window.htmx) window.htmx.trigger($slug, "keyup");
+});
+
+/* ======================================================
+   16) Flags globales en lote
+   - Los switches "Usar en todas mis tarjetas" siguen declarando
+     hx-post a set-global; aquí se cancela ese request y el cambio se
+     junta con los demás: tras una pausa sale un solo POST a set-globals.
+   ====================================================== */
+(function () {
+  const pending = {};
+  let timer = null;
+
+  function flush() {
+    timer = null;
+    const changes = Object.assign({}, pending);
+    Object.keys(pending).forEach((k) => delete pending[k]);
+    if (!Object.keys(changes).length) return;
+    const url = document.getElementById("editorForm")?.dataset?.globalsUrl;
+    if (!url) return;
+    const csrf = document.querySelector('input[name="csrfmiddlewaretoken"]')?.value || "";
+    fetch(url, {
+      method: "POST",
+      body: JSON.stringify(changes),
+      headers: { "Content-Type": "application/json", "X-CSRFToken": csrf },
+      keepalive: true,
+    }).catch(() => {
+      // Se reintenta con el siguiente cambio (sin pisar uno más nuevo)
+      Object.keys(changes).forEach((k) => { if (!(k in pending)) pending[k] = changes[k]; });
+    });
+  }
+
+  document.addEventListener("htmx:confirm", (evt) => {
+    const path = evt.detail.path || "";
+    if (!/\/vcards\/set-global\/?$/.test(path)) return;
+    const elt = evt.detail.elt;
+    const field = /"field"\s*:\s*"([^"]+)"/.exec(elt?.getAttribute("hx-vals") || "")?.[1];
+    if (!field) return;
+    evt.preventDefault();
+    pending[field] = !!elt.checked;
+    clearTimeout(timer);
+    timer = setTimeout(flush, 400);
+  });
+
+  window.addEventListener("pagehide", () => { if (timer) { clearTimeout(timer); flush(); } });
+})();
+
+/* ======================================================
+   17) Borrador en el servidor (parches JSON)
+   - Al cargar se abre el borrador: si ya había uno (cambios de antes de
+     recargar) se restaura en el form; "Descartar cambios" lo reemplaza
+     con el form tal como vino del server (reset=1).
+   - Desde ahí, cada request de preview se manda a draft_patch con sólo
+     el campo que cambió: [{"op":"add","path":"/full_name","value":"..."}]
+     (el desvío lo hace el handler de la sección 14).
+   - Sin campo identificable (agregar/quitar filas, htmx.ajax, varios
+     campos en el mismo debounce) se manda el estado completo como
+     reemplazo de la raíz.
+   - 409 (el parche no aplica) => se resincroniza con el estado completo.
+   ====================================================== */
+(function () {
+  const form = document.getElementById("editorForm");
+  const openUrl = form?.dataset?.draftsUrl;
+  if (!form || !openUrl) return;
+  const csrf = () => document.querySelector('input[name="csrfmiddlewaretoken"]')?.value || "";
+
+  // Filas de una lista repetida (contactos, redes, enlaces) clonadas del
+  // <template> de cada una; sin disparar previews por fila
+  function rebuildRows(list, selector, templates) {
+    if (!list) return;
+    list.querySelectorAll(selector).forEach((row) => row.remove());
+    templates.forEach((tpl) => {
+      if (!tpl) return;
+      list.appendChild(tpl.content.cloneNode(true));
+      const row = list.lastElementChild;
+      if (row && window.htmx) window.htmx.process(row);
+    });
+  }
+
+  function restoreState(state) {
+    const list = (name) => (Array.isArray(state[name]) ? state[name] : []);
+    rebuildRows(
+      document.getElementById("contactList"),
+      ".contact-item",
+      list("contact_type[]").map((type) => document.getElementById(`tpl-contact-${type}`))
+    );
+    rebuildRows(
+      document.getElementById("socialList"),
+      ".social-item",
+      list("social_network[]").map(() => document.getElementById("socialItemTemplate"))
+    );
+    rebuildRows(
+      document.getElementById("linksList"),
+      ".link-item",
+      list("link_url[]").map(() => document.getElementById("linkItemTemplate"))
+    );
+    const imageList = document.getElementById("imageList");
+    imageList?.querySelectorAll(".image-item").forEach((row) => row.remove());
+    list("images[]").forEach((url) => {
+      const item = document.createElement("div");
+      item.className = "image-item";
+      item.innerHTML = '<img alt="" loading="lazy"><input type="hidden" name="images[]">' +
+        '<button type="button" class="image-del" title="Quitar">×</button>';
+      item.querySelector("img").src = url;
+      item.querySelector("input").value = url;
+      imageList?.appendChild(item);
+    });
+
+    const byName = {};
+    document.querySelectorAll(EDITOR_FIELDS).forEach((el) => {
+      if (el.type === "file" || el.name === "csrfmiddlewaretoken") return;
+      (byName[el.name] = byName[el.name] || []).push(el);
+    });
+    Object.entries(byName).forEach(([name, els]) => {
+      const value = state[name];
+      els.forEach((el, i) => {
+        if (el.type === "radio") el.checked = el.value === value;
+        else if (el.type === "checkbox") el.checked = name in state;
+        else if (name.endsWith("[]")) el.value = list(name)[i] ?? "";
+        else if (value !== undefined) el.value = value;
+      });
+    });
+
+    // Controles que espejean a un campo: selector de color, tiles, plantilla
+    document.querySelectorAll(".color-field").forEach((cf) => {
+      const hex = cf.querySelector(".hex")?.value || "";
+      const pick = cf.querySelector(".color-picker");
+      if (pick && /^#[0-9a-fA-F]{6}$/.test(hex)) pick.value = hex;
+    });
+    [["photo", "photoTile"], ["banner", "bannerTile"]].forEach(([name, tileId]) => {
+      const tile = document.getElementById(tileId);
+      if (!tile || !state[name]) return;
+      const img = document.createElement("img");
+      img.className = "tile-preview";
+      img.alt = "";
+      img.src = state[name];
+      tile.replaceChildren(img);
+    });
+    document.querySelectorAll("#templateRadios .tplItem").forEach((l) => {
+      l.setAttribute("aria-selected", l.querySelector("input")?.checked ? "true" : "false");
+    });
+  }
+
+  function showRestoredNotice(initial) {
+    const bar = document.querySelector(".previewDock");
+    if (!bar || document.getElementById("draftRestored")) return;
+    const note = document.createElement("div");
+    note.id = "draftRestored";
+    note.className = "hint";
+    note.textContent = "Se recuperaron cambios sin guardar. ";
+    const discard = document.createElement("button");
+    discard.type = "button";
+    discard.className = "btn-add";
+    discard.textContent = "Descartar cambios";
+    discard.addEventListener("click", () => {
+      initial.set("reset", "1");
+      fetch(openUrl, { method: "POST", body: initial, headers: { "X-CSRFToken": csrf() } })
+        .then((r) => { if (r.ok) window.location.reload(); });
+    });
+    note.appendChild(discard);
+    bar.appendChild(note);
+  }
+
+  // Form tal como vino del server (antes de restaurar): base del reset
+  const initial = editorFields();
+  const cardId = document.getElementById("saveBtnRight")?.dataset?.cardId;
+  if (cardId) initial.set("card", cardId);
+  fetch(openUrl, { method: "POST", body: initial, headers: { "X-CSRFToken": csrf() } })
+    .then((r) => (r.ok ? r.json() : null))
+    .then((data) => {
+      if (!data) return;
+      window.editorDraft = { id: data.id, patchUrl: data.patch_url, version: data.version };
+      if (data.restored) {
+        restoreState(data.state);
+        showRestoredNotice(initial);
+        triggerPreviewWithForm(form);
+      }
+    })
+    .catch(() => {}); // sin borrador el preview sigue con el form completo
+
+  document.addEventListener("htmx:responseError", (evt) => {
+    const draft = window.editorDraft;
+    const status = evt.detail.xhr?.status;
+    if (!draft || !(evt.detail.pathInfo?.requestPath || "").startsWith(draft.patchUrl)) return;
+    if (status === 404) window.editorDraft = null; // borrado: vuelve al form completo
+    if (status === 409 || status === 404) triggerPreviewWithForm(form);
+  });
+})();
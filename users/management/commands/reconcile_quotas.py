@@ -0,0 +1,34 @@
+# users/management/commands/reconcile_quotas.py
+"""
+Recarga de la BD los contadores de cuota (users/quotas.py).
+
+    python manage.py reconcile_quotas              # usuarios con tarjetas
+    python manage.py reconcile_quotas --user ana   # uno solo
+
+Útil después de cargas masivas o borrados fuera de Django; sin él los
+contadores se reconcilian solos cada QUOTA_RECONCILE_SECONDS.
+"""
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from users import quotas
+from vcards.models import VCard
+
+
+class Command(BaseCommand):
+    help = "Reconciliar los contadores de cuota (tarjetas y visitas) con la BD."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="Username o email.")
+
+    def handle(self, *args, **opts):
+        if opts["user"]:
+            User = get_user_model()
+            ids = list(
+                User.objects.filter(username=opts["user"]).values_list("id", flat=True)
+                or User.objects.filter(email__iexact=opts["user"]).values_list("id", flat=True)
+            )
+        else:
+            ids = list(VCard.objects.values_list("owner_id", flat=True).distinct())
+        quotas.reconcile(ids)
+        self.stdout.write(self.style.SUCCESS(f"{len(ids)} usuarios reconciliados"))
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:12
+
+from django.db import migrations, models
+
+# Búsqueda del admin (dashboard.views.admin_users): Django traduce
+# __istartswith a UPPER(col::text) LIKE UPPER('x%'). Un índice GIN
+# trigram sobre esa misma expresión lo resuelve (y también '%x%').
+# Sólo existe en PostgreSQL; en SQLite no hace nada.
+SEARCH_FIELDS = ("username", "email", "first_name", "last_name")
+
+
+def _index_name(field):
+    return f"user_{field}_trgm_idx"
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for field in SEARCH_FIELDS:
+        schema_editor.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{_index_name(field)}" '
+            f'ON "users_user" USING gin ((UPPER("{field}"::text)) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for field in SEARCH_FIELDS:
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{_index_name(field)}"')
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY no puede correr dentro de una transacción
+    atomic = False
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0003_user_plan_and_kpi_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='user',
+            name='user_date_joined_idx',
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['date_joined', 'id'], name='user_joined_id_idx'),
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -15,6 +15,29 @@ class User(AbstractUser):
         help_text="Rol del usuario para redirecciones y permisos."
     )
 
+    class Plans(models.TextChoices):
+        STARTER = "starter", "Starter"
+        PRO = "pro", "Pro"
+        BUSINESS = "business", "Business"
+
+    plan = models.CharField(max_length=10, choices=Plans.choices, default=Plans.STARTER)
+
+    # Se incrementa al crear/editar/borrar carpetas (ver folders/cache.py).
+    # Vive en el usuario porque request.user ya viene cargado: validar el
+    # ETag de los fragmentos de carpetas no cuesta queries extra.
+    folders_version = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta(AbstractUser.Meta):
+        # KPIs del admin (dashboard/metrics.py): activos, altas por mes, planes.
+        # (date_joined, id) además es la llave del listado keyset del admin
+        # (dashboard/paging.py). La búsqueda usa índices trigram sólo en
+        # PostgreSQL (migración 0004).
+        indexes = [
+            models.Index(fields=["last_login"], name="user_last_login_idx"),
+            models.Index(fields=["date_joined", "id"], name="user_joined_id_idx"),
+            models.Index(fields=["plan"], name="user_plan_idx"),
+        ]
+
     def is_admin(self) -> bool:
         return self.role == self.Roles.ADMIN
 
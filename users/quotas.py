@@ -0,0 +1,222 @@
+# users/quotas.py
+"""
+Límites por plan (tarjetas y visitas al mes) con contadores en la caché.
+
+Los contadores viven en la caché de Django por usuario:
+  - quota:cards:<user>          tarjetas del usuario
+  - quota:views:<user>:<YYYYMM> visitas del mes (las cuenta la página
+                                pública, sin bots ni repetidas)
+Revisarlos es un cache.get: ni crear tarjetas ni la página pública
+hacen COUNT. Cada contador se carga de la BD cuando no está y expira a
+los QUOTA_RECONCILE_SECONDS, así que se reconcilia solo; reconcile()
+(comando reconcile_quotas) lo fuerza después de cargas masivas.
+
+Semántica con varios workers:
+  - Tarjetas: reserve_cards() hace incr atómico y, si se pasa del
+    límite, lo regresa (decr) y falla. Con caché compartida (Redis) dos
+    workers no pueden pasar ambos la última plaza. Si la creación falla
+    después de reservar, card_slot() libera la reserva. Con LocMem (un
+    contador por proceso) el límite es por worker hasta la siguiente
+    reconciliación.
+  - Visitas: las cuenta la página pública al servir la tarjeta (un 200,
+    no un 304), una vez por IP y tarjeta cada QUOTA_VIEW_WINDOW s; el
+    beacon de analytics (sin autenticación) no toca la cuota. La página
+    sólo se bloquea cuando el contador ya llegó al límite. Si el
+    contador no está en caché se sirve la página (fail-open): el hot path
+    nunca espera a la BD.
+  - Una tarjeta reservada pero aún sin commit cuando el contador se
+    recarga de la BD queda fuera del conteo hasta la siguiente recarga.
+"""
+import hashlib
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Sum
+from django.utils import timezone
+
+# None = ilimitado. Se puede sobrescribir con settings.PLAN_LIMITS.
+DEFAULT_PLAN_LIMITS = {
+    "starter": {"vcards": 1, "views": 100},
+    "pro": {"vcards": 10, "views": 10_000},
+    "business": {"vcards": None, "views": None},
+}
+UNLIMITED = {"vcards": None, "views": None}
+
+
+class QuotaExceeded(Exception):
+    def __init__(self, resource, limit):
+        self.resource = resource
+        self.limit = limit
+        super().__init__(f"Límite del plan alcanzado ({resource}: {limit})")
+
+
+def plan_limits(plan):
+    limits = getattr(settings, "PLAN_LIMITS", DEFAULT_PLAN_LIMITS)
+    return limits.get(plan, limits["starter"])
+
+
+def limits_for(user):
+    if user.is_staff or user.is_superuser:
+        return UNLIMITED
+    return plan_limits(user.plan)
+
+
+def _ttl():
+    return getattr(settings, "QUOTA_RECONCILE_SECONDS", 900)
+
+
+def _month(now=None):
+    return timezone.localdate(now).strftime("%Y%m")
+
+
+def cards_key(user_id):
+    return f"quota:cards:{user_id}"
+
+
+def views_key(user_id, month=None):
+    return f"quota:views:{user_id}:{month or _month()}"
+
+
+# ------------------------------ Conteos en BD ------------------------------
+def _db_cards(user_id):
+    from vcards.models import VCard
+
+    return VCard.objects.filter(owner_id=user_id).count()
+
+
+def _db_views(user_id, month=None):
+    """Vistas del mes: rollups diarios + eventos que aún no se suman."""
+    from analytics.models import CardEvent, CardStatDay, RollupState
+
+    today = timezone.localdate()
+    start = today.replace(day=1)
+    rolled = (
+        CardStatDay.objects.filter(card__owner_id=user_id, kind=CardEvent.Kind.VIEW, bucket__gte=start)
+        .aggregate(n=Sum("count"))["n"]
+        or 0
+    )
+    state = RollupState.objects.filter(name="default").values_list("last_event_id", flat=True).first() or 0
+    pending = CardEvent.objects.filter(
+        card__owner_id=user_id, kind=CardEvent.Kind.VIEW, id__gt=state, created_at__date__gte=start
+    ).count()
+    return rolled + pending
+
+
+def _counter(key, load):
+    value = cache.get(key)
+    if value is None:
+        # Sólo el primero que llega lo escribe; los demás usan ese valor
+        cache.add(key, load(), _ttl())
+        value = cache.get(key, 0)
+    return value
+
+
+def _incr(key, load, delta=1):
+    for _ in range(2):
+        _counter(key, load)
+        try:
+            return cache.incr(key, delta)
+        except ValueError:
+            continue  # expiró entre el get y el incr: se vuelve a cargar
+    return _counter(key, load)
+
+
+# --------------------------------- Tarjetas ---------------------------------
+def card_count(user_id):
+    return _counter(cards_key(user_id), lambda: _db_cards(user_id))
+
+
+def reserve_cards(user, n=1):
+    """Aparta n tarjetas o lanza QuotaExceeded (sin dejar nada apartado)."""
+    limit = limits_for(user)["vcards"]
+    # También sin límite: el contador sigue exacto si el plan baja
+    used = _incr(cards_key(user.pk), lambda: _db_cards(user.pk), n)
+    if limit is not None and used > limit:
+        release_cards(user.pk, n)
+        raise QuotaExceeded("vcards", limit)
+
+
+def release_cards(user_id, n=1):
+    try:
+        cache.decr(cards_key(user_id), n)
+    except ValueError:
+        pass  # sin contador: se recarga de la BD la próxima vez
+
+
+@contextmanager
+def card_slot(user, n=1):
+    """reserve_cards + liberar si el bloque falla (p.ej. IntegrityError)."""
+    reserve_cards(user, n)
+    try:
+        yield
+    except BaseException:
+        release_cards(user.pk, n)
+        raise
+
+
+# --------------------------------- Visitas ---------------------------------
+def _view_window():
+    return getattr(settings, "QUOTA_VIEW_WINDOW", 1800)
+
+
+def first_in_window(scope, slug, client):
+    """
+    True la primera vez que client (IP) toca slug en la ventana
+    QUOTA_VIEW_WINDOW; False las siguientes. Un cache.add: recargar la
+    página, reintentos del beacon o un script desde la misma IP cuentan
+    una vez.
+    """
+    digest = hashlib.blake2b(str(client).encode(), digest_size=8).hexdigest()
+    return cache.add(f"quota:seen:{scope}:{slug}:{digest}", 1, _view_window())
+
+
+def record_view(owner_id, plan):
+    """Suma una visita al contador del mes del dueño."""
+    if plan_limits(plan)["views"] is None:
+        return
+    _incr(views_key(owner_id), lambda: _db_views(owner_id))
+
+
+def count_view(owner_id, plan, slug, client):
+    """
+    Visita servida por la página pública (vcards.views.public_card): se
+    cuenta a lo más una vez por IP y tarjeta en la ventana.
+    """
+    if plan_limits(plan)["views"] is not None and first_in_window("view", slug, client):
+        record_view(owner_id, plan)
+
+
+def views_exhausted(owner_id, plan):
+    """True si el dueño ya gastó las visitas del mes. Un cache.get."""
+    limit = plan_limits(plan)["views"]
+    if limit is None:
+        return False
+    used = cache.get(views_key(owner_id))
+    return used is not None and used >= limit
+
+
+def usage(user):
+    """{"vcards": (usadas, límite), "views": (usadas, límite)} para la UI."""
+    limits = limits_for(user)
+    return {
+        "vcards": (card_count(user.pk), limits["vcards"]),
+        "views": (_counter(views_key(user.pk), lambda: _db_views(user.pk)), limits["views"]),
+    }
+
+
+# ------------------------------ Reconciliación ------------------------------
+def reconcile(user_ids):
+    """
+    Recarga los contadores de la BD. Las visitas nunca bajan (los eventos
+    en el buffer de un worker aún no están en la BD); las tarjetas sí.
+    """
+    ttl = _ttl()
+    for user_id in user_ids:
+        cache.set(cards_key(user_id), _db_cards(user_id), ttl)
+        key = views_key(user_id)
+        cache.set(key, max(_db_views(user_id), cache.get(key, 0)), ttl)
+
+
+def on_card_deleted(sender, instance, **kwargs):
+    release_cards(instance.owner_id)
@@ -1,3 +1,105 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
 
-# Create your tests here.
+from users import quotas
+from users.models import User
+from vcards.models import VCard
+
+LIMITS = {
+    "starter": {"vcards": 1, "views": 3},
+    "pro": {"vcards": 2, "views": 10},
+    "business": {"vcards": None, "views": None},
+}
+BROWSER = "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) Mobile"
+
+
+@override_settings(PLAN_LIMITS=LIMITS)
+class ReserveCardsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("ana", password="x", plan=User.Plans.PRO)
+
+    def test_reserves_up_to_the_limit(self):
+        quotas.reserve_cards(self.user)
+        quotas.reserve_cards(self.user)
+        with self.assertRaises(quotas.QuotaExceeded) as ctx:
+            quotas.reserve_cards(self.user)
+        self.assertEqual(ctx.exception.limit, 2)
+        # La reserva fallida no queda apartada
+        self.assertEqual(quotas.card_count(self.user.pk), 2)
+
+    def test_batch_is_all_or_nothing(self):
+        with self.assertRaises(quotas.QuotaExceeded):
+            quotas.reserve_cards(self.user, 3)
+        self.assertEqual(quotas.card_count(self.user.pk), 0)
+
+    def test_counter_loads_existing_cards(self):
+        VCard.objects.create(owner=self.user, slug="ana-uno")
+        cache.clear()
+        quotas.reserve_cards(self.user)
+        with self.assertRaises(quotas.QuotaExceeded):
+            quotas.reserve_cards(self.user)
+
+    def test_card_slot_releases_on_error(self):
+        with self.assertRaises(RuntimeError):
+            with quotas.card_slot(self.user):
+                raise RuntimeError
+        self.assertEqual(quotas.card_count(self.user.pk), 0)
+
+    def test_unlimited_plan(self):
+        self.user.plan = User.Plans.BUSINESS
+        quotas.reserve_cards(self.user, 50)
+        self.assertEqual(quotas.card_count(self.user.pk), 50)
+
+
+@override_settings(PLAN_LIMITS=LIMITS)
+class PublicViewQuotaTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("ana", password="x")
+        self.card = VCard.objects.create(owner=self.user, slug="ana-perez", template="buro")
+        self.card.publish()
+        self.url = reverse("public_card", args=[self.card.slug])
+
+    def get(self, ip="203.0.113.1", **headers):
+        return self.client.get(self.url, HTTP_USER_AGENT=BROWSER, REMOTE_ADDR=ip, **headers)
+
+    def used(self):
+        return quotas.usage(self.user)["views"][0]
+
+    def test_counts_once_per_ip(self):
+        for _ in range(5):
+            self.assertEqual(self.get().status_code, 200)
+        self.assertEqual(self.used(), 1)
+
+    def test_blocks_after_limit(self):
+        for n in range(3):
+            self.get(ip=f"203.0.113.{n}")
+        response = self.get(ip="203.0.113.99")
+        self.assertEqual(response.status_code, 429)
+
+    def test_not_modified_and_bots_do_not_count(self):
+        etag = self.get()["ETag"]
+        self.assertEqual(self.get(ip="203.0.113.2", HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.client.get(self.url, HTTP_USER_AGENT="Googlebot/2.1", REMOTE_ADDR="203.0.113.3")
+        self.assertEqual(self.used(), 1)
+
+    def test_beacons_do_not_touch_the_quota(self):
+        for n in range(20):
+            self.client.post(
+                reverse("analytics:collect"),
+                data=f'{{"id": null, "card": "{self.card.slug}", "type": "view"}}',
+                content_type="text/plain",
+                HTTP_USER_AGENT=BROWSER,
+                REMOTE_ADDR=f"198.51.100.{n}",
+            )
+        self.assertEqual(self.get().status_code, 200)
+        self.assertEqual(self.used(), 1)
+
+    @override_settings(TRUSTED_PROXY_HOPS=1)
+    def test_client_ip_behind_proxy(self):
+        # El cliente puede inventar la primera IP; cuenta la del proxy
+        for fake in ("1.1.1.1", "2.2.2.2", "3.3.3.3"):
+            self.get(ip="10.0.0.1", HTTP_X_FORWARDED_FOR=f"{fake}, 203.0.113.7")
+        self.assertEqual(self.used(), 1)
@@ -1,3 +1,10 @@
 from django.contrib import admin
+from .models import VCard
 
-# Register your models here.
+@admin.register(VCard)
+class VCardAdmin(admin.ModelAdmin):
+    list_display = ("slug", "owner", "folder", "template", "is_published", "published_version", "updated_at")
+    list_filter = ("is_published", "template")
+    search_fields = ("slug", "full_name", "owner__email", "owner__username")
+    raw_id_fields = ("owner", "folder")
+    readonly_fields = ("published_at", "published_etag", "published_version")
@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class VcardsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'vcards'
+
+    def ready(self):
+        # Mantiene al día el registro de slugs en memoria (altas/bajas/renames)
+        from .slugs import slug_registry
+        slug_registry.connect_signals()
+
+        # Baja de tarjetas -> libera la plaza en el contador del plan
+        from django.db.models.signals import post_delete
+        from users.quotas import on_card_deleted
+        post_delete.connect(on_card_deleted, sender=self.get_model("VCard"), dispatch_uid="quota_card_deleted")
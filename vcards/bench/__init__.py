@@ -0,0 +1,12 @@
+# vcards/bench/__init__.py
+"""
+Benchmarks del editor: reproduce sesiones grabadas contra los endpoints
+HTMX "calientes" (preview, check_slug, set_global, chips/options de
+carpetas) y mide latencia, queries SQL, bytes y tiempo de templates.
+
+- sessions.py : formato de sesión (JSONL), sesión sintética por defecto
+                y middleware para grabar sesiones reales.
+- replay.py   : reproductor y agregación de métricas.
+
+Uso: python manage.py bench_editor --help
+"""
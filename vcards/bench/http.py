@@ -0,0 +1,158 @@
+# vcards/bench/http.py
+"""
+Carga HTTP contra un servidor corriendo (WSGI o ASGI) para comparar
+despliegues: N usuarios virtuales, cada uno en su hilo y con su conexión
+keep-alive, reproducen la sesión del editor en bucle durante un tiempo
+fijo. Se reportan throughput y p50/p95/p99 por vista.
+
+Cada usuario virtual tiene su propia sesión de Django (creada en la misma
+BD que usa el servidor) y un token CSRF fijo en cookie + header.
+"""
+import http.client
+import os
+import secrets
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlencode, urlsplit
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.sessions.backends.db import SessionStore
+from django.urls import reverse
+
+from .replay import percentile
+
+
+def login_cookies(user):
+    """Cookies de una sesión nueva de user (como si hubiera hecho login)."""
+    session = SessionStore()
+    session[SESSION_KEY] = str(user.pk)
+    session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+    session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+    session.create()
+    csrf = secrets.token_hex(16)  # 32 caracteres: el secreto sin enmascarar
+    return {settings.SESSION_COOKIE_NAME: session.session_key, settings.CSRF_COOKIE_NAME: csrf}
+
+
+def rss_bytes(pid):
+    """RSS del proceso y todos sus descendientes (Linux, /proc)."""
+    children = defaultdict(list)
+    for entry in _proc_pids():
+        try:
+            with open(f"/proc/{entry}/stat") as fh:
+                ppid = int(fh.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children[ppid].append(entry)
+    total, pending = 0, [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            with open(f"/proc/{current}/status") as fh:
+                for line in fh:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+        except OSError:
+            pass
+        pending.extend(children.get(current, []))
+    return total
+
+
+def _proc_pids():
+    return [int(name) for name in os.listdir("/proc") if name.isdigit()]
+
+
+class HttpLoad:
+    def __init__(self, base_url, steps, cookies, duration=20.0, timeout=30.0):
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.steps = steps
+        self.cookies = cookies      # [dict por usuario virtual]
+        self.duration = duration
+        self.timeout = timeout
+        self._urls = {}
+        self._lock = threading.Lock()
+        self.latency_ms = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def _url(self, name):
+        if name not in self._urls:
+            self._urls[name] = reverse(name)
+        return self._urls[name]
+
+    def _request(self, conn, step, cookies):
+        url = self._url(step["name"])
+        body = urlencode(step.get("data", {}), doseq=True)
+        headers = {
+            "Cookie": "; ".join(f"{k}={v}" for k, v in cookies.items()),
+            "X-CSRFToken": cookies[settings.CSRF_COOKIE_NAME],
+            "Referer": f"http://{self.host}:{self.port}/",
+            "HX-Request": "true",
+            **step.get("headers", {}),
+        }
+        if step.get("method", "GET").upper() == "POST":
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+            conn.request("POST", url, body=body, headers=headers)
+        else:
+            conn.request("GET", f"{url}?{body}" if body else url, headers=headers)
+        response = conn.getresponse()
+        response.read()
+        return response.status
+
+    def _user(self, index, deadline):
+        cookies = self.cookies[index]
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        latencies, errors = defaultdict(list), defaultdict(int)
+        i = index * 7 % len(self.steps)   # cada usuario empieza en otro punto
+        while time.monotonic() < deadline:
+            step = self.steps[i]
+            i = (i + 1) % len(self.steps)
+            start = time.perf_counter()
+            try:
+                status = self._request(conn, step, cookies)
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+                status = 599
+            latencies[step["name"]].append((time.perf_counter() - start) * 1000)
+            # Un 302 es el redirect al login: la sesión no sirvió
+            if status >= 300 and status != 304:
+                errors[step["name"]] += 1
+        conn.close()
+        with self._lock:
+            for name, values in latencies.items():
+                self.latency_ms[name].extend(values)
+            for name, n in errors.items():
+                self.errors[name] += n
+
+    def run(self):
+        deadline = time.monotonic() + self.duration
+        threads = [
+            threading.Thread(target=self._user, args=(i, deadline), daemon=True)
+            for i in range(len(self.cookies))
+        ]
+        started = time.monotonic()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return self.report(time.monotonic() - started)
+
+    def report(self, elapsed):
+        def row(values, errors):
+            if not values:
+                return {"requests": 0, "errors": errors}
+            return {
+                "requests": len(values),
+                "errors": errors,
+                "rps": round(len(values) / elapsed, 1),
+                "p50_ms": round(percentile(values, 50), 2),
+                "p95_ms": round(percentile(values, 95), 2),
+                "p99_ms": round(percentile(values, 99), 2),
+            }
+
+        views = {name: row(values, self.errors[name]) for name, values in sorted(self.latency_ms.items())}
+        everything = [v for values in self.latency_ms.values() for v in values]
+        views["TOTAL"] = row(everything, sum(self.errors.values()))
+        return views
@@ -0,0 +1,153 @@
+# vcards/bench/replay.py
+"""
+Reproductor de sesiones del editor con django.test.Client.
+
+Por cada request mide:
+  - latencia total (ms)
+  - número de queries SQL
+  - bytes de respuesta
+  - tiempo dentro del motor de templates (ms, sólo el render externo)
+y agrega percentiles p50/p95/p99 por vista.
+"""
+import math
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import connection
+from django.template.base import Template
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+
+# ------------------------- Tiempo de templates -------------------------
+class _TemplateClock:
+    __slots__ = ("ms", "depth")
+
+    def __init__(self):
+        self.ms = 0.0
+        self.depth = 0
+
+
+# ContextVar y no threading.local: el test Client corre las vistas async
+# (y los sync_to_async de adentro) en otros hilos, que heredan el contexto
+# del request pero no los locals del hilo que lo lanzó
+_tpl_clock = ContextVar("bench_template_clock", default=None)
+
+
+@contextmanager
+def template_timer():
+    """
+    Envuelve Template.render mientras dura el bloque y acumula en el
+    _TemplateClock del request actual el tiempo del render más externo
+    (los {% include %} anidados no se cuentan dos veces).
+    """
+    original = Template.render
+
+    def timed_render(self, context):
+        clock = _tpl_clock.get()
+        if clock is None or clock.depth:
+            return original(self, context)
+        clock.depth += 1
+        start = time.perf_counter()
+        try:
+            return original(self, context)
+        finally:
+            clock.depth -= 1
+            clock.ms += (time.perf_counter() - start) * 1000
+
+    Template.render = timed_render
+    try:
+        yield
+    finally:
+        Template.render = original
+
+
+# ------------------------------ Métricas ------------------------------
+def percentile(values, pct):
+    """Percentil por rango más cercano (values no vacío)."""
+    ordered = sorted(values)
+    k = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[k]
+
+
+class ViewStats:
+    def __init__(self):
+        self.latency_ms = []
+        self.queries = []
+        self.bytes = []
+        self.template_ms = []
+        self.errors = 0
+
+    def summary(self):
+        n = len(self.latency_ms)
+        if not n:
+            return {"requests": 0, "errors": self.errors}
+        return {
+            "requests": n,
+            "errors": self.errors,
+            "p50_ms": round(percentile(self.latency_ms, 50), 3),
+            "p95_ms": round(percentile(self.latency_ms, 95), 3),
+            "p99_ms": round(percentile(self.latency_ms, 99), 3),
+            "queries_per_req": round(sum(self.queries) / n, 2),
+            "bytes_per_req": round(sum(self.bytes) / n, 1),
+            "template_ms_per_req": round(sum(self.template_ms) / n, 3),
+        }
+
+
+# ----------------------------- Reproductor -----------------------------
+class Replayer:
+    """
+    Reproduce pasos de sesión como un usuario autenticado.
+    'client' debe tener la sesión iniciada (force_login).
+    """
+
+    def __init__(self, client: Client):
+        self.client = client
+        self.stats = defaultdict(ViewStats)
+        self._urls = {}
+
+    def _url(self, name):
+        if name not in self._urls:
+            self._urls[name] = reverse(name)
+        return self._urls[name]
+
+    def run(self, steps, iterations=1):
+        with template_timer():
+            for _ in range(iterations):
+                for step in steps:
+                    self.play(step)
+        return self.report()
+
+    def play(self, step):
+        name = step["name"]
+        url = self._url(name)
+        data = step.get("data", {})
+        headers = {"HX-Request": "true", **step.get("headers", {})}
+        clock = _TemplateClock()
+        token = _tpl_clock.set(clock)
+
+        try:
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                if step.get("method", "GET").upper() == "POST":
+                    response = self.client.post(url, data, headers=headers)
+                else:
+                    response = self.client.get(url, data, headers=headers)
+                elapsed = (time.perf_counter() - start) * 1000
+        finally:
+            _tpl_clock.reset(token)
+
+        st = self.stats[name]
+        if response.status_code >= 400:
+            st.errors += 1
+        st.latency_ms.append(elapsed)
+        st.queries.append(len(queries))
+        st.bytes.append(len(response.content))
+        st.template_ms.append(clock.ms)
+        return response
+
+    def report(self):
+        return {name: st.summary() for name, st in sorted(self.stats.items())}
@@ -0,0 +1,213 @@
+# vcards/bench/sessions.py
+"""
+Sesiones del editor para los benchmarks.
+
+Una sesión es una lista de pasos (un JSON por línea en disco):
+  {"name": "vcards:preview", "method": "POST",
+   "data": {"full_name": "Ana", "contact_label[]": ["Tel"]},
+   "headers": {"HX-Trigger-Name": "full_name"}}
+
+'name' es el nombre de la URL (se resuelve con reverse) para que las
+grabaciones sobrevivan a cambios de prefijos.
+"""
+import json
+import threading
+
+from django.conf import settings
+from django.urls import resolve, Resolver404
+
+
+# Vistas que se graban/reproducen
+HOT_PATHS = (
+    "vcards:preview",
+    "vcards:check_slug",
+    "vcards:set_global",
+    "vcards:set_globals",
+    "dashboard:folders:chips",
+    "dashboard:folders:options",
+    "dashboard:folders:fragments",
+)
+
+
+def load_session(path):
+    """Lee una sesión JSONL (líneas vacías y '#' se ignoran)."""
+    steps = []
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                steps.append(json.loads(line))
+    return steps
+
+
+def dump_session(steps, path):
+    with open(path, "w", encoding="utf-8") as fh:
+        for step in steps:
+            fh.write(json.dumps(step, ensure_ascii=False) + "\n")
+
+
+# ----------------------- Sesión sintética por defecto -----------------------
+def _typing(text):
+    """Prefijos que ve el server con el debounce de ~250ms (≈ cada 2 teclas)."""
+    prefixes = [text[:i] for i in range(2, len(text) + 1, 2)]
+    if not prefixes or prefixes[-1] != text:
+        prefixes.append(text)
+    return prefixes
+
+
+def default_session():
+    """
+    Sesión realista de un usuario creando una tarjeta: carga del listado
+    (fragments, y chips / options por separado), slug, nombre, puesto,
+    colores (con re-disparos del picker), acerca de, contactos, redes,
+    toggles globales y galería.
+    """
+    form = {
+        "template": "buro",
+        "full_name": "",
+        "job_title": "",
+        "theme_primary": "#517AFA",
+        "theme_secondary": "#C5FEFF",
+        "card_bg": "#0D1626",
+        "block_bg": "#111827",
+        "section_title": "Acerca de",
+        "section_desc": "",
+        "contact_label[]": [],
+        "contact_value[]": [],
+        "contact_type[]": [],
+        "social_network[]": [],
+        "social_url[]": [],
+        "social_label[]": [],
+        "social_desc[]": [],
+        "images_view": "list",
+        "images[]": [],
+    }
+    steps = []
+
+    def preview(changed=None):
+        step = {"name": "vcards:preview", "method": "POST", "data": json.loads(json.dumps(form))}
+        if changed:
+            step["data"]["_changed"] = changed
+        steps.append(step)
+
+    def get(name, data=None):
+        steps.append({"name": name, "method": "GET", "data": data or {}})
+
+    # Listado de tarjetas: chips + options en un request, y otra vez tras un evento
+    get("dashboard:folders:fragments")
+    get("dashboard:folders:fragments")
+    # chips y options sueltos siguen expuestos (grabaciones anteriores,
+    # refrescos de un solo selector): se miden para que no regresen a ciegas
+    get("dashboard:folders:chips")
+    get("dashboard:folders:options")
+
+    # Editor: carga inicial (form de perfil + form de colores)
+    preview()
+    preview()
+
+    for prefix in _typing("ana-garcia-bienes-raices"):
+        get("vcards:check_slug", {"slug": prefix})
+
+    for prefix in _typing("Ana García López"):
+        form["full_name"] = prefix
+        preview("full_name")
+    # focus/blur: mismo payload otra vez
+    preview("full_name")
+
+    for prefix in _typing("Asesora inmobiliaria"):
+        form["job_title"] = prefix
+        preview("job_title")
+
+    for color in ("#2B4C9B", "#2B4C9B", "#D6285F", "#D6285F", "#517AFA", "#517AFA"):
+        form["theme_primary"] = color
+        preview("theme_primary_picker")
+
+    for prefix in _typing("Te ayudo a encontrar tu próximo hogar en CDMX."):
+        form["section_desc"] = prefix
+        preview("section_desc")
+
+    for ctype, label, value in (
+        ("number", "Celular", "+52 55 1234 5678"),
+        ("email", "Trabajo", "ana@inmobiliaria.mx"),
+        ("address", "Oficina", "Av. Reforma 123, CDMX"),
+    ):
+        form["contact_label[]"].append("")
+        form["contact_value[]"].append("")
+        form["contact_type[]"].append(ctype)
+        preview()
+        form["contact_label[]"][-1] = label
+        preview("contact_label[]")
+        for prefix in _typing(value):
+            form["contact_value[]"][-1] = prefix
+            preview("contact_value[]")
+
+    for network, url in (
+        ("facebook", "https://facebook.com/anagarcia"),
+        ("instagram", "https://instagram.com/anagarcia.mx"),
+        ("linkedin", "https://linkedin.com/in/anagarcia"),
+    ):
+        form["social_network[]"].append(network)
+        form["social_url[]"].append("")
+        form["social_label[]"].append(network.title())
+        form["social_desc[]"].append("")
+        preview()
+        for prefix in _typing(url):
+            form["social_url[]"][-1] = prefix
+            preview("social_url[]")
+
+    for field in ("name", "title", "photo", "theme_primary", "name"):
+        steps.append({
+            "name": "vcards:set_global",
+            "method": "POST",
+            "data": {"field": field, "enabled": "true"},
+        })
+
+    for i in range(6):
+        form["images[]"].append(f"/media/demo/gallery-{i}.webp")
+        preview()
+    form["images_view"] = "grid2"
+    preview("images_view")
+
+    # Vuelve al listado
+    get("dashboard:folders:fragments")
+    get("dashboard:folders:chips")
+    get("dashboard:folders:options")
+    return steps
+
+
+# --------------------------- Grabación de sesiones ---------------------------
+class EditorRecorderMiddleware:
+    """
+    Graba en BENCH_RECORD_PATH (JSONL) los requests a HOT_PATHS para
+    reproducirlos después con 'bench_editor --session'. Sólo para desarrollo:
+    agrégalo a MIDDLEWARE cuando quieras capturar una sesión real.
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.path = getattr(settings, "BENCH_RECORD_PATH", None)
+
+    def __call__(self, request):
+        if self.path:
+            self._record(request)
+        return self.get_response(request)
+
+    def _record(self, request):
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return
+        if match.view_name not in HOT_PATHS:
+            return
+        params = request.POST if request.method == "POST" else request.GET
+        data = {k: (v if len(v) > 1 or k.endswith("[]") else v[0]) for k, v in params.lists()}
+        data.pop("csrfmiddlewaretoken", None)
+        step = {"name": match.view_name, "method": request.method, "data": data}
+        trigger = request.headers.get("HX-Trigger-Name")
+        if trigger:
+            step["headers"] = {"HX-Trigger-Name": trigger}
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as fh:
+                fh.write(json.dumps(step, ensure_ascii=False) + "\n")
@@ -0,0 +1,192 @@
+# vcards/drafts.py
+"""
+Borradores del editor (VCardDraft) y parches JSON (RFC 6902, subconjunto).
+
+El editor ya no manda el form completo en cada keystroke: manda el campo
+que cambió como un parche, p.ej.
+    [{"op": "replace", "path": "/contact_value[]/2", "value": "ana@x.com"}]
+y el preview se renderiza desde el estado guardado. Cada parche es una
+escritura, así que el borrador es también el autoguardado.
+
+Cambios estructurales (agregar/quitar filas, reordenar) mandan el estado
+completo como un solo parche a la raíz ({"op": "replace", "path": ""}).
+
+Al recargar el editor, draft_open devuelve el borrador guardado y el
+editor lo restaura; sólo "Descartar cambios" (reset) lo reemplaza con el
+form tal como lo pinta el server.
+
+Estado: {nombre: str} para campos simples y {"campo[]": [str, ...]} para
+los repetidos; as_querydict() lo convierte a lo que espera
+vcards.views._preview_context.
+"""
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils.datastructures import MultiValueDict
+
+from .models import VCardDraft
+
+MAX_OPS = 50
+IGNORED_FIELDS = frozenset({"csrfmiddlewaretoken", "_changed", "card", "draft", "publish", "reset"})
+
+
+class PatchError(ValueError):
+    """El parche no aplica sobre el estado actual (el cliente debe resincronizar)."""
+
+
+# ------------------------------- Estado -------------------------------
+def form_state(data):
+    """Estado de borrador a partir de un QueryDict del form del editor."""
+    return {
+        key: data.getlist(key) if key.endswith("[]") else data.get(key, "")
+        for key in data
+        if key not in IGNORED_FIELDS
+    }
+
+
+def as_querydict(state):
+    return MultiValueDict({k: v if isinstance(v, list) else [v] for k, v in state.items()})
+
+
+def _check_state(state):
+    if not isinstance(state, dict):
+        raise PatchError("El estado debe ser un objeto")
+    for key, value in state.items():
+        if key.endswith("[]"):
+            if not (isinstance(value, list) and all(isinstance(v, str) for v in value)):
+                raise PatchError(f"{key} debe ser una lista de textos")
+        elif not isinstance(value, str):
+            raise PatchError(f"{key} debe ser texto")
+
+
+# ------------------------------- Parches -------------------------------
+def _pointer(path):
+    """'/contact_value[]/2' -> ['contact_value[]', '2'] (RFC 6901)."""
+    if path == "":
+        return []
+    if not path.startswith("/"):
+        raise PatchError(f"Ruta inválida: {path}")
+    return [p.replace("~1", "/").replace("~0", "~") for p in path[1:].split("/")]
+
+
+def _index(items, token, allow_end):
+    if token == "-" and allow_end:
+        return len(items)
+    if not token.isdigit():
+        raise PatchError(f"Índice inválido: {token}")
+    i = int(token)
+    if i > len(items) or (i == len(items) and not allow_end):
+        raise PatchError(f"Índice fuera de rango: {token}")
+    return i
+
+
+def apply_patch(state, ops):
+    """
+    Aplica add/replace/remove sobre una copia del estado (dos niveles:
+    campo y posición en la lista). Lanza PatchError si algo no aplica; en
+    ese caso no se cambia nada.
+    """
+    if not isinstance(ops, list) or not ops or len(ops) > MAX_OPS:
+        raise PatchError("Parche vacío o demasiado grande")
+    state = {k: list(v) if isinstance(v, list) else v for k, v in state.items()}
+    for op in ops:
+        if not isinstance(op, dict):
+            raise PatchError("Operación inválida")
+        kind, tokens = op.get("op"), _pointer(op.get("path", ""))
+        if kind not in ("add", "replace", "remove"):
+            raise PatchError(f"Operación no soportada: {kind}")
+
+        if not tokens:  # raíz: estado completo
+            if kind == "remove":
+                raise PatchError("No se puede borrar la raíz")
+            state = op.get("value")
+            _check_state(state)
+            state = dict(state)
+            continue
+
+        key = tokens[0]
+        if len(tokens) == 1:
+            if kind == "remove":
+                if key not in state:
+                    raise PatchError(f"No existe: {key}")
+                del state[key]
+            else:
+                if kind == "replace" and key not in state:
+                    raise PatchError(f"No existe: {key}")
+                state[key] = op.get("value")
+        elif len(tokens) == 2:
+            items = state.get(key)
+            if not isinstance(items, list):
+                raise PatchError(f"{key} no es una lista")
+            i = _index(items, tokens[1], allow_end=kind == "add")
+            if kind == "add":
+                items.insert(i, op.get("value"))
+            elif kind == "replace":
+                items[i] = op.get("value")
+            else:
+                items.pop(i)
+        else:
+            raise PatchError(f"Ruta inválida: {op.get('path')}")
+    _check_state(state)
+    return state
+
+
+def changed_field(ops):
+    """Campo que tocó el parche si es uno solo (para el preview por sección)."""
+    keys = {tuple(_pointer(op.get("path", "")))[:1] for op in ops}
+    if len(keys) != 1:
+        return None
+    (key,) = keys
+    return key[0] if key else None
+
+
+# ------------------------------- Borradores -------------------------------
+def open_draft(user, card=None, state=None, reset=False):
+    """
+    Borrador de card (o de la tarjeta nueva) del usuario. Si no hay, lo
+    crea con state; si ya hay, lo devuelve sin tocar (son los cambios de
+    antes de recargar). reset=True lo reemplaza con state.
+    """
+    draft = VCardDraft.objects.filter(owner=user, card=card).first()
+    if draft is None:
+        try:
+            with transaction.atomic():
+                draft = VCardDraft.objects.create(owner=user, card=card, data=state or {})
+            return draft
+        except IntegrityError:
+            # Otra pestaña lo creó al mismo tiempo
+            draft = VCardDraft.objects.get(owner=user, card=card)
+    if reset and state is not None:
+        save_state(draft, state)
+    return draft
+
+
+def save_state(draft, state):
+    draft.data = state
+    draft.version += 1
+    draft.save(update_fields=["data", "version", "updated_at"])
+
+
+def patch_draft(user, draft_id, ops):
+    """
+    Aplica ops al borrador (bloqueando la fila: los parches de un mismo
+    editor se aplican en orden) y devuelve el borrador actualizado.
+    """
+    max_bytes = getattr(settings, "DRAFT_MAX_BYTES", 256 * 1024)
+    with transaction.atomic():
+        draft = VCardDraft.objects.select_for_update().filter(id=draft_id, owner=user).first()
+        if draft is None:
+            return None
+        state = apply_patch(draft.data, ops)
+        if len(json.dumps(state)) > max_bytes:
+            raise PatchError("El borrador es demasiado grande")
+        save_state(draft, state)
+    return draft
+
+
+# Las escrituras van en transacciones (y patch_draft con SELECT ... FOR
+# UPDATE), que el ORM async no tiene: corren en el hilo de sync_to_async.
+aopen_draft = sync_to_async(open_draft)
+apatch_draft = sync_to_async(patch_draft)
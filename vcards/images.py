@@ -0,0 +1,333 @@
+# vcards/images.py
+"""
+Almacenamiento de imágenes del editor (foto, banner, galería).
+
+- El upload se copia a disco por chunks calculando su sha256 (nunca se
+  carga completo en memoria).
+- Se guarda por contenido: media/img/<h[:2]>/<h>/original.<ext>. Dos
+  uploads idénticos (aunque sean de usuarios distintos) ocupan un solo
+  archivo y comparten variantes.
+- Las variantes (WebP + JPEG, 1x y 2x) se generan en un pool de procesos,
+  fuera del hilo del request. Al terminar se escribe variants.json; hasta
+  entonces srcset() devuelve sólo el original.
+- Publicar tampoco las espera: schedule_card_variants() encola todas las
+  que faltan y when_ready() avisa cuando terminan para volver a renderizar
+  el snapshot (VCard.refresh_snapshot).
+"""
+import hashlib
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.db import connections
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+IMAGE_DIR = "img"
+MANIFEST = "variants.json"
+
+# Formatos aceptados -> extensión del original
+ALLOWED_FORMATS = {"JPEG": "jpg", "PNG": "png", "WEBP": "webp", "GIF": "gif"}
+
+# Variantes (ancho, alto) a 1x; la 2x se genera si el original alcanza
+VARIANTS = {
+    "thumb": (160, 160),
+    "avatar": (400, 500),   # 4:5
+    "banner": (960, 320),   # 3:1
+    "gallery": (600, 600),  # 1:1
+}
+
+# Qué variantes necesita cada tipo de upload (?field=...)
+FIELD_VARIANTS = {
+    "photo": ("avatar", "thumb"),
+    "banner": ("banner", "thumb"),
+    "gallery": ("gallery", "thumb"),
+}
+
+
+class InvalidImage(ValueError):
+    pass
+
+
+# ------------------------------ Upload ------------------------------
+def store_upload(uploaded_file):
+    """
+    Copia el UploadedFile a su ruta por contenido y devuelve
+    (hash, ruta_relativa_del_original). Si ya existía, no duplica nada.
+    """
+    base = os.path.join(settings.MEDIA_ROOT, IMAGE_DIR)
+    os.makedirs(base, exist_ok=True)
+
+    digest = hashlib.sha256()
+    fd, tmp_path = tempfile.mkstemp(dir=base, suffix=".upload")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            for chunk in uploaded_file.chunks():
+                digest.update(chunk)
+                out.write(chunk)
+
+        try:
+            with Image.open(tmp_path) as img:
+                fmt = img.format
+                img.verify()  # sólo valida cabeceras/estructura, no decodifica
+        except (UnidentifiedImageError, OSError, SyntaxError):
+            raise InvalidImage("El archivo no es una imagen válida")
+        if fmt not in ALLOWED_FORMATS:
+            raise InvalidImage("Formato no soportado")
+
+        h = digest.hexdigest()
+        rel_dir = os.path.join(IMAGE_DIR, h[:2], h)
+        rel_path = os.path.join(rel_dir, f"original.{ALLOWED_FORMATS[fmt]}")
+        abs_path = os.path.join(settings.MEDIA_ROOT, rel_path)
+        if os.path.exists(abs_path):
+            os.unlink(tmp_path)
+        else:
+            os.makedirs(os.path.dirname(abs_path), exist_ok=True)
+            os.replace(tmp_path, abs_path)
+        return h, rel_path
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+# ----------------------------- Variantes -----------------------------
+def generate_variants(abs_dir, original_name, variant_names):
+    """
+    Corre en el pool de procesos (sin Django). Genera <variante>[@2x].webp/.jpg
+    dentro de abs_dir y actualiza el manifest. Devuelve el manifest.
+    """
+    manifest_path = os.path.join(abs_dir, MANIFEST)
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as fh:
+            manifest = json.load(fh)
+
+    with Image.open(os.path.join(abs_dir, original_name)) as src:
+        src = ImageOps.exif_transpose(src)
+        if src.mode not in ("RGB", "RGBA"):
+            src = src.convert("RGBA" if "transparency" in src.info else "RGB")
+
+        for name in variant_names:
+            if name in manifest:
+                continue
+            w, h = VARIANTS[name]
+            files = {}
+            for scale in (1, 2):
+                size = (w * scale, h * scale)
+                if scale > 1 and (src.width < size[0] or src.height < size[1]):
+                    continue  # no escalamos hacia arriba
+                img = ImageOps.fit(src, size, Image.Resampling.LANCZOS)
+                suffix = "" if scale == 1 else f"@{scale}x"
+                webp = f"{name}{suffix}.webp"
+                jpg = f"{name}{suffix}.jpg"
+                img.save(os.path.join(abs_dir, webp), "WEBP", quality=80, method=4)
+                img.convert("RGB").save(
+                    os.path.join(abs_dir, jpg), "JPEG", quality=82, optimize=True, progressive=True
+                )
+                files[f"{scale}x"] = {"webp": webp, "jpg": jpg}
+            manifest[name] = files
+
+    # Escritura atómica: el manifest sólo aparece completo
+    tmp = manifest_path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh)
+    os.replace(tmp, manifest_path)
+    return manifest
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Pool de procesos por worker (se crea en el primer upload)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=getattr(settings, "IMAGE_WORKERS", 2),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def schedule_variants(rel_path, field):
+    """Encola la generación de variantes sin bloquear el request."""
+    abs_dir = os.path.join(settings.MEDIA_ROOT, os.path.dirname(rel_path))
+    wanted = FIELD_VARIANTS.get(field, FIELD_VARIANTS["gallery"])
+    manifest = _read_manifest(abs_dir)
+    if manifest and all(name in manifest for name in wanted):
+        return None
+    args = (generate_variants, abs_dir, os.path.basename(rel_path), wanted)
+    try:
+        return get_pool().submit(*args)
+    except BrokenProcessPool:
+        # Un hijo murió (OOM, imagen patológica): se recrea el pool una vez
+        _reset_pool()
+        return get_pool().submit(*args)
+
+
+def schedule_card_variants(assets):
+    """
+    assets: [(url, field)] de una tarjeta. Encola de una vez las variantes
+    que faltan y devuelve [(url, future)] sin esperar a ninguna.
+    """
+    pending = []
+    for url, field in assets:
+        rel_path = _media_rel_path(url)
+        if not rel_path or not os.path.exists(os.path.join(settings.MEDIA_ROOT, rel_path)):
+            continue
+        try:
+            future = schedule_variants(rel_path, field)
+        except (OSError, RuntimeError):
+            continue  # sin variantes se publica igual, con el original
+        if future is not None:
+            pending.append((url, future))
+    return pending
+
+
+def when_ready(pending, callback, timeout=300):
+    """
+    Corre callback() en un hilo cuando terminan los futures de
+    schedule_card_variants (o al vencer timeout, con lo que haya).
+    """
+    def run():
+        try:
+            wait([future for _, future in pending], timeout=timeout)
+            for url, _ in pending:
+                _manifests.discard(url.rsplit("/", 1)[0])
+            callback()
+        finally:
+            connections.close_all()  # el hilo abrió su propia conexión
+
+    threading.Thread(target=run, daemon=True).start()
+
+
+def media_url(rel_path):
+    return settings.MEDIA_URL.rstrip("/") + "/" + rel_path.replace(os.sep, "/")
+
+
+def _media_rel_path(url):
+    """'/media/img/ab/abcd/original.jpg' -> 'img/ab/abcd/original.jpg' (o None)."""
+    prefix = settings.MEDIA_URL.strip("/") + "/"
+    path = (url or "").lstrip("/")
+    if not path.startswith(prefix + IMAGE_DIR + "/"):
+        return None
+    rel_path = path[len(prefix):]
+    if ".." in rel_path.split("/"):
+        return None
+    return rel_path
+
+
+# ------------------------------ srcset ------------------------------
+class _ManifestCache:
+    """LRU acotada y thread-safe: URL base de la imagen -> manifest."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            manifest = self._data.get(key)
+            if manifest is not None:
+                self._data.move_to_end(key)
+            return manifest
+
+    def set(self, key, manifest):
+        with self._lock:
+            self._data[key] = manifest
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def __len__(self):
+        return len(self._data)
+
+
+_manifests = _ManifestCache(getattr(settings, "IMAGE_MANIFEST_CACHE_SIZE", 4096))
+
+
+def _read_manifest(abs_dir):
+    try:
+        with open(os.path.join(abs_dir, MANIFEST), encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def _variant_files(url, variant):
+    """
+    Para una URL de original (MEDIA_URL/img/..../original.ext) devuelve
+    (url_base, {"1x": {...}, "2x": {...}}) o None si aún no hay variantes.
+    """
+    rel_path = _media_rel_path(url)
+    if not rel_path:
+        return None
+    base_url = url.rsplit("/", 1)[0]
+    manifest = _manifests.get(base_url)
+    if manifest is None or variant not in manifest:
+        manifest = _read_manifest(os.path.join(settings.MEDIA_ROOT, os.path.dirname(rel_path)))
+        if not manifest:
+            return None
+        _manifests.set(base_url, manifest)
+    files = manifest.get(variant)
+    return (base_url, files) if files else None
+
+
+def variants_state(urls):
+    """
+    Variantes ya generadas de cada URL ([[nombre, ...], ...], [] si aún no
+    hay o no es un upload). Entra en la llave de la caché del preview: el
+    HTML de las secciones con imágenes cambia cuando el pool termina.
+    """
+    state = []
+    for url in urls:
+        rel_path = _media_rel_path(url)
+        manifest = None
+        if rel_path:
+            base_url = url.rsplit("/", 1)[0]
+            manifest = _manifests.get(base_url)
+            if manifest is None:
+                manifest = _read_manifest(os.path.join(settings.MEDIA_ROOT, os.path.dirname(rel_path)))
+                if manifest:
+                    _manifests.set(base_url, manifest)
+        state.append(sorted(manifest or ()))
+    return state
+
+
+def variant_url(url, variant, fmt="jpg"):
+    """URL de la variante 1x, o el original si todavía no existe."""
+    found = _variant_files(url, variant)
+    if not found:
+        return url
+    base_url, files = found
+    return f"{base_url}/{files['1x'][fmt]}"
+
+
+def srcset(url, variant, fmt="webp"):
+    """'a.webp 1x, a@2x.webp 2x' o '' si todavía no hay variantes."""
+    found = _variant_files(url, variant)
+    if not found:
+        return ""
+    base_url, files = found
+    return ", ".join(f"{base_url}/{f[fmt]} {scale}" for scale, f in sorted(files.items()))
@@ -0,0 +1,433 @@
+# vcards/importer.py
+"""
+Importación masiva de tarjetas desde CSV o .vcf (varias tarjetas por
+archivo), pensada para dar de alta equipos completos.
+
+Todo es streaming:
+  - el archivo se lee línea por línea (iter_rows es un generador),
+  - se valida / normaliza por lotes de batch_size filas,
+  - cada lote se inserta con un bulk_create dentro de su transacción,
+así que la memoria no depende del tamaño del archivo y el costo es de
+unas pocas queries por lote, no un save() por fila.
+
+Las tarjetas se crean como borradores (no se publican: eso renderiza el
+snapshot de cada una y se hace desde el editor).
+"""
+import codecs
+import csv
+import io
+import itertools
+import quopri
+import re
+import unicodedata
+from urllib.parse import urlparse
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+
+from folders.models import Folder
+from users import quotas
+
+from . import validation
+from .models import VCard
+from .slugs import RESERVED_SLUGS, SLUG_MAX_LENGTH, SLUG_MIN_LENGTH, normalize_slug, slug_registry
+
+BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 200  # se cuentan todos, pero sólo se guardan estos
+
+# Encabezados aceptados en el CSV (minúsculas, sin acentos) -> campo
+CSV_ALIASES = {
+    "slug": "slug", "enlace": "slug",
+    "full_name": "full_name", "nombre": "full_name", "name": "full_name", "nombre completo": "full_name",
+    "job_title": "job_title", "puesto": "job_title", "cargo": "job_title", "title": "job_title",
+    "email": "email", "correo": "email", "e-mail": "email",
+    "phone": "phone", "telefono": "phone", "tel": "phone", "celular": "phone",
+    "address": "address", "direccion": "address",
+    "website": "website", "sitio": "website", "web": "website", "url": "website",
+    "about": "section_desc", "descripcion": "section_desc", "bio": "section_desc",
+    "folder": "folder", "carpeta": "folder",
+    "template": "template", "plantilla": "template",
+}
+
+# Redes del editor (mismo texto que el <select> de social_network[])
+SOCIAL_NETWORKS = {
+    "facebook": "Facebook", "instagram": "Instagram", "linkedin": "LinkedIn",
+    "x": "X", "twitter": "X", "tiktok": "TikTok", "youtube": "YouTube",
+    "whatsapp": "WhatsApp", "telegram": "Telegram", "snapchat": "Snapchat",
+    "pinterest": "Pinterest", "reddit": "Reddit", "github": "GitHub", "twitch": "Twitch",
+}
+_SOCIAL_DOMAINS = {
+    "facebook.com": "Facebook", "fb.com": "Facebook", "instagram.com": "Instagram",
+    "linkedin.com": "LinkedIn", "x.com": "X", "twitter.com": "X", "tiktok.com": "TikTok",
+    "youtube.com": "YouTube", "youtu.be": "YouTube", "wa.me": "WhatsApp",
+    "t.me": "Telegram", "snapchat.com": "Snapchat", "pinterest.com": "Pinterest",
+    "reddit.com": "Reddit", "github.com": "GitHub", "twitch.tv": "Twitch",
+}
+
+_ACCENTS = str.maketrans("áéíóúüñ", "aeiouun")
+
+
+class RowError(ValueError):
+    pass
+
+
+def can_import(user):
+    """Plan Business ("Tarjetas ilimitadas") o staff."""
+    return user.plan == user.Plans.BUSINESS or user.is_staff or user.is_superuser
+
+
+# =======================================================================
+# Lectura (generadores)
+# =======================================================================
+def _text_stream(fileobj):
+    """Binario -> texto UTF-8 (con o sin BOM) sin cargar el archivo."""
+    if isinstance(fileobj, io.TextIOBase):
+        return fileobj
+    return codecs.getreader("utf-8-sig")(fileobj, errors="replace")
+
+
+def iter_rows(fileobj, filename=""):
+    """
+    (número_de_fila, dict) por cada tarjeta del archivo. El formato sale de
+    la extensión o, si no es clara, de la primera línea.
+    """
+    text = _text_stream(fileobj)
+    first = text.readline()
+    lines = itertools.chain([first], text)
+    is_vcf = filename.lower().endswith((".vcf", ".vcard")) or first.strip().upper() == "BEGIN:VCARD"
+    return _iter_vcf(lines) if is_vcf else _iter_csv(lines, first)
+
+
+def _iter_csv(lines, header_line):
+    delimiter = max(",;\t", key=header_line.count)
+    reader = csv.reader(lines, delimiter=delimiter)
+    header = [h.strip().lower().translate(_ACCENTS) for h in next(reader, [])]
+    for number, values in enumerate(reader, start=2):
+        if not any(v.strip() for v in values):
+            continue
+        row = {"contacts": [], "socials": []}
+        for key, value in zip(header, values):
+            value = value.strip()
+            if not value:
+                continue
+            if key in SOCIAL_NETWORKS:
+                row["socials"].append((SOCIAL_NETWORKS[key], value))
+            elif key in CSV_ALIASES:
+                field = CSV_ALIASES[key]
+                if field in ("email", "phone", "address", "website"):
+                    row["contacts"].append((field, value))
+                else:
+                    row[field] = value
+        yield number, row
+
+
+def _unfold(lines):
+    """Une las líneas continuadas de RFC 6350 (empiezan con espacio/tab)."""
+    current = None
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current is not None:
+        yield current
+
+
+def _vcf_unescape(value):
+    return re.sub(r"\\([nN,;\\])", lambda m: "\n" if m.group(1) in "nN" else m.group(1), value)
+
+
+def _iter_vcf(lines):
+    row, start, number = None, 0, 0
+    for number, line in enumerate(_unfold(lines), start=1):
+        if ":" not in line:
+            continue
+        head, value = line.split(":", 1)
+        name, *params = head.split(";")
+        name = name.split(".")[-1].upper()  # "item1.EMAIL" -> "EMAIL"
+        params = [p.upper() for p in params]
+        if "ENCODING=QUOTED-PRINTABLE" in params:
+            value = quopri.decodestring(value.encode()).decode("utf-8", "replace")
+
+        if name == "BEGIN":
+            row, start = {"contacts": [], "socials": []}, number
+        elif row is None:
+            continue
+        elif name == "END":
+            yield start, row
+            row = None
+        elif name == "FN":
+            row["full_name"] = _vcf_unescape(value)
+        elif name == "N" and "full_name" not in row:
+            parts = [_vcf_unescape(p) for p in re.split(r"(?<!\\);", value)]
+            family, given = (parts + ["", ""])[:2]
+            row["n_name"] = f"{given} {family}".strip()
+        elif name == "TITLE":
+            row["job_title"] = _vcf_unescape(value)
+        elif name == "NOTE":
+            row["section_desc"] = _vcf_unescape(value)
+        elif name == "EMAIL":
+            row["contacts"].append(("email", value.strip()))
+        elif name == "TEL":
+            row["contacts"].append(("phone", value.replace("tel:", "").strip()))
+        elif name == "ADR":
+            parts = [_vcf_unescape(p).strip() for p in re.split(r"(?<!\\);", value)]
+            row["contacts"].append(("address", ", ".join(p for p in parts if p)))
+        elif name in ("URL", "X-SOCIALPROFILE"):
+            url = _vcf_unescape(value).strip()
+            network = _social_from_url(url)
+            if network:
+                row["socials"].append((network, url))
+            else:
+                row["contacts"].append(("website", url))
+    if row is not None:
+        yield start, row  # archivo sin END:VCARD final
+
+
+def _social_from_url(url):
+    host = urlparse(url if "//" in url else f"//{url}").netloc.lower()
+    host = host[4:] if host.startswith("www.") else host
+    return _SOCIAL_DOMAINS.get(host)
+
+
+# =======================================================================
+# Normalización
+# =======================================================================
+_CONTACT_TYPES = {
+    # campo -> (type del editor, etiqueta)
+    "email": ("email", "Correo"),
+    "phone": ("number", "Teléfono"),
+    "address": ("address", "Dirección"),
+    "website": ("url", "Sitio web"),
+}
+
+
+def _safe_url(url, label):
+    """Misma regla que el editor (vcards/validation.py): sólo http(s), mailto y tel."""
+    try:
+        return validation.safe_url(url, label)
+    except validation.InvalidCard as e:
+        raise RowError(str(e))
+
+
+def _normalize(row):
+    """dict crudo -> campos de VCard. RowError si la fila no sirve."""
+    full_name = (row.get("full_name") or row.get("n_name") or "").strip()
+    if not full_name:
+        raise RowError("Falta el nombre")
+
+    contacts = []
+    for field, value in row["contacts"]:
+        if field == "email":
+            value = value.lower()
+            try:
+                validate_email(value)
+            except ValidationError:
+                raise RowError(f"Email inválido: {value[:60]}")
+        elif field == "phone":
+            value = re.sub(r"[^\d+ ]", "", value).strip()
+            if len(re.sub(r"\D", "", value)) < 7:
+                raise RowError(f"Teléfono inválido: {value[:30]}")
+        elif field == "website":
+            value = _safe_url(value, "Sitio web")
+        elif validation.has_control_chars(value):
+            value = " ".join(value.split())  # direcciones de varias líneas
+        type_, label = _CONTACT_TYPES[field]
+        contacts.append({"label": label, "value": value[:300], "type": type_})
+
+    template = (row.get("template") or "").lower()
+    return {
+        "slug": normalize_slug(row.get("slug")),
+        "explicit_slug": bool(row.get("slug")),
+        "full_name": full_name[:120],
+        "job_title": (row.get("job_title") or "")[:120],
+        "section_desc": row.get("section_desc") or "",
+        "template": template if template in VCard.Templates.values else VCard.Templates.BURO,
+        "contacts": contacts,
+        "socials": [
+            {"network": network, "url": _safe_url(url, network)[:300], "label": network, "desc": ""}
+            for network, url in row["socials"]
+        ],
+        "folder": (row.get("folder") or "")[:60],
+    }
+
+
+def _name_slug(full_name):
+    """Slug a partir del nombre, sin perder letras acentuadas (é -> e)."""
+    ascii_name = unicodedata.normalize("NFKD", full_name).encode("ascii", "ignore").decode()
+    base = normalize_slug(ascii_name)[: SLUG_MAX_LENGTH - 6].strip("-")
+    return base or "tarjeta"
+
+
+def _suffixed(base, taken, used, start=2):
+    """(slug, n): primer base-N (N >= start) libre y con largo válido."""
+    for n in itertools.count(start):
+        cand = f"{base}-{n}"
+        if len(cand) >= SLUG_MIN_LENGTH and cand not in taken and cand not in used:
+            return cand, n
+
+
+def _assign_slugs(pending, report):
+    """
+    Asigna slug a cada (número, datos) de pending y devuelve las filas
+    listas. Un slug explícito ocupado es error de la fila; uno derivado del
+    nombre toma el siguiente sufijo libre (juan-perez-2, -3...).
+
+    Queries: una para todos los slugs "base" del lote y una más por cada
+    base que choca (prefijo sobre el índice único de slug).
+    """
+    wanted = {}
+    for number, data in pending:
+        if data["explicit_slug"]:
+            slug = data["slug"]
+            if len(slug) < SLUG_MIN_LENGTH or slug in RESERVED_SLUGS:
+                report.error(number, f"Enlace no válido: {slug or '(vacío)'}")
+                continue
+        else:
+            slug = _name_slug(data["full_name"])
+        wanted[number] = slug
+
+    taken = set(VCard.objects.filter(slug__in=set(wanted.values())).values_list("slug", flat=True))
+    used, ready, collided = set(), [], []
+    for number, data in pending:
+        slug = wanted.get(number)
+        if slug is None:
+            continue
+        if (slug in taken or slug in used or len(slug) < SLUG_MIN_LENGTH
+                or slug in RESERVED_SLUGS):
+            if data["explicit_slug"]:
+                report.error(number, f"El enlace ya está en uso: {slug}")
+            else:
+                collided.append((number, data, slug))
+            continue
+        used.add(slug)
+        data["slug"] = slug
+        ready.append((number, data))
+
+    prefixes = {}  # base -> [slugs ocupados con ese prefijo, último N usado]
+    for number, data, base in collided:
+        if base not in prefixes:
+            existing = VCard.objects.filter(slug__startswith=f"{base}-").values_list("slug", flat=True)
+            prefixes[base] = [set(existing), 1]
+        data["slug"], prefixes[base][1] = _suffixed(base, prefixes[base][0], used, prefixes[base][1] + 1)
+        used.add(data["slug"])
+        ready.append((number, data))
+    ready.sort(key=lambda item: item[0])
+    return ready
+
+
+# =======================================================================
+# Importación
+# =======================================================================
+class ImportReport:
+    def __init__(self):
+        self.rows = 0
+        self.created = 0
+        self.error_count = 0
+        self.errors = []
+
+    def error(self, row, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "error": message})
+
+    def as_dict(self, errors=False):
+        out = {"rows": self.rows, "created": self.created, "failed": self.error_count}
+        if errors:
+            out["errors"] = self.errors
+        return out
+
+
+class _FolderResolver:
+    """Nombre de carpeta -> id, cargando las carpetas del usuario una vez."""
+
+    def __init__(self, owner):
+        self.owner = owner
+        self._ids = None
+
+    def get(self, name):
+        if not name:
+            return None
+        if self._ids is None:
+            self._ids = {f.name.lower(): f.id for f in Folder.objects.filter(owner=self.owner)}
+        key = name.lower()
+        if key not in self._ids:
+            folder, _ = Folder.objects.get_or_create(owner=self.owner, name=name)
+            self._ids[key] = folder.id
+        return self._ids[key]
+
+
+def _insert(owner, ready, folder_id, folders):
+    cards = [
+        VCard(
+            owner=owner,
+            slug=data["slug"],
+            folder_id=folders.get(data["folder"]) or folder_id,
+            template=data["template"],
+            full_name=data["full_name"],
+            job_title=data["job_title"],
+            section_desc=data["section_desc"],
+            contacts=data["contacts"],
+            socials=data["socials"],
+        )
+        for _, data in ready
+    ]
+    with quotas.card_slot(owner, len(cards)), transaction.atomic():
+        VCard.objects.bulk_create(cards, batch_size=BATCH_SIZE)
+    # bulk_create no manda post_save: el registro de slugs se actualiza aquí
+    for card in cards:
+        slug_registry.add(card.slug)
+    return len(cards)
+
+
+def iter_import(owner, rows, folder=None, batch_size=BATCH_SIZE):
+    """
+    Importa rows (de iter_rows) para owner. Es un generador: entrega el
+    ImportReport después de cada lote para reportar progreso.
+    """
+    report = ImportReport()
+    folders = _FolderResolver(owner)
+    folder_id = folder.id if folder is not None else None
+
+    while True:
+        chunk = list(itertools.islice(rows, batch_size))
+        if not chunk:
+            break
+        pending = []
+        for number, row in chunk:
+            report.rows += 1
+            try:
+                pending.append((number, _normalize(row)))
+            except RowError as e:
+                report.error(number, str(e))
+
+        ready = pending
+        for _ in range(3):
+            ready = _assign_slugs(ready, report)
+            try:
+                report.created += _insert(owner, ready, folder_id, folders)
+                break
+            except IntegrityError:
+                # Otro proceso tomó un slug entre la revisión y el INSERT: el
+                # lote completo se revirtió; se re-asignan slugs y se reintenta
+                continue
+            except quotas.QuotaExceeded as e:
+                for number, _ in ready:
+                    report.error(number, f"Tu plan permite {e.limit} tarjetas")
+                break
+        else:
+            for number, _ in ready:
+                report.error(number, "No se pudo guardar (conflicto de enlace)")
+        yield report
+
+
+def import_cards(owner, fileobj, filename="", folder=None, batch_size=BATCH_SIZE):
+    """Importa el archivo completo y devuelve el ImportReport final."""
+    report = ImportReport()
+    for report in iter_import(owner, iter_rows(fileobj, filename), folder, batch_size):
+        pass
+    return report
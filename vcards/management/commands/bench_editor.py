@@ -0,0 +1,79 @@
+# vcards/management/commands/bench_editor.py
+"""
+Reproduce sesiones del editor contra los endpoints HTMX y reporta
+p50/p95/p99, queries SQL, bytes y tiempo de templates por vista.
+
+Corre sobre una base de datos de prueba desechable (la de tests de
+Django; con SQLite es en memoria), así que no toca datos reales:
+
+    python manage.py bench_editor
+    python manage.py bench_editor --iterations 20 --folders 25
+    python manage.py bench_editor --session grabacion.jsonl --json
+"""
+import json
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from vcards.bench.replay import Replayer
+from vcards.bench.sessions import default_session, load_session
+from vcards.preview_cache import preview_cache
+
+
+class Command(BaseCommand):
+    help = "Benchmark de los endpoints HTMX del editor (replay de sesiones)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--session", help="Sesión JSONL grabada (por defecto: sesión sintética).")
+        parser.add_argument("--iterations", type=int, default=5, help="Veces que se reproduce la sesión.")
+        parser.add_argument("--warmup", type=int, default=1, help="Iteraciones de calentamiento (no se miden).")
+        parser.add_argument("--folders", type=int, default=12, help="Carpetas del usuario de prueba.")
+        parser.add_argument("--json", action="store_true", help="Salida en JSON.")
+
+    def handle(self, *args, **opts):
+        steps = load_session(opts["session"]) if opts["session"] else default_session()
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            report = self._run(steps, opts)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        if opts["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self._print_table(report, len(steps), opts["iterations"])
+
+    def _run(self, steps, opts):
+        from django.contrib.auth import get_user_model
+        from folders.models import Folder
+
+        user = get_user_model().objects.create_user("bench", "bench@mibio.local", "bench")
+        Folder.objects.bulk_create(
+            Folder(owner=user, name=f"Carpeta {i:02d}") for i in range(opts["folders"])
+        )
+        # Los errores se cuentan en el reporte en lugar de abortar el benchmark
+        client = Client(raise_request_exception=False)
+        client.force_login(user)
+
+        if opts["warmup"]:
+            Replayer(client).run(steps, iterations=opts["warmup"])
+            # El calentamiento no debe dejar la caché del preview llena
+            preview_cache.clear()
+        return Replayer(client).run(steps, iterations=opts["iterations"])
+
+    def _print_table(self, report, n_steps, iterations):
+        self.stdout.write(f"Sesión: {n_steps} requests × {iterations} iteraciones\n")
+        cols = ("requests", "errors", "p50_ms", "p95_ms", "p99_ms",
+                "queries_per_req", "bytes_per_req", "template_ms_per_req")
+        header = f"{'vista':<28}" + "".join(f"{c:>{len(c) + 2}}" for c in cols)
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for name, row in report.items():
+            self.stdout.write(
+                f"{name:<28}" + "".join(f"{row.get(c, '-'):>{len(c) + 2}}" for c in cols)
+            )
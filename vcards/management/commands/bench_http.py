@@ -0,0 +1,64 @@
+# vcards/management/commands/bench_http.py
+"""
+Benchmark de carga de los endpoints del editor contra un servidor ya
+corriendo, para comparar el despliegue WSGI (gunicorn sync) con el ASGI
+(gunicorn + uvicorn, ver config/asgi.py) con los mismos procesos:
+
+    gunicorn config.wsgi:application -w 4 -b 127.0.0.1:8001 &
+    gunicorn config.asgi:application -k uvicorn_worker.UvicornWorker -w 4 -b 127.0.0.1:8002 &
+    python manage.py bench_http http://127.0.0.1:8001 --user bench --pid <pid master>
+    python manage.py bench_http http://127.0.0.1:8002 --user bench --pid <pid master>
+
+El despliegue WSGI sirve las vistas síncronas del editor y el ASGI las
+async (settings.ASYNC_VIEWS): la comparación es sync contra async. Para
+aislar el servidor de las vistas, ASYNC_VIEWS=0 en el ASGI sirve las
+síncronas.
+
+Usa la sesión sintética de bench_editor (o --session) y crea las sesiones
+de login en la misma BD que el servidor: corre con los mismos settings.
+--pid suma el RSS del master y sus workers al terminar ("misma memoria").
+"""
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from vcards.bench.http import HttpLoad, login_cookies, rss_bytes
+from vcards.bench.sessions import default_session, load_session
+
+
+class Command(BaseCommand):
+    help = "Carga HTTP (throughput y latencia de cola) contra un servidor corriendo."
+
+    def add_arguments(self, parser):
+        parser.add_argument("url", help="Base del servidor, p.ej. http://127.0.0.1:8000")
+        parser.add_argument("--user", required=True, help="Username con el que se hacen los requests.")
+        parser.add_argument("--session", help="Sesión JSONL grabada (por defecto: sesión sintética).")
+        parser.add_argument("--concurrency", type=int, default=32, help="Usuarios virtuales simultáneos.")
+        parser.add_argument("--duration", type=float, default=20.0, help="Segundos de carga.")
+        parser.add_argument("--pid", type=int, help="PID del servidor (master) para medir su memoria.")
+        parser.add_argument("--json", action="store_true", help="Salida en JSON.")
+
+    def handle(self, *args, **opts):
+        try:
+            user = get_user_model().objects.get(username=opts["user"])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"No existe el usuario {opts['user']}")
+        steps = load_session(opts["session"]) if opts["session"] else default_session()
+        cookies = [login_cookies(user) for _ in range(opts["concurrency"])]
+
+        report = HttpLoad(opts["url"], steps, cookies, duration=opts["duration"]).run()
+        rss = rss_bytes(opts["pid"]) if opts["pid"] else None
+
+        if opts["json"]:
+            self.stdout.write(json.dumps({"views": report, "server_rss_bytes": rss}, indent=2))
+            return
+        cols = ("requests", "errors", "rps", "p50_ms", "p95_ms", "p99_ms")
+        header = f"{'vista':<28}" + "".join(f"{c:>{len(c) + 4}}" for c in cols)
+        self.stdout.write(f"{opts['url']} · {opts['concurrency']} usuarios · {opts['duration']:.0f}s\n")
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+        for name, row in report.items():
+            self.stdout.write(f"{name:<28}" + "".join(f"{row.get(c, '-'):>{len(c) + 4}}" for c in cols))
+        if rss is not None:
+            self.stdout.write(f"\nRSS del servidor: {rss / 1024 / 1024:.0f} MB")
@@ -0,0 +1,56 @@
+# vcards/management/commands/import_cards.py
+"""
+Importa tarjetas desde un CSV o .vcf (ver vcards/importer.py).
+
+    python manage.py import_cards equipo.csv --owner ventas@empresa.com
+    python manage.py import_cards contactos.vcf --owner ventas --folder "Ventas norte"
+
+Se crean como borradores del usuario --owner (email o username).
+"""
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from folders.models import Folder
+from vcards.importer import BATCH_SIZE, iter_import, iter_rows
+
+
+class Command(BaseCommand):
+    help = "Importa tarjetas (borradores) desde un archivo CSV o vCard."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Archivo .csv o .vcf")
+        parser.add_argument("--owner", required=True, help="Email o username del dueño.")
+        parser.add_argument("--folder", help="Carpeta para todas las tarjetas (se crea si no existe).")
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **opts):
+        try:
+            owner = get_user_model().objects.get(Q(email__iexact=opts["owner"]) | Q(username=opts["owner"]))
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"No existe el usuario {opts['owner']}")
+        except get_user_model().MultipleObjectsReturned:
+            raise CommandError(f"Hay varios usuarios con {opts['owner']}; usa el username")
+        folder = None
+        if opts["folder"]:
+            folder, _ = Folder.objects.get_or_create(owner=owner, name=opts["folder"])
+
+        started = time.monotonic()
+        report = None
+        with open(opts["path"], "rb") as fh:
+            for report in iter_import(owner, iter_rows(fh, opts["path"]), folder, opts["batch_size"]):
+                self.stdout.write(f"\r{report.rows} filas, {report.created} creadas, {report.error_count} errores", ending="")
+        self.stdout.write("")
+        if report is None:
+            raise CommandError("El archivo no tiene filas")
+
+        for err in report.errors:
+            self.stderr.write(f"  fila {err['row']}: {err['error']}")
+        if report.error_count > len(report.errors):
+            self.stderr.write(f"  ... y {report.error_count - len(report.errors)} errores más")
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"{report.created} tarjetas creadas en {elapsed:.1f}s ({report.rows / max(elapsed, 1e-6):.0f} filas/s)"
+        ))
@@ -0,0 +1,46 @@
+# vcards/management/commands/qr_codes.py
+"""
+Genera por adelantado los QR (estilo por defecto) de las tarjetas
+publicadas, en el pool de procesos (ver vcards/qr.py).
+
+    python manage.py qr_codes --folder 12
+    python manage.py qr_codes --owner ventas@empresa.com --fmt svg
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from vcards import qr
+from vcards.models import VCard
+
+
+class Command(BaseCommand):
+    help = "Genera en lote los códigos QR de las tarjetas publicadas."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--folder", type=int, help="Id de la carpeta.")
+        parser.add_argument("--owner", help="Email o username del dueño.")
+        parser.add_argument("--fmt", choices=sorted(qr.FORMATS), default="png")
+        parser.add_argument("--batch-size", type=int, default=200)
+
+    def handle(self, *args, **opts):
+        cards = VCard.objects.filter(is_published=True).only("slug", "theme", "photo")
+        if opts["folder"]:
+            cards = cards.filter(folder_id=opts["folder"])
+        if opts["owner"]:
+            cards = cards.filter(Q(owner__email__iexact=opts["owner"]) | Q(owner__username=opts["owner"]))
+        if not (opts["folder"] or opts["owner"]):
+            raise CommandError("Indica --folder o --owner")
+
+        started, done, batch = time.monotonic(), 0, []
+        for card in cards.order_by("id").iterator(chunk_size=opts["batch_size"]):
+            batch.append((qr.card_url(card), qr.make_style(card, opts["fmt"])))
+            if len(batch) >= opts["batch_size"]:
+                done += len(qr.generate_batch(batch))
+                batch = []
+                self.stdout.write(f"\r{done} códigos", ending="")
+        if batch:
+            done += len(qr.generate_batch(batch))
+        self.stdout.write("")
+        self.stdout.write(self.style.SUCCESS(f"{done} códigos en {time.monotonic() - started:.1f}s"))
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:58
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('folders', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VCard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slug', models.SlugField(max_length=60, unique=True)),
+                ('template', models.CharField(default='buro', max_length=20)),
+                ('full_name', models.CharField(blank=True, max_length=120)),
+                ('job_title', models.CharField(blank=True, max_length=120)),
+                ('photo', models.CharField(blank=True, max_length=500)),
+                ('banner', models.CharField(blank=True, max_length=500)),
+                ('video_url', models.CharField(blank=True, max_length=500)),
+                ('theme', models.JSONField(blank=True, default=dict)),
+                ('section_title', models.CharField(blank=True, max_length=120)),
+                ('section_desc', models.TextField(blank=True)),
+                ('contacts', models.JSONField(blank=True, default=list)),
+                ('socials', models.JSONField(blank=True, default=list)),
+                ('gallery', models.JSONField(blank=True, default=list)),
+                ('gallery_view', models.CharField(default='list', max_length=10)),
+                ('gallery_bg', models.BooleanField(default=False)),
+                ('is_published', models.BooleanField(default=False)),
+                ('published_at', models.DateTimeField(blank=True, null=True)),
+                ('published_html', models.TextField(blank=True, editable=False)),
+                ('published_etag', models.CharField(blank=True, editable=False, max_length=64)),
+                ('published_version', models.PositiveIntegerField(default=0, editable=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('folder', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='vcards', to='folders.folder')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='vcards', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ('-updated_at',),
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('folders', '0001_initial'),
+        ('vcards', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='vcard',
+            name='template',
+            field=models.CharField(choices=[('buro', 'Buró'), ('dual', 'Dual')], default='buro', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='vcard',
+            index=models.Index(fields=['updated_at', 'id'], name='vcard_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vcard',
+            index=models.Index(fields=['owner', 'updated_at', 'id'], name='vcard_owner_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vcard',
+            index=models.Index(fields=['folder', 'updated_at', 'id'], name='vcard_folder_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vcard',
+            index=models.Index(fields=['is_published', 'updated_at', 'id'], name='vcard_pub_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vcard',
+            index=models.Index(fields=['template', 'updated_at', 'id'], name='vcard_tpl_updated_idx'),
+        ),
+    ]
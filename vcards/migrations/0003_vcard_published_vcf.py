@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vcards', '0002_admin_browse_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vcard',
+            name='published_vcf',
+            field=models.TextField(blank=True, editable=False),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-18 12:31
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_user_search_indexes'),
+        ('vcards', '0003_vcard_published_vcf'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EditorPreferences',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='editor_prefs', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('global_flags', models.JSONField(blank=True, default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 13:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vcards', '0005_vcard_draft'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='vcard',
+            name='template',
+            field=models.CharField(choices=[('buro', 'Buró'), ('dual', 'Dual'), ('dual2', 'Dual 2'), ('dual3', 'Dual 3')], default='buro', max_length=20),
+        ),
+    ]
@@ -1,3 +1,275 @@
-from django.db import models
+import copy
+import hashlib
 
-# Create your models here.
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from . import images, validation, vcf
+
+# Colores del tema con sus valores por defecto (mismos que el editor)
+DEFAULT_THEME = {
+    "theme_primary": "#517AFA",
+    "theme_secondary": "#C5FEFF",
+    "profile_text_primary": "#061244",
+    "profile_text_secondary": "#76839B",
+    "text_primary": "#061244",
+    "text_secondary": "#76839B",
+    "card_bg": "#0D1626",
+    "block_bg": "#111827",
+}
+
+
+# Textos de ejemplo del preview cuando el campo está vacío. No son datos
+# de la tarjeta: apply_preview_context no los guarda
+PREVIEW_PLACEHOLDERS = {
+    "full_name": "Nombre Apellido",
+    "job_title": "Profesión / Puesto",
+    "section_desc": "Escribe una breve descripción para tu vCard.",
+}
+
+
+def public_cache_key(slug):
+    return f"vcards:public:v2:{slug}"
+
+
+def public_vcf_cache_key(slug):
+    return f"vcards:public-vcf:{slug}"
+
+
+class VCard(models.Model):
+    """
+    Tarjeta digital de un usuario. El contenido se guarda tal como lo
+    normaliza el editor (ver vcards.views._preview_context).
+
+    Al publicar se renderiza la página pública UNA vez y se guarda el HTML
+    (published_html) con su ETag; la vista pública sólo sirve esos bytes.
+    """
+
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="vcards")
+    folder = models.ForeignKey(
+        "folders.Folder", on_delete=models.SET_NULL, null=True, blank=True, related_name="vcards"
+    )
+    class Templates(models.TextChoices):
+        BURO = "buro", "Buró"
+        DUAL = "dual", "Dual"
+        DUAL2 = "dual2", "Dual 2"
+        DUAL3 = "dual3", "Dual 3"
+
+    slug = models.SlugField(max_length=60, unique=True)
+    template = models.CharField(max_length=20, choices=Templates.choices, default=Templates.BURO)
+
+    # Perfil
+    full_name = models.CharField(max_length=120, blank=True)
+    job_title = models.CharField(max_length=120, blank=True)
+    photo = models.CharField(max_length=500, blank=True)
+    banner = models.CharField(max_length=500, blank=True)
+    video_url = models.CharField(max_length=500, blank=True)
+
+    # Diseño: {"theme_primary": "#517AFA", ...} (llaves de DEFAULT_THEME)
+    theme = models.JSONField(default=dict, blank=True)
+
+    # Acerca de
+    section_title = models.CharField(max_length=120, blank=True)
+    section_desc = models.TextField(blank=True)
+
+    # Listas tal como las arma el editor
+    contacts = models.JSONField(default=list, blank=True)  # [{"label","value","type"}]
+    socials = models.JSONField(default=list, blank=True)   # [{"network","url","label","desc"}]
+    gallery = models.JSONField(default=list, blank=True)   # [url, ...]
+    gallery_view = models.CharField(max_length=10, default="list")
+    gallery_bg = models.BooleanField(default=False)
+
+    # Publicación (snapshot pre-renderizado)
+    is_published = models.BooleanField(default=False)
+    published_at = models.DateTimeField(null=True, blank=True)
+    published_html = models.TextField(blank=True, editable=False)
+    published_etag = models.CharField(max_length=64, blank=True, editable=False)
+    published_vcf = models.TextField(blank=True, editable=False)  # .vcf del snapshot (vcards/vcf.py)
+    published_version = models.PositiveIntegerField(default=0, editable=False)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ("-updated_at",)
+        # Listado del admin (dashboard.views.admin_vcards): keyset sobre
+        # (updated_at, id), con el filtro más común como primera columna
+        indexes = [
+            models.Index(fields=["updated_at", "id"], name="vcard_updated_idx"),
+            models.Index(fields=["owner", "updated_at", "id"], name="vcard_owner_updated_idx"),
+            models.Index(fields=["folder", "updated_at", "id"], name="vcard_folder_updated_idx"),
+            models.Index(fields=["is_published", "updated_at", "id"], name="vcard_pub_updated_idx"),
+            models.Index(fields=["template", "updated_at", "id"], name="vcard_tpl_updated_idx"),
+        ]
+
+    def __str__(self):
+        return self.slug
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        cache.delete_many([public_cache_key(self.slug), public_vcf_cache_key(self.slug)])
+
+    def delete(self, *args, **kwargs):
+        slug = self.slug
+        result = super().delete(*args, **kwargs)
+        cache.delete_many([public_cache_key(slug), public_vcf_cache_key(slug)])
+        return result
+
+    # --------------------------- Editor <-> modelo ---------------------------
+    def preview_context(self):
+        """Contexto con la misma forma que arma el editor para el preview."""
+        return {
+            "template": self.template,
+            "full_name": self.full_name,
+            "job_title": self.job_title,
+            "photo": self.photo,
+            "banner": self.banner,
+            "video_url": self.video_url,
+            **DEFAULT_THEME,
+            **{k: v for k, v in self.theme.items() if k in DEFAULT_THEME},
+            "section_title": self.section_title,
+            "section_desc": self.section_desc,
+            "contacts": self.contacts,
+            "socials": self.socials,
+            "images_view": self.gallery_view,
+            "images_bg": self.gallery_bg,
+            "images": self.gallery,
+        }
+
+    def apply_preview_context(self, ctx):
+        """
+        Copia un contexto normalizado del editor a los campos del modelo
+        (validado antes con vcards.validation.clean_context).
+        """
+        ctx = {
+            **ctx,
+            **{k: "" for k, text in PREVIEW_PLACEHOLDERS.items() if ctx[k] == text},
+        }
+        self.template = ctx["template"]
+        self.full_name = ctx["full_name"]
+        self.job_title = ctx["job_title"]
+        self.photo = ctx["photo"]
+        self.banner = ctx["banner"]
+        self.video_url = ctx["video_url"]
+        self.theme = {k: ctx[k] for k in DEFAULT_THEME}
+        self.section_title = ctx["section_title"]
+        self.section_desc = ctx["section_desc"]
+        self.contacts = [c for c in ctx["contacts"] if c["label"] or c["value"]]
+        self.socials = [s for s in ctx["socials"] if s["url"]]
+        self.gallery = [img for img in ctx["images"] if img]
+        self.gallery_view = ctx["images_view"]
+        self.gallery_bg = ctx["images_bg"]
+
+    # ------------------------------ Publicación ------------------------------
+    def publish(self):
+        """
+        Renderiza la página pública una sola vez y guarda el snapshot.
+        Cada publicación incrementa la versión y cambia el ETag.
+        InvalidCard (vcards/validation.py) si el contenido no es seguro.
+
+        No espera a las variantes de imagen de uploads recientes: se
+        encolan todas juntas, el snapshot sale con el original y se vuelve
+        a renderizar (refresh_snapshot) cuando el pool termina, con el
+        contenido de esta publicación.
+        """
+        # Nunca se publica contenido sin validar (InvalidCard)
+        validation.clean_context(self.preview_context())
+
+        pending = images.schedule_card_variants(self._image_assets())
+        self._render_snapshot()
+        self.published_version += 1
+        self.is_published = True
+        self.published_at = timezone.now()
+        self.save()
+        if pending:
+            # Contenido publicado: lo guardado después (sin publicar) no
+            # debe llegar a la página pública con el refresh
+            pk, version, context = self.pk, self.published_version, copy.deepcopy(self.preview_context())
+            transaction.on_commit(lambda: images.when_ready(
+                pending, lambda: _refresh_published(pk, version, context)
+            ))
+
+    def refresh_snapshot(self, version, context):
+        """
+        Re-renderiza el snapshot de la versión publicada `version` (p. ej.
+        ya con srcset) sin cambiar de versión, a partir del `context`
+        (preview_context()) capturado al publicar: los cambios guardados
+        después sin publicar no se filtran. No hace nada si entretanto se
+        publicó otra versión o se despublicó. Devuelve si actualizó.
+        """
+        if not self.is_published or self.published_version != version:
+            return False
+        # Sólo en memoria: update() de abajo escribe únicamente el snapshot
+        self.apply_preview_context(context)
+        self._render_snapshot()
+        updated = VCard.objects.filter(pk=self.pk, is_published=True, published_version=version).update(
+            published_html=self.published_html,
+            published_etag=self.published_etag,
+            published_vcf=self.published_vcf,
+        )
+        if updated:
+            cache.delete_many([public_cache_key(self.slug), public_vcf_cache_key(self.slug)])
+        return bool(updated)
+
+    def _image_assets(self):
+        return [(self.photo, "photo"), (self.banner, "banner"), *((url, "gallery") for url in self.gallery)]
+
+    def _render_snapshot(self):
+        html = render_to_string("vcards/public.html", {"card": self, **self.preview_context()})
+        self.published_html = html
+        self.published_etag = hashlib.sha256(html.encode("utf-8")).hexdigest()[:32]
+        self.published_vcf = vcf.render_vcf(self)
+
+    def unpublish(self):
+        self.is_published = False
+        self.save(update_fields=["is_published", "updated_at"])
+
+
+def _refresh_published(pk, version, context):
+    card = VCard.objects.filter(pk=pk).first()
+    if card is not None:
+        card.refresh_snapshot(version, context)
+
+
+class EditorPreferences(models.Model):
+    """
+    Preferencias del editor por usuario (antes en la sesión). Sólo se
+    guardan los nombres de los flags globales activos; la lectura pasa
+    por la caché (ver vcards/preferences.py).
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name="editor_prefs"
+    )
+    global_flags = models.JSONField(default=list, blank=True)  # ["photo", "name", ...]
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Preferencias de {self.user_id}"
+
+
+class VCardDraft(models.Model):
+    """
+    Borrador del editor en el servidor: el estado de los campos tal como
+    los manda el form ({nombre: valor} o {"campo[]": [valores]}). El
+    editor lo actualiza con parches JSON (vcards/drafts.py) y el preview
+    se renderiza desde aquí. card vacío = tarjeta que aún no se guarda
+    (uno por usuario).
+    """
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="vcard_drafts")
+    card = models.OneToOneField(VCard, on_delete=models.CASCADE, null=True, blank=True, related_name="draft")
+    data = models.JSONField(default=dict, blank=True)
+    version = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["owner"], condition=models.Q(card__isnull=True), name="vcard_draft_one_new_per_owner"
+            ),
+        ]
+
+    def __str__(self):
+        return f"Borrador {self.pk} ({self.card_id or 'nueva'})"
@@ -0,0 +1,113 @@
+# vcards/preferences.py
+"""
+Flags "globales" del editor (usar foto, nombre, plantilla... en todas las
+tarjetas), guardados por usuario en EditorPreferences.
+
+- Lectura: caché de Django por usuario; el valor ya está normalizado
+  ({flag: True}), el preview no lo vuelve a copiar ni a convertir.
+- Escritura: set_globals() aplica un lote de cambios con un solo UPDATE
+  (y ninguno si no cambia nada) y, al confirmar la transacción, borra la
+  llave de la caché: la siguiente lectura la vuelve a llenar desde la BD.
+  Reescribirla con el resultado podía dejar en caché el valor de un
+  escritor más lento que confirmó antes.
+- Los flags que seguían en la sesión (vc_global) se pasan al registro la
+  primera vez que se leen.
+- aget_globals / aset_globals: lo mismo para las vistas async del editor.
+"""
+import re
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import EditorPreferences
+
+FLAG_RE = re.compile(r"^[a-z][a-z0-9_]{0,39}$")
+MAX_FLAGS = 64
+SESSION_KEY = "vc_global"
+
+
+class InvalidFlags(ValueError):
+    pass
+
+
+def cache_key(user_id):
+    return f"vcards:prefs:{user_id}"
+
+
+def _ttl():
+    return getattr(settings, "EDITOR_PREFS_CACHE_TTL", 24 * 3600)
+
+
+def _as_dict(flags):
+    return {name: True for name in flags}
+
+
+def parse_bool(value):
+    return str(value).lower() in ("1", "true", "on", "yes")
+
+
+def get_globals(user, session=None):
+    """{flag: True} de los flags activos del usuario."""
+    key = cache_key(user.pk)
+    flags = cache.get(key)
+    if flags is not None:
+        return flags
+
+    row = EditorPreferences.objects.filter(user_id=user.pk).values_list("global_flags", flat=True).first()
+    if row is None and session is not None and session.get(SESSION_KEY):
+        # Flags de antes de EditorPreferences: se mueven una sola vez
+        legacy = {k: bool(v) for k, v in session[SESSION_KEY].items() if FLAG_RE.match(k)}
+        del session[SESSION_KEY]
+        return set_globals(user, legacy)
+    flags = _as_dict(row or [])
+    cache.set(key, flags, _ttl())
+    return flags
+
+
+async def aget_globals(user, session=None):
+    """get_globals() con la caché, el ORM y la sesión async."""
+    key = cache_key(user.pk)
+    flags = await cache.aget(key)
+    if flags is not None:
+        return flags
+
+    row = await EditorPreferences.objects.filter(user_id=user.pk).values_list("global_flags", flat=True).afirst()
+    if row is None and session is not None:
+        legacy = await session.aget(SESSION_KEY)
+        if legacy:
+            await session.apop(SESSION_KEY)
+            return await aset_globals(user, {k: bool(v) for k, v in legacy.items() if FLAG_RE.match(k)})
+    flags = _as_dict(row or [])
+    await cache.aset(key, flags, _ttl())
+    return flags
+
+
+def set_globals(user, changes):
+    """
+    Aplica {flag: bool} de una vez y devuelve los flags resultantes.
+    Lanza InvalidFlags si algún nombre no es válido.
+    """
+    bad = [name for name in changes if not FLAG_RE.match(str(name))]
+    if bad:
+        raise InvalidFlags(f"Flag inválido: {bad[0]}")
+
+    with transaction.atomic():
+        prefs, _ = EditorPreferences.objects.select_for_update().get_or_create(user_id=user.pk)
+        current = set(prefs.global_flags)
+        updated = (current | {k for k, v in changes.items() if v}) - {k for k, v in changes.items() if not v}
+        if len(updated) > MAX_FLAGS:
+            raise InvalidFlags("Demasiados flags")
+        if updated != current:
+            prefs.global_flags = sorted(updated)
+            prefs.save(update_fields=["global_flags", "updated_at"])
+            key = cache_key(user.pk)
+            transaction.on_commit(lambda: cache.delete(key))
+
+    return _as_dict(sorted(updated))
+
+
+# El SELECT ... FOR UPDATE dentro de una transacción no tiene versión async
+# en el ORM: corre en el hilo de sync_to_async.
+aset_globals = sync_to_async(set_globals)
@@ -0,0 +1,94 @@
+# vcards/preview_cache.py
+"""
+Caché LRU en memoria para el fragmento HTML del preview del editor.
+
+El editor dispara un POST a /vcards/preview/ en cada keyup/change, aunque
+el contenido normalizado no haya cambiado (foco, color pickers que vuelven
+a disparar 'change', re-clic en la misma plantilla...). Aquí guardamos el
+HTML ya renderizado indexado por un hash canónico del contexto, de modo
+que un payload repetido no vuelve a pasar por el motor de templates.
+
+La caché vive por proceso (cada worker de gunicorn tiene la suya) y está
+acotada por número de entradas.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+def context_key(ctx):
+    """
+    Hash canónico (sha256) de un contexto de preview ya normalizado.
+    Las llaves se ordenan para que el mismo contenido produzca la misma llave
+    sin importar el orden en que llegaron los campos del form.
+    """
+    raw = json.dumps(ctx, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class PreviewCache:
+    """
+    LRU acotada y thread-safe: llave -> HTML renderizado.
+    Lleva contadores de aciertos/fallos para poder medir su efecto.
+    """
+
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            html = self._data.get(key)
+            if html is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return html
+
+    def set(self, key, html):
+        with self._lock:
+            self._data[key] = html
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_render(self, ctx, render):
+        """
+        Devuelve (html, hit). 'render' sólo se llama en un fallo; el render
+        ocurre fuera del lock para no serializar a los demás hilos.
+        """
+        key = context_key(ctx)
+        html = self.get(key)
+        if html is not None:
+            return html, True
+        html = render()
+        self.set(key, html)
+        return html, False
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Instancia única por proceso
+preview_cache = PreviewCache(getattr(settings, "VCARD_PREVIEW_CACHE_SIZE", 512))
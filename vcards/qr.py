@@ -0,0 +1,308 @@
+# vcards/qr.py
+"""
+Códigos QR de las tarjetas (PNG con Pillow y SVG), guardados en disco.
+
+- La llave es el sha256 de (url, estilo): mismo contenido -> mismo
+  archivo, en media/qr/<h[:2]>/<h>.<png|svg>. Un archivo nunca cambia, así
+  que se sirve con Cache-Control immutable (vcards.views.qr_file) y un
+  escaneo / descarga repetido no vuelve a codificar nada.
+- La carpeta tiene tope de tamaño (QR_CACHE_MAX_BYTES): se desalojan los
+  menos usados (LRU por mtime; servir un archivo lo "toca" a lo más una
+  vez por hora).
+- generate_batch() genera los de una carpeta completa en el pool de
+  procesos de vcards/images.py; stream_zip() los manda en un zip conforme
+  termina cada lote.
+"""
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import qrcode
+from django.conf import settings
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+
+from . import images
+from .zipstream import iter_zip
+
+QR_DIR = "qr"
+FORMATS = {"png": "image/png", "svg": "image/svg+xml"}
+BORDER = 4  # módulos de margen (mínimo del estándar)
+_HEX = re.compile(r"^#[0-9a-fA-F]{6}$")
+
+# Escrituras desde el último barrido de desalojo (por proceso)
+_writes = 0
+_writes_lock = threading.Lock()
+EVICT_EVERY = 50
+
+
+class InvalidStyle(ValueError):
+    pass
+
+
+# ------------------------------- Estilo -------------------------------
+def _luminance(color):
+    r, g, b = (int(color[i:i + 2], 16) / 255 for i in (1, 3, 5))
+    lin = [c / 12.92 if c <= 0.03928 else ((c + 0.055) / 1.055) ** 2.4 for c in (r, g, b)]
+    return 0.2126 * lin[0] + 0.7152 * lin[1] + 0.0722 * lin[2]
+
+
+def _contrast(a, b):
+    la, lb = sorted((_luminance(a), _luminance(b)), reverse=True)
+    return (la + 0.05) / (lb + 0.05)
+
+
+def make_style(card, fmt="png", fg=None, bg=None, scale=10, logo=False):
+    """
+    Estilo validado para card. Colores por defecto: los del tema de la
+    tarjeta; si no contrastan lo suficiente para leerse, negro sobre blanco.
+    """
+    if fmt not in FORMATS:
+        raise InvalidStyle("Formato no soportado")
+    fg = fg or card.theme.get("profile_text_primary") or "#000000"
+    bg = bg or "#FFFFFF"
+    if not (_HEX.match(fg) and _HEX.match(bg)):
+        raise InvalidStyle("Color inválido (usa #RRGGBB)")
+    if _contrast(fg, bg) < 4:
+        fg, bg = "#000000", "#FFFFFF"
+    try:
+        scale = min(max(int(scale), 4), 20)
+    except (TypeError, ValueError):
+        raise InvalidStyle("Tamaño inválido")
+
+    logo_path = ""
+    if logo and card.photo:
+        rel_path = images._media_rel_path(images.variant_url(card.photo, "thumb", "jpg"))
+        if rel_path and os.path.exists(os.path.join(settings.MEDIA_ROOT, rel_path)):
+            logo_path = rel_path
+    return {"fmt": fmt, "fg": fg.upper(), "bg": bg.upper(), "scale": scale, "logo": logo_path}
+
+
+def card_url(card):
+    return getattr(settings, "SITE_URL", "").rstrip("/") + reverse("public_card", args=[card.slug])
+
+
+def key_for(url, style):
+    raw = json.dumps({"url": url, **style}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def rel_path(key, fmt):
+    return os.path.join(QR_DIR, key[:2], f"{key}.{fmt}")
+
+
+def abs_path(key, fmt):
+    return os.path.join(settings.MEDIA_ROOT, rel_path(key, fmt))
+
+
+def file_url(key, fmt):
+    return reverse("vcards:qr_file", args=[key, fmt])
+
+
+def _media_base():
+    # El SVG se descarga y se usa fuera del sitio: el logo va con URL absoluta
+    return getattr(settings, "SITE_URL", "").rstrip("/") + settings.MEDIA_URL
+
+
+# ------------------------------ Render ------------------------------
+def _matrix(url, with_logo):
+    # Con logo se tapa el centro: corrección H (hasta ~30% recuperable)
+    code = qrcode.QRCode(
+        error_correction=qrcode.constants.ERROR_CORRECT_H if with_logo else qrcode.constants.ERROR_CORRECT_M,
+        border=BORDER,
+    )
+    code.add_data(url)
+    code.make(fit=True)
+    return code.get_matrix()  # incluye el borde
+
+
+def _render_png(matrix, style, logo_abs):
+    size = len(matrix)
+    mask = Image.new("L", (size, size))
+    mask.putdata([0 if cell else 255 for row in matrix for cell in row])  # 255 = fondo
+    mask = mask.resize((size * style["scale"],) * 2, Image.Resampling.NEAREST)
+    img = Image.composite(
+        Image.new("RGB", mask.size, style["bg"]), Image.new("RGB", mask.size, style["fg"]), mask
+    )
+    if logo_abs:
+        with Image.open(logo_abs) as logo:
+            side = img.width // 5  # ~20% del ancho: cabe en la corrección H
+            logo = logo.convert("RGB")
+            logo.thumbnail((side, side), Image.Resampling.LANCZOS)
+            pad = style["scale"]
+            box = Image.new("RGB", (logo.width + 2 * pad, logo.height + 2 * pad), style["bg"])
+            box.paste(logo, (pad, pad))
+            img.paste(box, ((img.width - box.width) // 2, (img.height - box.height) // 2))
+    return img
+
+
+def _render_svg(matrix, style, logo_url):
+    size = len(matrix)
+    path = "".join(
+        f"M{x},{y}h1v1h-1z" for y, row in enumerate(matrix) for x, cell in enumerate(row) if cell
+    )
+    px = size * style["scale"]
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {size} {size}" width="{px}" height="{px}" shape-rendering="crispEdges">',
+        f'<rect width="{size}" height="{size}" fill="{style["bg"]}"/>',
+        f'<path d="{path}" fill="{style["fg"]}"/>',
+    ]
+    if logo_url:
+        side = size / 5
+        at = (size - side) / 2
+        parts.append(f'<rect x="{at - 0.5:.2f}" y="{at - 0.5:.2f}" width="{side + 1:.2f}" height="{side + 1:.2f}" fill="{style["bg"]}"/>')
+        parts.append(f'<image href="{logo_url}" x="{at:.2f}" y="{at:.2f}" width="{side:.2f}" height="{side:.2f}" preserveAspectRatio="xMidYMid slice"/>')
+    parts.append("</svg>")
+    return "".join(parts).encode("utf-8")
+
+
+def render_to_file(url, style, dest, media_root, media_url):
+    """
+    Codifica y escribe dest de forma atómica. Función de módulo (sin
+    settings) para poder correr en el pool de procesos.
+    """
+    if os.path.exists(dest):
+        return dest
+    matrix = _matrix(url, bool(style["logo"]))
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(dest), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            if style["fmt"] == "png":
+                logo_abs = os.path.join(media_root, style["logo"]) if style["logo"] else ""
+                _render_png(matrix, style, logo_abs).save(out, "PNG", optimize=True)
+            else:
+                logo_url = media_url.rstrip("/") + "/" + style["logo"].replace(os.sep, "/") if style["logo"] else ""
+                out.write(_render_svg(matrix, style, logo_url))
+        os.replace(tmp, dest)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return dest
+
+
+# ------------------------------ API ------------------------------
+def get_or_create(url, style):
+    """Llave del QR (lo genera en este proceso si no existe en disco)."""
+    key = key_for(url, style)
+    dest = abs_path(key, style["fmt"])
+    if not os.path.exists(dest):
+        render_to_file(url, style, dest, settings.MEDIA_ROOT, _media_base())
+        _after_write()
+    return key
+
+
+def generate_batch(items, timeout=300):
+    """
+    items: [(url, style)]. Genera en el pool los que no están en disco y
+    devuelve las llaves en el mismo orden.
+    """
+    keys = [key_for(url, style) for url, style in items]
+    jobs = [
+        (url, style, abs_path(key, style["fmt"]), settings.MEDIA_ROOT, _media_base())
+        for key, (url, style) in zip(keys, items)
+        if not os.path.exists(abs_path(key, style["fmt"]))
+    ]
+    if jobs:
+        try:
+            futures = [images.get_pool().submit(render_to_file, *job) for job in jobs]
+        except BrokenProcessPool:
+            images._reset_pool()
+            futures = [images.get_pool().submit(render_to_file, *job) for job in jobs]
+        for future in futures:
+            future.result(timeout=timeout)
+        evict()
+    return keys
+
+
+def stream_zip(cards, fmt="png", batch_size=100):
+    """
+    Zip con el QR (estilo por defecto) de cada tarjeta. Los lotes se
+    generan en el pool y cada uno se entrega en cuanto termina.
+    """
+    return iter_zip(_entries(cards, fmt, batch_size), compress=fmt == "svg")
+
+
+def _entries(cards, fmt, batch_size):
+    batch = []
+    for card in cards.iterator(chunk_size=batch_size):
+        batch.append(card)
+        if len(batch) >= batch_size:
+            yield from _batch_entries(batch, fmt)
+            batch = []
+    yield from _batch_entries(batch, fmt)
+
+
+def _batch_entries(batch, fmt):
+    if not batch:
+        return
+    keys = generate_batch([(card_url(card), make_style(card, fmt)) for card in batch])
+    for card, key in zip(batch, keys):
+        with open(abs_path(key, fmt), "rb") as fh:
+            data = fh.read()
+        stamp = timezone.localtime(card.updated_at).timetuple()[:6]
+        yield f"{card.slug}.{fmt}", stamp, data
+
+
+def touch(path, every=3600):
+    """Marca el archivo como usado (LRU), a lo más una vez por `every` s."""
+    try:
+        if time.time() - os.stat(path).st_mtime > every:
+            os.utime(path)
+    except OSError:
+        pass
+
+
+# ------------------------------ Desalojo ------------------------------
+def _after_write():
+    global _writes
+    with _writes_lock:
+        _writes += 1
+        if _writes < EVICT_EVERY:
+            return
+        _writes = 0
+    evict()
+
+
+def evict(max_bytes=None):
+    """
+    Borra los QR menos usados hasta quedar en 90% del tope. Devuelve
+    cuántos bytes liberó. Otro proceso puede estar borrando a la vez: los
+    errores de archivos que ya no existen se ignoran.
+    """
+    if max_bytes is None:
+        max_bytes = getattr(settings, "QR_CACHE_MAX_BYTES", 200 * 1024 * 1024)
+    root = os.path.join(settings.MEDIA_ROOT, QR_DIR)
+    entries, total = [], 0
+    try:
+        buckets = list(os.scandir(root))
+    except FileNotFoundError:
+        return 0
+    for bucket in buckets:
+        if not bucket.is_dir():
+            continue
+        for entry in os.scandir(bucket.path):
+            if entry.name.endswith(".tmp"):
+                continue
+            st = entry.stat()
+            entries.append((st.st_mtime, st.st_size, entry.path))
+            total += st.st_size
+    if total <= max_bytes:
+        return 0
+    freed, target = 0, total - int(max_bytes * 0.9)
+    for _, size, path in sorted(entries):
+        if freed >= target:
+            break
+        try:
+            os.remove(path)
+            freed += size
+        except OSError:
+            pass
+    return freed
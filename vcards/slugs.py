@@ -0,0 +1,249 @@
+# vcards/slugs.py
+"""
+Normalización de slugs y registro en memoria de slugs ocupados.
+
+check_slug se llama en cada keystroke (con debounce) del campo slug y
+propone alternativas cuando el slug está ocupado. Cada proceso mantiene
+un set con los slugs existentes:
+  - se carga completo de la tabla de tarjetas en el primer uso (y se
+    recarga cada SLUG_REGISTRY_REFRESH segundos para limpiar falsos
+    positivos),
+  - cada SLUG_REGISTRY_SYNC segundos trae sólo las tarjetas creadas o
+    renombradas desde la última sincronización (updated_at >= marca, un
+    rango sobre el índice (updated_at, id)), para ver lo de otros workers,
+  - se actualiza con las señales post_save/post_delete de VCard.
+
+Semántica: "no está en el set" se responde sin tocar la BD (libre, salvo
+lo creado en otro worker en los últimos SLUG_REGISTRY_SYNC segundos).
+"Está en el set" puede ser un falso positivo (borrado o renombrado en
+otro proceso), así que se confirma con un exists() sobre el índice
+único. Las sugerencias se arman con el set y se confirman todas juntas
+con una query. La unicidad real la garantiza el unique de la columna al
+guardar.
+"""
+import re
+import threading
+import time
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.apps import apps
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+SLUG_MIN_LENGTH = 5
+SLUG_MAX_LENGTH = 60
+
+# Rutas de primer nivel que no pueden ser slugs públicos (mibio.mx/<slug>/)
+RESERVED_SLUGS = frozenset({
+    "admin", "dashboard", "users", "vcards", "static", "media",
+    "create-users", "login", "logout", "api", "metrics", "analytics",
+})
+
+# Sufijos para sugerir alternativas, en orden de preferencia
+_SUGGESTION_SUFFIXES = ("mx", "oficial", "pro", "info", "contacto")
+# Candidatos de más al sugerir, por si alguno ya se ocupó en otro worker
+_EXTRA_CANDIDATES = 4
+# Margen hacia atrás en cada sincronización incremental: transacciones que
+# confirman tarde con un updated_at anterior y desfase de reloj entre hosts
+_SYNC_OVERLAP = timedelta(seconds=10)
+
+
+def normalize_slug(raw):
+    """
+    Normalización idéntica al front: minúsculas, espacios→-, solo a-z0-9-,
+    sin guiones repetidos ni en los extremos.
+    """
+    slug = re.sub(r"\s+", "-", (raw or "").strip().lower())
+    slug = re.sub(r"[^a-z0-9-]", "", slug)
+    slug = re.sub(r"-+", "-", slug).strip("-")
+    return slug[:SLUG_MAX_LENGTH]
+
+
+def _get_model():
+    try:
+        return apps.get_model("vcards", "VCard")
+    except LookupError:
+        return None
+
+
+class SlugRegistry:
+    def __init__(self, refresh_seconds=3600, sync_seconds=2):
+        self.refresh_seconds = refresh_seconds
+        self.sync_seconds = sync_seconds
+        self._slugs = set()
+        self._loaded_at = None
+        self._synced_at = None
+        self._since = None
+        self._lock = threading.Lock()
+
+    # ------------------------------ Carga ------------------------------
+    def warm(self):
+        """(Re)carga el set completo desde la BD."""
+        model = _get_model()
+        since = timezone.now()
+        slugs = set()
+        if model is not None:
+            slugs.update(
+                model.objects.values_list("slug", flat=True).iterator(chunk_size=5000)
+            )
+        with self._lock:
+            self._slugs = slugs
+            self._loaded_at = self._synced_at = time.monotonic()
+            self._since = since
+
+    def sync(self):
+        """Agrega al set las tarjetas creadas o renombradas desde la última marca."""
+        model = _get_model()
+        since = timezone.now()
+        slugs = []
+        if model is not None:
+            slugs = list(
+                model.objects.filter(updated_at__gte=self._since - _SYNC_OVERLAP)
+                .values_list("slug", flat=True)
+            )
+        with self._lock:
+            self._slugs.update(slugs)
+            self._synced_at = time.monotonic()
+            self._since = since
+
+    def _pending(self):
+        """Qué carga toca: "warm", "sync" o None si el set está al día."""
+        now = time.monotonic()
+        if self._loaded_at is None or now - self._loaded_at > self.refresh_seconds:
+            return "warm"
+        if now - self._synced_at > self.sync_seconds:
+            return "sync"
+        return None
+
+    def _ensure_fresh(self):
+        pending = self._pending()
+        if pending:
+            getattr(self, pending)()
+
+    async def _aensure_fresh(self):
+        pending = self._pending()
+        if pending:
+            await sync_to_async(getattr(self, pending))()
+
+    # ----------------------------- Señales -----------------------------
+    def add(self, slug):
+        with self._lock:
+            self._slugs.add(slug)
+
+    def discard(self, slug):
+        with self._lock:
+            self._slugs.discard(slug)
+
+    def connect_signals(self):
+        model = _get_model()
+        if model is None:
+            return
+        post_save.connect(self._on_save, sender=model, dispatch_uid="slug_registry_save")
+        post_delete.connect(self._on_delete, sender=model, dispatch_uid="slug_registry_delete")
+
+    def _on_save(self, sender, instance, **kwargs):
+        # En un rename el slug viejo queda como falso positivo: inofensivo,
+        # se confirma contra la BD y se limpia en la próxima recarga completa.
+        self.add(instance.slug)
+
+    def _on_delete(self, sender, instance, **kwargs):
+        self.discard(instance.slug)
+
+    # ----------------------------- Consultas -----------------------------
+    def is_taken(self, slug):
+        """
+        True si el slug está ocupado o reservado. Si el set no lo tiene se
+        responde sin ir a la BD; si lo tiene se confirma con exists() (puede
+        haberse borrado o renombrado en otro worker) y se corrige el set.
+        """
+        if slug in RESERVED_SLUGS:
+            return True
+        self._ensure_fresh()
+        if slug not in self._slugs:
+            return False
+        model = _get_model()
+        return self._remember(slug, model is not None and model.objects.filter(slug=slug).exists())
+
+    async def ais_taken(self, slug):
+        """is_taken() para vistas async (la confirmación usa aexists())."""
+        if slug in RESERVED_SLUGS:
+            return True
+        await self._aensure_fresh()
+        if slug not in self._slugs:
+            return False
+        model = _get_model()
+        return self._remember(slug, model is not None and await model.objects.filter(slug=slug).aexists())
+
+    def _remember(self, slug, taken):
+        if taken:
+            self.add(slug)
+        else:
+            self.discard(slug)
+        return taken
+
+    def _maybe_free(self, slug):
+        return (
+            SLUG_MIN_LENGTH <= len(slug) <= SLUG_MAX_LENGTH
+            and slug not in RESERVED_SLUGS
+            and slug not in self._slugs
+        )
+
+    def suggest(self, slug, limit=4):
+        """
+        Alternativas libres (según el set) ordenadas por preferencia:
+        primero sufijos con palabra, luego numéricos (-2, -3, ...).
+        """
+        self._ensure_fresh()
+        candidates = self._suggest(slug, limit + _EXTRA_CANDIDATES)
+        model = _get_model()
+        taken = set(model.objects.filter(slug__in=candidates).values_list("slug", flat=True)) if model else set()
+        return self._confirmed(candidates, taken, limit)
+
+    async def asuggest(self, slug, limit=4):
+        await self._aensure_fresh()
+        candidates = self._suggest(slug, limit + _EXTRA_CANDIDATES)
+        model = _get_model()
+        taken = set()
+        if model is not None:
+            taken = {s async for s in model.objects.filter(slug__in=candidates).values_list("slug", flat=True)}
+        return self._confirmed(candidates, taken, limit)
+
+    def _confirmed(self, candidates, taken, limit):
+        # Lo que el set creía libre y ya existe (creado en otro worker)
+        for slug in taken:
+            self.add(slug)
+        return [cand for cand in candidates if cand not in taken][:limit]
+
+    def _suggest(self, slug, limit):
+        base = normalize_slug(slug)[: SLUG_MAX_LENGTH - 9].strip("-")
+        if not base:
+            return []
+
+        candidates = []
+        if "-" in base:
+            candidates.append(base.replace("-", ""))
+        candidates += [f"{base}-{suffix}" for suffix in _SUGGESTION_SUFFIXES]
+        candidates += [f"mi-{base}"]
+
+        out = []
+        for cand in candidates:
+            if cand not in out and self._maybe_free(cand):
+                out.append(cand)
+            if len(out) >= limit:
+                return out
+        n = 2
+        while len(out) < limit and n < 1000:
+            cand = f"{base}-{n}"
+            if self._maybe_free(cand):
+                out.append(cand)
+            n += 1
+        return out
+
+
+# Instancia única por proceso
+slug_registry = SlugRegistry(
+    getattr(settings, "SLUG_REGISTRY_REFRESH", 3600),
+    getattr(settings, "SLUG_REGISTRY_SYNC", 2),
+)
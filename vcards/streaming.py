@@ -0,0 +1,44 @@
+# vcards/streaming.py
+"""
+Respuestas en streaming que sirven igual bajo WSGI (gunicorn sync) y ASGI
+(uvicorn).
+
+Bajo ASGI, StreamingHttpResponse con un iterador síncrono no hace
+streaming: Django lo consume entero con sync_to_async(list) antes de
+mandar el primer byte (zip completo en memoria, sin progreso en el
+import). Aquí el mismo generador se envuelve en un iterador async que
+pide cada chunk con sync_to_async, siempre en el hilo del request (el
+ORM y los cursores de iterator() no se pueden mover de hilo).
+"""
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+
+_DONE = object()
+
+
+def _next(iterator):
+    return next(iterator, _DONE)
+
+
+async def aiter_sync(iterable):
+    """Iterador async sobre un iterable síncrono, un chunk por sync_to_async."""
+    iterator = iter(iterable)
+    try:
+        while True:
+            chunk = await sync_to_async(_next)(iterator)
+            if chunk is _DONE:
+                return
+            yield chunk
+    finally:
+        # Cliente desconectado: cerrar el generador (y su cursor) en su hilo
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            await sync_to_async(close)()
+
+
+def streaming_response(request, iterable, content_type):
+    """StreamingHttpResponse con el tipo de iterador que no bufferea en este servidor."""
+    if isinstance(request, ASGIRequest):
+        iterable = aiter_sync(iterable)
+    return StreamingHttpResponse(iterable, content_type=content_type)
@@ -0,0 +1,25 @@
+# vcards/templatetags/vcard_images.py
+"""
+Filtros para servir las variantes generadas por vcards/images.py:
+
+    {% load vcard_images %}
+    <img src="{{ photo|variant:'avatar' }}" {% with s=photo|srcset:'avatar' %}{% if s %}srcset="{{ s }}"{% endif %}{% endwith %}>
+
+Si la URL no es un upload propio o las variantes aún no existen, variant
+devuelve la URL original y srcset una cadena vacía.
+"""
+from django import template
+
+from vcards import images
+
+register = template.Library()
+
+
+@register.filter
+def variant(url, name):
+    return images.variant_url(url, name)
+
+
+@register.filter
+def srcset(url, name):
+    return images.srcset(url, name)
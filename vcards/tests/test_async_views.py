@@ -0,0 +1,100 @@
+import importlib
+import json
+
+from django.test import TestCase, override_settings
+from django.urls import clear_url_caches, resolve, reverse
+
+from folders import views as folder_views
+from users.models import User
+from vcards import views
+from vcards.models import VCard
+
+# Las URLs eligen la vista sync/async al importarse (settings.ASYNC_VIEWS)
+URLCONFS = ("vcards.urls", "folders.urls", "dashboard.urls", "config.urls")
+
+
+def _reload_urls():
+    for name in URLCONFS:
+        importlib.reload(importlib.import_module(name))
+    clear_url_caches()
+
+
+class SyncRoutingTests(TestCase):
+    def test_wsgi_routes_sync_views(self):
+        self.assertIs(resolve(reverse("vcards:preview")).func, views.preview)
+        self.assertIs(resolve(reverse("vcards:draft_patch", args=[1])).func, views.draft_patch)
+        self.assertIs(resolve(reverse("dashboard:folders:chips")).func, folder_views.folders_chips)
+
+
+class AsyncViewsTests(TestCase):
+    """Las versiones async que se enrutan bajo ASGI (config/asgi.py)."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls._async_views = override_settings(ASYNC_VIEWS=True)
+        cls._async_views.enable()
+        _reload_urls()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._async_views.disable()
+        _reload_urls()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.user = User.objects.create_user("ana", password="x")
+        self.async_client.force_login(self.user)
+
+    def test_asgi_routes_async_views(self):
+        self.assertIs(resolve(reverse("vcards:preview")).func, views.apreview)
+        self.assertIs(resolve(reverse("vcards:check_slug")).func, views.acheck_slug)
+        self.assertIs(resolve(reverse("dashboard:folders:options")).func, folder_views.afolders_options)
+
+    async def test_preview_full_and_section(self):
+        url = reverse("vcards:preview")
+        response = await self.async_client.post(url, {"full_name": "Ana García", "template": "buro"})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Ana García", response.content.decode())
+        self.assertNotIn("HX-Reswap", response)
+
+        response = await self.async_client.post(url, {"full_name": "Ana", "_changed": "full_name"})
+        self.assertEqual(response["HX-Reswap"], "none")
+        self.assertIn('hx-swap-oob', response.content.decode())
+
+    async def test_check_slug(self):
+        await VCard.objects.acreate(owner=self.user, slug="ana-perez")
+        url = reverse("vcards:check_slug")
+        response = await self.async_client.get(url, {"slug": "Ana Perez"})
+        self.assertIn("ya está en uso", response.content.decode())
+        self.assertIn("ana-perez-mx", response.content.decode())
+        response = await self.async_client.get(url, {"slug": "beto-ramos"})
+        self.assertIn("Disponible", response.content.decode())
+
+    async def test_set_global_and_globals(self):
+        response = await self.async_client.post(reverse("vcards:set_global"), {"field": "name"})
+        self.assertEqual(response.status_code, 400)
+        response = await self.async_client.post(reverse("vcards:set_global"), {"field": "name", "enabled": "1"})
+        self.assertEqual(response.json(), {"ok": True, "field": "name", "enabled": True})
+        response = await self.async_client.post(
+            reverse("vcards:set_globals"), json.dumps({"photo": True, "name": False}), content_type="application/json"
+        )
+        self.assertEqual(response.json()["globals"], {"photo": True})
+
+    async def test_draft_open_and_patch(self):
+        response = await self.async_client.post(reverse("vcards:draft_open"), {"full_name": "", "template": "buro"})
+        draft = response.json()
+        response = await self.async_client.post(
+            draft["patch_url"], {"patch": json.dumps([{"op": "replace", "path": "/full_name", "value": "Ana"}])}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Draft-Version"], "1")
+        response = await self.async_client.post(draft["patch_url"], {"patch": "no es json"})
+        self.assertEqual(response.status_code, 400)
+
+    async def test_folder_fragment_etag(self):
+        url = reverse("dashboard:folders:chips")
+        response = await self.async_client.get(url)
+        self.assertEqual(response.status_code, 200)
+        response = await self.async_client.get(url, headers={"If-None-Match": response["ETag"]})
+        self.assertEqual(response.status_code, 304)
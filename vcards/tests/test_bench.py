@@ -0,0 +1,79 @@
+from django.core.cache import cache
+from django.test import Client, SimpleTestCase, TestCase
+
+from folders.models import Folder
+from users.models import User
+from vcards.bench.replay import Replayer, percentile
+from vcards.bench.sessions import HOT_PATHS, default_session
+from vcards.preview_cache import preview_cache
+
+# Queries por request (promedio) que cada vista no debe pasar: sesión,
+# usuario y lo propio de la vista. Si una cambia a propósito, se ajusta aquí
+QUERY_BUDGET = {
+    "vcards:preview": 3,
+    "vcards:check_slug": 3,
+    "vcards:set_global": 7,
+    "dashboard:folders:chips": 3,
+    "dashboard:folders:options": 3,
+    "dashboard:folders:fragments": 3,
+}
+
+
+class PercentileTests(SimpleTestCase):
+    def test_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([7], 99), 7)
+
+
+class DefaultSessionTests(SimpleTestCase):
+    def test_covers_folder_endpoints(self):
+        names = {step["name"] for step in default_session()}
+        for name in ("dashboard:folders:chips", "dashboard:folders:options", "dashboard:folders:fragments"):
+            self.assertIn(name, names)
+        self.assertLessEqual(names, set(HOT_PATHS))
+
+
+class EditorReplayBenchmarkTests(TestCase):
+    """
+    Benchmark del editor como test (lo mismo que 'manage.py bench_editor',
+    una iteración): sin errores, métricas completas y presupuesto de
+    queries por vista.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("bench", "bench@mibio.local", "bench")
+        Folder.objects.bulk_create(Folder(owner=cls.user, name=f"Carpeta {i:02d}") for i in range(12))
+
+    def setUp(self):
+        # Cachés frías: el primer request de cada vista renderiza
+        cache.clear()
+        preview_cache.clear()
+        self.addCleanup(preview_cache.clear)
+        client = Client(raise_request_exception=False)
+        client.force_login(self.user)
+        self.steps = default_session()
+        self.report = Replayer(client).run(self.steps)
+
+    def test_every_view_replays_without_errors(self):
+        self.assertEqual(set(self.report), {step["name"] for step in self.steps})
+        for name, row in self.report.items():
+            with self.subTest(view=name):
+                self.assertEqual(row["errors"], 0)
+                self.assertLessEqual(row["p50_ms"], row["p95_ms"])
+                self.assertLessEqual(row["p95_ms"], row["p99_ms"])
+                self.assertGreater(row["bytes_per_req"], 0)
+        self.assertEqual(sum(row["requests"] for row in self.report.values()), len(self.steps))
+
+    def test_query_budget(self):
+        for name, row in self.report.items():
+            with self.subTest(view=name):
+                self.assertLessEqual(row["queries_per_req"], QUERY_BUDGET[name])
+
+    def test_template_time_is_measured(self):
+        for name in ("vcards:preview", "dashboard:folders:fragments", "dashboard:folders:chips"):
+            with self.subTest(view=name):
+                self.assertGreater(self.report[name]["template_ms_per_req"], 0)
@@ -0,0 +1,106 @@
+import json
+
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from users.models import User
+from vcards.drafts import PatchError, apply_patch, changed_field
+from vcards.models import VCardDraft
+
+
+class ApplyPatchTests(SimpleTestCase):
+    state = {"full_name": "Ana", "contact_value[]": ["55 1234", "ana@x.com"]}
+
+    def test_replace_and_add_fields(self):
+        state = apply_patch(self.state, [
+            {"op": "replace", "path": "/full_name", "value": "Ana García"},
+            {"op": "add", "path": "/job_title", "value": "Asesora"},
+        ])
+        self.assertEqual(state["full_name"], "Ana García")
+        self.assertEqual(state["job_title"], "Asesora")
+
+    def test_list_items(self):
+        state = apply_patch(self.state, [
+            {"op": "replace", "path": "/contact_value[]/1", "value": "ana@y.com"},
+            {"op": "add", "path": "/contact_value[]/-", "value": "Reforma 123"},
+            {"op": "remove", "path": "/contact_value[]/0"},
+        ])
+        self.assertEqual(state["contact_value[]"], ["ana@y.com", "Reforma 123"])
+
+    def test_does_not_mutate_input(self):
+        apply_patch(self.state, [{"op": "add", "path": "/contact_value[]/0", "value": "x"}])
+        self.assertEqual(self.state["contact_value[]"], ["55 1234", "ana@x.com"])
+
+    def test_root_replace(self):
+        state = apply_patch(self.state, [{"op": "replace", "path": "", "value": {"full_name": "Beto"}}])
+        self.assertEqual(state, {"full_name": "Beto"})
+
+    def test_escaped_pointer(self):
+        state = apply_patch({}, [{"op": "add", "path": "/a~1b~0c", "value": "x"}])
+        self.assertEqual(state, {"a/b~c": "x"})
+
+    def test_invalid_patches(self):
+        for ops in (
+            [],
+            [{"op": "move", "path": "/full_name"}],
+            [{"op": "replace", "path": "/missing", "value": "x"}],
+            [{"op": "replace", "path": "/contact_value[]/2", "value": "x"}],
+            [{"op": "add", "path": "/full_name/0", "value": "x"}],
+            [{"op": "add", "path": "/contact_value[]/0", "value": 3}],
+            [{"op": "remove", "path": ""}],
+            [{"op": "add", "path": "full_name", "value": "x"}],
+            [{"op": "add", "path": "/a/b/c", "value": "x"}],
+        ):
+            with self.subTest(ops=ops), self.assertRaises(PatchError):
+                apply_patch(self.state, ops)
+
+    def test_changed_field(self):
+        self.assertEqual(changed_field([{"op": "add", "path": "/full_name"}]), "full_name")
+        self.assertIsNone(changed_field([{"op": "add", "path": "/a"}, {"op": "add", "path": "/b"}]))
+        self.assertIsNone(changed_field([{"op": "replace", "path": ""}]))
+
+
+class DraftViewTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("ana", password="x")
+        self.client.force_login(self.user)
+        self.open_url = reverse("vcards:draft_open")
+
+    def _open(self, **data):
+        response = self.client.post(self.open_url, {"full_name": "", "template": "buro", **data})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def _patch(self, draft, ops):
+        return self.client.post(draft["patch_url"], {"patch": json.dumps(ops)}, headers={"HX-Request": "true"})
+
+    def test_reload_restores_saved_draft(self):
+        draft = self._open()
+        self.assertFalse(draft["restored"])
+        response = self._patch(draft, [{"op": "replace", "path": "/full_name", "value": "Ana García"}])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Draft-Version"], "1")
+
+        # Recarga: el form llega vacío y el borrador no se pisa
+        reopened = self._open()
+        self.assertEqual(reopened["id"], draft["id"])
+        self.assertTrue(reopened["restored"])
+        self.assertEqual(reopened["state"]["full_name"], "Ana García")
+        self.assertEqual(reopened["version"], 1)
+        self.assertEqual(VCardDraft.objects.get().data["full_name"], "Ana García")
+
+    def test_reset_replaces_draft(self):
+        draft = self._open()
+        self._patch(draft, [{"op": "replace", "path": "/full_name", "value": "Ana García"}])
+        reopened = self._open(reset="1")
+        self.assertFalse(reopened["restored"])
+        self.assertEqual(reopened["state"], {"full_name": "", "template": "buro"})
+
+    def test_patch_conflict_and_missing(self):
+        draft = self._open()
+        response = self._patch(draft, [{"op": "replace", "path": "/missing", "value": "x"}])
+        self.assertEqual(response.status_code, 409)
+        other = User.objects.create_user("beto", password="x")
+        self.client.force_login(other)
+        response = self._patch(draft, [{"op": "replace", "path": "/full_name", "value": "x"}])
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,129 @@
+import io
+import os
+import shutil
+import tempfile
+from concurrent.futures import Future
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from users.models import User
+from vcards import images
+from vcards.models import VCard
+
+
+class FakePool:
+    """Acepta trabajos sin correrlos: el test decide cuándo 'terminan'."""
+
+    def __init__(self):
+        self.jobs = []
+
+    def submit(self, fn, *args):
+        self.jobs.append(args)
+        return Future()
+
+
+def _png(color):
+    buf = io.BytesIO()
+    Image.new("RGB", (1000, 1000), color).save(buf, "PNG")
+    return SimpleUploadedFile("x.png", buf.getvalue(), content_type="image/png")
+
+
+class PublishVariantsTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.pool = FakePool()
+        patcher = mock.patch.object(images, "get_pool", return_value=self.pool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.uploads = [images.store_upload(_png(c))[1] for c in ("red", "green", "blue")]
+        urls = [images.media_url(p) for p in self.uploads]
+        # Los manifests se cachean por proceso y las rutas se repiten entre tests
+        for url in urls:
+            self.addCleanup(images._manifests.discard, url.rsplit("/", 1)[0])
+        user = User.objects.create_user("ana", password="x")
+        self.card = VCard.objects.create(
+            owner=user, slug="ana", full_name="Ana", photo=urls[0], banner=urls[1], gallery=[urls[2]]
+        )
+
+    def _finish_jobs(self):
+        for abs_dir, original, wanted in self.pool.jobs:
+            images.generate_variants(abs_dir, original, wanted)
+
+    def test_publish_submits_every_variant_without_waiting(self):
+        self.card.publish()  # los futures nunca terminan: no debe bloquear
+        self.assertEqual(len(self.pool.jobs), 3)
+        self.assertTrue(self.card.is_published)
+        self.assertNotIn("avatar.jpg", self.card.published_html)
+        self.assertIn(self.card.photo, self.card.published_html)
+
+    def test_refresh_snapshot_picks_up_variants(self):
+        self.card.publish()
+        etag = self.card.published_etag
+        self._finish_jobs()
+
+        card = VCard.objects.get(pk=self.card.pk)
+        self.assertTrue(card.refresh_snapshot(card.published_version, card.preview_context()))
+        card.refresh_from_db()
+        self.assertIn("avatar.jpg", card.published_html)
+        self.assertNotEqual(card.published_etag, etag)
+        self.assertEqual(card.published_version, 1)
+
+    def test_refresh_snapshot_keeps_published_content(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self.card.publish()
+        # Edición guardada sin publicar antes de que terminen las variantes
+        self.card.full_name = "Borrador"
+        self.card.save()
+        self._finish_jobs()
+
+        with mock.patch.object(images, "when_ready", lambda pending, callback: callback()):
+            for callback in callbacks:
+                callback()
+        card = VCard.objects.get(pk=self.card.pk)
+        self.assertIn("avatar.jpg", card.published_html)
+        self.assertIn("Ana", card.published_html)
+        self.assertNotIn("Borrador", card.published_html)
+        self.assertEqual(card.full_name, "Borrador")
+
+    def test_refresh_snapshot_ignores_stale_version(self):
+        self.card.publish()
+        self.card.publish()
+        self._finish_jobs()
+
+        card = VCard.objects.get(pk=self.card.pk)
+        self.assertFalse(card.refresh_snapshot(1, card.preview_context()))
+        card.unpublish()
+        self.assertFalse(card.refresh_snapshot(2, card.preview_context()))
+
+    def test_missing_upload_is_skipped(self):
+        os.unlink(os.path.join(self.media, self.uploads[0]))
+        pending = images.schedule_card_variants(self.card._image_assets())
+        self.assertEqual([url for url, _ in pending], [self.card.banner, *self.card.gallery])
+
+
+class ManifestCacheTests(TestCase):
+    def test_evicts_least_recently_used(self):
+        manifests = images._ManifestCache(maxsize=2)
+        manifests.set("a", {"thumb": {}})
+        manifests.set("b", {"thumb": {}})
+        manifests.get("a")
+        manifests.set("c", {"thumb": {}})
+        self.assertEqual(len(manifests), 2)
+        self.assertIsNone(manifests.get("b"))
+        self.assertIsNotNone(manifests.get("a"))
+
+    def test_discard(self):
+        manifests = images._ManifestCache(maxsize=2)
+        manifests.set("a", {})
+        manifests.discard("a")
+        manifests.discard("missing")
+        self.assertIsNone(manifests.get("a"))
@@ -0,0 +1,86 @@
+import io
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from users.models import User
+from vcards import importer
+from vcards.models import VCard
+
+
+def _row(**fields):
+    return {"contacts": [], "socials": [], **fields}
+
+
+class NormalizeTests(TestCase):
+    def test_social_and_website_urls(self):
+        data = importer._normalize(_row(
+            full_name="Ana Pérez",
+            contacts=[("website", "ejemplo.mx")],
+            socials=[("Instagram", "https://instagram.com/ana")],
+        ))
+        self.assertEqual(data["contacts"][0], {"label": "Sitio web", "value": "https://ejemplo.mx", "type": "url"})
+        self.assertEqual(data["socials"][0]["url"], "https://instagram.com/ana")
+
+    def test_rejects_script_urls(self):
+        for row in (
+            _row(full_name="Ana", socials=[("X", "javascript:alert(1)")]),
+            _row(full_name="Ana", contacts=[("website", "javascript:alert(1)")]),
+        ):
+            with self.assertRaises(importer.RowError):
+                importer._normalize(row)
+
+    def test_templates(self):
+        self.assertEqual(importer._normalize(_row(full_name="Ana", template="Dual3"))["template"], "dual3")
+        self.assertEqual(importer._normalize(_row(full_name="Ana", template="otra"))["template"], "buro")
+
+
+class AssignSlugsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("ana", password="x", plan=User.Plans.BUSINESS)
+        VCard.objects.create(owner=self.user, slug="ana-perez")
+        VCard.objects.create(owner=self.user, slug="ana-perez-2")
+
+    def _pending(self, *rows):
+        return [(n, importer._normalize(_row(**row))) for n, row in enumerate(rows, start=2)]
+
+    def test_derived_slugs_take_next_free_suffix(self):
+        report = importer.ImportReport()
+        ready = importer._assign_slugs(
+            self._pending({"full_name": "Ana Pérez"}, {"full_name": "Ana Perez"}, {"full_name": "Luis Gómez"}),
+            report,
+        )
+        self.assertEqual([data["slug"] for _, data in ready], ["ana-perez-3", "ana-perez-4", "luis-gomez"])
+        self.assertEqual(report.error_count, 0)
+
+    def test_explicit_slug_taken_is_row_error(self):
+        report = importer.ImportReport()
+        ready = importer._assign_slugs(
+            self._pending({"full_name": "Ana", "slug": "ana-perez"}, {"full_name": "Ana", "slug": "admin"}),
+            report,
+        )
+        self.assertEqual(ready, [])
+        self.assertEqual([e["row"] for e in report.errors], [3, 2])
+
+    def test_explicit_slug_duplicated_in_batch(self):
+        report = importer.ImportReport()
+        ready = importer._assign_slugs(
+            self._pending({"full_name": "Ana", "slug": "equipo-ana"}, {"full_name": "Otra", "slug": "equipo-ana"}),
+            report,
+        )
+        self.assertEqual([n for n, _ in ready], [2])
+        self.assertEqual(report.errors, [{"row": 3, "error": "El enlace ya está en uso: equipo-ana"}])
+
+
+class ImportCardsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("ana", password="x", plan=User.Plans.BUSINESS)
+
+    def test_csv(self):
+        csv = "nombre,puesto,sitio,instagram\nAna Pérez,CEO,ejemplo.mx,instagram.com/ana\n,,,\nLuis,,javascript:x,\n"
+        report = importer.import_cards(self.user, io.BytesIO(csv.encode()), "equipo.csv")
+        self.assertEqual(report.as_dict(), {"rows": 2, "created": 1, "failed": 1})
+        card = VCard.objects.get()
+        self.assertEqual(card.slug, "ana-perez")
+        self.assertEqual(card.socials[0]["url"], "https://instagram.com/ana")
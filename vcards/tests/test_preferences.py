@@ -0,0 +1,66 @@
+from django.contrib.sessions.backends.cache import SessionStore
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase
+
+from users.models import User
+from vcards import preferences
+from vcards.models import EditorPreferences
+
+
+class GlobalsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("ana", password="x")
+        self.key = preferences.cache_key(self.user.pk)
+
+    def test_set_invalidates_and_next_read_repopulates(self):
+        self.assertEqual(preferences.get_globals(self.user), {})
+        self.assertEqual(cache.get(self.key), {})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            flags = preferences.set_globals(self.user, {"photo": True, "name": True})
+        self.assertEqual(flags, {"name": True, "photo": True})
+        self.assertIsNone(cache.get(self.key))
+
+        with self.assertNumQueries(1):
+            self.assertEqual(preferences.get_globals(self.user), flags)
+        with self.assertNumQueries(0):
+            self.assertEqual(preferences.get_globals(self.user), flags)
+
+    def test_invalidation_waits_for_commit(self):
+        preferences.get_globals(self.user)
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            with transaction.atomic():
+                preferences.set_globals(self.user, {"photo": True})
+        # Antes del commit otros workers leen la BD vieja: la caché no se toca
+        self.assertEqual(cache.get(self.key), {})
+        for callback in callbacks:
+            callback()
+        self.assertIsNone(cache.get(self.key))
+
+    def test_unchanged_flags_do_not_write(self):
+        preferences.set_globals(self.user, {"photo": True})
+        preferences.get_globals(self.user)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.assertEqual(preferences.set_globals(self.user, {"photo": True, "name": False}), {"photo": True})
+        self.assertEqual(callbacks, [])
+        self.assertEqual(cache.get(self.key), {"photo": True})
+
+    def test_turning_flags_off(self):
+        preferences.set_globals(self.user, {"photo": True, "name": True})
+        self.assertEqual(preferences.set_globals(self.user, {"photo": False}), {"name": True})
+        self.assertEqual(EditorPreferences.objects.get(user=self.user).global_flags, ["name"])
+
+    def test_invalid_flags(self):
+        with self.assertRaises(preferences.InvalidFlags):
+            preferences.set_globals(self.user, {"Bad-Flag": True})
+        with self.assertRaises(preferences.InvalidFlags):
+            preferences.set_globals(self.user, {f"f{i}": True for i in range(preferences.MAX_FLAGS + 1)})
+
+    def test_legacy_session_flags_move_once(self):
+        session = SessionStore()
+        session[preferences.SESSION_KEY] = {"photo": True, "title": False, "Bad": True}
+        self.assertEqual(preferences.get_globals(self.user, session), {"photo": True})
+        self.assertNotIn(preferences.SESSION_KEY, session)
+        self.assertEqual(EditorPreferences.objects.get(user=self.user).global_flags, ["photo"])
@@ -0,0 +1,82 @@
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.urls import reverse
+
+from users.models import User
+from vcards import views
+from vcards.preview_cache import preview_cache
+
+
+class ChangedSectionTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def _section(self, data=None, **headers):
+        return views._changed_section(self.factory.post("/", data or {}, headers=headers))
+
+    def test_field_to_section(self):
+        cases = {
+            "full_name": (True, "header"),
+            "section_desc": (True, "about"),
+            "contact_label[]": (True, "contacts"),
+            "social_url[]": (True, "socials"),
+            "images[]": (True, "gallery"),
+            "tiktok_url": (True, None),
+            "link_url[]": (True, None),
+            "no_existe": (False, None),
+        }
+        for field, expected in cases.items():
+            with self.subTest(field=field):
+                self.assertEqual(self._section({"_changed": field}), expected)
+
+    def test_trigger_name_header(self):
+        self.assertEqual(self._section(**{"HX-Trigger-Name": "full_name"}), (True, "header"))
+        self.assertEqual(self._section(), (False, None))
+
+    def test_empty_changed_wins_over_header(self):
+        # Varios campos pendientes: el JS manda _changed vacío => completo
+        self.assertEqual(self._section({"_changed": ""}, **{"HX-Trigger-Name": "full_name"}), (False, None))
+
+    def test_explicit_field(self):
+        self.assertEqual(views._changed_section(self.factory.post("/"), "contact_value[]"), (True, "contacts"))
+
+
+class PreviewResponseTests(TestCase):
+    def setUp(self):
+        preview_cache.clear()
+        self.addCleanup(preview_cache.clear)
+        self.client.force_login(User.objects.create_user("ana", password="x"))
+        self.url = reverse("vcards:preview")
+
+    def _post(self, headers=None, **data):
+        return self.client.post(self.url, {"template": "buro", "full_name": "Ana García", **data}, headers=headers)
+
+    def test_single_field_is_oob_section(self):
+        response = self._post(_changed="full_name")
+        self.assertEqual(response["HX-Reswap"], "none")
+        html = response.content.decode()
+        self.assertIn('hx-swap-oob="true"', html)
+        self.assertIn("Ana García", html)
+
+    def test_field_outside_preview_swaps_nothing(self):
+        response = self._post(_changed="tiktok_url")
+        self.assertEqual(response["HX-Reswap"], "none")
+        self.assertEqual(response.content, b"")
+        self.assertNotIn("X-Preview-Cache", response)
+
+    def test_unknown_field_is_full_preview(self):
+        response = self._post(_changed="no_existe")
+        self.assertNotIn("HX-Reswap", response)
+        self.assertNotIn('hx-swap-oob="true"', response.content.decode())
+        self.assertIn("Ana García", response.content.decode())
+
+    def test_several_fields_fall_back_to_full(self):
+        # El input con hx-post propio manda HX-Trigger-Name, pero cambiaron varios
+        response = self._post(_changed="", job_title="CEO", headers={"HX-Trigger-Name": "full_name"})
+        self.assertNotIn("HX-Reswap", response)
+        html = response.content.decode()
+        self.assertNotIn('hx-swap-oob="true"', html)
+        self.assertIn("Ana García", html)
+        self.assertIn("CEO", html)
+
+    def test_get_is_rejected(self):
+        self.assertEqual(self.client.get(self.url).status_code, 400)
@@ -0,0 +1,96 @@
+import io
+import os
+import shutil
+import tempfile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+
+from users.models import User
+from vcards import images
+from vcards.preview_cache import PreviewCache, context_key, preview_cache
+
+
+class PreviewCacheTests(SimpleTestCase):
+    def test_key_ignores_field_order(self):
+        self.assertEqual(context_key({"a": 1, "b": [1, 2]}), context_key({"b": [1, 2], "a": 1}))
+        self.assertNotEqual(context_key({"a": 1}), context_key({"a": 2}))
+
+    def test_miss_then_hit(self):
+        cache = PreviewCache(maxsize=4)
+        renders = []
+
+        def render():
+            renders.append(1)
+            return "<p>x</p>"
+
+        self.assertEqual(cache.get_or_render({"a": 1}, render), ("<p>x</p>", False))
+        self.assertEqual(cache.get_or_render({"a": 1}, render), ("<p>x</p>", True))
+        self.assertEqual(len(renders), 1)
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1, "hit_ratio": 0.5, "size": 1, "maxsize": 4})
+
+    def test_evicts_least_recently_used(self):
+        cache = PreviewCache(maxsize=2)
+        cache.set("a", "A")
+        cache.set("b", "B")
+        cache.get("a")  # "b" queda como el menos usado
+        cache.set("c", "C")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((cache.get("a"), cache.get("c")), ("A", "C"))
+        self.assertEqual(cache.stats()["size"], 2)
+
+
+class PreviewViewCacheTests(TestCase):
+    def setUp(self):
+        preview_cache.clear()
+        self.addCleanup(preview_cache.clear)
+        self.user = User.objects.create_user("ana", password="x")
+        self.client.force_login(self.user)
+        self.url = reverse("vcards:preview")
+
+    def _post(self, **data):
+        return self.client.post(self.url, {"template": "buro", **data})
+
+    def test_repeated_payload_is_a_hit(self):
+        self.assertEqual(self._post(full_name="Ana")["X-Preview-Cache"], "MISS")
+        self.assertEqual(self._post(full_name="Ana")["X-Preview-Cache"], "HIT")
+        self.assertEqual(self._post(full_name="Ana", _changed="full_name")["X-Preview-Cache"], "MISS")
+        self.assertEqual(self._post(full_name="Ana", _changed="full_name")["X-Preview-Cache"], "HIT")
+
+    def test_image_sections_miss_when_variants_appear(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=media)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        buf = io.BytesIO()
+        Image.new("RGB", (600, 600), "red").save(buf, "PNG")
+        _, rel_path = images.store_upload(SimpleUploadedFile("x.png", buf.getvalue()))
+        photo = images.media_url(rel_path)
+        self.addCleanup(images._manifests.discard, photo.rsplit("/", 1)[0])
+
+        for changed in ("photo", ""):
+            with self.subTest(changed=changed or "completo"):
+                self.assertEqual(self._post(photo=photo, _changed=changed)["X-Preview-Cache"], "MISS")
+                self.assertEqual(self._post(photo=photo, _changed=changed)["X-Preview-Cache"], "HIT")
+
+        images.generate_variants(
+            os.path.join(media, os.path.dirname(rel_path)), os.path.basename(rel_path), images.FIELD_VARIANTS["photo"]
+        )
+        for changed in ("photo", ""):
+            with self.subTest(changed=changed or "completo"):
+                response = self._post(photo=photo, _changed=changed)
+                self.assertEqual(response["X-Preview-Cache"], "MISS")
+                self.assertIn("srcset=", response.content.decode())
+
+    def test_stats_are_staff_only(self):
+        url = reverse("vcards:preview_cache_stats")
+        self.assertEqual(self.client.get(url).status_code, 302)
+        self._post(full_name="Ana")
+        self.user.is_staff = True
+        self.user.save()
+        stats = self.client.get(url).json()
+        self.assertEqual((stats["misses"], stats["size"]), (1, 1))
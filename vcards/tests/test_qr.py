@@ -0,0 +1,116 @@
+import io
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+from concurrent.futures import Future
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from users.models import User
+from vcards import images, qr
+from vcards.models import VCard
+
+
+class InlinePool:
+    """Corre cada trabajo al enviarlo (sin procesos hijos) y los cuenta."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def submit(self, fn, *args):
+        self.calls += 1
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+
+class QRTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media, SITE_URL="https://mibio.mx")
+        override.enable()
+        self.addCleanup(override.disable)
+        self.user = User.objects.create_user("ana", password="x")
+        self.card = VCard.objects.create(owner=self.user, slug="ana", is_published=True)
+
+    def test_style_validation(self):
+        with self.assertRaises(qr.InvalidStyle):
+            qr.make_style(self.card, "gif")
+        with self.assertRaises(qr.InvalidStyle):
+            qr.make_style(self.card, fg="rojo")
+        with self.assertRaises(qr.InvalidStyle):
+            qr.make_style(self.card, scale="grande")
+        style = qr.make_style(self.card, "svg", fg="#1a2b3c", scale=100)
+        self.assertEqual((style["fg"], style["bg"], style["scale"]), ("#1A2B3C", "#FFFFFF", 20))
+        # Sin contraste suficiente no se leería: negro sobre blanco
+        style = qr.make_style(self.card, fg="#EEEEEE", bg="#FFFFFF")
+        self.assertEqual((style["fg"], style["bg"]), ("#000000", "#FFFFFF"))
+
+    def test_same_content_same_file(self):
+        url = qr.card_url(self.card)
+        self.assertEqual(url, "https://mibio.mx/ana/")
+        style = qr.make_style(self.card)
+        key = qr.get_or_create(url, style)
+        path = qr.abs_path(key, "png")
+        mtime = os.stat(path).st_mtime_ns
+        self.assertEqual(qr.get_or_create(url, style), key)
+        self.assertEqual(os.stat(path).st_mtime_ns, mtime)
+        self.assertNotEqual(qr.key_for(url, {**style, "scale": 5}), key)
+        with open(path, "rb") as fh:
+            self.assertEqual(fh.read(8), b"\x89PNG\r\n\x1a\n")
+
+    def test_evicts_least_recently_used(self):
+        url = qr.card_url(self.card)
+        paths = []
+        for i, scale in enumerate((4, 5, 6)):
+            key = qr.get_or_create(url, qr.make_style(self.card, "svg", scale=scale))
+            path = qr.abs_path(key, "svg")
+            old = time.time() - 86400 * (3 - i)  # el primero es el más viejo
+            os.utime(path, (old, old))
+            paths.append(path)
+        qr.touch(paths[0])  # servirlo lo vuelve el más reciente
+        sizes = [os.path.getsize(p) for p in paths]
+        total = sum(sizes)
+
+        self.assertEqual(qr.evict(max_bytes=total), 0)
+        # Tope de ~2.5 archivos: baja al 90% => sólo sale el menos usado
+        self.assertEqual(qr.evict(max_bytes=total * 5 // 6), sizes[1])
+        self.assertEqual([os.path.exists(p) for p in paths], [True, False, True])
+
+    def test_card_qr_redirects_to_immutable_file(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("vcards:card_qr", args=[self.card.id, "svg"]), {"download": "1"})
+        self.assertEqual(response.status_code, 302)
+        file_response = self.client.get(response["Location"])
+        self.assertEqual(file_response["Content-Type"], "image/svg+xml")
+        self.assertIn("immutable", file_response["Cache-Control"])
+        self.assertIn('filename="ana-qr.svg"', file_response["Content-Disposition"])
+        file_response.close()
+        response = self.client.get(response["Location"], headers={"If-None-Match": file_response["ETag"]})
+        self.assertEqual(response.status_code, 304)
+
+        response = self.client.get(reverse("vcards:card_qr", args=[self.card.id, "png"]), {"bg": "blanco"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_batch_zip(self):
+        VCard.objects.create(owner=self.user, slug="beto", is_published=True)
+        pool = InlinePool()
+        patcher = mock.patch.object(images, "get_pool", return_value=pool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        cards = VCard.objects.order_by("slug")
+        data = b"".join(qr.stream_zip(cards, "svg", batch_size=1))
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            self.assertEqual(archive.namelist(), ["ana.svg", "beto.svg"])
+            self.assertTrue(archive.read("ana.svg").startswith(b"<svg"))
+        self.assertEqual(pool.calls, 2)
+
+        # Segunda exportación: todo está en disco, no se codifica nada
+        b"".join(qr.stream_zip(cards, "svg"))
+        self.assertEqual(pool.calls, 2)
@@ -0,0 +1,62 @@
+from asgiref.sync import async_to_sync
+from django.test import TestCase
+
+from users.models import User
+from vcards.models import VCard
+from vcards.slugs import SlugRegistry, normalize_slug
+
+
+class NormalizeSlugTests(TestCase):
+    def test_normalize(self):
+        self.assertEqual(normalize_slug("  Ana  Pérez--MX "), "ana-prez-mx")
+        self.assertEqual(normalize_slug(None), "")
+
+
+class SlugRegistryTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("ana", password="x")
+        # sync_seconds=0: cada consulta sincroniza lo creado en otros workers
+        self.registry = SlugRegistry(refresh_seconds=300, sync_seconds=0)
+        self.registry.warm()
+
+    def _create_elsewhere(self, slug):
+        # Como si otro worker creara la tarjeta: este set no se entera
+        VCard.objects.bulk_create([VCard(owner=self.user, slug=slug)])
+
+    def test_slug_created_in_another_worker_is_taken(self):
+        self._create_elsewhere("ana-perez")
+        self.assertTrue(self.registry.is_taken("ana-perez"))
+        self.assertTrue(async_to_sync(self.registry.ais_taken)("ana-perez"))
+
+    def test_deleted_slug_is_free(self):
+        card = VCard.objects.create(owner=self.user, slug="ana-perez")
+        VCard.objects.filter(pk=card.pk).delete()  # sin señal post_delete
+        self.assertFalse(self.registry.is_taken("ana-perez"))
+
+    def test_free_slug_does_not_hit_the_db(self):
+        registry = SlugRegistry(refresh_seconds=300, sync_seconds=300)
+        registry.warm()
+        with self.assertNumQueries(0):
+            self.assertFalse(registry.is_taken("ana-perez"))
+            self.assertFalse(async_to_sync(registry.ais_taken)("ana-perez"))
+
+    def test_sync_only_reads_recent_changes(self):
+        self._create_elsewhere("ana-perez")
+        card = VCard.objects.get(slug="ana-perez")
+        self.registry.sync()
+        self.assertIn("ana-perez", self.registry._slugs)
+        # Rename en otro worker: sin señal, lo trae la siguiente sincronización
+        VCard.objects.filter(pk=card.pk).update(slug="ana-perez-mx", updated_at=card.updated_at)
+        self.registry.sync()
+        self.assertTrue(self.registry.is_taken("ana-perez-mx"))
+        self.assertFalse(self.registry.is_taken("ana-perez"))
+
+    def test_reserved(self):
+        self.assertTrue(self.registry.is_taken("admin"))
+
+    def test_suggestions_skip_slugs_taken_elsewhere(self):
+        self._create_elsewhere("ana-perez-mx")
+        suggestions = self.registry.suggest("ana-perez")
+        self.assertNotIn("ana-perez-mx", suggestions)
+        self.assertEqual(len(suggestions), 4)
+        self.assertEqual(async_to_sync(self.registry.asuggest)("ana-perez"), suggestions)
@@ -0,0 +1,39 @@
+from asgiref.sync import async_to_sync
+from django.test import AsyncRequestFactory, RequestFactory, SimpleTestCase
+
+from vcards.streaming import aiter_sync, streaming_response
+
+
+class StreamingResponseTests(SimpleTestCase):
+    def test_wsgi_keeps_sync_iterator(self):
+        response = streaming_response(RequestFactory().get("/"), iter([b"a", b"b"]), "text/plain")
+        self.assertFalse(response.is_async)
+        self.assertEqual(b"".join(response), b"ab")
+
+    def test_asgi_gets_async_iterator(self):
+        response = streaming_response(AsyncRequestFactory().get("/"), iter([b"a", b"b"]), "text/plain")
+        self.assertTrue(response.is_async)
+
+        async def consume():
+            return [chunk async for chunk in response]
+
+        self.assertEqual(async_to_sync(consume)(), [b"a", b"b"])
+
+    def test_closing_early_closes_generator(self):
+        closed = []
+
+        def gen():
+            try:
+                yield b"a"
+                yield b"b"
+            finally:
+                closed.append(True)
+
+        async def first_chunk():
+            chunks = aiter_sync(gen())
+            chunk = await anext(chunks)
+            await chunks.aclose()
+            return chunk
+
+        self.assertEqual(async_to_sync(first_chunk)(), b"a")
+        self.assertEqual(closed, [True])
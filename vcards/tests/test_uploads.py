@@ -0,0 +1,123 @@
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import time
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from users.models import User
+from vcards import uploads
+
+# Cabecera ISO BMFF mínima: lo único que revisa finalize()
+VIDEO = b"\x00\x00\x00\x18ftypmp42" + (bytes(range(256)) * 4)[12:]  # 1024 bytes, dos chunks
+
+
+def _sha(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class UploadTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media, VIDEO_CHUNK_SIZE=512)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.user = User.objects.create_user("ana", password="x")
+        self.upload_id = uploads.start(self.user.id, len(VIDEO), "clip.mp4")["id"]
+
+    def _write(self, offset, data, checksum=None):
+        return uploads.write_chunk(
+            self.upload_id, self.user.id, offset, len(data), checksum or _sha(data), io.BytesIO(data)
+        )
+
+    def _part_size(self):
+        return os.path.getsize(uploads._paths(self.upload_id)[1])
+
+    def test_chunks_and_finalize(self):
+        self.assertEqual(self._write(0, VIDEO[:512]), 512)
+        self.assertEqual(self._write(512, VIDEO[512:]), len(VIDEO))
+        rel_path = uploads.finalize(self.upload_id, self.user.id)
+        with open(os.path.join(self.media, rel_path), "rb") as fh:
+            self.assertEqual(fh.read(), VIDEO)
+        with self.assertRaises(uploads.UploadError) as ctx:
+            uploads.status(self.upload_id, self.user.id)
+        self.assertEqual(ctx.exception.status, 404)
+
+    def test_offset_mismatch_is_409_with_real_offset(self):
+        self._write(0, VIDEO[:512])
+        with self.assertRaises(uploads.UploadError) as ctx:
+            self._write(0, VIDEO[:512])
+        self.assertEqual(ctx.exception.status, 409)
+        self.assertIn("512", str(ctx.exception))
+
+    def test_offset_mismatch_view(self):
+        self.client.force_login(self.user)
+        url = reverse("vcards:upload_video_chunk", args=[self.upload_id])
+        chunk = VIDEO[:512]
+        response = self.client.generic(
+            "PATCH", url, chunk, content_type="application/octet-stream",
+            headers={"Upload-Offset": "100", "X-Chunk-Sha256": _sha(chunk)},
+        )
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(self.client.get(url).json()["offset"], 0)
+
+    def test_bad_checksum_truncates_back(self):
+        self._write(0, VIDEO[:512])
+        with self.assertRaises(uploads.UploadError) as ctx:
+            self._write(512, VIDEO[512:], checksum="0" * 64)
+        self.assertEqual(ctx.exception.status, 422)
+        self.assertEqual(self._part_size(), 512)
+        self.assertEqual(uploads.status(self.upload_id, self.user.id)["offset"], 512)
+        # El reintento del mismo chunk entra sin 409
+        self.assertEqual(self._write(512, VIDEO[512:]), len(VIDEO))
+
+    def test_short_body_truncates_back(self):
+        data = VIDEO[:512]
+        with self.assertRaises(uploads.UploadError):
+            uploads.write_chunk(self.upload_id, self.user.id, 0, 512, _sha(data), io.BytesIO(data[:100]))
+        self.assertEqual(self._part_size(), 0)
+
+    def test_stale_lock_is_taken_over(self):
+        lock_path = uploads._paths(self.upload_id)[2]
+        open(lock_path, "w").close()
+        with self.assertRaises(uploads.UploadError) as ctx:
+            self._write(0, VIDEO[:512])
+        self.assertEqual(ctx.exception.status, 409)
+
+        old = time.time() - 600
+        os.utime(lock_path, (old, old))
+        self.assertEqual(self._write(0, VIDEO[:512]), 512)
+        self.assertFalse(os.path.exists(lock_path))
+
+    def test_unverified_bytes_of_dead_worker_are_dropped(self):
+        self._write(0, VIDEO[:512])
+        # Worker que murió a media escritura: bytes sin verificar en el .part
+        with open(uploads._paths(self.upload_id)[1], "ab") as fh:
+            fh.write(b"basura")
+        self.assertEqual(uploads.status(self.upload_id, self.user.id)["offset"], 512)
+        self.assertEqual(self._write(512, VIDEO[512:]), len(VIDEO))
+        self.assertEqual(self._part_size(), len(VIDEO))
+
+    def test_finalize_incomplete_is_409(self):
+        self._write(0, VIDEO[:512])
+        with self.assertRaises(uploads.UploadError) as ctx:
+            uploads.finalize(self.upload_id, self.user.id)
+        self.assertEqual(ctx.exception.status, 409)
+
+        # Tampoco cuentan los bytes sin verificar de un worker caído
+        with open(uploads._paths(self.upload_id)[1], "ab") as fh:
+            fh.write(VIDEO[512:])
+        with self.assertRaises(uploads.UploadError) as ctx:
+            uploads.finalize(self.upload_id, self.user.id)
+        self.assertEqual(ctx.exception.status, 409)
+        self.assertEqual(self._part_size(), 512)
+
+    def test_other_owner_is_404(self):
+        other = User.objects.create_user("beto", password="x")
+        with self.assertRaises(uploads.UploadError) as ctx:
+            uploads.status(self.upload_id, other.id)
+        self.assertEqual(ctx.exception.status, 404)
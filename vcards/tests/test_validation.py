@@ -0,0 +1,93 @@
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from users.models import User
+from vcards import validation
+from vcards.models import PREVIEW_PLACEHOLDERS, VCard
+
+
+class SafeUrlTests(SimpleTestCase):
+    def test_allowed_schemes(self):
+        for url in ("https://ejemplo.mx", "http://ejemplo.mx", "mailto:ana@ejemplo.mx", "tel:+525512345678"):
+            self.assertEqual(validation.safe_url(url), url)
+
+    def test_domain_without_scheme_gets_https(self):
+        self.assertEqual(validation.safe_url("instagram.com/ana"), "https://instagram.com/ana")
+        self.assertEqual(validation.safe_url("//x.com/ana"), "https://x.com/ana")
+        self.assertEqual(validation.safe_url("ejemplo.mx:8080/a"), "https://ejemplo.mx:8080/a")
+
+    def test_rejects_script_schemes(self):
+        for url in ("javascript:alert(1)", " JavaScript:alert(1)", "data:text/html,x", "vbscript:x"):
+            with self.assertRaises(validation.InvalidCard):
+                validation.safe_url(url)
+
+    def test_rejects_control_characters(self):
+        for url in ("java\tscript:alert(1)", "https://x.mx\r\nEMAIL:a@b.c"):
+            with self.assertRaises(validation.InvalidCard):
+                validation.safe_url(url)
+
+    def test_empty(self):
+        self.assertEqual(validation.safe_url("  "), "")
+
+
+class SafeAssetTests(SimpleTestCase):
+    def test_media_and_http(self):
+        for url in ("/media/img/ab/abcd/original.jpg", "https://cdn.ejemplo.mx/a.jpg"):
+            self.assertEqual(validation.safe_asset(url), url)
+
+    def test_rejects_css_breakout(self):
+        for url in ("/media/a.jpg') no-repeat;x:url('", "/media/../secret", "javascript:x", "/static/a.jpg"):
+            with self.assertRaises(validation.InvalidCard):
+                validation.safe_asset(url)
+
+
+class SafeColorTests(SimpleTestCase):
+    def test_hex(self):
+        self.assertEqual(validation.safe_color("#a1b2c3"), "#a1b2c3")
+
+    def test_rejects_css(self):
+        for color in ("red", "#fff", "#000000;}body{x:y", ""):
+            with self.assertRaises(validation.InvalidCard):
+                validation.safe_color(color)
+
+
+class SaveVCardTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("ana", password="x", plan=User.Plans.PRO)
+        self.client.force_login(self.user)
+
+    def post(self, **fields):
+        data = {"slug": "ana-perez", "template": "buro", **fields}
+        return self.client.post(reverse("vcards:save"), data)
+
+    def test_rejects_javascript_social(self):
+        response = self.post(**{"social_network[]": "X", "social_url[]": "javascript:alert(1)", "publish": "1"})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(VCard.objects.exists())
+
+    def test_rejects_bad_color(self):
+        response = self.post(theme_primary="#000;}</style><script>")
+        self.assertEqual(response.status_code, 400)
+
+    def test_too_long_is_form_error(self):
+        response = self.post(full_name="a" * 121)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("120", response.content.decode())
+
+    def test_publish_normalizes_urls(self):
+        response = self.post(**{"social_network[]": "Instagram", "social_url[]": "instagram.com/ana", "publish": "1"})
+        self.assertEqual(response.status_code, 200)
+        card = VCard.objects.get()
+        self.assertEqual(card.socials[0]["url"], "https://instagram.com/ana")
+        self.assertIn('href="https://instagram.com/ana"', card.published_html)
+
+    def test_placeholders_are_not_saved(self):
+        response = self.post()
+        self.assertEqual(response.status_code, 200)
+        card = VCard.objects.get()
+        self.assertEqual(card.full_name, "")
+        self.assertEqual(card.job_title, "")
+        self.assertEqual(card.section_desc, "")
+        self.assertNotIn(PREVIEW_PLACEHOLDERS["full_name"], card.published_vcf)
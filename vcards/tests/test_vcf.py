@@ -0,0 +1,39 @@
+from django.test import SimpleTestCase
+from django.utils import timezone
+
+from vcards import vcf
+from vcards.models import VCard
+
+
+def _card(**fields):
+    defaults = {"pk": 7, "slug": "ana-perez", "full_name": "Ana Pérez", "updated_at": timezone.now()}
+    return VCard(**{**defaults, **fields})
+
+
+def _properties(text):
+    # Desdobla las líneas continuadas y devuelve el nombre de cada propiedad
+    unfolded = text.replace("\r\n ", "")
+    return [line.split(":", 1)[0].split(";")[0] for line in unfolded.split("\r\n") if line]
+
+
+class RenderVcfTests(SimpleTestCase):
+    def test_crlf_in_urls_does_not_inject_properties(self):
+        card = _card(
+            contacts=[{"label": "Sitio", "value": "https://a.mx\r\nEMAIL:x@evil.mx", "type": "url"}],
+            socials=[{"network": "X\r\nFN:Otro", "url": "https://x.com/ana\nTEL:123"}],
+        )
+        props = _properties(vcf.render_vcf(card))
+        self.assertNotIn("EMAIL", props)
+        self.assertNotIn("TEL", props)
+        self.assertEqual(props.count("FN"), 1)
+        self.assertIn("X-SOCIALPROFILE", props)
+
+    def test_text_values_are_escaped(self):
+        text = vcf.render_vcf(_card(job_title="CEO\rEMAIL:x@evil.mx", section_desc="a;b,c\nd"))
+        self.assertIn(r"TITLE:CEO\nEMAIL:x@evil.mx", text)
+        self.assertIn(r"NOTE:a\;b\,c\nd", text)
+        self.assertNotIn("EMAIL", _properties(text))
+
+    def test_lines_are_folded(self):
+        text = vcf.render_vcf(_card(section_desc="á" * 100))
+        self.assertTrue(all(len(line.encode()) <= 75 for line in text.split("\r\n")))
@@ -0,0 +1,268 @@
+# vcards/uploads.py
+"""
+Upload de video por chunks, reanudable.
+
+Protocolo (lo usa el tile de video del editor):
+  1) POST  /vcards/upload-video/                 size, filename
+       -> {"id", "offset": 0, "chunk_size"}
+  2) PATCH /vcards/upload-video/<id>/            cuerpo crudo (octet-stream)
+       headers: Upload-Offset: <bytes ya enviados>
+                X-Chunk-Sha256: <sha256 hex del chunk>
+       -> {"offset": <nuevo offset>}
+  3) GET   /vcards/upload-video/<id>/            -> {"offset", "size"}
+       (para reanudar después de un corte: se continúa desde offset)
+  4) POST  /vcards/upload-video/<id>/finalize/   -> {"url"}
+
+Cada chunk se escribe directo al archivo .part leyendo el stream del
+request en bloques de 64 KB (nunca request.body ni los upload handlers de
+Django), así la memoria del worker no depende del tamaño del video. Si el
+checksum no coincide, el .part se trunca al offset anterior.
+
+El estado vive en disco (MEDIA_ROOT/uploads/<id>.json + <id>.part), así
+que cualquier worker puede recibir el siguiente chunk. El .json guarda el
+offset verificado (hasta el último chunk con checksum correcto): si un
+worker muere a media escritura el .part queda más largo, status() no
+cuenta esos bytes y quien tome el lock después lo recorta.
+"""
+import hashlib
+import json
+import os
+import time
+import uuid
+
+from django.conf import settings
+
+UPLOAD_DIR = "uploads"
+VIDEO_DIR = "video"
+READ_BLOCK = 64 * 1024
+
+ALLOWED_EXTENSIONS = ("mp4", "m4v", "mov", "webm")
+
+
+class UploadError(Exception):
+    """Error del cliente; status es el código HTTP sugerido."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def chunk_size():
+    return getattr(settings, "VIDEO_CHUNK_SIZE", 4 * 1024 * 1024)
+
+
+def max_size():
+    return getattr(settings, "VIDEO_MAX_UPLOAD_BYTES", 250 * 1024 * 1024)
+
+
+def _upload_dir():
+    path = os.path.join(settings.MEDIA_ROOT, UPLOAD_DIR)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _paths(upload_id):
+    base = os.path.join(_upload_dir(), str(upload_id))
+    return base + ".json", base + ".part", base + ".lock"
+
+
+# ------------------------------ Estado ------------------------------
+def start(owner_id, size, filename):
+    """Crea una subida vacía y devuelve su estado."""
+    try:
+        size = int(size)
+    except (TypeError, ValueError):
+        raise UploadError("Tamaño inválido")
+    if size <= 0:
+        raise UploadError("Tamaño inválido")
+    if size > max_size():
+        raise UploadError("El video es demasiado grande", status=413)
+
+    ext = os.path.splitext(filename or "")[1].lower().lstrip(".")
+    if ext not in ALLOWED_EXTENSIONS:
+        raise UploadError("Formato de video no soportado")
+
+    purge_stale()
+    upload_id = str(uuid.uuid4())
+    state_path, part_path, _ = _paths(upload_id)
+    state = {"id": upload_id, "owner": owner_id, "size": size, "ext": ext, "created": time.time(), "offset": 0}
+    open(part_path, "wb").close()
+    _save(state_path, state)
+    return status(upload_id, owner_id)
+
+
+def _save(state_path, state):
+    # Escribe aparte y reemplaza: otro worker nunca lee un .json a medias
+    tmp_path = state_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump(state, fh)
+    os.replace(tmp_path, state_path)
+
+
+def _load(upload_id, owner_id):
+    state_path, part_path, _ = _paths(upload_id)
+    try:
+        with open(state_path, encoding="utf-8") as fh:
+            state = json.load(fh)
+    except (OSError, ValueError):
+        raise UploadError("La subida no existe o expiró", status=404)
+    if state["owner"] != owner_id:
+        raise UploadError("La subida no existe o expiró", status=404)
+    return state, part_path
+
+
+def _offset(state, part_path):
+    """Offset verificado (subidas de antes del campo: el tamaño del .part)."""
+    return state.get("offset", os.path.getsize(part_path))
+
+
+def _verified(state, part_path):
+    """
+    Con el lock tomado: recorta del .part los bytes sin verificar (worker
+    que murió a media escritura) y devuelve el offset verificado.
+    """
+    offset = _offset(state, part_path)
+    if os.path.getsize(part_path) > offset:
+        os.truncate(part_path, offset)
+    return offset
+
+
+def status(upload_id, owner_id):
+    state, part_path = _load(upload_id, owner_id)
+    return {
+        "id": state["id"],
+        "size": state["size"],
+        "offset": min(_offset(state, part_path), os.path.getsize(part_path)),
+        "chunk_size": chunk_size(),
+    }
+
+
+class _Lock:
+    """Lock por subida (archivo O_EXCL): evita dos chunks simultáneos."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def __enter__(self):
+        try:
+            os.close(os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        except FileExistsError:
+            # Lock huérfano de un worker que murió a media escritura
+            if time.time() - os.path.getmtime(self.path) < 300:
+                raise UploadError("Hay otro chunk en curso", status=409)
+            os.utime(self.path)
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+# ------------------------------ Chunks ------------------------------
+def write_chunk(upload_id, owner_id, offset, length, checksum, stream):
+    """
+    Agrega length bytes leídos de stream en offset. El offset tiene que ser
+    exactamente el tamaño actual del .part (si no, 409 con el offset real
+    para que el cliente reanude desde ahí).
+    """
+    state, part_path = _load(upload_id, owner_id)
+    try:
+        offset, length = int(offset), int(length)
+    except (TypeError, ValueError):
+        raise UploadError("Faltan Upload-Offset / Content-Length")
+    if length <= 0 or length > chunk_size():
+        raise UploadError("Tamaño de chunk inválido", status=413)
+    if offset + length > state["size"]:
+        raise UploadError("El chunk excede el tamaño declarado", status=413)
+    checksum = (checksum or "").strip().lower()
+    if len(checksum) != 64:
+        raise UploadError("Falta X-Chunk-Sha256")
+
+    state_path, _, lock_path = _paths(upload_id)
+    with _Lock(lock_path):
+        # Estado fresco: otro worker pudo escribir el chunk anterior
+        state, part_path = _load(upload_id, owner_id)
+        current = _verified(state, part_path)
+        if offset != current:
+            raise UploadError(f"Offset esperado: {current}", status=409)
+
+        digest = hashlib.sha256()
+        written = 0
+        with open(part_path, "r+b") as out:
+            out.seek(offset)
+            try:
+                while written < length:
+                    block = stream.read(min(READ_BLOCK, length - written))
+                    if not block:
+                        break
+                    digest.update(block)
+                    out.write(block)
+                    written += len(block)
+                ok = written == length and digest.hexdigest() == checksum
+            except OSError:
+                # Conexión cortada a media lectura
+                ok = False
+            if not ok:
+                out.truncate(offset)
+        if not ok:
+            raise UploadError("Chunk incompleto o checksum inválido", status=422)
+        state["offset"] = offset + written
+        _save(state_path, state)
+        return offset + written
+
+
+# ----------------------------- Finalizar -----------------------------
+def _looks_like_video(path, ext):
+    with open(path, "rb") as fh:
+        head = fh.read(12)
+    if ext == "webm":
+        return head[:4] == b"\x1a\x45\xdf\xa3"  # EBML
+    return head[4:8] == b"ftyp"  # ISO BMFF (mp4/mov)
+
+
+def finalize(upload_id, owner_id):
+    """
+    Verifica que llegó todo, calcula el hash (en streaming) y mueve el .part
+    a media/video/<h[:2]>/<h>.<ext> con os.replace (atómico). Devuelve la
+    ruta relativa a MEDIA_ROOT.
+    """
+    _load(upload_id, owner_id)
+    state_path, _, lock_path = _paths(upload_id)
+    with _Lock(lock_path):
+        state, part_path = _load(upload_id, owner_id)
+        if _verified(state, part_path) != state["size"]:
+            raise UploadError("La subida está incompleta", status=409)
+        if not _looks_like_video(part_path, state["ext"]):
+            raise UploadError("El archivo no es un video válido")
+
+        digest = hashlib.sha256()
+        with open(part_path, "rb") as fh:
+            for block in iter(lambda: fh.read(READ_BLOCK), b""):
+                digest.update(block)
+        h = digest.hexdigest()
+
+        rel_path = os.path.join(VIDEO_DIR, h[:2], f"{h}.{state['ext']}")
+        abs_path = os.path.join(settings.MEDIA_ROOT, rel_path)
+        os.makedirs(os.path.dirname(abs_path), exist_ok=True)
+        if os.path.exists(abs_path):
+            os.unlink(part_path)  # mismo contenido ya subido
+        else:
+            os.replace(part_path, abs_path)
+        os.unlink(state_path)
+    return rel_path
+
+
+def purge_stale():
+    """Borra subidas abandonadas (más viejas que VIDEO_UPLOAD_TTL)."""
+    ttl = getattr(settings, "VIDEO_UPLOAD_TTL", 24 * 3600)
+    now = time.time()
+    base = _upload_dir()
+    for name in os.listdir(base):
+        path = os.path.join(base, name)
+        try:
+            if now - os.path.getmtime(path) > ttl:
+                os.unlink(path)
+        except OSError:
+            pass
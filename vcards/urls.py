@@ -1,12 +1,36 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
 app_name = "vcards"
 
+# Vistas calientes del editor con versión async (apreview, acheck_slug,
+# ...): sólo se enrutan bajo ASGI (ver config/asgi.py). Bajo WSGI van las
+# síncronas, sin pagar async_to_sync en cada request.
+_async = "a" if settings.ASYNC_VIEWS else ""
+
+
+def _editor_view(name):
+    return getattr(views, _async + name)
+
+
 urlpatterns = [
     path("create/", views.create_vcard, name="create"),
-    path("preview/", views.preview, name="preview"),
+    path("preview/", _editor_view("preview"), name="preview"),
+    path("preview/stats/", views.preview_cache_stats, name="preview_cache_stats"),
+    path("drafts/", _editor_view("draft_open"), name="draft_open"),
+    path("drafts/<int:draft_id>/patch/", _editor_view("draft_patch"), name="draft_patch"),
     # NUEVO: validación de slug
-    path("check-slug/", views.check_slug, name="check_slug"),
-    path("set-global/", views.set_global, name="set_global"),
+    path("check-slug/", _editor_view("check_slug"), name="check_slug"),
+    path("set-global/", _editor_view("set_global"), name="set_global"),
+    path("set-globals/", _editor_view("set_globals"), name="set_globals"),
+    path("save/", views.save_vcard, name="save"),
+    path("upload-image/", views.upload_image, name="upload_image"),
+    path("upload-video/", views.upload_video, name="upload_video"),
+    path("upload-video/<uuid:upload_id>/", views.upload_video_chunk, name="upload_video_chunk"),
+    path("upload-video/<uuid:upload_id>/finalize/", views.upload_video_finalize, name="upload_video_finalize"),
+    path("import/", views.import_cards, name="import_cards"),
+    path("<int:card_id>/vcf/", views.card_vcf, name="card_vcf"),
+    path("<int:card_id>/qr.<str:fmt>", views.card_qr, name="card_qr"),
+    path("qr/<str:key>.<str:fmt>", views.qr_file, name="qr_file"),
 ]
@@ -0,0 +1,123 @@
+# vcards/validation.py
+"""
+Validación del contenido de una tarjeta antes de guardarlo o publicarlo.
+
+El snapshot público (VCard.publish) se sirve desde el dominio del sitio:
+lo que el usuario escribe termina en href, en url('...') de un style y
+dentro de un <style>. Por eso:
+
+  - URLs (redes, contactos tipo url): sólo http, https, mailto y tel.
+    Sin esquema ("instagram.com/ana") se asume https://.
+  - Imágenes y video: archivos de MEDIA_URL (lo que sube el editor) o
+    http(s), sin comillas ni paréntesis (van dentro de url('...')).
+  - Colores: #rrggbb.
+  - Textos: el largo máximo de cada campo del modelo (en Postgres un
+    valor más largo es un DataError, no un error de formulario).
+
+Ningún valor puede traer caracteres de control (saltos de línea dentro
+de una URL partirían también el .vcf, ver vcards/vcf.py).
+"""
+import re
+from urllib.parse import urlsplit
+
+from django.conf import settings
+
+SAFE_SCHEMES = ("http", "https", "mailto", "tel")
+_COLOR = re.compile(r"^#[0-9a-fA-F]{6}$")
+_CONTROL = re.compile(r"[\x00-\x1f\x7f]")
+_UNSAFE_IN_CSS = re.compile(r"[\s'\"()\\<>]")
+
+
+class InvalidCard(ValueError):
+    pass
+
+
+def has_control_chars(value):
+    return bool(_CONTROL.search(value or ""))
+
+
+def safe_url(value, label="Enlace"):
+    """
+    URL lista para un href: "" si está vacía, con https:// si no trae
+    esquema. InvalidCard si el esquema no es uno de SAFE_SCHEMES.
+    """
+    value = (value or "").strip()
+    if not value:
+        return ""
+    if has_control_chars(value):
+        raise InvalidCard(f"{label}: la URL tiene caracteres no válidos")
+    if value.startswith("//"):
+        value = "https:" + value
+    scheme = urlsplit(value).scheme.lower()
+    if not scheme or (scheme not in SAFE_SCHEMES and "." in scheme):
+        # "instagram.com/ana" o "instagram.com:443/ana": dominio sin esquema
+        value, scheme = "https://" + value, "https"
+    if scheme not in SAFE_SCHEMES:
+        raise InvalidCard(f"{label}: sólo se permiten enlaces http, https, mailto o tel")
+    return value
+
+
+def safe_asset(value, label="Imagen"):
+    """Archivo subido (MEDIA_URL) o URL http(s) que se puede poner en url('...')."""
+    value = (value or "").strip()
+    if not value:
+        return ""
+    media = "/" + settings.MEDIA_URL.strip("/") + "/"
+    if _UNSAFE_IN_CSS.search(value) or has_control_chars(value):
+        raise InvalidCard(f"{label}: la URL tiene caracteres no válidos")
+    if value.startswith(media) and ".." not in value.split("/"):
+        return value
+    if urlsplit(value).scheme.lower() in ("http", "https"):
+        return value
+    raise InvalidCard(f"{label}: URL no válida")
+
+
+def safe_color(value, label="Color"):
+    value = (value or "").strip()
+    if not _COLOR.match(value):
+        raise InvalidCard(f"{label}: usa el formato #RRGGBB")
+    return value
+
+
+def _max_length(value, field, label):
+    from .models import VCard
+
+    limit = VCard._meta.get_field(field).max_length
+    if len(value) > limit:
+        raise InvalidCard(f"{label}: máximo {limit} caracteres")
+    return value
+
+
+def clean_context(ctx):
+    """
+    Copia validada de un contexto del editor (vcards.views._preview_context)
+    con las URLs normalizadas. InvalidCard con el primer error encontrado.
+    """
+    from .models import DEFAULT_THEME, VCard
+
+    if ctx["template"] not in VCard.Templates.values:
+        raise InvalidCard("Plantilla no válida")
+    clean = dict(ctx)
+    clean["images_view"] = _max_length(ctx["images_view"], "gallery_view", "Vista de galería")
+    clean["full_name"] = _max_length(ctx["full_name"], "full_name", "Nombre")
+    clean["job_title"] = _max_length(ctx["job_title"], "job_title", "Puesto")
+    clean["section_title"] = _max_length(ctx["section_title"], "section_title", "Título de la sección")
+    for field, label in (("photo", "Foto"), ("banner", "Portada"), ("video_url", "Video")):
+        clean[field] = _max_length(safe_asset(ctx[field], label), field, label)
+    for key in DEFAULT_THEME:
+        clean[key] = safe_color(ctx[key]).upper()
+    clean["images"] = [safe_asset(img, "Galería") for img in ctx["images"]]
+
+    clean["contacts"] = []
+    for contact in ctx["contacts"]:
+        contact = dict(contact)
+        if contact["type"] == "url":
+            contact["value"] = safe_url(contact["value"], contact["label"] or "Sitio web")
+        elif has_control_chars(contact["value"]):
+            raise InvalidCard(f"{contact['label'] or 'Contacto'}: caracteres no válidos")
+        clean["contacts"].append(contact)
+    clean["socials"] = [
+        {**social, "url": safe_url(social["url"], social["network"] or "Red social")}
+        for social in ctx["socials"]
+    ]
+    return clean
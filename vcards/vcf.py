@@ -0,0 +1,186 @@
+# vcards/vcf.py
+"""
+Archivos vCard (.vcf, RFC 6350 / versión 4.0) de las tarjetas y
+exportación de una carpeta como zip en streaming.
+
+  - render_vcf(card): texto del .vcf a partir de los campos del modelo.
+  - cached_vcf(card): lo mismo, en la caché de Django bajo una llave con
+    la versión de la tarjeta (id + updated_at): editar la tarjeta cambia
+    la llave, no hay que invalidar nada.
+  - stream_zip(cards): genera los bytes de un zip con un .vcf por tarjeta
+    conforme se van generando (vcards/zipstream.py).
+
+La versión pública (la que descarga quien visita la tarjeta) se genera
+al publicar y se guarda en VCard.published_vcf, igual que el HTML.
+"""
+import re
+import uuid
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+
+from . import images
+from .zipstream import iter_zip
+
+CRLF = "\r\n"
+_CONTROL = re.compile(r"[\x00-\x1f\x7f]")
+
+# Red del editor -> TYPE de X-SOCIALPROFILE (lo que entienden iOS/macOS)
+_SOCIAL_TYPES = {"X": "twitter"}
+
+
+def _absolute(url):
+    if url.startswith(("http://", "https://")):
+        return url
+    return getattr(settings, "SITE_URL", "").rstrip("/") + url
+
+
+def _escape(value):
+    """Escapa texto de una propiedad (RFC 6350 §3.4)."""
+    value = str(value).replace("\r\n", "\n").replace("\r", "\n")
+    return _CONTROL.sub("", (
+        value.replace("\\", "\\\\").replace(",", "\\,").replace(";", "\\;").replace("\n", "\\n")
+    ))
+
+
+def _uri(value):
+    """
+    Valor URI (URL, X-SOCIALPROFILE, PHOTO): va sin escapar, así que se
+    quitan los caracteres de control; un CR/LF agregaría propiedades.
+    """
+    return _CONTROL.sub("", str(value))
+
+
+def _fold(line):
+    """Parte la línea en trozos de ≤ 75 octetos sin cortar caracteres UTF-8."""
+    if len(line.encode("utf-8")) <= 75:
+        return line
+    parts, current, size = [], "", 0
+    for ch in line:
+        n = len(ch.encode("utf-8"))
+        if size + n > (75 if not parts else 74):  # las continuaciones llevan un espacio
+            parts.append(current)
+            current, size = "", 0
+        current += ch
+        size += n
+    parts.append(current)
+    return (CRLF + " ").join(parts)
+
+
+def _split_name(full_name):
+    """("Pérez", "Ana María") — el último token como apellido, sin más reglas."""
+    tokens = full_name.split()
+    if len(tokens) < 2:
+        return full_name, ""
+    return tokens[-1], " ".join(tokens[:-1])
+
+
+def render_vcf(card):
+    """Texto del .vcf de card (str con CRLF)."""
+    full_name = card.full_name or card.slug
+    family, given = _split_name(full_name)
+    lines = [
+        "BEGIN:VCARD",
+        "VERSION:4.0",
+        f"UID:urn:uuid:{uuid.uuid5(uuid.NAMESPACE_URL, f'mibio:vcard:{card.pk}')}",
+        f"FN:{_escape(full_name)}",
+        f"N:{_escape(family)};{_escape(given)};;;",
+    ]
+    if card.job_title:
+        lines.append(f"TITLE:{_escape(card.job_title)}")
+
+    for contact in card.contacts:
+        value = (contact.get("value") or "").strip()
+        if not value:
+            continue
+        kind = contact.get("type")
+        if kind == "email":
+            lines.append(f"EMAIL;TYPE=work:{_escape(value)}")
+        elif kind == "number":
+            digits = re.sub(r"[^\d+]", "", value)
+            lines.append(f'TEL;VALUE=uri;TYPE="voice,cell":tel:{digits}')
+        elif kind == "address":
+            # Dirección libre del editor: va completa en "calle"
+            lines.append(f"ADR;TYPE=work:;;{_escape(value)};;;;")
+        elif kind == "url":
+            lines.append(f"URL:{_uri(value)}")
+        else:
+            label = contact.get("label") or "Dato"
+            lines.append(f"NOTE:{_escape(f'{label}: {value}')}")
+
+    for social in card.socials:
+        url = (social.get("url") or "").strip()
+        if url:
+            network = social.get("network") or ""
+            kind = _SOCIAL_TYPES.get(network, network.lower() or "other")
+            kind = re.sub(r"[^a-z0-9-]", "", kind) or "other"  # parámetro: sin ":" ni ";"
+            lines.append(f"X-SOCIALPROFILE;TYPE={kind}:{_uri(url)}")
+
+    if card.is_published:
+        lines.append(f"URL;TYPE=home:{_absolute(reverse('public_card', args=[card.slug]))}")
+    if card.photo:
+        lines.append(f"PHOTO:{_uri(_absolute(images.variant_url(card.photo, 'avatar', 'jpg')))}")
+    if card.section_desc:
+        lines.append(f"NOTE:{_escape(card.section_desc)}")
+    updated = card.updated_at or timezone.now()
+    lines.append(f"REV:{updated.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')}")
+    lines.append("END:VCARD")
+    return CRLF.join(_fold(line) for line in lines) + CRLF
+
+
+def filename(card):
+    return f"{card.slug}.vcf"
+
+
+# ------------------------------- Caché -------------------------------
+def cache_key(card):
+    return f"vcards:vcf:{card.pk}:{card.updated_at.timestamp():.6f}"
+
+
+def cached_vcf(card):
+    key = cache_key(card)
+    text = cache.get(key)
+    if text is None:
+        text = render_vcf(card)
+        cache.set(key, text, getattr(settings, "VCF_CACHE_TTL", 86400))
+    return text
+
+
+def cached_vcfs(cards):
+    """[(card, texto)] para un lote: un get_many y un set_many a la caché."""
+    keys = {cache_key(card): card for card in cards}
+    found = cache.get_many(keys)
+    missing = {key: render_vcf(card) for key, card in keys.items() if key not in found}
+    if missing:
+        cache.set_many(missing, getattr(settings, "VCF_CACHE_TTL", 86400))
+    texts = {**found, **missing}
+    return [(card, texts[key]) for key, card in keys.items()]
+
+
+# ----------------------------- Zip en streaming -----------------------------
+def stream_zip(cards, batch_size=500):
+    """
+    Bytes de un zip con un .vcf por tarjeta, entregados conforme se
+    generan (vcards/zipstream.py). cards debe ser un queryset: se lee con
+    iterator() y la caché se consulta por lotes.
+    """
+    return iter_zip(_entries(cards, batch_size))
+
+
+def _entries(cards, batch_size):
+    batch = []
+    for card in cards.iterator(chunk_size=batch_size):
+        batch.append(card)
+        if len(batch) >= batch_size:
+            yield from _batch_entries(batch)
+            batch = []
+    yield from _batch_entries(batch)
+
+
+def _batch_entries(batch):
+    for card, text in cached_vcfs(batch):
+        stamp = timezone.localtime(card.updated_at).timetuple()[:6]
+        yield filename(card), stamp, text.encode("utf-8")
@@ -1,33 +1,65 @@
 # vcards/views.py
-from django.contrib.auth.decorators import login_required
+import json
+import os
+import re
+from contextlib import nullcontext
+
+from django.contrib.auth.decorators import login_required, user_passes_test
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError
 from django.http import (
+    FileResponse,
+    Http404,
     HttpResponseBadRequest,
+    HttpResponseForbidden,
     HttpResponse,
     JsonResponse,
 )
-from django.shortcuts import render
-from django.views.decorators.http import require_GET
+from django.shortcuts import redirect, render
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from django.utils.text import slugify
+from django.views.decorators.http import require_GET, require_http_methods, require_POST
 from django.template.loader import render_to_string
-import re
 
-# Intentamos importar el modelo. Si aún no existe, seguimos sin romper.
-try:
-    from .models import VCard  # ajusta si tu modelo se llama distinto
-except Exception:  # pragma: no cover
-    VCard = None
+from . import drafts, images, importer, preferences, qr, uploads, validation, vcf
+from .preview_cache import preview_cache
+from .slugs import SLUG_MIN_LENGTH, normalize_slug, slug_registry
+from .streaming import streaming_response
 
+from analytics.views import client_ip, is_bot
+from folders.models import Folder
+from users import quotas
+from .models import (
+    DEFAULT_THEME,
+    PREVIEW_PLACEHOLDERS,
+    VCard,
+    VCardDraft,
+    public_cache_key,
+    public_vcf_cache_key,
+)
 
-# -------------------- Util: flags globales en sesión --------------------
+
+# ------------------- Util: flags globales del editor -------------------
 def _get_globals(request):
     """
-    Devuelve un dict con los flags 'globales' guardados en sesión, p.ej.:
-      { "assets": True, "name": False, "title": True }
+    Dict con los flags 'globales' activos del usuario, p.ej.:
+      { "assets": True, "title": True }
+    Se lee una vez por request (vcards/preferences.py, con caché).
     """
-    g = request.session.get("vc_global", {})
-    # normaliza a bool
-    for k, v in list(g.items()):
-        g[k] = bool(v)
-    return g
+    if not hasattr(request, "_vc_globals"):
+        request._vc_globals = preferences.get_globals(request.user, request.session)
+    return request._vc_globals
+
+
+async def _aget_globals(request):
+    """_get_globals() para vistas async (sesión, caché y ORM async)."""
+    if not hasattr(request, "_vc_globals"):
+        user = await request.auser()
+        request._vc_globals = await preferences.aget_globals(user, request.session)
+    return request._vc_globals
 
 
 # ------------------------------ Vistas UI -------------------------------
@@ -44,45 +76,33 @@ def create_vcard(request):
     return render(request, "vcards/create.html", ctx)
 
 
-@login_required
-def preview(request):
+def _preview_context(data):
     """
-    Recibe los valores del formulario (POST) y devuelve SOLO el HTML
-    interno para el contenedor #preview (fragmento).
+    Normaliza los valores del form del editor (QueryDict) al contexto que
+    usa vcards/_preview.html. El resultado sólo contiene tipos JSON
+    (str/bool/list/dict) para poder usarlo como llave de caché.
     """
-    if request.method != "POST":
-        return HttpResponseBadRequest("HTMX preview only accepts POST")
-
     # Lee valores del form (con defaults para no romper)
-    template = request.POST.get("template", "buro")
-    full_name = request.POST.get("full_name", "").strip() or "Nombre Apellido"
-    job_title = request.POST.get("job_title", "").strip() or "Profesión / Puesto"
-
-    # Colores (con defaults)
-    theme_primary = request.POST.get("theme_primary", "#517AFA")
-    theme_secondary = request.POST.get("theme_secondary", "#C5FEFF")
-    profile_text_primary = request.POST.get("profile_text_primary", "#061244")
-    profile_text_secondary = request.POST.get("profile_text_secondary", "#76839B")
-    text_primary = request.POST.get("text_primary", "#061244")
-    text_secondary = request.POST.get("text_secondary", "#76839B")
-    card_bg = request.POST.get("card_bg", "#0D1626")
-    block_bg = request.POST.get("block_bg", "#111827")
+    template = data.get("template", "buro")
+    full_name = data.get("full_name", "").strip() or PREVIEW_PLACEHOLDERS["full_name"]
+    job_title = data.get("job_title", "").strip() or PREVIEW_PLACEHOLDERS["job_title"]
+
+    # Colores (con defaults, ver vcards.models.DEFAULT_THEME)
+    theme = {key: data.get(key, default) for key, default in DEFAULT_THEME.items()}
 
     # Assets
-    photo = request.POST.get("photo", "")
-    banner = request.POST.get("banner", "")
-    video_url = request.POST.get("video_url", "")
+    photo = data.get("photo", "")
+    banner = data.get("banner", "")
+    video_url = data.get("video_url", "")
 
     # Secciones simples
-    section_title = request.POST.get("section_title", "Acerca de")
-    section_desc = request.POST.get(
-        "section_desc", "Escribe una breve descripción para tu vCard."
-    )
+    section_title = data.get("section_title", "Acerca de")
+    section_desc = data.get("section_desc", PREVIEW_PLACEHOLDERS["section_desc"])
 
     # Contactos
-    contact_labels = request.POST.getlist("contact_label[]")
-    contact_values = request.POST.getlist("contact_value[]")
-    contact_types = request.POST.getlist("contact_type[]")
+    contact_labels = data.getlist("contact_label[]")
+    contact_values = data.getlist("contact_value[]")
+    contact_types = data.getlist("contact_type[]")
     contacts = []
     for i in range(max(len(contact_labels), len(contact_values), len(contact_types))):
         contacts.append(
@@ -94,10 +114,10 @@ def preview(request):
         )
 
     # Social
-    social_networks = request.POST.getlist("social_network[]")
-    social_urls = request.POST.getlist("social_url[]")
-    social_labels = request.POST.getlist("social_label[]")
-    social_descs = request.POST.getlist("social_desc[]")
+    social_networks = data.getlist("social_network[]")
+    social_urls = data.getlist("social_url[]")
+    social_labels = data.getlist("social_label[]")
+    social_descs = data.getlist("social_desc[]")
     socials = []
     L = max(len(social_networks), len(social_urls), len(social_labels), len(social_descs))
     for i in range(L):
@@ -111,25 +131,18 @@ def preview(request):
         )
 
     # Galería
-    images_view = request.POST.get("images_view", "list")
-    images_bg = request.POST.get("images_card_bg", "0") == "1"
-    images = request.POST.getlist("images[]")
+    images_view = data.get("images_view", "list")
+    images_bg = data.get("images_card_bg", "0") == "1"
+    images = data.getlist("images[]")
 
-    ctx = {
+    return {
         "template": template,
         "full_name": full_name,
         "job_title": job_title,
         "photo": photo,
         "banner": banner,
         "video_url": video_url,
-        "theme_primary": theme_primary,
-        "theme_secondary": theme_secondary,
-        "profile_text_primary": profile_text_primary,
-        "profile_text_secondary": profile_text_secondary,
-        "text_primary": text_primary,
-        "text_secondary": text_secondary,
-        "card_bg": card_bg,
-        "block_bg": block_bg,
+        **theme,
         "section_title": section_title,
         "section_desc": section_desc,
         "contacts": contacts,
@@ -137,66 +150,754 @@ def preview(request):
         "images_view": images_view,
         "images_bg": images_bg,
         "images": images,
-        # flags para toggles/pills
-        "globals": _get_globals(request),
     }
-    return render(request, "vcards/_preview.html", ctx)
 
 
-# ------------------------ API: toggles globales -------------------------
+# Secciones del preview que se pueden re-renderizar solas (ver
+# templates/vcards/preview/). Cada una declara qué llaves del contexto usa.
+PREVIEW_SECTIONS = {
+    "colors": (
+        "theme_primary", "theme_secondary", "profile_text_primary",
+        "profile_text_secondary", "text_primary", "text_secondary",
+        "card_bg", "block_bg",
+    ),
+    "assets": ("photo", "banner", "video_url"),
+    "header": ("full_name", "job_title"),
+    "about": ("section_title", "section_desc"),
+    "contacts": ("contacts",),
+    "socials": ("socials",),
+    "gallery": ("images", "images_view", "images_bg"),
+}
+
+# Campo del form -> sección que afecta. None = el preview no lo muestra
+# (no hay nada que re-renderizar). Campos desconocidos => render completo.
+_FIELD_SECTION = {
+    field: section
+    for section, fields in PREVIEW_SECTIONS.items()
+    for field in fields
+}
+_FIELD_SECTION.update({
+    **{f"{name}_picker": "colors" for name in PREVIEW_SECTIONS["colors"]},
+    "contact_label[]": "contacts",
+    "contact_value[]": "contacts",
+    "contact_type[]": "contacts",
+    "social_network[]": "socials",
+    "social_url[]": "socials",
+    "social_label[]": "socials",
+    "social_desc[]": "socials",
+    "images[]": "gallery",
+    "images_card_bg": "gallery",
+    "tiktok_url": None,
+    "contact_section_title": None,
+    "social_section_title": None,
+    "links_section_title": None,
+    "links_section_desc": None,
+    "link_url[]": None,
+    "link_title[]": None,
+    "link_subtitle[]": None,
+})
+
+
+def _changed_section(request, field=None):
+    """
+    Determina qué sección cambió a partir del campo que disparó el request:
+      - '_changed': lo agrega el JS del editor (htmx:configRequest)
+      - 'HX-Trigger-Name': lo manda HTMX cuando el propio input tiene hx-post
+    '_changed' manda sobre el header: vacío significa que cambiaron varios
+    campos y hace falta el completo.
+    Devuelve (conocido, sección). Si no se sabe, conocido=False => completo.
+    """
+    if field is None:
+        if "_changed" in request.POST:
+            field = request.POST["_changed"]
+        else:
+            field = request.headers.get("HX-Trigger-Name") or ""
+    if field not in _FIELD_SECTION:
+        return False, None
+    return True, _FIELD_SECTION[field]
+
+
+# Secciones con imágenes: su HTML depende también de las variantes ya
+# generadas (srcset), así que entran en la llave de la caché del preview
+_IMAGE_FIELDS = {"assets": ("photo", "banner"), "gallery": ("images",)}
+
+
+def _variants_key(ctx, sections):
+    urls = []
+    for section in sections:
+        for field in _IMAGE_FIELDS.get(section, ()):
+            value = ctx[field]
+            urls += value if isinstance(value, list) else [value]
+    return images.variants_state(urls)
+
+
+def _render_preview(request, ctx, known, section, flags=None):
+    """
+    Respuesta del preview: la sección que cambió (OOB) o el completo.
+    flags: los globales ya leídos (vista async); si no, se leen aquí.
+    """
+    if known and section is None:
+        # El campo no se refleja en el preview: nada que cambiar
+        response = HttpResponse("")
+        response["HX-Reswap"] = "none"
+        return response
+
+    if known:
+        template_name = f"vcards/preview/_{section}.html"
+        section_ctx = {k: ctx[k] for k in PREVIEW_SECTIONS[section]}
+        section_ctx["oob"] = True
+        key_ctx = {"_section": section, "_variants": _variants_key(ctx, [section]), **section_ctx}
+        html, hit = preview_cache.get_or_render(
+            key_ctx, lambda: render_to_string(template_name, section_ctx)
+        )
+        response = HttpResponse(html)
+        response["HX-Reswap"] = "none"
+    else:
+        # flags para toggles/pills
+        ctx["globals"] = flags if flags is not None else _get_globals(request)
+        key_ctx = {"_variants": _variants_key(ctx, _IMAGE_FIELDS), **ctx}
+        html, hit = preview_cache.get_or_render(
+            key_ctx, lambda: render_to_string("vcards/_preview.html", ctx)
+        )
+        response = HttpResponse(html)
+
+    response["X-Preview-Cache"] = "HIT" if hit else "MISS"
+    return response
+
+
 @login_required
-def set_global(request):
+def preview(request):
     """
-    Guarda un flag global en sesión. Espera POST con:
-      - field: 'assets' | 'name' | 'title' | ...
-      - enabled: 'true'/'false' o '1'/'0'
+    Recibe los valores del formulario (POST) y devuelve SOLO el HTML
+    interno para el contenedor #preview (fragmento).
+
+    Si se sabe qué campo cambió, devuelve sólo el fragmento de esa sección
+    como swap out-of-band (con 'HX-Reswap: none' para no tocar el resto
+    del #preview). En cualquier otro caso (carga inicial, cambio de
+    plantilla, campo desconocido) devuelve el preview completo.
+
+    Los fragmentos se sirven desde la caché LRU (ver vcards/preview_cache.py)
+    cuando el contexto normalizado ya se renderizó antes.
+
+    Con un borrador abierto el editor usa draft_patch en su lugar.
     """
     if request.method != "POST":
-        return HttpResponseBadRequest("POST only")
+        return HttpResponseBadRequest("HTMX preview only accepts POST")
+
+    known, section = _changed_section(request)
+    return _render_preview(request, _preview_context(request.POST), known, section)
+
 
+@login_required
+async def apreview(request):
+    """
+    preview() async, la que se enruta bajo ASGI (settings.ASYNC_VIEWS, ver
+    config/asgi.py): esperar la caché/BD de los flags no ocupa un worker.
+    """
+    if request.method != "POST":
+        return HttpResponseBadRequest("HTMX preview only accepts POST")
+
+    known, section = _changed_section(request)
+    # Sólo el preview completo necesita los flags globales
+    flags = None if known else await _aget_globals(request)
+    return _render_preview(request, _preview_context(request.POST), known, section, flags)
+
+
+# ---------------------- Borradores (parches JSON) ----------------------
+def _draft_open_response(draft, state):
+    return JsonResponse({
+        "ok": True,
+        "id": draft.id,
+        "version": draft.version,
+        "state": draft.data,
+        "restored": draft.data != state,
+        "patch_url": reverse("vcards:draft_patch", args=[draft.id]),
+    })
+
+
+@login_required
+@require_POST
+def draft_open(request):
+    """
+    Abre el borrador de la tarjeta (card=<id>) o de la tarjeta nueva. Si
+    ya existía se devuelve su estado ('state', 'restored'=true cuando no
+    coincide con el form) para que el editor lo restaure; con reset=1 se
+    reemplaza con el estado actual del form.
+    """
+    card = None
+    card_id = (request.POST.get("card") or "").strip()
+    if card_id:
+        card = VCard.objects.filter(id=card_id, owner=request.user).only("id").first()
+        if card is None:
+            raise Http404("Tarjeta no encontrada")
+    state = drafts.form_state(request.POST)
+    draft = drafts.open_draft(request.user, card, state, reset=request.POST.get("reset") == "1")
+    return _draft_open_response(draft, state)
+
+
+@login_required
+@require_POST
+async def adraft_open(request):
+    """draft_open() async (ASGI)."""
+    user = await request.auser()
+    card = None
+    card_id = (request.POST.get("card") or "").strip()
+    if card_id:
+        card = await VCard.objects.filter(id=card_id, owner=user).only("id").afirst()
+        if card is None:
+            raise Http404("Tarjeta no encontrada")
+    state = drafts.form_state(request.POST)
+    draft = await drafts.aopen_draft(user, card, state, reset=request.POST.get("reset") == "1")
+    return _draft_open_response(draft, state)
+
+
+def _parse_patch(request):
+    """Operaciones del parche JSON (campo 'patch') o None si no es JSON."""
+    try:
+        return json.loads(request.POST.get("patch") or "")
+    except ValueError:
+        return None
+
+
+def _draft_section(request, ops):
+    field = request.POST.get("_changed") or drafts.changed_field(ops) or ""
+    return _changed_section(request, field)
+
+
+def _draft_preview(request, draft, known, section, flags=None):
+    ctx = _preview_context(drafts.as_querydict(draft.data))
+    response = _render_preview(request, ctx, known, section, flags)
+    response["X-Draft-Version"] = str(draft.version)
+    return response
+
+
+@login_required
+@require_POST
+def draft_patch(request, draft_id):
+    """
+    Aplica un parche JSON (campo 'patch') al borrador y responde con el
+    preview, igual que preview(). 409 si el parche no aplica sobre el
+    estado guardado: el editor vuelve a mandar el estado completo.
+    """
+    ops = _parse_patch(request)
+    if ops is None:
+        return HttpResponseBadRequest("Parche inválido")
+    try:
+        draft = drafts.patch_draft(request.user, draft_id, ops)
+    except drafts.PatchError as e:
+        return HttpResponse(str(e), status=409)
+    if draft is None:
+        raise Http404("Borrador no encontrado")
+    known, section = _draft_section(request, ops)
+    return _draft_preview(request, draft, known, section)
+
+
+@login_required
+@require_POST
+async def adraft_patch(request, draft_id):
+    """draft_patch() async (ASGI)."""
+    ops = _parse_patch(request)
+    if ops is None:
+        return HttpResponseBadRequest("Parche inválido")
+    try:
+        draft = await drafts.apatch_draft(await request.auser(), draft_id, ops)
+    except drafts.PatchError as e:
+        return HttpResponse(str(e), status=409)
+    if draft is None:
+        raise Http404("Borrador no encontrado")
+
+    known, section = _draft_section(request, ops)
+    flags = None if known else await _aget_globals(request)
+    return _draft_preview(request, draft, known, section, flags)
+
+
+@login_required
+@user_passes_test(lambda u: u.is_staff)
+def preview_cache_stats(request):
+    """
+    Contadores de la caché del preview (sólo staff). Son por proceso.
+    """
+    return JsonResponse(preview_cache.stats())
+
+
+# ------------------------ API: toggles globales -------------------------
+def _global_change(request):
+    """{field: bool} del POST de set_global, o None si falta algún campo."""
     field = request.POST.get("field")
     enabled = request.POST.get("enabled")
     if field is None or enabled is None:
+        return None
+    return {field: preferences.parse_bool(enabled)}
+
+
+@login_required
+@require_POST
+def set_global(request):
+    """
+    Guarda un flag global. Espera POST con:
+      - field: 'assets' | 'name' | 'title' | ...
+      - enabled: 'true'/'false' o '1'/'0'
+    El editor manda los cambios en lote a set_globals; éste queda para
+    clientes que aún mandan uno por uno.
+    """
+    changes = _global_change(request)
+    if changes is None:
         return HttpResponseBadRequest("Missing field/enabled")
+    try:
+        preferences.set_globals(request.user, changes)
+    except preferences.InvalidFlags as e:
+        return HttpResponseBadRequest(str(e))
+    ((field, val),) = changes.items()
+    return JsonResponse({"ok": True, "field": field, "enabled": val})
 
-    val = str(enabled).lower() in ("1", "true", "on", "yes")
-    g = request.session.get("vc_global", {})
-    g[field] = val
-    request.session["vc_global"] = g
-    request.session.modified = True
 
+@login_required
+@require_POST
+async def aset_global(request):
+    """set_global() async (ASGI)."""
+    changes = _global_change(request)
+    if changes is None:
+        return HttpResponseBadRequest("Missing field/enabled")
+    try:
+        await preferences.aset_globals(await request.auser(), changes)
+    except preferences.InvalidFlags as e:
+        return HttpResponseBadRequest(str(e))
+    ((field, val),) = changes.items()
     return JsonResponse({"ok": True, "field": field, "enabled": val})
 
 
+def _globals_changes(request):
+    """
+    Pares campo=bool de set_globals (JSON o form). Devuelve (cambios, None)
+    o (None, respuesta 400).
+    """
+    if request.content_type == "application/json":
+        try:
+            payload = json.loads(request.body or b"{}")
+        except ValueError:
+            return None, HttpResponseBadRequest("JSON inválido")
+        if not isinstance(payload, dict):
+            return None, HttpResponseBadRequest("Se espera un objeto")
+        changes = {str(k): bool(v) for k, v in payload.items()}
+    else:
+        changes = {
+            k: preferences.parse_bool(v) for k, v in request.POST.items() if k != "csrfmiddlewaretoken"
+        }
+    if not changes:
+        return None, HttpResponseBadRequest("Sin cambios")
+    return changes, None
+
+
+@login_required
+@require_POST
+def set_globals(request):
+    """
+    Aplica varios flags globales en un request (y una sola escritura).
+    Acepta JSON {"photo": true, "name": false} o un form con los mismos
+    pares campo=valor. Responde con todos los flags activos.
+    """
+    changes, error = _globals_changes(request)
+    if error:
+        return error
+    try:
+        flags = preferences.set_globals(request.user, changes)
+    except preferences.InvalidFlags as e:
+        return HttpResponseBadRequest(str(e))
+    return JsonResponse({"ok": True, "globals": flags})
+
+
+@login_required
+@require_POST
+async def aset_globals(request):
+    """set_globals() async (ASGI)."""
+    changes, error = _globals_changes(request)
+    if error:
+        return error
+    try:
+        flags = await preferences.aset_globals(await request.auser(), changes)
+    except preferences.InvalidFlags as e:
+        return HttpResponseBadRequest(str(e))
+    return JsonResponse({"ok": True, "globals": flags})
+
+
 # --------------------- API: validación de slug (HTMX) -------------------
+def _slug_status(slug, min_ok, taken, suggestions):
+    html = render_to_string(
+        "vcards/_slug_status.html",
+        {
+            "slug": slug,
+            "available": (min_ok and not taken),
+            "min_ok": min_ok,
+            "suggestions": suggestions,
+        },
+    )
+    return HttpResponse(html)
+
+
 @require_GET
 @login_required
 def check_slug(request):
     """
     Normaliza el valor enviado como 'slug' y responde con un fragmento HTML
     indicando si está disponible (y si cumple el mínimo de 5 caracteres).
+    Si está ocupado, incluye alternativas libres para elegir con un clic.
     """
-    raw = (request.GET.get("slug") or "").strip().lower()
+    slug = normalize_slug(request.GET.get("slug"))
+    min_ok = len(slug) >= SLUG_MIN_LENGTH
 
-    # Normalización idéntica al front: minúsculas, espacios→-, solo a-z0-9-
-    slug = re.sub(r"\s+", "-", raw)
-    slug = re.sub(r"[^a-z0-9-]", "", slug)
-    slug = re.sub(r"-+", "-", slug).strip("-")
+    # Un slug libre se responde desde el registro en memoria; si el set lo
+    # tiene se confirma con la BD y las sugerencias se confirman con una
+    # sola query (ver vcards/slugs.py)
+    taken = min_ok and slug_registry.is_taken(slug)
+    suggestions = slug_registry.suggest(slug) if taken else []
+    return _slug_status(slug, min_ok, taken, suggestions)
 
-    min_ok = len(slug) >= 5
 
-    # Si tienes modelo, consulta existencia; si no existe, asumimos disponible
-    exists = False
-    if min_ok and VCard is not None:
+@require_GET
+@login_required
+async def acheck_slug(request):
+    """check_slug() async (ASGI)."""
+    slug = normalize_slug(request.GET.get("slug"))
+    min_ok = len(slug) >= SLUG_MIN_LENGTH
+    taken = min_ok and await slug_registry.ais_taken(slug)
+    suggestions = await slug_registry.asuggest(slug) if taken else []
+    return _slug_status(slug, min_ok, taken, suggestions)
+
+
+# ------------------------ Guardar / publicar tarjeta ---------------------
+@login_required
+@require_POST
+def save_vcard(request):
+    """
+    Guarda la tarjeta con los mismos campos que manda el editor al preview.
+      - card:    id de la tarjeta (vacío => crea una nueva)
+      - slug:    sólo al crear (después no se puede cambiar)
+      - folder:  id de carpeta del usuario (opcional)
+      - publish: '1' para publicar (renderiza el snapshot público)
+      - draft:   borrador abierto en el editor (se liga a la tarjeta)
+    """
+    card_id = (request.POST.get("card") or "").strip()
+    if card_id:
         try:
-            exists = VCard.objects.filter(slug=slug).exists()
-        except Exception:
-            exists = False
+            card = VCard.objects.get(id=card_id, owner=request.user)
+        except (VCard.DoesNotExist, ValueError):
+            return HttpResponseBadRequest("No existe")
+    else:
+        slug = normalize_slug(request.POST.get("slug"))
+        if len(slug) < SLUG_MIN_LENGTH:
+            return HttpResponseBadRequest("El enlace debe tener al menos 5 caracteres")
+        if slug_registry.is_taken(slug):
+            return HttpResponseBadRequest("Ese enlace ya está en uso")
+        card = VCard(owner=request.user, slug=slug)
 
-    html = render_to_string(
-        "vcards/_slug_status.html",
-        {
-            "available": (min_ok and not exists),
-        },
+    folder_id = (request.POST.get("folder") or "").strip()
+    if "folder" in request.POST:
+        card.folder = Folder.objects.filter(id=folder_id, owner=request.user).first() if folder_id else None
+
+    # Lo que se guarda termina en la página pública: URLs, colores y largos
+    # se validan antes (vcards/validation.py)
+    try:
+        ctx = validation.clean_context(_preview_context(request.POST))
+    except validation.InvalidCard as e:
+        return HttpResponseBadRequest(str(e))
+    card.apply_preview_context(ctx)
+    try:
+        # Tarjeta nueva: aparta la plaza del plan (users/quotas.py) antes de guardar
+        with quotas.card_slot(request.user) if card.pk is None else nullcontext():
+            if request.POST.get("publish") == "1":
+                card.publish()
+            else:
+                card.save()
+    except quotas.QuotaExceeded as e:
+        return HttpResponseForbidden(f"Tu plan permite {e.limit} tarjeta(s). Mejora tu plan para crear más.")
+    except IntegrityError:
+        # Carrera con otro usuario que tomó el mismo slug
+        return HttpResponseBadRequest("Ese enlace ya está en uso")
+
+    # El borrador de la tarjeta nueva pasa a ser el de esta tarjeta
+    draft_id = (request.POST.get("draft") or "").strip()
+    if draft_id.isdigit() and not VCardDraft.objects.filter(card=card).exists():
+        VCardDraft.objects.filter(id=draft_id, owner=request.user, card=None).update(
+            card=card, data=drafts.form_state(request.POST)
+        )
+
+    return JsonResponse({
+        "ok": True,
+        "id": card.id,
+        "slug": card.slug,
+        "published": card.is_published,
+        "url": reverse("public_card", args=[card.slug]),
+    })
+
+
+# ------------------------- Upload de imágenes --------------------------
+@login_required
+@require_POST
+def upload_image(request):
+    """
+    Recibe un archivo 'image' del editor:
+      - ?field=photo|banner -> devuelve el tile (#photoTile / #bannerTile)
+        más el input oculto actualizado (OOB).
+      - sin field (galería) -> devuelve un .image-item para #imageList.
+    El archivo se guarda por hash de contenido y las variantes se generan
+    en segundo plano (vcards/images.py); la respuesta no las espera.
+    """
+    field = request.GET.get("field") or "gallery"
+    if field not in images.FIELD_VARIANTS:
+        return HttpResponseBadRequest("Campo inválido")
+
+    upload = request.FILES.get("image")
+    if upload is None:
+        return HttpResponseBadRequest("Falta el archivo")
+    if upload.size > getattr(settings, "IMAGE_MAX_UPLOAD_BYTES", 15 * 1024 * 1024):
+        return HttpResponseBadRequest("La imagen es demasiado grande")
+
+    try:
+        _, rel_path = images.store_upload(upload)
+    except images.InvalidImage as e:
+        return HttpResponseBadRequest(str(e))
+    images.schedule_variants(rel_path, field)
+
+    ctx = {
+        "field": field,
+        "url": images.media_url(rel_path),
+        "globals": _get_globals(request),
+    }
+    if field == "gallery":
+        return render(request, "vcards/_image_item.html", ctx)
+
+    response = render(request, "vcards/_asset_tile.html", ctx)
+    # El editor refresca el preview al recibir este evento
+    response["HX-Trigger"] = "vcard:asset-uploaded"
+    return response
+
+
+# ------------------- Upload de video (chunks, reanudable) -------------------
+def _upload_error(e):
+    return JsonResponse({"ok": False, "error": str(e)}, status=e.status)
+
+
+@login_required
+@require_POST
+def upload_video(request):
+    """Inicia una subida por chunks (ver protocolo en vcards/uploads.py)."""
+    try:
+        state = uploads.start(request.user.id, request.POST.get("size"), request.POST.get("filename"))
+    except uploads.UploadError as e:
+        return _upload_error(e)
+    return JsonResponse({"ok": True, **state}, status=201)
+
+
+@login_required
+@require_http_methods(["GET", "PATCH"])
+def upload_video_chunk(request, upload_id):
+    """
+    GET: offset actual (para reanudar). PATCH: agrega un chunk; el cuerpo se
+    lee del stream con request.read(), nunca se carga completo.
+    """
+    try:
+        if request.method == "GET":
+            return JsonResponse({"ok": True, **uploads.status(str(upload_id), request.user.id)})
+        offset = uploads.write_chunk(
+            str(upload_id),
+            request.user.id,
+            offset=request.headers.get("Upload-Offset"),
+            length=request.META.get("CONTENT_LENGTH"),
+            checksum=request.headers.get("X-Chunk-Sha256"),
+            stream=request,
+        )
+    except uploads.UploadError as e:
+        return _upload_error(e)
+    return JsonResponse({"ok": True, "offset": offset})
+
+
+@login_required
+@require_POST
+def upload_video_finalize(request, upload_id):
+    """Mueve el video completo a media/ y devuelve su URL."""
+    try:
+        rel_path = uploads.finalize(str(upload_id), request.user.id)
+    except uploads.UploadError as e:
+        return _upload_error(e)
+    return JsonResponse({"ok": True, "url": images.media_url(rel_path)})
+
+
+# ------------------------ Importación masiva (CSV/.vcf) ------------------------
+@login_required
+@require_POST
+def import_cards(request):
+    """
+    Recibe el archivo ('file') y responde NDJSON en streaming: una línea
+    de progreso por lote y una final con los errores por fila.
+    """
+    if not importer.can_import(request.user):
+        return HttpResponseForbidden("La importación masiva es parte del plan Business")
+    upload = request.FILES.get("file")
+    if upload is None:
+        return HttpResponseBadRequest("Falta el archivo")
+    if upload.size > getattr(settings, "IMPORT_MAX_UPLOAD_BYTES", 20 * 1024 * 1024):
+        return HttpResponseBadRequest("El archivo es demasiado grande")
+    folder_id = (request.POST.get("folder") or "").strip()
+    folder = Folder.objects.filter(id=folder_id, owner=request.user).first() if folder_id.isdigit() else None
+
+    def stream():
+        report = importer.ImportReport()
+        rows = importer.iter_rows(upload, upload.name)
+        for report in importer.iter_import(request.user, rows, folder):
+            yield json.dumps(report.as_dict()) + "\n"
+        yield json.dumps({**report.as_dict(errors=True), "done": True}) + "\n"
+
+    response = streaming_response(request, stream(), "application/x-ndjson")
+    response["Cache-Control"] = "no-store"
+    response["X-Accel-Buffering"] = "no"  # nginx: no juntar el progreso
+    return response
+
+
+# --------------------------- Página pública ----------------------------
+def _public_snapshot(slug):
+    """
+    (etag, html, owner_id, plan) del snapshot publicado, o None. Se guarda
+    en la caché de Django; VCard.save() la invalida en este proceso y el
+    TTL (VCARD_PUBLIC_CACHE_TTL) acota lo que tarda en verse en los demás
+    workers si la caché no es compartida. El dueño y su plan van aquí para
+    revisar la cuota de visitas sin queries.
+    """
+    key = public_cache_key(slug)
+    snap = cache.get(key)
+    if snap is None:
+        row = (
+            VCard.objects.filter(slug=slug, is_published=True)
+            .values_list("published_etag", "published_html", "owner_id", "owner__plan")
+            .first()
+        )
+        snap = row or ()
+        cache.set(key, snap, getattr(settings, "VCARD_PUBLIC_CACHE_TTL", 60))
+    return snap or None
+
+
+@require_GET
+def public_card(request, slug):
+    """
+    Sirve el HTML pre-renderizado al publicar. Nunca ejecuta templates:
+    con caché caliente no hace queries, y responde 304 si el navegador
+    ya tiene la versión actual (If-None-Match).
+
+    Si el dueño ya gastó las visitas del mes de su plan se muestra un
+    aviso en lugar de la tarjeta (un cache.get, ver users/quotas.py). La
+    visita se cuenta aquí, sólo al servir la tarjeta (200) a alguien que
+    no es bot, una vez por IP y tarjeta (quotas.count_view).
+    """
+    snap = _public_snapshot(slug)
+    if snap is None:
+        raise Http404("Tarjeta no encontrada")
+    etag, html, owner_id, plan = snap
+    if quotas.views_exhausted(owner_id, plan):
+        response = render(request, "vcards/over_quota.html", status=429)
+        response["Cache-Control"] = "no-store"
+        return response
+    etag = quote_etag(etag)
+
+    response = HttpResponse(html)
+    response["ETag"] = etag
+    response["Cache-Control"] = "public, max-age=60"
+    response = get_conditional_response(request, etag=etag, response=response)
+    if response.status_code == 200 and not is_bot(request.headers.get("User-Agent", "")):
+        quotas.count_view(owner_id, plan, slug, client_ip(request))
+    return response
+
+
+@require_GET
+def public_vcf(request, slug):
+    """
+    .vcf de la versión publicada (se genera al publicar, ver vcards/vcf.py).
+    Mismo esquema de caché y ETag que public_card.
+    """
+    key = public_vcf_cache_key(slug)
+    snap = cache.get(key)
+    if snap is None:
+        row = (
+            VCard.objects.filter(slug=slug, is_published=True)
+            .exclude(published_vcf="")
+            .values_list("published_etag", "published_vcf")
+            .first()
+        )
+        snap = row or ()
+        cache.set(key, snap, getattr(settings, "VCARD_PUBLIC_CACHE_TTL", 60))
+    if not snap:
+        raise Http404("Tarjeta no encontrada")
+    etag, text = snap
+    etag = quote_etag(f"{etag}-vcf")
+
+    response = HttpResponse(text, content_type="text/vcard; charset=utf-8")
+    response["Content-Disposition"] = f'attachment; filename="{slug}.vcf"'
+    response["ETag"] = etag
+    response["Cache-Control"] = "public, max-age=60"
+    return get_conditional_response(request, etag=etag, response=response)
+
+
+# ------------------------ .vcf del dueño (borrador) ------------------------
+@login_required
+@require_GET
+def card_vcf(request, card_id):
+    """.vcf con los datos actuales (incluye cambios sin publicar)."""
+    card = (
+        VCard.objects.filter(id=card_id, owner=request.user)
+        .defer("published_html", "published_vcf")
+        .first()
     )
-    return HttpResponse(html)
+    if card is None:
+        raise Http404("Tarjeta no encontrada")
+    etag = quote_etag(f"vcf-{card.pk}-{card.updated_at.timestamp():.6f}")
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(vcf.cached_vcf(card), content_type="text/vcard; charset=utf-8")
+        response["Content-Disposition"] = f'attachment; filename="{vcf.filename(card)}"'
+    response["ETag"] = etag
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+# ------------------------------- Códigos QR -------------------------------
+@login_required
+@require_GET
+def card_qr(request, card_id, fmt):
+    """
+    QR de la tarjeta con el estilo pedido (?fg=#RRGGBB&bg=&scale=&logo=1).
+    Redirige al archivo por contenido (qr_file), que se cachea para siempre.
+    """
+    card = VCard.objects.filter(id=card_id, owner=request.user).only("slug", "theme", "photo").first()
+    if card is None:
+        raise Http404("Tarjeta no encontrada")
+    try:
+        style = qr.make_style(
+            card, fmt,
+            fg=request.GET.get("fg"), bg=request.GET.get("bg"),
+            scale=request.GET.get("scale", 10), logo=request.GET.get("logo") == "1",
+        )
+    except qr.InvalidStyle as e:
+        return HttpResponseBadRequest(str(e))
+    url = qr.file_url(qr.get_or_create(qr.card_url(card), style), fmt)
+    if request.GET.get("download") == "1":
+        url += f"?download={card.slug}"
+    return redirect(url)
+
+
+@require_GET
+def qr_file(request, key, fmt):
+    """Archivo de un QR. La URL es el hash del contenido: immutable."""
+    if fmt not in qr.FORMATS or not re.fullmatch(r"[0-9a-f]{64}", key):
+        raise Http404("No existe")
+    etag = quote_etag(key)
+    path = qr.abs_path(key, fmt)
+    if not os.path.exists(path):
+        raise Http404("No existe")
+    qr.touch(path)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = FileResponse(open(path, "rb"), content_type=qr.FORMATS[fmt])
+        name = request.GET.get("download")
+        if name:
+            response["Content-Disposition"] = f'attachment; filename="{slugify(name) or "qr"}-qr.{fmt}"'
+    response["ETag"] = etag
+    response["Cache-Control"] = "public, max-age=31536000, immutable"
+    return response
@@ -0,0 +1,55 @@
+# vcards/zipstream.py
+"""
+Zip en streaming: ZipFile escribe sobre un destino no-seekable y los bytes
+se entregan conforme se agrega cada archivo. En memoria sólo queda el
+directorio central (nombre + offsets por archivo), nunca el zip completo.
+Lo usan las exportaciones de carpetas (.vcf y QR).
+"""
+import zipfile
+
+
+class _ChunkSink:
+    """Destino no-seekable para ZipFile: junta lo escrito hasta que se saca."""
+
+    def __init__(self):
+        self._chunks = []
+        self._offset = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._offset
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def iter_zip(entries, compress=True):
+    """
+    entries: iterable de (nombre, date_time, bytes). Genera los bytes del
+    zip; nombres repetidos se desambiguan con un sufijo.
+    """
+    method = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+    sink = _ChunkSink()
+    used = set()
+    with zipfile.ZipFile(sink, mode="w", compression=method) as archive:
+        for name, date_time, data in entries:
+            if name in used:
+                stem, dot, ext = name.rpartition(".")
+                name = f"{stem}-{len(used)}.{ext}" if dot else f"{name}-{len(used)}"
+            used.add(name)
+            info = zipfile.ZipInfo(name, date_time=date_time)
+            info.compress_type = method
+            archive.writestr(info, data)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    yield sink.drain()  # directorio central